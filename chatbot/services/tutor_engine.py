@@ -415,8 +415,8 @@ async def _collect_stock_context(
                 }
             )
 
-    for _, code in detected_stocks[:2]:
-        fdr_text = get_fundamentals_text(code)
+    for name, code in detected_stocks[:2]:
+        fdr_text = get_fundamentals_text(code, name)
         if fdr_text:
             db_context += f"\n{fdr_text}"
             sources.append(
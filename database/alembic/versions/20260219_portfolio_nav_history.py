@@ -0,0 +1,39 @@
+"""portfolio_nav_history 테이블 생성 (일별 포트폴리오 평가액)
+
+Revision ID: 20260219_nav_history
+Revises: 20260218_unique_portfolio
+Create Date: 2026-02-19
+"""
+from alembic import op
+
+revision = "20260219_nav_history"
+down_revision = "20260218_unique_portfolio"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 모델: app.models.portfolio.PortfolioNavHistory
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS portfolio_nav_history (
+            id SERIAL PRIMARY KEY,
+            portfolio_id INTEGER NOT NULL REFERENCES user_portfolios(id) ON DELETE CASCADE,
+            user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            nav_date DATE NOT NULL,
+            cash BIGINT NOT NULL,
+            holdings_value BIGINT NOT NULL,
+            total_value BIGINT NOT NULL,
+            profit_loss BIGINT NOT NULL,
+            profit_loss_pct DOUBLE PRECISION NOT NULL,
+            created_at TIMESTAMP DEFAULT NOW(),
+            CONSTRAINT uq_portfolio_nav_history_portfolio_date UNIQUE (portfolio_id, nav_date)
+        )
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_portfolio_nav_history_nav_date "
+        "ON portfolio_nav_history(nav_date)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS portfolio_nav_history")
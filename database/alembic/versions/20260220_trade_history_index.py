@@ -0,0 +1,27 @@
+"""simulation_trades 거래 내역 키셋 페이지용 커버링 인덱스
+
+Revision ID: 20260220_trade_history_idx
+Revises: 20260219_nav_history
+Create Date: 2026-02-20
+"""
+from alembic import op
+
+revision = "20260220_trade_history_idx"
+down_revision = "20260219_nav_history"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 모델: app.models.portfolio.SimulationTrade
+    # WHERE portfolio_id = ? AND (traded_at, id) < (?, ?) ORDER BY traded_at DESC, id DESC LIMIT n
+    # 을 인덱스 역방향 스캔으로 처리. trade_reason(자유 텍스트)은 인덱스 크기 때문에 제외.
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_simulation_trades_portfolio_traded_at
+        ON simulation_trades (portfolio_id, traded_at, id)
+        INCLUDE (trade_type, stock_code, stock_name, quantity, price, total_amount)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_simulation_trades_portfolio_traded_at")
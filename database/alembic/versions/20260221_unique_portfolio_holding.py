@@ -0,0 +1,49 @@
+"""portfolio_holdings (portfolio_id, stock_code) UNIQUE — 매매 시 보유 종목 upsert용
+
+같은 종목이 여러 행으로 쪼개져 있으면 수량 합계/가중 평균단가로 한 행에 합친 뒤
+UNIQUE 인덱스를 만든다.
+
+Revision ID: 20260221_unique_holding
+Revises: 20260220_trade_history_idx
+Create Date: 2026-02-21
+"""
+from alembic import op
+
+revision = "20260221_unique_holding"
+down_revision = "20260220_trade_history_idx"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 모델: app.models.portfolio.PortfolioHolding
+    op.execute("""
+        WITH merged AS (
+            SELECT MIN(id) AS keep_id,
+                   SUM(quantity) AS quantity,
+                   SUM(avg_buy_price * quantity) / NULLIF(SUM(quantity), 0) AS avg_buy_price
+            FROM portfolio_holdings
+            GROUP BY portfolio_id, stock_code
+            HAVING COUNT(*) > 1
+        )
+        UPDATE portfolio_holdings h
+        SET quantity = m.quantity,
+            avg_buy_price = COALESCE(m.avg_buy_price, h.avg_buy_price)
+        FROM merged m
+        WHERE h.id = m.keep_id
+    """)
+    op.execute("""
+        DELETE FROM portfolio_holdings h
+        USING portfolio_holdings k
+        WHERE h.portfolio_id = k.portfolio_id
+          AND h.stock_code = k.stock_code
+          AND h.id > k.id
+    """)
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_portfolio_holdings_portfolio_stock "
+        "ON portfolio_holdings(portfolio_id, stock_code)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS uq_portfolio_holdings_portfolio_stock")
@@ -22,6 +22,8 @@ from sqlalchemy.exc import IntegrityError
 
 from app.core.database import AsyncSessionLocal
 from app.models.stock_listing import StockListing
+from app.services.redis_cache import close_redis_cache
+from app.services.stock_search_index import bump_stock_listings_version
 
 
 async def init_stock_listings():
@@ -134,6 +136,15 @@ async def init_stock_listings():
             print(f"❌ DB 저장 실패: {e}")
             raise
 
+    # 5. API 워커의 종목 검색 인덱스 재로드 신호
+    try:
+        await bump_stock_listings_version()
+        print("🔄 종목 검색 인덱스 재로드 요청 완료")
+    except Exception as e:
+        print(f"  ⚠️  검색 인덱스 재로드 요청 실패 (다음 재시작 시 반영): {e}")
+    finally:
+        await close_redis_cache()
+
     print("\n" + "=" * 60)
     print(f"🎉 완료! 총 {len(listings)}개 종목 처리")
 
@@ -1,46 +1,36 @@
 """pykrx 기반 재무 지표 수집기.
 
 PER, PBR, EPS, DIV 등 기본 재무 지표를 텍스트로 포맷팅한다.
+지표는 일별 전종목 스냅샷(fundamentals_store)에서 종목 하나만 O(1)로 조회한다.
 """
 
-from datetime import datetime, timedelta
+from typing import Optional
 
-from pykrx import stock as pykrx_stock
+from .fundamentals_store import get_fundamentals_store
 
 
-def format_fundamentals_for_llm(ticker: str) -> str:
+def format_fundamentals_for_llm(ticker: str, name: Optional[str] = None) -> str:
     """종목 재무 지표를 LLM 컨텍스트용 텍스트로 반환.
 
     Args:
         ticker: 종목 코드 (6자리)
+        name: 종목명 (없으면 pykrx로 조회)
 
     Returns:
         재무 지표 텍스트 (PER, PBR, EPS, 배당수익률)
     """
-    today = datetime.now()
-    date_str = today.strftime("%Y%m%d")
+    found = get_fundamentals_store().lookup(ticker)
+    if found is None:
+        return f"{ticker}: 재무 지표를 찾을 수 없습니다."
+    date_str, row = found
 
-    # 최근 영업일 탐색
-    df = None
-    for days_back in range(7):
-        try_date = (today - timedelta(days=days_back)).strftime("%Y%m%d")
+    if not name:
         try:
-            result = pykrx_stock.get_market_fundamental_by_ticker(try_date, market="ALL")
-            if result is not None and not result.empty and ticker in result.index:
-                df = result
-                date_str = try_date
-                break
-        except Exception:
-            continue
+            from pykrx import stock as pykrx_stock
 
-    if df is None or ticker not in df.index:
-        return f"{ticker}: 재무 지표를 찾을 수 없습니다."
-
-    row = df.loc[ticker]
-    try:
-        name = pykrx_stock.get_market_ticker_name(ticker)
-    except Exception:
-        name = ticker
+            name = pykrx_stock.get_market_ticker_name(ticker)
+        except Exception:
+            name = ticker
 
     per = row.get("PER", 0)
     pbr = row.get("PBR", 0)
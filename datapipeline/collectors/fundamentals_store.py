@@ -0,0 +1,180 @@
+"""일별 전종목 재무 지표(PER/PBR/EPS/BPS/DIV/DPS) 스냅샷.
+
+pykrx 전종목 펀더멘털 표는 한 번 받는 데 수 초가 걸리지만 하루에 한 번만 바뀐다.
+거래일마다 한 번 받아 로컬 파일(fundamentals_YYYYMMDD.npz, 컬럼형)로 저장하고,
+프로세스 안에서는 종목코드 → 행 번호 dict로 색인해 종목 하나를 O(1)로 조회한다.
+
+- 스냅샷 갱신 시점: 확정된 최근 거래일(ohlcv_store._settled_through 기준)이 바뀔 때
+  조회 경로에서 한 번, 그리고 스케줄러의 일일 잡에서 미리 한 번
+- 같은 날짜 파일이 이미 있으면 네트워크 없이 파일만 읽는다 (워커/재시작 간 공유)
+- 휴장일은 거래일 달력(shared.trading_calendar)으로 건너뛰어 가장 최근 거래일 표를 쓴다
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+from shared.trading_calendar import recent_trading_days
+
+from .ohlcv_store import _settled_through, _to_date
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = Path(__file__).resolve().parent.parent / "data" / "fundamentals"
+
+FIELDS = ("BPS", "PER", "PBR", "EPS", "DIV", "DPS")
+LOOKBACK_DAYS = 2        # 최근 거래일 탐색 개수 (당일 표가 아직 없을 때 직전 거래일)
+KEEP_SNAPSHOTS = 5       # 디스크에 남겨 둘 최근 스냅샷 수
+RETRY_SECONDS = 600      # 갱신 실패 후 재시도 간격
+
+
+class FundamentalsSnapshot:
+    """한 거래일의 전종목 재무 지표 (불변). 컬럼별 numpy 배열 + 종목코드 색인."""
+
+    __slots__ = ("trade_date", "codes", "columns", "_index")
+
+    def __init__(self, trade_date: str, codes: np.ndarray, columns: dict[str, np.ndarray]):
+        self.trade_date = trade_date
+        self.codes = codes
+        self.columns = columns
+        self._index = {str(code): i for i, code in enumerate(codes)}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._index
+
+    def get(self, code: str) -> Optional[dict[str, float]]:
+        """종목 하나의 지표 dict. 없으면 None."""
+        i = self._index.get(code)
+        if i is None:
+            return None
+        return {field: float(col[i]) for field, col in self.columns.items()}
+
+    @classmethod
+    def from_frame(cls, trade_date: str, df: pd.DataFrame) -> "FundamentalsSnapshot":
+        """pykrx get_market_fundamental_by_ticker 결과(index=티커) → 스냅샷."""
+        codes = np.asarray([str(c) for c in df.index], dtype="U12")
+        columns = {
+            field: df[field].fillna(0).to_numpy(dtype=np.float64) if field in df.columns
+            else np.zeros(len(df), dtype=np.float64)
+            for field in FIELDS
+        }
+        return cls(trade_date, codes, columns)
+
+
+def _fetch_fundamentals(date_str: str) -> Optional[pd.DataFrame]:
+    from pykrx import stock as pykrx_stock
+
+    df = pykrx_stock.get_market_fundamental_by_ticker(date_str, market="ALL")
+    if df is None or df.empty:
+        return None
+    return df
+
+
+class FundamentalsStore:
+    """거래일별 재무 지표 스냅샷 파일 저장소 + 프로세스 내 최신 스냅샷."""
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._snapshot: Optional[FundamentalsSnapshot] = None
+        self._checked_for: Optional[int] = None  # 마지막으로 맞춰 본 확정 거래일 기준값
+        self._retry_at = 0.0
+
+    # --- 파일 I/O ---
+
+    def _path(self, date_str: str) -> Path:
+        return self.root / f"fundamentals_{date_str}.npz"
+
+    def load(self, date_str: str) -> Optional[FundamentalsSnapshot]:
+        """저장된 스냅샷 읽기 (네트워크 없음). 없으면 None."""
+        try:
+            with np.load(self._path(date_str)) as data:
+                columns = {field: data[field] for field in FIELDS}
+                return FundamentalsSnapshot(date_str, data["codes"], columns)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("재무 지표 스냅샷 손상 (%s): %s", date_str, e)
+            return None
+
+    def save(self, snapshot: FundamentalsSnapshot) -> None:
+        """임시 파일에 쓴 뒤 os.replace로 원자적으로 교체하고, 오래된 스냅샷을 정리한다."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(snapshot.trade_date)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                np.savez(f, codes=snapshot.codes, **snapshot.columns)
+            os.replace(tmp, path)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        for old in sorted(self.root.glob("fundamentals_*.npz"))[:-KEEP_SNAPSHOTS]:
+            old.unlink(missing_ok=True)
+
+    # --- 갱신 ---
+
+    def refresh(self, now: Optional[datetime] = None) -> Optional[FundamentalsSnapshot]:
+        """확정된 최근 거래일 스냅샷을 준비한다 (파일 우선, 없으면 pykrx 1회 조회)."""
+        settled = _settled_through(now)
+        latest = _to_date(settled)
+        with self._lock:
+            for day in recent_trading_days(latest, LOOKBACK_DAYS):
+                date_str = day.strftime("%Y%m%d")
+                if self._snapshot is not None and self._snapshot.trade_date == date_str:
+                    break
+                snapshot = self.load(date_str)
+                if snapshot is None:
+                    try:
+                        df = _fetch_fundamentals(date_str)
+                    except Exception as e:
+                        logger.warning("재무 지표 조회 실패 (%s): %s", date_str, e)
+                        self._retry_at = time.monotonic() + RETRY_SECONDS
+                        return self._snapshot
+                    if df is None:
+                        continue  # 아직 발표 전
+                    snapshot = FundamentalsSnapshot.from_frame(date_str, df)
+                    self.save(snapshot)
+                    logger.info("재무 지표 스냅샷 저장: %s, %d종목", date_str, len(snapshot))
+                self._snapshot = snapshot
+                break
+            self._checked_for = settled
+        return self._snapshot
+
+    def snapshot(self, now: Optional[datetime] = None) -> Optional[FundamentalsSnapshot]:
+        """최신 스냅샷. 확정 거래일이 바뀐 뒤 처음 부를 때만 갱신을 시도한다."""
+        if self._checked_for == _settled_through(now) and self._snapshot is not None:
+            return self._snapshot
+        if time.monotonic() < self._retry_at:
+            return self._snapshot
+        return self.refresh(now)
+
+    def lookup(self, code: str) -> Optional[tuple[str, dict[str, float]]]:
+        """(거래일, 지표 dict). 스냅샷이 없거나 종목이 없으면 None."""
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return None
+        row = snapshot.get(code)
+        if row is None:
+            return None
+        return snapshot.trade_date, row
+
+
+_store: Optional[FundamentalsStore] = None
+
+
+def get_fundamentals_store() -> FundamentalsStore:
+    """재무 지표 저장소 싱글톤 (FUNDAMENTALS_STORE_DIR 환경변수로 위치 지정)."""
+    global _store
+    if _store is None:
+        _store = FundamentalsStore(os.getenv("FUNDAMENTALS_STORE_DIR", str(DEFAULT_STORE_DIR)))
+    return _store
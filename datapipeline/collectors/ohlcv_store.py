@@ -0,0 +1,352 @@
+"""로컬 컬럼형 일봉 OHLCV 저장소.
+
+종목별로 numpy 구조화 배열 파일(.npy) 하나를 두고 memory-map으로 읽는다.
+히스토리가 필요한 곳(튜터 종목 컨텍스트, 기술적 지표, 스크리너, attention score)은
+네트워크 대신 이 저장소를 읽고, 비어 있는 구간만 한 번 받아 채운다 (read-through).
+
+- 일일 증분: append_day(date)가 pykrx 전종목 보드 1회 호출로 모든 종목에 하루치를 추가
+- 범위 조회: read(symbol, start, end) → 구조화 배열 (arr["close"] 등 컬럼별 numpy 배열)
+- 파일 교체는 임시 파일 + os.replace로 원자적으로 수행 (읽는 쪽은 기존 mmap 유지)
+
+종목별 {symbol}.json 에 확인된 구간(from/through)을 기록해 상장 전 구간이나 휴장일 때문에
+같은 구간을 반복해서 받지 않도록 한다. 당일 봉은 해당 시장의 장 마감 후 확정된 뒤에만 저장한다
+(국내 6자리 코드: 16:00 KST, 그 외(스크리너 S&P500 등): 17:00 미 동부시간).
+
+보드 등락률로 역산한 전일 종가가 저장된 직전 거래일 종가와 어긋나면(액면분할/권리락 등
+수정주가 이벤트) 해당 종목 파일을 지우고 다음 조회 때 수정주가로 다시 받는다. 저장된 마지막 봉이
+직전 거래일이 아니면(빈 구간) 비교할 근거가 없으므로 지우지 않는다.
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional, Union
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+from shared.trading_calendar import prev_trading_day, recent_trading_days
+
+logger = logging.getLogger(__name__)
+
+KST = timezone(timedelta(hours=9))
+ET = ZoneInfo("America/New_York")
+MARKET_KRX = "KRX"
+MARKET_US = "US"
+# 시장별 (시간대, 당일 봉을 확정으로 보는 현지 시각)
+SETTLED_AT = {
+    MARKET_KRX: (KST, 16),
+    MARKET_US: (ET, 17),    # 16:00 ET 마감 + 1시간
+}
+ADJUST_TOLERANCE = 0.01     # 수정주가 이벤트 판정 허용 오차 (1%)
+
+DEFAULT_STORE_DIR = Path(__file__).resolve().parent.parent / "data" / "ohlcv"
+
+OHLCV_DTYPE = np.dtype([
+    ("date", "<i4"),        # YYYYMMDD
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<i8"),
+])
+
+# pykrx(한글) / FinanceDataReader(영문) 컬럼 → 저장 필드
+_COLUMN_MAP = {
+    "시가": "open", "고가": "high", "저가": "low", "종가": "close", "거래량": "volume",
+    "Open": "open", "High": "high", "Low": "low", "Close": "close", "Volume": "volume",
+}
+
+DateLike = Union[str, int, datetime, None]
+
+
+def _to_int_date(value: DateLike) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, datetime):
+        return int(value.strftime("%Y%m%d"))
+    return int(str(value).replace("-", "")[:8])
+
+
+def _to_date(value: int) -> datetime:
+    return datetime.strptime(str(value), "%Y%m%d")
+
+
+def _shift(day: int, days: int) -> int:
+    return int((_to_date(day) + timedelta(days=days)).strftime("%Y%m%d"))
+
+
+def market_of(symbol: str) -> str:
+    """국내 6자리 코드는 KRX, 그 외(티커)는 US."""
+    return MARKET_KRX if len(symbol) == 6 and symbol.isdigit() else MARKET_US
+
+
+def _settled_through(now: Optional[datetime] = None, market: str = MARKET_KRX) -> int:
+    """저장 가능한 마지막 날짜 (당일은 해당 시장 장 마감 확정 후에만, 현지 날짜 기준)."""
+    tz, hour = SETTLED_AT[market]
+    now = now.astimezone(tz) if now else datetime.now(tz)
+    day = now if now.hour >= hour else now - timedelta(days=1)
+    return int(day.strftime("%Y%m%d"))
+
+
+def frame_to_rows(df: pd.DataFrame) -> np.ndarray:
+    """pykrx/FDR 일봉 DataFrame(index=날짜) → 구조화 배열. 종가 0(거래정지) 행은 제외."""
+    if df is None or df.empty:
+        return np.empty(0, dtype=OHLCV_DTYPE)
+    df = df.rename(columns={k: v for k, v in _COLUMN_MAP.items() if k in df.columns})
+    rows = np.zeros(len(df), dtype=OHLCV_DTYPE)
+    rows["date"] = pd.DatetimeIndex(df.index).strftime("%Y%m%d").astype(np.int32)
+    for field in ("open", "high", "low", "close", "volume"):
+        if field in df.columns:
+            rows[field] = df[field].fillna(0).to_numpy()
+    return rows[rows["close"] > 0]
+
+
+def _fetch_history(symbol: str, start: int, end: int) -> np.ndarray:
+    """네트워크에서 일봉 조회 (국내 6자리 코드는 pykrx 수정주가, 그 외 FDR)."""
+    if market_of(symbol) == MARKET_KRX:
+        from pykrx import stock as pykrx_stock
+
+        df = pykrx_stock.get_market_ohlcv_by_date(str(start), str(end), symbol)
+    else:
+        import FinanceDataReader as fdr
+
+        df = fdr.DataReader(
+            symbol, _to_date(start).strftime("%Y-%m-%d"), _to_date(end).strftime("%Y-%m-%d")
+        )
+    return frame_to_rows(df)
+
+
+class OHLCVStore:
+    """종목별 .npy 파일 기반 일봉 저장소."""
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    # --- 파일 I/O ---
+
+    def _path(self, symbol: str, suffix: str = ".npy") -> Path:
+        safe = re.sub(r"[^0-9A-Za-z._-]", "_", symbol)
+        return self.root / f"{safe}{suffix}"
+
+    def _atomic_write(self, path: Path, writer) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                writer(f)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def load(self, symbol: str) -> Optional[np.ndarray]:
+        """종목 전체 일봉 (memory-mapped, 읽기 전용). 없으면 None."""
+        try:
+            return np.load(self._path(symbol), mmap_mode="r")
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("OHLCV 파일 손상 (%s): %s", symbol, e)
+            return None
+
+    def coverage(self, symbol: str) -> Optional[tuple[int, int]]:
+        """확인된 구간 (from, through). 기록이 없으면 None."""
+        try:
+            meta = json.loads(self._path(symbol, ".json").read_text())
+            return int(meta["from"]), int(meta["through"])
+        except FileNotFoundError:
+            return None
+        except Exception:
+            return None
+
+    def _set_coverage(self, symbol: str, start: int, through: int) -> None:
+        payload = json.dumps({"from": start, "through": through}).encode()
+        self._atomic_write(self._path(symbol, ".json"), lambda f: f.write(payload))
+
+    def merge(self, symbol: str, rows: np.ndarray) -> np.ndarray:
+        """기존 일봉과 합쳐 저장한다 (같은 날짜는 새 값 우선)."""
+        existing = self.load(symbol)
+        if existing is not None and len(existing):
+            combined = np.concatenate([np.asarray(rows, dtype=OHLCV_DTYPE), existing])
+        else:
+            combined = np.asarray(rows, dtype=OHLCV_DTYPE)
+        # 새 행이 앞에 있으므로 날짜별 첫 등장(=새 값)만 남긴다. unique 결과는 날짜순.
+        _, first = np.unique(combined["date"], return_index=True)
+        merged = np.ascontiguousarray(combined[first])
+        self._atomic_write(self._path(symbol), lambda f: np.save(f, merged))
+        return merged
+
+    def drop(self, symbol: str) -> None:
+        for suffix in (".npy", ".json"):
+            try:
+                self._path(symbol, suffix).unlink()
+            except FileNotFoundError:
+                pass
+
+    # --- 조회 ---
+
+    def read(self, symbol: str, start: DateLike = None, end: DateLike = None) -> np.ndarray:
+        """저장된 구간만 읽는다 (네트워크 없음). 날짜 범위는 양 끝 포함."""
+        arr = self.load(symbol)
+        if arr is None:
+            return np.empty(0, dtype=OHLCV_DTYPE)
+        dates = arr["date"]
+        lo = 0 if start is None else int(np.searchsorted(dates, _to_int_date(start), "left"))
+        hi = len(arr) if end is None else int(np.searchsorted(dates, _to_int_date(end), "right"))
+        return arr[lo:hi]
+
+    def ensure(self, symbol: str, start: DateLike, end: DateLike = None) -> np.ndarray:
+        """범위를 읽되, 아직 확인하지 않은 구간만 네트워크에서 받아 채운다."""
+        start_i = _to_int_date(start)
+        settled = _settled_through(market=market_of(symbol))
+        end_i = min(_to_int_date(end) or settled, settled)
+        if start_i > end_i:
+            return self.read(symbol, start_i, end_i)
+
+        with self._lock:
+            cov = self.coverage(symbol)
+            if cov is not None and self.load(symbol) is None:
+                cov = None
+            gaps = []
+            if cov is None:
+                gaps.append((start_i, end_i))
+                new_cov = (start_i, end_i)
+            else:
+                cov_from, cov_through = cov
+                if start_i < cov_from:
+                    gaps.append((start_i, _shift(cov_from, -1)))
+                if end_i > cov_through:
+                    gaps.append((_shift(cov_through, 1), end_i))
+                new_cov = (min(start_i, cov_from), max(end_i, cov_through))
+
+            if gaps:
+                try:
+                    fetched = [_fetch_history(symbol, lo, hi) for lo, hi in gaps]
+                except Exception as e:
+                    logger.warning("OHLCV 조회 실패 (%s): %s (저장분만 사용)", symbol, e)
+                    return self.read(symbol, start_i, end_i)
+                rows = np.concatenate(fetched) if fetched else np.empty(0, dtype=OHLCV_DTYPE)
+                if len(rows):
+                    self.merge(symbol, rows)
+                self._set_coverage(symbol, *new_cov)
+
+        return self.read(symbol, start_i, end_i)
+
+    def ensure_frame(self, symbol: str, start: DateLike, end: DateLike = None) -> Optional[pd.DataFrame]:
+        """ensure()의 pandas 버전 (Open/High/Low/Close/Volume, DatetimeIndex). 비어 있으면 None."""
+        rows = self.ensure(symbol, start, end)
+        if not len(rows):
+            return None
+        return pd.DataFrame(
+            {
+                "Open": rows["open"], "High": rows["high"], "Low": rows["low"],
+                "Close": rows["close"], "Volume": rows["volume"],
+            },
+            index=pd.to_datetime(rows["date"].astype(str), format="%Y%m%d"),
+        )
+
+    # --- 일일 증분 ---
+
+    def append_board(self, date_str: str, board: pd.DataFrame) -> int:
+        """전종목 일봉 보드(index=티커, pykrx 컬럼) 하루치를 각 종목 파일에 추가한다."""
+        day = _to_int_date(date_str)
+        prev_day = int(prev_trading_day(date_str).strftime("%Y%m%d"))
+        board = board.rename(columns={k: v for k, v in _COLUMN_MAP.items() if k in board.columns})
+        rate_col = "등락률" if "등락률" in board.columns else None
+        appended = 0
+
+        with self._lock:
+            for ticker, row in board.iterrows():
+                symbol = str(ticker)
+                close = float(row.get("close", 0) or 0)
+                if close <= 0 or int(row.get("volume", 0) or 0) == 0:
+                    continue
+
+                existing = self.load(symbol)
+                cov = self.coverage(symbol)
+                if existing is not None and len(existing) and rate_col:
+                    prev = existing[existing["date"] < day]
+                    rate = float(row[rate_col])
+                    # 직전 거래일 봉이 있을 때만 비교 (빈 구간 너머의 종가와는 어긋나는 게 정상)
+                    if len(prev) and int(prev["date"][-1]) == prev_day and rate > -100:
+                        implied_prev = close / (1 + rate / 100)
+                        stored_prev = float(prev["close"][-1])
+                        ratio = stored_prev / implied_prev
+                        if abs(ratio - 1) > ADJUST_TOLERANCE:
+                            # 기준가 ≠ 전일 종가 → 수정주가 이벤트, 다음 조회 때 전체 재수집
+                            logger.warning(
+                                "OHLCV 수정주가 이벤트 감지, 재수집 대상: %s (%s) 저장 종가 %.0f / 기준가 %.0f = %.3f",
+                                symbol, date_str, stored_prev, implied_prev, ratio,
+                            )
+                            self.drop(symbol)
+                            existing, cov = None, None
+
+                rows = np.zeros(1, dtype=OHLCV_DTYPE)
+                rows["date"] = day
+                for field in ("open", "high", "low", "close", "volume"):
+                    rows[field] = row.get(field, 0) or 0
+                self.merge(symbol, rows)
+
+                # 직전까지 빈틈없이 확인된 종목만 through를 연장한다 (주말/연휴 7일 허용)
+                if cov is not None and (_to_date(day) - _to_date(cov[1])).days <= 7:
+                    self._set_coverage(symbol, cov[0], max(cov[1], day))
+                elif cov is None:
+                    self._set_coverage(symbol, day, day)
+                appended += 1
+
+        logger.info("OHLCV 일일 추가: %s, %d종목", date_str, appended)
+        return appended
+
+    def append_day(self, date_str: str) -> int:
+        """pykrx 전종목 보드 1회 호출로 하루치를 추가한다. 휴장일이면 0."""
+        from pykrx import stock as pykrx_stock
+
+        board = pykrx_stock.get_market_ohlcv_by_ticker(date_str, market="ALL")
+        if board is None or board.empty:
+            return 0
+        volume_col = "거래량" if "거래량" in board.columns else "Volume"
+        if volume_col in board.columns and int(board[volume_col].sum()) == 0:
+            return 0
+        return self.append_board(date_str, board)
+
+    def append_latest_session(self, now: Optional[datetime] = None, lookback_days: int = 2) -> Optional[str]:
+        """확정된 가장 최근 거래일 하루치를 추가한다 ("어제 추가" 잡). 추가한 날짜 반환.
+
+        lookback_days 는 거래일 기준 (휴장일은 거래일 달력으로 건너뛴다).
+        """
+        latest = _to_date(_settled_through(now))
+        for day in recent_trading_days(latest, lookback_days):
+            date_str = day.strftime("%Y%m%d")
+            try:
+                if self.append_day(date_str):
+                    return date_str
+            except Exception as e:
+                logger.warning("OHLCV 일일 추가 실패 (%s): %s", date_str, e)
+        return None
+
+
+_store: Optional[OHLCVStore] = None
+
+
+def get_ohlcv_store() -> OHLCVStore:
+    """OHLCV 저장소 싱글톤 (OHLCV_STORE_DIR 환경변수로 위치 지정)."""
+    global _store
+    if _store is None:
+        _store = OHLCVStore(os.getenv("OHLCV_STORE_DIR", str(DEFAULT_STORE_DIR)))
+    return _store
+
+
+if __name__ == "__main__":
+    # python -m datapipeline.collectors.ohlcv_store  (저장소 루트에서) → 최근 거래일 추가
+    logging.basicConfig(level=logging.INFO)
+    print(get_ohlcv_store().append_latest_session())
@@ -3,10 +3,34 @@
 급등/급락 종목, 거래량 상위 종목, 시장 지수 요약, 종목별 히스토리를 제공한다.
 """
 
+import threading
+import time
 from datetime import datetime, timedelta
 
+import numpy as np
 from pykrx import stock as pykrx_stock
 
+from .ohlcv_store import get_ohlcv_store
+
+# 같은 날짜의 전종목 보드를 급등락/거래량 조회가 함께 쓰도록 잠깐 보관 (초)
+_BOARD_TTL = 300
+_board_cache: dict[str, tuple[float, object]] = {}
+_board_lock = threading.Lock()
+
+
+def _get_market_board(date_str: str):
+    """전종목 OHLCV 보드 조회. 같은 날짜는 _BOARD_TTL 동안 한 번만 다운로드한다."""
+    with _board_lock:
+        cached = _board_cache.get(date_str)
+        if cached and time.monotonic() - cached[0] < _BOARD_TTL:
+            return cached[1]
+        df = pykrx_stock.get_market_ohlcv_by_ticker(date_str, market="ALL")
+        # 최근 몇 개 날짜만 유지
+        if len(_board_cache) >= 4:
+            _board_cache.pop(next(iter(_board_cache)))
+        _board_cache[date_str] = (time.monotonic(), df)
+        return df
+
 
 def get_top_movers(date_str: str, top_n: int = 10) -> dict:
     """급등/급락 종목 조회.
@@ -18,7 +42,7 @@ def get_top_movers(date_str: str, top_n: int = 10) -> dict:
     Returns:
         {"date": str, "gainers": [...], "losers": [...]}
     """
-    df = pykrx_stock.get_market_ohlcv_by_ticker(date_str, market="ALL")
+    df = _get_market_board(date_str)
     if df is None or df.empty:
         return {"date": date_str, "gainers": [], "losers": []}
 
@@ -58,7 +82,7 @@ def get_high_volume_stocks(date_str: str, top_n: int = 10) -> dict:
     Returns:
         {"date": str, "high_volume": [...]}
     """
-    df = pykrx_stock.get_market_ohlcv_by_ticker(date_str, market="ALL")
+    df = _get_market_board(date_str)
     if df is None or df.empty:
         return {"date": date_str, "high_volume": []}
 
@@ -112,7 +136,7 @@ def get_market_summary(date_str: str) -> dict:
 
 
 def get_stock_history(code: str, days: int = 10) -> dict:
-    """종목별 기간 OHLCV 조회.
+    """종목별 기간 OHLCV 조회 (로컬 OHLCV 저장소, 비어 있는 구간만 네트워크 조회).
 
     Args:
         code: 종목 코드 (6자리)
@@ -122,12 +146,11 @@ def get_stock_history(code: str, days: int = 10) -> dict:
         {"name": str, "history": [{date, close, change_pct, open, high, low, volume}, ...]}
     """
     end = datetime.now()
-    start = end - timedelta(days=days * 2)  # 영업일 고려 여유분
-    start_str = start.strftime("%Y%m%d")
-    end_str = end.strftime("%Y%m%d")
+    # 영업일 고려 여유분 + 첫 행 등락률 계산용 전일 종가
+    start = end - timedelta(days=days * 2 + 7)
 
-    df = pykrx_stock.get_market_ohlcv_by_date(start_str, end_str, code)
-    if df is None or df.empty:
+    rows = get_ohlcv_store().ensure(code, start, end)
+    if not len(rows):
         return {"name": code, "history": []}
 
     try:
@@ -135,19 +158,23 @@ def get_stock_history(code: str, days: int = 10) -> dict:
     except Exception:
         name = code
 
-    # 최근 N일만
-    df = df.tail(days)
+    # 최근 N일만 (등락률은 직전 종가 대비)
+    closes = rows["close"]
+    prev_closes = np.concatenate([[np.nan], closes[:-1]])
+    change_pct = np.where(prev_closes > 0, (closes / prev_closes - 1) * 100, 0.0)
+    offset = max(0, len(rows) - days)
 
     history = []
-    for date_idx, row in df.iterrows():
+    for i in range(offset, len(rows)):
+        date_int = int(rows["date"][i])
         history.append({
-            "date": date_idx.strftime("%Y-%m-%d"),
-            "close": int(row["종가"]),
-            "change_pct": round(float(row["등락률"]), 2),
-            "open": int(row["시가"]),
-            "high": int(row["고가"]),
-            "low": int(row["저가"]),
-            "volume": int(row["거래량"]),
+            "date": f"{date_int // 10000:04d}-{date_int // 100 % 100:02d}-{date_int % 100:02d}",
+            "close": int(closes[i]),
+            "change_pct": round(float(change_pct[i]), 2),
+            "open": int(rows["open"][i]),
+            "high": int(rows["high"][i]),
+            "low": int(rows["low"][i]),
+            "volume": int(rows["volume"][i]),
         })
 
     return {"name": name, "history": history}
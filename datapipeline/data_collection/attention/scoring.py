@@ -16,10 +16,10 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
-import FinanceDataReader as fdr
 import pandas as pd
 from tqdm import tqdm
 
+from ...collectors.ohlcv_store import get_ohlcv_store
 from .media import fetch_google_news_coverage
 
 
@@ -42,13 +42,11 @@ def _get_col(df: pd.DataFrame, primary: str, fallback: str) -> Optional[str]:
 
 
 def _fetch_ohlcv(symbol: str, start: str, end: str) -> Optional[pd.DataFrame]:
+    """로컬 OHLCV 저장소에서 일봉 조회 (비어 있는 구간만 네트워크)."""
     try:
-        df = fdr.DataReader(symbol, start, end)
+        return get_ohlcv_store().ensure_frame(symbol, start, end)
     except Exception:
         return None
-    if df is None or df.empty:
-        return None
-    return df.sort_index()
 
 
 def _zscore(values: List[Optional[float]]) -> List[Optional[float]]:
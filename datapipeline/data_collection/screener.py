@@ -1,6 +1,6 @@
 """가격 변동 스크리닝: 단기(급등/급락/거래량) + 중장기(6-1 수익률).
 
-FinanceDataReader로 OHLCV 데이터를 가져와 4가지 시그널을 감지한다.
+종목 목록은 FinanceDataReader, 일봉은 로컬 OHLCV 저장소에서 읽어 4가지 시그널을 감지한다.
 """
 
 from __future__ import annotations
@@ -12,6 +12,7 @@ import FinanceDataReader as fdr
 import pandas as pd
 from tqdm import tqdm
 
+from ..collectors.ohlcv_store import get_ohlcv_store
 from ..config import (
     MID_TERM_FORMATION_DAYS,
     MID_TERM_RETURN_MIN,
@@ -28,14 +29,6 @@ from ..config import (
 logger = logging.getLogger(__name__)
 
 
-def _get_col(df: pd.DataFrame, primary: str, fallback: str) -> str | None:
-    if primary in df.columns:
-        return primary
-    if fallback in df.columns:
-        return fallback
-    return None
-
-
 def _get_symbol_col(df: pd.DataFrame) -> str:
     for c in ("Code", "Symbol"):
         if c in df.columns:
@@ -121,6 +114,7 @@ def _screen_single_market(market: str) -> list[dict]:
         rows = rows[:SCAN_LIMIT]
 
     results: list[dict] = []
+    store = get_ohlcv_store()
 
     for _, row in tqdm(rows, desc=f"가격 스크리닝 ({market})", unit="종목"):
         sym = str(row[symbol_col]).strip()
@@ -129,20 +123,14 @@ def _screen_single_market(market: str) -> list[dict]:
             continue
 
         try:
-            df = fdr.DataReader(sym, start, end)
+            df = store.ensure_frame(sym, start, end)
         except Exception:
             continue
         if df is None or len(df) < SHORT_TERM_DAYS + 1:
             continue
 
-        df = df.sort_index()
-        close_col = _get_col(df, "Close", "close")
-        vol_col = _get_col(df, "Volume", "volume")
-        if not close_col:
-            continue
-
-        closes = df[close_col]
-        volumes = df[vol_col] if vol_col else None
+        closes = df["Close"]
+        volumes = df["Volume"]
 
         if closes.iloc[-1] < min_price:
             continue
@@ -10,6 +10,7 @@ import logging
 import time
 
 from langsmith import traceable
+from shared.trading_calendar import recent_trading_days
 
 from ..config import kst_today
 
@@ -23,13 +24,8 @@ def _update_metrics(state: dict, node_name: str, elapsed: float, status: str = "
 
 
 def _recent_business_days(start_date: dt.date, limit: int) -> list[dt.date]:
-    days: list[dt.date] = []
-    cursor = start_date
-    while len(days) < limit:
-        if cursor.weekday() < 5:  # Mon-Fri
-            days.append(cursor)
-        cursor -= dt.timedelta(days=1)
-    return days
+    """start_date 이하 최근 KRX 거래일 limit개 (최신순, 휴장일 제외)."""
+    return recent_trading_days(start_date, limit)
 
 
 def _build_crawl_status(
@@ -116,7 +116,7 @@ def fetch_stock_data(stock_codes: list[str]) -> str:
             # 재무지표 (PER/PBR/EPS) 추가
             try:
                 from datapipeline.collectors.financial_collector import format_fundamentals_for_llm
-                fundamentals = format_fundamentals_for_llm(code)
+                fundamentals = format_fundamentals_for_llm(code, name)
                 if fundamentals and "찾을 수 없습니다" not in fundamentals:
                     lines.append(fundamentals)
             except ImportError:
@@ -20,7 +20,9 @@ from pathlib import Path
 
 import pandas as pd
 from pykrx import stock as pykrx_stock
+from datapipeline.collectors.ohlcv_store import get_ohlcv_store
 from datapipeline.constants.home_icons import resolve_icon_key
+from shared.trading_calendar import recent_trading_days
 
 # 프로젝트 루트 추가
 project_root = Path(__file__).resolve().parent.parent.parent
@@ -129,19 +131,20 @@ def calculate_macd(closes: pd.Series, fast: int = 12, slow: int = 26, signal: in
 def calculate_technical_indicators(stock_codes: list[str], end_date_str: str) -> dict:
     """선택된 종목들의 기술적 지표 계산.
 
-    30일 OHLCV 데이터를 조회하여 RSI/MACD를 계산한다.
+    30일 OHLCV 데이터를 로컬 OHLCV 저장소에서 읽어 RSI/MACD를 계산한다.
     """
     end_date = datetime.strptime(end_date_str, "%Y%m%d")
     start_date = (end_date - timedelta(days=45)).strftime("%Y%m%d")  # 충분한 기간
     results = {}
 
+    store = get_ohlcv_store()
     for code in stock_codes:
         try:
-            df = pykrx_stock.get_market_ohlcv_by_date(start_date, end_date_str, code)
-            if df is None or len(df) < 14:
+            rows = store.ensure(code, start_date, end_date_str)
+            if len(rows) < 14:
                 continue
 
-            closes = df["종가"]
+            closes = pd.Series(rows["close"])
             rsi = calculate_rsi(closes)
             macd = calculate_macd(closes)
 
@@ -212,11 +215,10 @@ def apply_sector_rotation_boost(stocks: list[dict], cycle_phase: str) -> list[di
 # Phase 1: 멀티데이 트렌드 감지
 # ============================================================
 
-def get_latest_trading_date(max_days_back=7):
-    """최근 영업일 반환."""
-    today = datetime.now()
-    for i in range(max_days_back):
-        target = today - timedelta(days=i)
+def get_latest_trading_date(max_days_back=2):
+    """최근 영업일 반환 (거래일 달력 기준 최근 max_days_back 거래일만 확인)."""
+    for day in recent_trading_days(n=max_days_back):
+        target = datetime.combine(day, datetime.min.time())
         date_str = target.strftime("%Y%m%d")
         try:
             tickers = pykrx_stock.get_market_ticker_list(date_str, market="KOSPI")
@@ -1,5 +1,6 @@
 """Briefing API routes."""
 
+import asyncio
 import sys
 from datetime import datetime, date, timedelta, timezone
 from pathlib import Path
@@ -18,9 +19,74 @@ from app.core.database import get_db
 from app.models.briefing import DailyBriefing, BriefingStock
 from app.schemas.briefing import BriefingResponse, BriefingStock as BriefingStockSchema
 from app.metrics import BRIEFING_TODAY_TOTAL
+from app.services.market_calendar import prev_trading_day, recent_trading_days
+from app.services.market_rankings import (
+    RANK_GAINERS,
+    RANK_HIGH_VOLUME,
+    RANK_LOSERS,
+    get_market_summary,
+    load_market_rankings,
+)
 
 router = APIRouter(prefix="/briefing", tags=["briefing"])
 
+LIVE_TOP_N = 5
+LIVE_LOOKBACK_DAYS = 2  # 최근 거래일 탐색 개수 (개장 전 당일은 비어 있음)
+
+
+async def _live_rankings(briefing_date: date) -> Optional[tuple[str, dict, Optional[dict]]]:
+    """사전 계산된 시장 랭킹으로 라이브 브리핑 데이터 구성 (pykrx 호출 없음).
+
+    스냅샷 거래일이 요청일 직전 거래일 ~ 요청일 범위 밖이면(과거 날짜 조회) None.
+    """
+    rankings = await load_market_rankings()
+    if rankings is None:
+        return None
+    trade_date = datetime.strptime(rankings.trade_date, "%Y%m%d").date()
+    if not (prev_trading_day(briefing_date) <= trade_date <= briefing_date):
+        return None
+    lists = {
+        rank_type: rankings.top(rank_type, LIVE_TOP_N)
+        for rank_type in (RANK_GAINERS, RANK_LOSERS, RANK_HIGH_VOLUME)
+    }
+    return rankings.trade_date, lists, get_market_summary(rankings.trade_date)
+
+
+def _collect_live_rankings(briefing_date: date) -> Optional[tuple[str, dict, Optional[dict]]]:
+    """과거 날짜 라이브 조회 (pykrx, 스레드풀에서 실행). 최근 거래일을 거슬러 탐색한다."""
+    from datapipeline.collectors.stock_collector import (
+        get_top_movers,
+        get_high_volume_stocks,
+        get_market_summary as collect_market_summary,
+    )
+
+    def _convert(items: list[dict]) -> list[dict]:
+        return [
+            {
+                "stock_code": item["ticker"],
+                "stock_name": item.get("name"),
+                "change_rate": item.get("등락률", 0),
+                "volume": item.get("거래량", 0),
+            }
+            for item in items
+        ]
+
+    for try_date in recent_trading_days(briefing_date, LIVE_LOOKBACK_DAYS):
+        try:
+            try_date_str = try_date.strftime("%Y%m%d")
+            movers = get_top_movers(try_date_str, top_n=LIVE_TOP_N)
+            if movers.get("gainers") or movers.get("losers"):
+                volume_data = get_high_volume_stocks(try_date_str, top_n=LIVE_TOP_N)
+                lists = {
+                    RANK_GAINERS: _convert(movers.get("gainers", [])),
+                    RANK_LOSERS: _convert(movers.get("losers", [])),
+                    RANK_HIGH_VOLUME: _convert(volume_data.get("high_volume", [])),
+                }
+                return try_date_str, lists, collect_market_summary(try_date_str)
+        except Exception:
+            continue
+    return None
+
 
 @router.get("/today", response_model=BriefingResponse)
 async def get_today_briefing(
@@ -86,75 +152,32 @@ async def get_today_briefing(
     
     # If not in DB, fetch live data
     try:
-        from collectors.stock_collector import (
-            get_top_movers,
-            get_high_volume_stocks,
-            get_market_summary,
-        )
-        
-        # 오늘 데이터가 없을 수 있으므로 (주말/공휴일) 최근 거래일을 탐색
         date_str = briefing_date.strftime("%Y%m%d")
-        movers = None
-        volume_data = None
-        market = None
-        actual_date_str = date_str
-        
-        for days_back in range(0, 5):
-            try:
-                try_date = briefing_date - timedelta(days=days_back)
-                try_date_str = try_date.strftime("%Y%m%d")
-                test_movers = get_top_movers(try_date_str, top_n=5)
-                if test_movers.get("gainers") or test_movers.get("losers"):
-                    movers = test_movers
-                    volume_data = get_high_volume_stocks(try_date_str, top_n=5)
-                    market = get_market_summary(try_date_str)
-                    actual_date_str = try_date_str
-                    break
-            except Exception:
-                continue
-        
-        if not movers:
+        live = await _live_rankings(briefing_date)
+        if live is None:
+            live = await asyncio.to_thread(_collect_live_rankings, briefing_date)
+        if not live:
             raise HTTPException(status_code=503, detail="No market data available for recent trading days")
-        
-        # Format gainers
-        gainers = [
-            BriefingStockSchema(
-                stock_code=item["ticker"],
-                stock_name=item.get("name", "Unknown"),
-                change_rate=float(item.get("등락률", 0)),
-                volume=int(item.get("거래량", 0)),
-                selection_reason="top_gainer",
-                keywords=[],
-            )
-            for item in movers.get("gainers", [])
-        ]
-        
-        # Format losers
-        losers = [
-            BriefingStockSchema(
-                stock_code=item["ticker"],
-                stock_name=item.get("name", "Unknown"),
-                change_rate=float(item.get("등락률", 0)),
-                volume=int(item.get("거래량", 0)),
-                selection_reason="top_loser",
-                keywords=[],
-            )
-            for item in movers.get("losers", [])
-        ]
-        
-        # Format high volume
-        high_volume = [
-            BriefingStockSchema(
-                stock_code=item["ticker"],
-                stock_name=item.get("name", "Unknown"),
-                change_rate=float(item.get("등락률", 0)),
-                volume=int(item.get("거래량", 0)),
-                selection_reason="high_volume",
-                keywords=[],
-            )
-            for item in volume_data.get("high_volume", [])
-        ]
-        
+        actual_date_str, lists, market = live
+        market = market or {}
+
+        def _schemas(items: list[dict], reason: str) -> list[BriefingStockSchema]:
+            return [
+                BriefingStockSchema(
+                    stock_code=item["stock_code"],
+                    stock_name=item.get("stock_name") or "Unknown",
+                    change_rate=float(item.get("change_rate", 0)),
+                    volume=int(item.get("volume", 0)),
+                    selection_reason=reason,
+                    keywords=[],
+                )
+                for item in items
+            ]
+
+        gainers = _schemas(lists[RANK_GAINERS], "top_gainer")
+        losers = _schemas(lists[RANK_LOSERS], "top_loser")
+        high_volume = _schemas(lists[RANK_HIGH_VOLUME], "high_volume")
+
         # Create market summary
         kospi_close = market.get("kospi", {}).get("close") if market.get("kospi") else None
         kosdaq_close = market.get("kosdaq", {}).get("close") if market.get("kosdaq") else None
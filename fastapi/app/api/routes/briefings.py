@@ -1,5 +1,4 @@
 """브리핑 API 라우트 - /api/v1/briefings/*"""
-import json as json_module
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select, desc
@@ -7,45 +6,54 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from datetime import date, timedelta
 
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal, get_db
+from app.core.http_cache import conditional_get
+from app.core.redis_keys import key_briefings_latest
 from app.models.narrative import DailyNarrative, NarrativeScenario
-from app.services.redis_cache import get_redis_cache
+from app.services.cache import CachePolicy, get_or_set
+from app.services.redis_cache import TAG_BRIEFINGS, get_redis_cache
 
 router = APIRouter(prefix="/briefings", tags=["briefings"])
 
 
-@router.get("/latest")
-async def get_latest_briefing(db: AsyncSession = Depends(get_db)):
-    """최신 브리핑 조회"""
-    # Redis 캐시 체크
-    cache_key = "api:briefings:latest"
-    try:
-        cache = await get_redis_cache()
-        cached = await cache.get(cache_key)
-        if cached:
-            return json_module.loads(cached)
-    except Exception:
-        pass
+# 파이프라인 산출물: 5분 신선, 이후 10분은 지난 값을 내주며 백그라운드 갱신
+LATEST_CACHE_TTL = 300
+LATEST_CACHE_POLICY = CachePolicy(stale_ttl=600, beta=1.0)
 
-    result = await db.execute(
-        select(DailyNarrative)
-        .options(selectinload(DailyNarrative.scenarios))
-        .order_by(desc(DailyNarrative.date))
-        .limit(1)
-    )
-    narrative = result.scalar_one_or_none()
-    if not narrative:
-        raise HTTPException(404, "No briefings available")
 
-    data = _serialize_narrative(narrative)
+async def _load_latest_briefing() -> dict:
+    # 백그라운드 갱신은 요청보다 오래 살 수 있어 세션을 직접 연다
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(DailyNarrative)
+            .options(selectinload(DailyNarrative.scenarios))
+            .order_by(desc(DailyNarrative.date))
+            .limit(1)
+        )
+        narrative = result.scalar_one_or_none()
+        if not narrative:
+            raise HTTPException(404, "No briefings available")
+        return _serialize_narrative(narrative)
+
 
-    # Redis 캐시 저장 (5분)
+@router.get("/latest", dependencies=[conditional_get()])
+async def get_latest_briefing():
+    """최신 브리핑 조회"""
+    # 키에 briefings 세대 포함 — 파이프라인 실행 시 세대만 올라간다
     try:
-        await cache.set(cache_key, json_module.dumps(data, ensure_ascii=False, default=str), 300)
+        cache = await get_redis_cache()
+        generation = await cache.get_generation(TAG_BRIEFINGS)
     except Exception:
-        pass
-
-    return data
+        generation = None
+    if generation is None:
+        return await _load_latest_briefing()
+    return await get_or_set(
+        key_briefings_latest(generation),
+        LATEST_CACHE_TTL,
+        _load_latest_briefing,
+        name="briefings_latest",
+        policy=LATEST_CACHE_POLICY,
+    )
 
 
 @router.get("/list")
@@ -15,6 +15,7 @@ from app.core.config import get_settings
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent.parent / "chatbot"))
 
 from app.core.database import get_db
+from app.core.http_cache import conditional_get
 from app.models.historical_case import HistoricalCase
 from app.schemas.case import (
     CaseSearchRequest,
@@ -123,7 +124,7 @@ async def search_cases(
         )
 
 
-@router.get("/story/{case_id}", response_model=StoryResponse)
+@router.get("/story/{case_id}", response_model=StoryResponse, dependencies=[conditional_get()])
 async def get_story(
     case_id: int,
     difficulty: str = Query("beginner", description="Difficulty level"),
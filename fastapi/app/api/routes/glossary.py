@@ -9,11 +9,12 @@ import logging
 import os
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
 from sqlalchemy import select, func, or_, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.http_cache import conditional_get, uncacheable
 from app.services.redis_cache import get_redis_cache
 
 logger = logging.getLogger(__name__)
@@ -105,8 +106,9 @@ async def _get_or_generate_term(term: str, db: AsyncSession) -> dict:
     return data
 
 
-@router.get("")
+@router.get("", dependencies=[conditional_get()])
 async def get_glossary(
+    response: Response,
     search: Optional[str] = Query(None, description="검색어"),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
@@ -139,8 +141,10 @@ async def get_glossary(
         total = count_result.scalar() or 0
 
         return {"items": items, "total": total, "page": page, "per_page": per_page}
-    except Exception:
-        # 테이블 없으면 빈 응답
+    except Exception as e:
+        # 테이블 없으면 빈 응답 — 파이프라인 세대 ETag 로 캐시되지 않게 한다
+        logger.warning("용어 목록 조회 실패 (빈 응답): %s", e)
+        uncacheable(response)
         return {"items": [], "total": 0, "page": page, "per_page": per_page}
 
 
@@ -151,7 +155,7 @@ async def search_glossary_term(term: str, db: AsyncSession = Depends(get_db)):
     return result
 
 
-@router.get("/{term_id}")
+@router.get("/{term_id}", dependencies=[conditional_get()])
 async def get_glossary_by_id(term_id: int, db: AsyncSession = Depends(get_db)):
     """ID로 용어 조회 (기존 호환)."""
     try:
@@ -1,7 +1,6 @@
 """Keywords API routes - today's dynamic keyword themes with matched cases."""
 
 import json
-import json as json_module
 from datetime import date, datetime, timedelta, timezone
 from typing import Optional
 
@@ -9,12 +8,14 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal, get_db
+from app.core.http_cache import conditional_get
 from app.core.redis_keys import key_keywords_today
 from app.models.briefing import DailyBriefing
 from app.models.historical_case import CaseMatch, HistoricalCase
 from app.models.stock_listing import StockListing
-from app.services.redis_cache import get_redis_cache
+from app.services.cache import CachePolicy, get_or_set
+from app.services.redis_cache import TAG_KEYWORDS, get_redis_cache
 from datapipeline.constants.home_icons import normalize_title_for_match, resolve_icon_key
 
 KST = timezone(timedelta(hours=9))
@@ -40,10 +41,14 @@ def _build_keyword_lookup(keywords_raw: list[dict]) -> tuple[dict[str, dict], di
     return exact, normalized
 
 
-@router.get("/today")
+# 파이프라인 산출물: 5분 신선, 이후 10분은 지난 값을 내주며 백그라운드 갱신
+TODAY_CACHE_TTL = 300
+TODAY_CACHE_POLICY = CachePolicy(stale_ttl=600, beta=1.0)
+
+
+@router.get("/today", dependencies=[conditional_get()])
 async def get_today_keywords(
     date: Optional[str] = Query(None, description="YYYYMMDD format"),
-    db: AsyncSession = Depends(get_db),
 ) -> dict:
     """Get today's keyword themes with matched historical cases."""
     if date:
@@ -54,18 +59,30 @@ async def get_today_keywords(
     else:
         target_date = datetime.now(KST).date()
 
-    # Redis 캐시 체크
-    target_date_str = target_date.strftime("%Y%m%d")
-    cache_key = key_keywords_today(target_date_str)
-    cache = None
+    async def load() -> dict:
+        # 백그라운드 갱신은 요청보다 오래 살 수 있어 세션을 직접 연다
+        async with AsyncSessionLocal() as session:
+            return await _build_today_keywords(session, target_date)
+
+    # 키에 keywords 세대 포함 — 파이프라인 실행 시 세대만 올라간다
     try:
         cache = await get_redis_cache()
-        cached = await cache.get(cache_key)
-        if cached:
-            return json_module.loads(cached)
+        generation = await cache.get_generation(TAG_KEYWORDS)
     except Exception:
-        pass
+        generation = None
+    if generation is None:
+        return await load()
+    return await get_or_set(
+        key_keywords_today(target_date.strftime("%Y%m%d"), generation),
+        TODAY_CACHE_TTL,
+        load,
+        name="keywords_today",
+        policy=TODAY_CACHE_POLICY,
+    )
 
+
+async def _build_today_keywords(db: AsyncSession, target_date: date) -> dict:
+    """Build the /today payload from the briefing and the day's case matches."""
     # Get briefing with keywords
     stmt = select(DailyBriefing).where(DailyBriefing.briefing_date == target_date)
     result = await db.execute(stmt)
@@ -259,22 +276,12 @@ async def get_today_keywords(
                 }
             )
 
-    response_payload = {
+    return {
         "date": target_date.strftime("%Y%m%d"),
         "market_summary": briefing.market_summary or "",
         "keywords": keywords_with_cases,
     }
 
-    # Redis 캐시 저장 (5분)
-    try:
-        if cache is None:
-            cache = await get_redis_cache()
-        await cache.set(cache_key, json_module.dumps(response_payload, ensure_ascii=False, default=str), 300)
-    except Exception:
-        pass
-
-    return response_payload
-
 
 @router.get("/history")
 async def get_keywords_history(
@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.http_cache import conditional_get
 from app.models.historical_case import HistoricalCase, CaseStockRelation
 from app.models.briefing import DailyBriefing, BriefingStock
 from app.schemas.narrative import NarrativeResponse
@@ -74,7 +75,7 @@ async def _fetch_market_history(db: AsyncSession, days: int = 5) -> list[dict]:
 
 # --- 엔드포인트 ---
 
-@router.get("/{case_id}", response_model=NarrativeResponse)
+@router.get("/{case_id}", response_model=NarrativeResponse, dependencies=[conditional_get()])
 async def get_narrative(case_id: int, db: AsyncSession = Depends(get_db)) -> NarrativeResponse:
     """사례 기반 내러티브 스토리를 6페이지 골든케이스로 반환."""
     case = await _fetch_case(db, case_id)
@@ -52,7 +52,7 @@ async def trigger_pipeline(
         try:
             if task == "stock":
                 # Run stock collection
-                from collectors.stock_collector import (
+                from datapipeline.collectors.stock_collector import (
                     get_top_movers,
                     get_high_volume_stocks,
                     get_market_summary,
@@ -70,7 +70,7 @@ async def trigger_pipeline(
             elif task == "report":
                 # Run report collection
                 import asyncio
-                from collectors.naver_report_crawler import collect_reports
+                from datapipeline.collectors.naver_report_crawler import collect_reports
                 
                 reports = await collect_reports(pages=1, download=False)
                 
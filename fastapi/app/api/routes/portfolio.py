@@ -1,6 +1,7 @@
 """포트폴리오 및 모의투자 API 라우트."""
 
 import logging
+import time
 from calendar import monthrange
 from datetime import datetime, timedelta
 from time import perf_counter
@@ -10,17 +11,22 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.core.auth import get_current_user, get_current_user_optional
-from app.core.database import get_db
-from app.core.redis_keys import key_portfolio_summary, TTL_MEDIUM
+from app.core.database import AsyncSessionLocal, get_db
+from app.core.redis_keys import key_portfolio_summary, key_stock_chart
+from app.services.cache_ttl import TTL_CHART_DAILY, TTL_PORTFOLIO_SUMMARY, cache_ttl
+from app.services.leaderboard import load_leaderboard_page
+from app.services.cache import get_or_set
+from app.services.portfolio_summary import SUMMARY_CACHE_POLICY, credit_rewards, write_summary
+from app.services.portfolio_valuation import get_current_nav, get_nav_history
 from app.services.redis_cache import get_redis_cache
-from app.models.portfolio import SimulationTrade
 from app.models.reward import BriefingReward, DwellReward
 from app.schemas.portfolio import (
     PortfolioResponse,
     PortfolioSummary,
+    PerformancePoint,
+    PerformanceResponse,
     RefreshPortfolioRequest,
     RefreshPortfolioResponse,
     RefreshInvalidatedInfo,
@@ -38,15 +44,17 @@ from app.schemas.portfolio import (
     LeaderboardResponse,
 )
 from app.services.portfolio_service import (
+    LOAD_BARE,
+    TRADE_PAGE_MAX,
     get_or_create_portfolio,
     execute_trade,
     complete_briefing_reward,
-    check_and_apply_multiplier,
+    list_trades,
 )
+from app.services.reward_sweeper import sweep_matured_rewards
 from app.metrics import PORTFOLIO_REFRESH_TOTAL
 from app.services.stock_price_service import get_current_price, get_batch_prices
 from app.api.routes.notification import create_notification
-from app.models.user import User
 from app.models.portfolio import UserPortfolio
 
 logger = logging.getLogger("narrative.portfolio")
@@ -79,7 +87,7 @@ async def invalidate_user_stock_price_caches(user_id: int, db: AsyncSession) ->
                 kis_keys = [f"kis:price:{code}" for code in stock_codes]
                 stock_price_deleted = await cache.client.delete(*stock_keys)
                 kis_price_deleted = await cache.client.delete(*kis_keys)
-            await cache.client.delete(key_portfolio_summary(user_id))
+            await cache.delete(key_portfolio_summary(user_id))
         else:
             await invalidate_portfolio_summary_cache(user_id)
     except Exception:
@@ -96,11 +104,15 @@ async def invalidate_user_stock_price_caches(user_id: int, db: AsyncSession) ->
 async def _load_portfolio_price_map(
     db: AsyncSession,
     user_id: int,
+    realtime: bool = False,
 ) -> tuple[UserPortfolio, dict[str, int]]:
-    """포트폴리오와 보유 종목 가격 맵을 함께 조회한다."""
+    """포트폴리오와 보유 종목 가격 맵을 함께 조회한다.
+
+    realtime=True면 시장 스냅샷 대신 종목별 실시간 시세(KIS 우선)를 사용한다.
+    """
     portfolio = await get_or_create_portfolio(db, user_id)
     codes = [h.stock_code for h in portfolio.holdings]
-    batch_results = await get_batch_prices(codes) if codes else []
+    batch_results = await get_batch_prices(codes, realtime=realtime) if codes else []
     price_map = {p["stock_code"]: p["current_price"] for p in batch_results}
     return portfolio, price_map
 
@@ -177,93 +189,33 @@ async def get_leaderboard(
     db: AsyncSession = Depends(get_db),
     current_user: Optional[dict] = Depends(get_current_user_optional),
 ):
-    """수익률 리더보드 조회. 보상 제외 수익률 기준, 공동 등수, 페이지네이션 지원."""
-    current_user_id = current_user["id"] if current_user else 0
-
-    # 모든 포트폴리오 조회 (holdings eager loading)
-    stmt = (
-        select(UserPortfolio, User.username)
-        .join(User, User.id == UserPortfolio.user_id)
-        .options(selectinload(UserPortfolio.holdings))
-        .order_by(UserPortfolio.user_id)
-    )
-    result = await db.execute(stmt)
-    rows = result.unique().all()
-
-    # 전체 종목 코드를 모아 배치 조회 (N+1 방지)
-    all_codes = set()
-    for portfolio, _ in rows:
-        for h in portfolio.holdings:
-            all_codes.add(h.stock_code)
-    batch_results = await get_batch_prices(list(all_codes))
-    price_map = {p["stock_code"]: p["current_price"] for p in batch_results}
+    """수익률 리더보드 조회. 보상 제외 수익률 기준, 페이지네이션 지원.
 
-    entries = []
-    for portfolio, username in rows:
-        total_holdings = 0.0
-        for h in portfolio.holdings:
-            cp = price_map.get(h.stock_code)
-            total_holdings += (cp if cp else float(h.avg_buy_price)) * h.quantity
-
-        total_value = portfolio.current_cash + total_holdings
-        # 수익률 계산: 누적 보상액 제외
-        rewards = getattr(portfolio, "total_rewards_received", 0) or 0
-        profit_loss = total_value - portfolio.initial_cash - rewards
-        profit_loss_pct = (profit_loss / portfolio.initial_cash * 100) if portfolio.initial_cash > 0 else 0
-
-        entries.append({
-            "user_id": portfolio.user_id,
-            "username": username,
-            "total_value": total_value,
-            "profit_loss": profit_loss,
-            "profit_loss_pct": round(profit_loss_pct, 2),
-        })
-
-    # user_id 중복 제거 (UNIQUE 제약 이전 데이터 방어)
-    seen_users = set()
-    unique_entries = []
-    for e in entries:
-        if e["user_id"] not in seen_users:
-            seen_users.add(e["user_id"])
-            unique_entries.append(e)
-    entries = unique_entries
-
-    # 수익률 내림차순 정렬
-    entries.sort(key=lambda e: e["profit_loss_pct"], reverse=True)
-
-    # 순차 등수 부여 (1,2,3... — 공동 등수 없음)
-    all_ranked = []
-    my_entry = None
-    my_rank = None
-
-    for i, e in enumerate(entries):
-        rank = i + 1
-        is_me = e["user_id"] == current_user_id
-        entry = LeaderboardEntry(
-            rank=rank,
-            user_id=e["user_id"],
-            username=e["username"],
-            total_value=e["total_value"] if is_me else 0.0,  # 타인 총자산 비공개
-            profit_loss=e["profit_loss"] if is_me else 0.0,
-            profit_loss_pct=e["profit_loss_pct"],
+    순위는 Redis ZSET(leaderboard 서비스)에서 페이지 단위로 읽는다.
+    """
+    current_user_id = current_user["id"] if current_user else 0
+    page = await load_leaderboard_page(db, offset, limit, current_user_id)
+
+    def _entry(row: dict) -> LeaderboardEntry:
+        is_me = row["user_id"] == current_user_id
+        return LeaderboardEntry(
+            rank=row["rank"],
+            user_id=row["user_id"],
+            username=row["username"],
+            total_value=row["total_value"] if is_me else 0.0,  # 타인 총자산 비공개
+            profit_loss=row["profit_loss"] if is_me else 0.0,
+            profit_loss_pct=row["profit_loss_pct"],
             is_me=is_me,
         )
-        if is_me:
-            my_entry = entry
-            my_rank = rank
-        all_ranked.append(entry)
-
-    total_users = len(all_ranked)
-    page_rankings = all_ranked[offset:offset + limit]
-    has_more = (offset + limit) < total_users
 
+    my_entry = _entry(page.me) if page.me else None
     return LeaderboardResponse(
-        my_rank=my_rank,
+        my_rank=my_entry.rank if my_entry else None,
         my_entry=my_entry,
-        rankings=page_rankings,
-        total_users=total_users,
+        rankings=[_entry(row) for row in page.rows],
+        total_users=page.total,
         offset=offset,
-        has_more=has_more,
+        has_more=(offset + limit) < page.total,
     )
 
 
@@ -281,35 +233,62 @@ async def get_portfolio(
     return _build_portfolio_response(portfolio, price_map)
 
 
+async def _compute_portfolio_summary(db: AsyncSession, user_id: int) -> PortfolioSummary:
+    nav = await get_current_nav(db, user_id)
+    if nav is not None:
+        # 장 마감 후 매매/보상이 없었으면 종가 기준 NAV 그대로 (보유 종목/시세 조회 생략)
+        portfolio = await db.get(UserPortfolio, nav.portfolio_id)
+        return PortfolioSummary(
+            total_value=nav.total_value,
+            total_profit_loss=nav.profit_loss,
+            total_profit_loss_pct=round(nav.profit_loss_pct, 2),
+            total_rewards_received=portfolio.total_rewards_received or 0,
+        )
+    portfolio, price_map = await _load_portfolio_price_map(db, user_id)
+    return _build_portfolio_summary(portfolio, price_map)
+
+
 @router.get("/summary", response_model=PortfolioSummary)
 async def get_portfolio_summary(
-    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
     """경량 포트폴리오 요약 (BottomNav 뱃지용). JWT 인증 필수."""
     user_id = current_user["id"]
 
-    # Redis 캐시 체크 (TTL 2분)
-    import json as _json
-    cache_key = key_portfolio_summary(user_id)
-    try:
-        cache = await get_redis_cache()
-        cached = await cache.get(cache_key)
-        if cached:
-            return PortfolioSummary(**_json.loads(cached))
-    except Exception:
-        pass
-
-    portfolio, price_map = await _load_portfolio_price_map(db, user_id)
-    summary = _build_portfolio_summary(portfolio, price_map)
+    async def load() -> dict:
+        # 백그라운드 갱신은 요청보다 오래 살 수 있어 세션을 직접 연다
+        async with AsyncSessionLocal() as session:
+            summary = await _compute_portfolio_summary(session, user_id)
+        return summary.model_dump()
+
+    # 캐시 (장중 5분, 장 마감 시 최대 1시간) — 매매/시세 갱신 시에는 write-through 로 덮어쓴다
+    data = await get_or_set(
+        key_portfolio_summary(user_id),
+        cache_ttl(TTL_PORTFOLIO_SUMMARY),
+        load,
+        name="portfolio_summary",
+        policy=SUMMARY_CACHE_POLICY,
+    )
+    return PortfolioSummary(**data)
 
-    # 캐시 저장 (2분)
-    try:
-        await cache.set(cache_key, _json.dumps(summary.model_dump()), TTL_MEDIUM)
-    except Exception:
-        pass
 
-    return summary
+@router.get("/performance", response_model=PerformanceResponse)
+async def get_portfolio_performance(
+    days: int = Query(90, ge=1, le=365),
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """성과 차트용 일별 평가액 (장 마감 후 NAV 잡이 기록한 값). JWT 인증 필수."""
+    rows = await get_nav_history(db, current_user["id"], days)
+    return PerformanceResponse(points=[
+        PerformancePoint(
+            nav_date=r.nav_date,
+            total_value=r.total_value,
+            profit_loss=r.profit_loss,
+            profit_loss_pct=round(r.profit_loss_pct, 2),
+        )
+        for r in rows
+    ])
 
 
 @router.post("/refresh", response_model=RefreshPortfolioResponse)
@@ -328,20 +307,16 @@ async def refresh_portfolio(
 
     try:
         invalidated = await invalidate_user_stock_price_caches(user_id, db)
-        portfolio, price_map = await _load_portfolio_price_map(db, user_id)
+        valued_at = time.time()
+        portfolio, price_map = await _load_portfolio_price_map(db, user_id, realtime=True)
         portfolio_response = _build_portfolio_response(portfolio, price_map)
         summary = _build_portfolio_summary(portfolio, price_map)
     except Exception:
         PORTFOLIO_REFRESH_TOTAL.labels("fail").inc()
         raise
 
-    # 최신 summary를 다시 캐싱해 이후 조회 지연을 줄인다.
-    try:
-        import json as _json
-        cache = await get_redis_cache()
-        await cache.set(key_portfolio_summary(user_id), _json.dumps(summary.model_dump()), TTL_MEDIUM)
-    except Exception:
-        pass
+    # 최신 summary를 다시 캐싱해 이후 조회 지연을 줄인다 (그 사이 매매/보상이 쓴 더 새 요약은 유지).
+    await write_summary(user_id, summary.model_dump(), valued_at)
 
     duration_ms = int((perf_counter() - started_at) * 1000)
     logger.info(
@@ -373,7 +348,7 @@ async def create_trade(
 ):
     """매수/매도 실행. JWT 인증 필수."""
     user_id = current_user["id"]
-    portfolio = await get_or_create_portfolio(db, user_id)
+    portfolio = await get_or_create_portfolio(db, user_id, load=LOAD_BARE)
     try:
         trade = await execute_trade(
             db, portfolio,
@@ -384,9 +359,6 @@ async def create_trade(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    await db.refresh(portfolio)
-    await invalidate_portfolio_summary_cache(user_id)
-
     return TradeResponse(
         id=trade.id,
         trade_type=trade.trade_type,
@@ -403,22 +375,18 @@ async def create_trade(
 
 @router.get("/trades", response_model=TradeHistoryResponse)
 async def get_trade_history(
-    limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=TRADE_PAGE_MAX),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (다음 페이지)"),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
-    """거래 내역 조회. JWT 인증 필수."""
+    """거래 내역 조회 (최신순, 커서 페이지네이션). JWT 인증 필수."""
     user_id = current_user["id"]
-    portfolio = await get_or_create_portfolio(db, user_id)
-    stmt = (
-        select(SimulationTrade)
-        .where(SimulationTrade.portfolio_id == portfolio.id)
-        .order_by(SimulationTrade.traded_at.desc())
-        .offset(offset).limit(limit)
-    )
-    result = await db.execute(stmt)
-    trades = result.scalars().all()
+    portfolio = await get_or_create_portfolio(db, user_id, load=LOAD_BARE)
+    try:
+        trades, next_cursor = await list_trades(db, portfolio.id, limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다")
 
     return TradeHistoryResponse(
         trades=[
@@ -437,6 +405,7 @@ async def get_trade_history(
             for t in trades
         ],
         total_count=len(trades),
+        next_cursor=next_cursor,
     )
 
 
@@ -486,7 +455,7 @@ async def claim_briefing_reward(
         data={"case_id": req.case_id, "amount": reward.base_reward},
     )
     await db.commit()
-    await invalidate_portfolio_summary_cache(user_id)
+    await credit_rewards({user_id: reward.base_reward})
 
     return RewardResponse(
         reward_id=reward.id,
@@ -504,6 +473,9 @@ async def get_rewards(
 ):
     """보상 목록 조회 (만기 도래 시 자동 체크). JWT 인증 필수."""
     user_id = current_user["id"]
+    # 스케줄러 스위퍼가 아직 처리하지 않은 만기 보상만 이 사용자 범위로 먼저 처리
+    await sweep_matured_rewards(db, user_ids=[user_id])
+
     stmt = (
         select(BriefingReward)
         .where(BriefingReward.user_id == user_id)
@@ -512,15 +484,8 @@ async def get_rewards(
     result = await db.execute(stmt)
     rewards = result.scalars().all()
 
-    items = []
-    summary_changed = False
-    for r in rewards:
-        before_status = r.status
-        before_final_reward = r.final_reward
-        r = await check_and_apply_multiplier(db, r)
-        if r.status != before_status or r.final_reward != before_final_reward:
-            summary_changed = True
-        items.append(RewardItem(
+    items = [
+        RewardItem(
             reward_id=r.id,
             case_id=r.case_id,
             base_reward=r.base_reward,
@@ -528,11 +493,9 @@ async def get_rewards(
             final_reward=r.final_reward,
             status=r.status,
             maturity_at=r.maturity_at.isoformat(),
-        ))
-
-    if summary_changed:
-        await invalidate_portfolio_summary_cache(user_id)
-
+        )
+        for r in rewards
+    ]
     return RewardsListResponse(rewards=items)
 
 
@@ -558,7 +521,7 @@ async def claim_dwell_reward(
     if req.dwell_seconds < DWELL_MIN_SECONDS:
         raise HTTPException(status_code=400, detail="체류 시간이 부족합니다 (최소 3분)")
 
-    portfolio = await get_or_create_portfolio(db, user_id)
+    portfolio = await get_or_create_portfolio(db, user_id, load=LOAD_BARE)
 
     # 오늘 같은 페이지에서 이미 보상을 받았는지 확인
     today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
@@ -594,7 +557,7 @@ async def claim_dwell_reward(
         data={"page": req.page, "amount": DWELL_REWARD_AMOUNT},
     )
     await db.commit()
-    await invalidate_portfolio_summary_cache(user_id)
+    await credit_rewards({user_id: DWELL_REWARD_AMOUNT})
 
     return {
         "reward_amount": DWELL_REWARD_AMOUNT,
@@ -622,6 +585,13 @@ async def get_stock_chart(
         day = min(base_dt.day, monthrange(year, month)[1])
         return base_dt.replace(year=year, month=month, day=day)
 
+    # 캐시 (장중 5분, 장 마감 시 다음 개장까지 — cache_ttl 정책)
+    cache_key = key_stock_chart(stock_code, period or f"{days}d")
+    cache = await get_redis_cache()
+    cached = await cache.get_json(cache_key, cache="stock_chart")
+    if cached:
+        return cached
+
     try:
         from pykrx import stock
         now = datetime.now()
@@ -655,7 +625,7 @@ async def get_stock_chart(
         if df.empty:
             raise HTTPException(status_code=404, detail="선택 기간 차트 데이터 없음")
 
-        return {
+        data = {
             "stock_code": stock_code,
             "period": period,
             "period_start": df.index[0].strftime("%Y-%m-%d"),
@@ -671,3 +641,6 @@ async def get_stock_chart(
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"차트 데이터 조회 실패: {e}")
+
+    await cache.set_json(cache_key, data, cache_ttl(TTL_CHART_DAILY))
+    return data
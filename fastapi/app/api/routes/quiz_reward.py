@@ -10,7 +10,8 @@ from app.core.database import get_db
 from app.core.auth import get_current_user
 from app.models.portfolio import UserPortfolio
 from app.models.reward import BriefingReward
-from app.services.portfolio_service import get_or_create_portfolio
+from app.services.portfolio_service import LOAD_BARE, get_or_create_portfolio
+from app.services.portfolio_summary import credit_rewards
 from app.metrics import QUIZ_REWARD_TOTAL
 
 router = APIRouter(prefix="/quiz", tags=["quiz"])
@@ -44,7 +45,7 @@ async def process_quiz_reward(
 
     try:
         # 포트폴리오 조회 (없으면 자동 생성, 중복 안전)
-        portfolio = await get_or_create_portfolio(db, user_id)
+        portfolio = await get_or_create_portfolio(db, user_id, load=LOAD_BARE)
 
         # 포트폴리오 현금 추가 + 누적 보상액 갱신 (특정 portfolio.id로 1건만 업데이트)
         new_cash = portfolio.current_cash + reward_amount
@@ -77,6 +78,7 @@ async def process_quiz_reward(
         raise
 
     QUIZ_REWARD_TOTAL.labels("success").inc()
+    await credit_rewards({user_id: reward_amount})
     return QuizRewardResponse(
         reward_amount=reward_amount,
         is_correct=is_correct,
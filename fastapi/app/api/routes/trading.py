@@ -1,16 +1,27 @@
 """자유 매매 API - 종목 검색, 시세 조회, 주문, 관심종목."""
 
+import json
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_current_user
 from app.core.database import get_db
+from app.services.kis_scheduler import LANE_ORDER, LANE_RANKING, kis_priority
 from app.services.kis_service import get_kis_service
+from app.services.order_matching import LimitOrder, get_matching_engine
+from app.services.portfolio_service import LOAD_BARE, execute_trade, get_or_create_portfolio
+from app.services.price_refresher import record_price_hit
+from app.services.price_stream import (
+    HEARTBEAT_SECONDS,
+    MAX_CODES_PER_CONNECTION,
+    get_price_stream_hub,
+)
 from app.services.stock_price_service import get_current_price
 from app.metrics import TRADING_ORDER_TOTAL
 
@@ -45,15 +56,64 @@ async def get_stock_detail(stock_code: str):
     """종목 상세 시세 조회."""
     kis = get_kis_service()
     result = None
-    if kis.is_configured:
-        result = await kis.get_current_price(stock_code)
-    if not result:
-        result = await get_current_price(stock_code)
+    with kis_priority(LANE_RANKING):
+        if kis.is_configured:
+            result = await kis.get_current_price(stock_code)
+        if not result:
+            result = await get_current_price(stock_code)
     if not result:
         raise HTTPException(status_code=404, detail="종목 정보를 찾을 수 없습니다")
+    await record_price_hit(stock_code)
     return result
 
 
+async def _price_events(request: Request, codes: list[str]):
+    """SSE 이벤트 생성기. 연결이 끊기면 구독을 해제한다."""
+    hub = get_price_stream_hub()
+    sub = hub.subscribe(codes)
+    try:
+        await hub.prime(sub)
+        while not sub.closed:
+            batch = await sub.next_batch(HEARTBEAT_SECONDS)
+            if await request.is_disconnected():
+                break
+            if not batch:
+                yield ": ping\n\n"
+                continue
+            for price in batch:
+                yield f"event: price\ndata: {json.dumps(price, ensure_ascii=False)}\n\n"
+    finally:
+        hub.unsubscribe(sub)
+
+
+@router.get("/stream")
+async def stream_prices(
+    request: Request,
+    codes: str = Query(..., description="쉼표로 구분한 종목코드"),
+):
+    """실시간 시세 구독 (SSE). 종목별 upstream 조회는 전체 워커에서 주기당 1회."""
+    code_list = list(dict.fromkeys(c.strip() for c in codes.split(",") if c.strip()))
+    if not code_list:
+        raise HTTPException(status_code=400, detail="종목코드를 입력하세요")
+    if len(code_list) > MAX_CODES_PER_CONNECTION:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 연결당 최대 {MAX_CODES_PER_CONNECTION}개 종목까지 구독할 수 있습니다",
+        )
+    if any(len(c) != 6 or not c.isalnum() for c in code_list):
+        raise HTTPException(status_code=400, detail="올바르지 않은 종목코드")
+
+    return StreamingResponse(
+        _price_events(request, code_list),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @router.get("/ranking")
 async def get_ranking(type: str = Query(default="volume")):
     """종목 랭킹."""
@@ -80,19 +140,50 @@ async def execute_order(
     user_id = current_user["id"]
 
     if order.order_kind == "limit":
-        # 지정가 주문 비활성화 (매칭/체결 로직 미구현)
-        TRADING_ORDER_TOTAL.labels(order.order_type, "fail").inc()
-        raise HTTPException(status_code=400, detail="현재 시장가 주문만 지원됩니다")
+        # 지정가 주문: 대기 주문으로 접수 → 시세 틱마다 매칭 엔진이 체결
+        if order.order_type not in ("buy", "sell"):
+            TRADING_ORDER_TOTAL.labels(order.order_type, "fail").inc()
+            raise HTTPException(status_code=400, detail="order_type은 buy 또는 sell이어야 합니다")
+        if not order.target_price or order.target_price <= 0:
+            TRADING_ORDER_TOTAL.labels(order.order_type, "fail").inc()
+            raise HTTPException(status_code=400, detail="지정가 주문에는 target_price가 필요합니다")
+        row = (await db.execute(text(
+            "INSERT INTO limit_orders (user_id, stock_code, stock_name, order_type, target_price, quantity, status) "
+            "VALUES (:uid, :sc, :sn, :ot, :tp, :q, 'pending') RETURNING id, created_at"
+        ), {
+            "uid": user_id, "sc": order.stock_code, "sn": order.stock_name,
+            "ot": order.order_type, "tp": order.target_price, "q": order.quantity,
+        })).first()
+        await db.commit()
+        get_matching_engine().add(LimitOrder(
+            id=row.id,
+            user_id=user_id,
+            stock_code=order.stock_code,
+            stock_name=order.stock_name,
+            order_type=order.order_type,
+            target_price=order.target_price,
+            quantity=order.quantity,
+        ))
+        TRADING_ORDER_TOTAL.labels(order.order_type, "success").inc()
+        return {
+            "order_id": row.id,
+            "status": "pending",
+            "stock_code": order.stock_code,
+            "order_type": order.order_type,
+            "target_price": order.target_price,
+            "quantity": order.quantity,
+            "created_at": row.created_at,
+        }
     else:
         # 시장가 주문
-        price_data = await get_current_price(order.stock_code)
+        with kis_priority(LANE_ORDER):
+            price_data = await get_current_price(order.stock_code)
         if not price_data:
             TRADING_ORDER_TOTAL.labels(order.order_type, "fail").inc()
             raise HTTPException(status_code=404, detail="가격 조회 불가")
 
         try:
-            from app.services.portfolio_service import get_or_create_portfolio, execute_trade
-            portfolio = await get_or_create_portfolio(db, user_id)
+            portfolio = await get_or_create_portfolio(db, user_id, load=LOAD_BARE)
             result = await execute_trade(
                 db=db,
                 portfolio=portfolio,
@@ -135,11 +226,13 @@ async def cancel_order(
 ):
     """지정가 주문 취소. JWT 인증 필수 (본인 주문만 취소 가능)."""
     user_id = current_user["id"]
-    await db.execute(text(
+    cancelled = (await db.execute(text(
         "UPDATE limit_orders SET status='cancelled', cancelled_at=NOW() "
-        "WHERE id=:id AND user_id=:uid AND status='pending'"
-    ), {"id": order_id, "uid": user_id})
+        "WHERE id=:id AND user_id=:uid AND status='pending' RETURNING id"
+    ), {"id": order_id, "uid": user_id})).first()
     await db.commit()
+    if cancelled:
+        get_matching_engine().cancel(order_id)
     return {"status": "cancelled"}
 
 
@@ -15,7 +15,6 @@ logger = logging.getLogger("narrative.tutor")
 from app.core.auth import get_current_user_optional
 from app.core.config import get_settings
 from app.core.database import get_db
-from app.core.limiter import limiter
 from app.models.glossary import Glossary
 from app.schemas.tutor import TutorChatRequest
 from app.services import get_redis_cache
@@ -138,7 +137,6 @@ async def explain_term(
 
 
 @router.post("/chat")
-@limiter.limit("10/minute")
 async def tutor_chat(
     request: Request,
     chat_request: TutorChatRequest,
@@ -4,8 +4,6 @@ import logging
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 
-from app.core.limiter import limiter
-
 logger = logging.getLogger("narrative.visualization")
 
 router = APIRouter(prefix="/tutor", tags=["visualization"])
@@ -0,0 +1,87 @@
+"""ETag / 조건부 GET 의존성 모듈.
+
+키워드·브리핑·내러티브·사례 스토리·용어 응답은 데일리 파이프라인이 돌 때만 바뀐다.
+파이프라인 캐시 무효화(invalidate_pipeline_caches) 때마다 pipeline 태그 세대가 올라가고,
+ETag 는 (세대, KST 브리핑 날짜, 요청 경로+쿼리) 로 만든다 — 본문을 보지 않고도 정해진다.
+
+If-None-Match 가 현재 ETag 와 맞으면 DB 조회·직렬화 전에 304 로 끝낸다.
+Redis 를 쓸 수 없으면(세대를 모르면) 조건부 처리 없이 평소대로 응답한다.
+
+사용:
+    @router.get("/latest", dependencies=[conditional_get()])
+
+파이프라인 산출물이 아닌 응답(예: DB 오류 시 빈 대체 응답)은 uncacheable(response) 로
+ETag/Cache-Control 을 걷어 낸다 — 세대 ETag 가 붙으면 복구 후에도 재검증에서 304 로 남는다.
+"""
+
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import Depends, Request, Response
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from app.services.redis_cache import TAG_PIPELINE, get_redis_cache
+
+logger = logging.getLogger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+# 파이프라인 산출물 — 1분은 재검증 없이 쓰고, 이후에는 If-None-Match 로 재검증
+CONTENT_CACHE_CONTROL = "public, max-age=60, must-revalidate"
+
+
+async def get_pipeline_generation() -> Optional[int]:
+    """현재 파이프라인 세대. Redis 미연결/오류 시 None."""
+    try:
+        cache = await get_redis_cache()
+        return await cache.get_generation(TAG_PIPELINE)
+    except Exception as e:
+        logger.debug("pipeline generation read error: %s", e)
+        return None
+
+
+def content_etag(generation: int, request: Request, today: Optional[str] = None) -> str:
+    """강한 ETag: 세대 + 브리핑 날짜 + 경로/쿼리 다이제스트."""
+    today = today or datetime.now(KST).strftime("%Y%m%d")
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    digest = hashlib.blake2b(f"{request.url.path}?{query}".encode(), digest_size=8).hexdigest()
+    return f'"g{generation}.{today}.{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 약한 비교 (RFC 9110 13.1.2): W/ 접두사는 무시, * 는 항상 일치."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def conditional_get(cache_control: str = CONTENT_CACHE_CONTROL):
+    """라우트 의존성: 맞는 If-None-Match 면 304, 아니면 응답에 ETag/Cache-Control 을 붙인다.
+
+    라우트 데코레이터 dependencies 로 넣으면 엔드포인트의 DB 세션보다 먼저 풀린다.
+    """
+
+    async def dependency(request: Request, response: Response) -> None:
+        generation = await get_pipeline_generation()
+        if generation is None:
+            return
+        etag = content_etag(generation, request)
+        headers = {"ETag": etag, "Cache-Control": cache_control}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise StarletteHTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return Depends(dependency)
+
+
+def uncacheable(response: Response) -> None:
+    """conditional_get 이 붙인 ETag 를 지우고 캐시하지 않게 한다."""
+    if "etag" in response.headers:
+        del response.headers["etag"]
+    response.headers["Cache-Control"] = "no-store"
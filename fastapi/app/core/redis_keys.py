@@ -17,14 +17,46 @@ def key_glossary_by_name(term_name: str) -> str:
     return f"{ENV}:api:glossary:name:{term_name.lower()}"
 
 
-def key_keywords_today(date_str: str) -> str:
-    return f"{ENV}:api:keywords:today:{date_str}"
+def key_keywords_today(date_str: str, generation: int) -> str:
+    return f"{ENV}:api:keywords:today:g{generation}:{date_str}"
+
+
+def key_briefings_latest(generation: int) -> str:
+    return f"{ENV}:api:briefings:latest:g{generation}"
+
+
+def key_cache_generation(tag: str) -> str:
+    return f"{ENV}:api:gen:{tag}"
+
+
+def key_cache_invalidation_channel() -> str:
+    return f"{ENV}:api:cache:invalidate"
 
 
 def key_rate_limit(scope: str, identifier: str) -> str:
     return f"{ENV}:rl:{scope}:{identifier}"
 
 
+def key_single_flight_lock(scope: str, identifier: str) -> str:
+    return f"{ENV}:lock:{scope}:{identifier}"
+
+
+def key_price_hot_set() -> str:
+    return f"{ENV}:api:price:hot"
+
+
+def key_price_refresher_leader() -> str:
+    return f"{ENV}:lock:price_refresher:leader"
+
+
+def key_price_stream_channel() -> str:
+    return f"{ENV}:api:price:stream"
+
+
+def key_stock_listings_version() -> str:
+    return f"{ENV}:api:stock_listings:version"
+
+
 def key_user_settings(user_id: int) -> str:
     return f"{ENV}:api:user:settings:{user_id}"
 
@@ -33,6 +65,18 @@ def key_portfolio_summary(user_id: int) -> str:
     return f"{ENV}:api:portfolio:summary:{user_id}"
 
 
+def key_stock_chart(stock_code: str, span: str) -> str:
+    return f"{ENV}:api:stock:chart:{stock_code}:{span}"
+
+
+def key_leaderboard() -> str:
+    return f"{ENV}:api:portfolio:leaderboard"
+
+
+def key_leaderboard_meta() -> str:
+    return f"{ENV}:api:portfolio:leaderboard:meta"
+
+
 # TTL 상수 (초 단위)
 TTL_SHORT = 60       # 1분 (rate limit window)
 TTL_MEDIUM = 300     # 5분 (keywords, portfolio summary)
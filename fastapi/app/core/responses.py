@@ -0,0 +1,66 @@
+"""전역 응답 포맷(envelope) 응답 클래스.
+
+응답 본문을 미들웨어에서 다시 파싱하지 않고, 직렬화하는 시점에 한 번만 포맷을 정한다.
+
+- 4xx/5xx: {"status": "error", "message": ..., "error": payload}
+- 2xx/3xx: payload 그대로 (프론트 api/client.js 가 본문 필드를 바로 읽는 계약)
+- 이미 전역 포맷({"status": "success" | "error", ...})이면 그대로 직렬화
+
+FastAPI(default_response_class=EnvelopeJSONResponse) 로 모든 JSON 라우트에 적용되며,
+예외 핸들러/미들웨어가 직접 만드는 JSON 응답도 이 클래스를 쓴다.
+"""
+
+import json
+import logging
+from typing import Any
+
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 미설치 환경
+    orjson = None
+    logger.warning("orjson 미설치 — 표준 json 으로 응답 직렬화")
+
+_ENVELOPE_STATUSES = {"success", "error"}
+
+
+def error_envelope(message: str, error: Any = None) -> dict:
+    """전역 에러 포맷."""
+    return {"status": "error", "message": message, "error": error}
+
+
+def envelope(content: Any, status_code: int) -> Any:
+    """에러 payload 를 전역 포맷으로 감싼다 (성공 payload 와 이미 감싼 값은 그대로)."""
+    if status_code < 400:
+        return content
+    if isinstance(content, dict):
+        if content.get("status") in _ENVELOPE_STATUSES:
+            return content
+        detail = content.get("detail")
+        if isinstance(detail, str):
+            return error_envelope(detail, {k: v for k, v in content.items() if k != "detail"} or None)
+    return error_envelope("Request failed", content)
+
+
+def dumps(content: Any) -> bytes:
+    """JSON 직렬화 (orjson 우선, 없으면 표준 json 으로 JSONResponse 와 같은 출력)."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class EnvelopeJSONResponse(JSONResponse):
+    """직렬화 시점에 전역 포맷을 적용하는 JSON 응답."""
+
+    def render(self, content: Any) -> bytes:
+        # Response.__init__ 이 status_code 를 먼저 설정한 뒤 render 를 호출한다
+        return dumps(envelope(content, self.status_code))
@@ -1,12 +1,14 @@
-"""매일 KST 09:00 모닝 파이프라인 + KST 16:10 레거시 파이프라인 스케줄러."""
+"""매일 KST 09:00 모닝 파이프라인 + KST 16:10 레거시 파이프라인 + 시세 스냅샷 갱신 + OHLCV 일일 추가 스케줄러."""
 
 import asyncio
 import logging
 import sys
+from datetime import datetime
 from pathlib import Path
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
 logger = logging.getLogger("narrative.scheduler")
 
@@ -144,8 +146,8 @@ async def _post_pipeline_hooks():
     # 1. Redis 캐시 무효화
     try:
         cache = await get_redis_cache()
-        deleted = await cache.invalidate_pipeline_caches()
-        logger.info(f"Redis 캐시 무효화: {deleted}개 키")
+        bumped = await cache.invalidate_pipeline_caches()
+        logger.info(f"Redis 캐시 무효화: {bumped}개 태그 세대 갱신")
     except Exception as e:
         logger.warning(f"캐시 무효화 실패 (서비스 영향 없음): {e}")
 
@@ -161,6 +163,80 @@ async def _post_pipeline_hooks():
         logger.warning(f"MV 리프레시 실패 (다음 파이프라인에서 재시도): {e}")
 
 
+async def refresh_market_snapshot_job():
+    """전종목 시세 스냅샷 + 지수 요약 주기 갱신. 휴장일에는 이미 로드된 스냅샷을 유지한다.
+
+    랭킹(market_rankings)은 새 스냅샷 기준으로 다음 조회 시 다시 계산된다.
+    """
+    from app.services.market_rankings import refresh_market_summary
+    from app.services.market_snapshot import get_market_snapshot, refresh_market_snapshot
+
+    if get_market_snapshot() is not None and not await _is_trading_day():
+        return
+    await refresh_market_snapshot()
+    await refresh_market_summary()
+
+    # 새 시세로 리더보드 전체 재계산 (워커 중 한 곳만)
+    try:
+        from app.services.leaderboard import refresh_leaderboard
+
+        rebuilt = await refresh_leaderboard()
+        if rebuilt is not None:
+            logger.info("리더보드 재계산: %d명", rebuilt)
+    except Exception as e:
+        logger.warning("리더보드 재계산 실패 (다음 주기 재시도): %s", e)
+
+
+async def portfolio_nav_job():
+    """장 마감 후 전 포트폴리오 일괄 평가 → portfolio_nav_history 기록 + 리더보드 교체."""
+    if not await _is_trading_day():
+        return
+    try:
+        from app.services.portfolio_valuation import run_nav_job
+
+        # 종가 스냅샷 갱신은 run_nav_job 안에서 락을 잡은 워커만 수행
+        written = await run_nav_job()
+        if written is not None:
+            logger.info("포트폴리오 NAV 기록: %d건", written)
+    except Exception as e:
+        logger.warning("포트폴리오 NAV 기록 실패: %s", e)
+        return
+    # 오늘 만기 보상은 오늘 NAV 행이 생긴 뒤에야 스윕 대상이 되므로 방금 기록한 종가 NAV로 바로 판정
+    await reward_sweep_job()
+
+
+async def reward_sweep_job():
+    """만기 지난 브리핑 보상 일괄 처리 (멀티플라이어 적용/소멸)."""
+    try:
+        from app.services.reward_sweeper import run_reward_sweeper
+
+        await run_reward_sweeper()
+    except Exception as e:
+        logger.warning("보상 만기 처리 실패 (다음 주기 재시도): %s", e)
+
+
+async def append_ohlcv_job():
+    """로컬 OHLCV 저장소에 확정된 최근 거래일 하루치 추가 (전종목 보드 1회 조회)."""
+    try:
+        from datapipeline.collectors.ohlcv_store import get_ohlcv_store
+
+        appended = await asyncio.to_thread(get_ohlcv_store().append_latest_session)
+        logger.info("OHLCV 일일 추가 완료: %s", appended)
+    except Exception as e:
+        logger.warning("OHLCV 일일 추가 실패 (다음 조회 시 read-through로 보충): %s", e)
+
+
+async def refresh_fundamentals_job():
+    """일별 전종목 재무 지표 스냅샷 미리 받기 (튜터 첫 조회가 pykrx를 기다리지 않도록)."""
+    try:
+        from datapipeline.collectors.fundamentals_store import get_fundamentals_store
+
+        snapshot = await asyncio.to_thread(get_fundamentals_store().refresh)
+        logger.info("재무 지표 스냅샷 갱신 완료: %s", snapshot.trade_date if snapshot else None)
+    except Exception as e:
+        logger.warning("재무 지표 스냅샷 갱신 실패 (다음 조회 시 재시도): %s", e)
+
+
 def start_scheduler():
     """스케줄러 시작. 모닝(KST 09:00) + 데일리(KST 16:10), 월-금."""
     global _scheduler
@@ -189,8 +265,63 @@ def start_scheduler():
         replace_existing=True,
     )
 
+    # 포트폴리오 NAV 일괄 평가: KST 16:00 = UTC 07:00 (장 마감 후 종가 확정)
+    _scheduler.add_job(
+        portfolio_nav_job,
+        trigger=CronTrigger(hour=7, minute=0, day_of_week="mon,tue,wed,thu,fri"),
+        id="portfolio_nav",
+        name="Portfolio NAV Snapshot (16:00 KST)",
+        misfire_grace_time=3600,
+        replace_existing=True,
+    )
+
+    # 로컬 OHLCV 저장소 일일 추가: KST 18:00 = UTC 09:00 (시간외 단일가 종료 후)
+    _scheduler.add_job(
+        append_ohlcv_job,
+        trigger=CronTrigger(hour=9, minute=0, day_of_week="mon,tue,wed,thu,fri"),
+        id="ohlcv_append",
+        name="OHLCV Store Daily Append (18:00 KST)",
+        misfire_grace_time=3600,
+        replace_existing=True,
+    )
+
+    # 일별 재무 지표 스냅샷: KST 18:05 = UTC 09:05
+    _scheduler.add_job(
+        refresh_fundamentals_job,
+        trigger=CronTrigger(hour=9, minute=5, day_of_week="mon,tue,wed,thu,fri"),
+        id="fundamentals_snapshot",
+        name="Fundamentals Snapshot Refresh (18:05 KST)",
+        misfire_grace_time=3600,
+        replace_existing=True,
+    )
+
+    # 만기 보상 스위퍼: 10분 주기 (SKIP LOCKED 라 워커가 겹쳐도 같은 보상을 두 번 처리하지 않음)
+    from app.services.reward_sweeper import SWEEP_INTERVAL_SECONDS
+    _scheduler.add_job(
+        reward_sweep_job,
+        trigger=IntervalTrigger(seconds=SWEEP_INTERVAL_SECONDS),
+        id="reward_sweep",
+        name="Briefing Reward Maturity Sweep",
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True,
+    )
+
+    # 전종목 시세 스냅샷: 5분 주기 (get_batch_prices / 랭킹 메모리 조회용), 시작 직후 1회 로드
+    from app.services.market_snapshot import SNAPSHOT_REFRESH_SECONDS
+    _scheduler.add_job(
+        refresh_market_snapshot_job,
+        trigger=IntervalTrigger(seconds=SNAPSHOT_REFRESH_SECONDS),
+        next_run_time=datetime.now(),
+        id="market_snapshot",
+        name="KRX Market Snapshot Refresh",
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True,
+    )
+
     _scheduler.start()
-    logger.info("스케줄러 시작: 모닝(09:00 KST) + 데일리(16:10 KST), Mon-Fri")
+    logger.info("스케줄러 시작: 모닝(09:00 KST) + 데일리(16:10 KST), Mon-Fri + 시세 스냅샷")
 
 
 def stop_scheduler():
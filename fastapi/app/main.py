@@ -1,18 +1,14 @@
 """FastAPI application entry point."""
 
-import json
 import logging
 import traceback
 import uuid
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Request, Response, HTTPException
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from starlette.responses import StreamingResponse
-from slowapi import _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
 import importlib
 import logging as _logging
@@ -44,10 +40,14 @@ for _mod_name in [
         _route_modules[_mod_name] = importlib.import_module(f"app.api.routes.{_mod_name}")
     except Exception as _e:
         _logging.getLogger("startup").warning(f"라우터 '{_mod_name}' 로드 실패 (무시): {_e}")
-from app.core.config import settings, get_settings
-from app.core.limiter import limiter
+from app.core.config import settings
+from app.core.responses import EnvelopeJSONResponse
 from app.services import get_redis_cache, close_redis_cache
 from app.services.kis_service import close_kis_service
+from app.services.order_matching import get_matching_engine
+from app.services.price_refresher import start_price_refresher, stop_price_refresher
+from app.services.price_stream import stop_price_stream_hub
+from app.services.stock_search_index import load_stock_search_index
 from app.core.scheduler import start_scheduler, stop_scheduler
 
 # --- 구조화된 로깅 설정 ---
@@ -70,10 +70,21 @@ async def lifespan(app: FastAPI):
         logger.info("Redis cache connected")
     else:
         logger.warning("Redis cache not available (running without cache)")
+    # 종목 검색 인덱스 로드 (실패 시 첫 검색에서 재시도)
+    await load_stock_search_index()
     # 데일리 파이프라인 스케줄러 시작
     start_scheduler()
+    # 지정가 호가창 재구성 (실패 시 첫 매칭 틱에서 다시 로드)
+    try:
+        await get_matching_engine().load()
+    except Exception as e:
+        logger.warning("지정가 호가창 로드 실패: %s", e)
+    # hot set 가격 선갱신 루프 시작
+    start_price_refresher()
     yield
     # Shutdown
+    await stop_price_stream_hub()
+    await stop_price_refresher()
     stop_scheduler()
     await close_kis_service()
     await close_redis_cache()
@@ -87,6 +98,8 @@ app = FastAPI(
     lifespan=lifespan,
     docs_url="/docs",
     redoc_url="/redoc",
+    # 전역 응답 포맷은 직렬화 시점에 적용 (app/core/responses.py)
+    default_response_class=EnvelopeJSONResponse,
 )
 
 # Prometheus 메트릭 — /metrics 엔드포인트 자동 노출
@@ -102,11 +115,6 @@ except ImportError:
     logger.warning("prometheus-fastapi-instrumentator 미설치 — /metrics 비활성화")
 
 
-# --- Rate Limiter 등록 ---
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
-
 # --- 글로벌 예외 핸들러 ---
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -120,7 +128,7 @@ async def global_exception_handler(request: Request, exc: Exception):
         exc,
         traceback.format_exc(),
     )
-    return JSONResponse(
+    return EnvelopeJSONResponse(
         status_code=500,
         content={
             "status": "error",
@@ -135,8 +143,12 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 
 @app.exception_handler(HTTPException)
-async def http_exception_handler(request: Request, exc: HTTPException):
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     """HTTP 예외를 전역 에러 포맷으로 변환."""
+    if exc.status_code in {204, 304}:
+        # 본문 없는 응답 (조건부 GET 304 등)
+        return Response(status_code=exc.status_code, headers=getattr(exc, "headers", None))
     detail = exc.detail
     if isinstance(detail, dict):
         message = detail.get("message") or detail.get("error") or "Request failed"
@@ -144,13 +156,14 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     else:
         message = str(detail) if detail else "Request failed"
         error = None
-    return JSONResponse(
+    return EnvelopeJSONResponse(
         status_code=exc.status_code,
         content={
             "status": "error",
             "message": message,
             "error": error,
         },
+        headers=getattr(exc, "headers", None),
     )
 
 
@@ -163,7 +176,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         request.url.path,
         exc.errors(),
     )
-    return JSONResponse(
+    return EnvelopeJSONResponse(
         status_code=422,
         content={
             "status": "error",
@@ -192,73 +205,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# --- 슬라이딩 윈도우 레이트리밋 (Lua 원자적, IP당 100 req/min) ---
+# --- 순수 ASGI 미들웨어 (응답 본문을 버퍼링하지 않음) ---
+# 요청 처리 순서: CSRF → 하이브리드 토큰 버킷 레이트리밋(IP당 100 req/min, 튜터 채팅 10 req/min) → CORS
+from app.middleware.csrf import CSRFMiddleware
 from app.middleware.rate_limit import RateLimitMiddleware
 app.add_middleware(RateLimitMiddleware)
-
-@app.middleware("http")
-async def csrf_middleware(request: Request, call_next):
-    settings = get_settings()
-    if request.method in {"GET", "HEAD", "OPTIONS"}:
-        return await call_next(request)
-
-    path = request.url.path
-    csrf_exempt_prefixes = {
-        "/api/v1/auth/login",
-        "/api/v1/auth/register",
-        "/api/v1/auth/refresh",
-        "/api/v1/auth/csrf",
-    }
-    if path in csrf_exempt_prefixes:
-        return await call_next(request)
-
-    csrf_cookie = request.cookies.get(settings.AUTH_CSRF_COOKIE_NAME)
-    if not csrf_cookie:
-        # CSRF 쿠키 없음 = 쿠키 인증 미사용 클라이언트 → 검증 스킵
-        # (Authorization 헤더 방식은 CSRF에 취약하지 않음)
-        return await call_next(request)
-    csrf_header = request.headers.get(settings.AUTH_CSRF_HEADER_NAME)
-    if not csrf_header or csrf_cookie != csrf_header:
-        return JSONResponse(
-            status_code=403,
-            content={"detail": "CSRF token missing or invalid"},
-        )
-
-    return await call_next(request)
-
-
-@app.middleware("http")
-async def response_envelope_middleware(request: Request, call_next):
-    """응답을 전역 스키마로 래핑 (JSON만 적용)."""
-    response = await call_next(request)
-
-    # 문서/메트릭/스키마/스트리밍 응답은 제외
-    if request.url.path in {"/metrics", "/docs", "/redoc", "/openapi.json"}:
-        return response
-    if isinstance(response, StreamingResponse):
-        return response
-
-    content_type = response.headers.get("content-type", "")
-    if "application/json" not in content_type:
-        return response
-
-    try:
-        body = response.body
-        payload = json.loads(body.decode("utf-8")) if body else None
-    except Exception:
-        return response
-
-    # 이미 전역 포맷이면 그대로 반환
-    if isinstance(payload, dict) and payload.get("status") in {"success", "error"}:
-        return response
-
-    if response.status_code >= 400:
-        wrapped = {"status": "error", "message": "Request failed", "error": payload}
-    else:
-        wrapped = {"status": "success", "data": payload}
-    headers = dict(response.headers)
-    headers.pop("content-length", None)
-    return JSONResponse(content=wrapped, status_code=response.status_code, headers=headers)
+app.add_middleware(CSRFMiddleware)
 
 
 # Include routers (로드 성공한 모듈만 등록)
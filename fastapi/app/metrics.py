@@ -1,6 +1,6 @@
 """Prometheus custom metrics."""
 
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 AUTH_LOGIN_TOTAL = Counter(
     "auth_login_total",
@@ -58,8 +58,14 @@ EXTERNAL_API_LATENCY_SECONDS = Histogram(
 
 CACHE_HIT_TOTAL = Counter(
     "cache_hit_total",
-    "Cache hit/miss counts",
-    ["cache", "hit"],
+    "Cache hit/miss counts by tier (l1: in-process, l2: Redis)",
+    ["cache", "tier", "hit"],
+)
+
+CACHE_REFRESH_TOTAL = Counter(
+    "cache_refresh_total",
+    "get_or_set loader runs by reason (miss, stale: SWR, early: XFetch)",
+    ["cache", "reason"],
 )
 
 DB_QUERY_TOTAL = Counter(
@@ -97,3 +103,80 @@ HTTP_REQUESTS_TOTAL = Counter(
     "Total HTTP requests",
     ["method", "path", "status"],
 )
+
+MARKET_SNAPSHOT_REFRESH_TOTAL = Counter(
+    "market_snapshot_refresh_total",
+    "Whole-market price snapshot refresh attempts",
+    ["result"],
+)
+
+SINGLE_FLIGHT_TOTAL = Counter(
+    "single_flight_total",
+    "Single-flight lookups by outcome (upstream fetch vs coalesced waiter)",
+    ["name", "result"],
+)
+
+KIS_SCHEDULER_QUEUE_DEPTH = Gauge(
+    "kis_scheduler_queue_depth",
+    "KIS API requests waiting for a rate-limit token",
+    ["lane"],
+)
+
+KIS_SCHEDULER_WAIT_SECONDS = Histogram(
+    "kis_scheduler_wait_seconds",
+    "Time spent waiting for a KIS rate-limit token",
+    ["lane"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0),
+)
+
+KIS_SCHEDULER_TIMEOUT_TOTAL = Counter(
+    "kis_scheduler_timeout_total",
+    "KIS API requests dropped after their queue deadline",
+    ["lane"],
+)
+
+PRICE_REFRESH_TOTAL = Counter(
+    "price_refresh_total",
+    "Background hot-set price refreshes",
+    ["result"],
+)
+
+PRICE_STREAM_CONNECTIONS = Gauge(
+    "price_stream_connections",
+    "Open price stream (SSE) connections",
+)
+
+PRICE_STREAM_EVENTS_TOTAL = Counter(
+    "price_stream_events_total",
+    "Price stream events by result",
+    ["result"],
+)
+
+REWARD_SWEEP_TOTAL = Counter(
+    "reward_sweep_total",
+    "Matured briefing rewards processed by the sweeper",
+    ["result"],
+)
+
+REWARD_SWEEP_SECONDS = Histogram(
+    "reward_sweep_seconds",
+    "Duration of one reward sweep batch transaction",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+LIMIT_ORDER_BOOK_SIZE = Gauge(
+    "limit_order_book_size",
+    "Pending limit orders held in this worker's in-memory order book",
+)
+
+LIMIT_ORDER_FILLS_TOTAL = Counter(
+    "limit_order_fills_total",
+    "Crossed limit orders by settlement result (filled, rejected, stale)",
+    ["result"],
+)
+
+RATE_LIMIT_DECISIONS_TOTAL = Counter(
+    "rate_limit_decisions_total",
+    "Rate limit decisions by path (local, redis, denied, fallback)",
+    ["result"],
+)
@@ -0,0 +1,52 @@
+"""CSRF double-submit 쿠키 검증 미들웨어 (순수 ASGI)."""
+
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.core.responses import EnvelopeJSONResponse
+
+_SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# CSRF 검증 제외 경로 (쿠키 발급 전 호출되는 인증 엔드포인트)
+_EXEMPT_PATHS = {
+    "/api/v1/auth/login",
+    "/api/v1/auth/register",
+    "/api/v1/auth/refresh",
+    "/api/v1/auth/csrf",
+}
+
+
+class CSRFMiddleware:
+    """상태 변경 요청에서 CSRF 쿠키와 헤더가 같은지 확인한다."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in _SAFE_METHODS
+            or scope["path"] in _EXEMPT_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        settings = get_settings()
+        conn = HTTPConnection(scope)
+        csrf_cookie = conn.cookies.get(settings.AUTH_CSRF_COOKIE_NAME)
+        if not csrf_cookie:
+            # CSRF 쿠키 없음 = 쿠키 인증 미사용 클라이언트 → 검증 스킵
+            # (Authorization 헤더 방식은 CSRF에 취약하지 않음)
+            await self.app(scope, receive, send)
+            return
+        csrf_header = conn.headers.get(settings.AUTH_CSRF_HEADER_NAME)
+        if not csrf_header or csrf_cookie != csrf_header:
+            response = EnvelopeJSONResponse(
+                {"detail": "CSRF token missing or invalid"},
+                status_code=403,
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
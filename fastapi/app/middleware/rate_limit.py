@@ -1,77 +1,272 @@
-"""Lua 기반 원자적 슬라이딩 윈도우 레이트리밋 미들웨어."""
+"""하이브리드 토큰 버킷 레이트리밋 미들웨어 (순수 ASGI).
 
+키(IP, 경로 규칙)마다 워커 로컬 토큰 버킷을 두고, 판정은 로컬에서 끝낸다.
+로컬에서 허용한 요청 수(pending)는 SYNC_INTERVAL_SEC 마다 한 번의 Lua 호출로 묶어
+Redis 의 전역 버킷에 반영하고, 그 응답(전역 잔량)으로 로컬 버킷을 맞춘다.
+
+- 한도에 여유가 있는 요청: Redis 왕복 없음
+- 동기화 사이 로컬 허용이 키의 로컬 버스트에 닿거나 로컬 토큰이 바닥나면 그 키만 즉시 동기화
+- 방금 Redis 에서 소진을 확인한 키는 다음 동기화 주기까지 로컬에서 바로 거부
+
+로컬 버스트는 규칙마다 min(LOCAL_BURST, 한도 // 워커 수) 로 잡는다 (최소 1). 그래서 전역 한도
+초과 허용량은 동기화 주기당 (워커 수 × 로컬 버스트) 이내 — 한도가 낮은 규칙(튜터 10/분)도
+워커 수만큼 한도를 통째로 더 허용하지 않는다.
+Redis 장애 시에는 워커 로컬 버킷만으로 판정한다 (graceful).
+"""
+
+import asyncio
 import logging
+import math
+import os
 import time
+from dataclasses import dataclass
+from typing import Optional
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.core.redis_keys import key_rate_limit
+from app.core.responses import EnvelopeJSONResponse
+from app.metrics import RATE_LIMIT_DECISIONS_TOTAL
 from app.services.redis_cache import get_redis_cache
 
 logger = logging.getLogger(__name__)
 
-# Sliding window Lua script (원자적 처리)
-SLIDING_WINDOW_LUA = """
-local key = KEYS[1]
-local now = tonumber(ARGV[1])
-local window = tonumber(ARGV[2])
-local limit = tonumber(ARGV[3])
-
-redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
-local count = redis.call('ZCARD', key)
-
-if count < limit then
-    redis.call('ZADD', key, now, now)
-    redis.call('EXPIRE', key, math.ceil(window / 1000))
-    return {1, limit - count - 1, 0}
-else
-    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
-    local reset = oldest[2] and (tonumber(oldest[2]) + window) or (now + window)
-    return {0, 0, reset}
+# 전역 토큰 버킷 배치 갱신: 키마다 로컬 사용량(spend)을 차감하고, need 개를 추가로 요청한다.
+# ARGV 는 키마다 (capacity, rate(토큰/ms), spend, need) 4개씩. 반환: 키마다 (granted, 잔량).
+# 잔량은 로컬에서 이미 허용한 요청 때문에 음수가 될 수 있다 (이후 리필로 상환).
+GLOBAL_BUCKET_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local out = {}
+for i, key in ipairs(KEYS) do
+    local base = (i - 1) * 4
+    local capacity = tonumber(ARGV[base + 1])
+    local rate = tonumber(ARGV[base + 2])
+    local spend = tonumber(ARGV[base + 3])
+    local need = tonumber(ARGV[base + 4])
+
+    local data = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(data[1]) or capacity
+    local ts = tonumber(data[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate) - spend
+
+    local granted = 0
+    if need > 0 and tokens >= need then
+        tokens = tokens - need
+        granted = 1
+    end
+    redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil(capacity / rate) + 1000)
+    out[#out + 1] = granted
+    out[#out + 1] = tostring(tokens)
 end
+return out
 """
 
 RATE_LIMIT = 100       # 요청/분
 WINDOW_MS = 60_000     # 1분 (ms)
 
+LOCAL_BURST = 10           # 동기화 사이 Redis 확인 없이 허용하는 키당 요청 수 (상한)
+WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", "4")))  # uvicorn 워커 수 (Dockerfile 기본값)
+SYNC_INTERVAL_SEC = 1.0    # 로컬 사용량 배치 반영 주기
+SYNC_BATCH = 500           # Lua 호출 한 번에 묶는 키 수
+
 # rate limit 제외 경로
 _EXEMPT_PATHS = {"/metrics", "/docs", "/redoc", "/openapi.json", "/"}
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """IP 기반 슬라이딩 윈도우 레이트리밋 (100 req/min)."""
+@dataclass(frozen=True)
+class RateRule:
+    scope: str
+    limit: int
+    window_sec: float
+
+    @property
+    def rate(self) -> float:
+        """초당 리필 토큰 수."""
+        return self.limit / self.window_sec
+
+
+DEFAULT_RULE = RateRule("ip", RATE_LIMIT, WINDOW_MS / 1000)
+
+# 경로별 규칙 (해당 경로는 기본 규칙 대신 적용)
+ROUTE_RULES = {
+    "/api/v1/tutor/chat": RateRule("tutor_chat", 10, 60),
+}
+
+
+class _Bucket:
+    """전역 잔량의 로컬 추정치 + 아직 Redis 에 반영하지 않은 로컬 허용 수."""
+
+    __slots__ = ("tokens", "ts", "pending", "synced_at")
+
+    def __init__(self, capacity: float, now: float):
+        self.tokens = capacity
+        self.ts = now
+        self.pending = 0
+        self.synced_at = -math.inf
+
+    def refill(self, rule: RateRule, now: float) -> None:
+        self.tokens = min(rule.limit, self.tokens + (now - self.ts) * rule.rate)
+        self.ts = now
+
+
+class HybridRateLimiter:
+    """워커 로컬 토큰 버킷 + Redis 전역 버킷 비동기 배치 동기화."""
 
-    async def dispatch(self, request: Request, call_next):
-        if request.url.path in _EXEMPT_PATHS:
-            return await call_next(request)
+    def __init__(
+        self,
+        local_burst: int = LOCAL_BURST,
+        sync_interval: float = SYNC_INTERVAL_SEC,
+        workers: int = WORKERS,
+    ):
+        self.local_burst = local_burst
+        self.sync_interval = sync_interval
+        self.workers = max(1, workers)
+        self._buckets: dict[str, tuple[RateRule, _Bucket]] = {}
+        self._last_flush = time.monotonic()
+        self._flush_task: Optional[asyncio.Task] = None
 
-        client_ip = request.client.host if request.client else "unknown"
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def burst(self, rule: RateRule) -> int:
+        """이 규칙에서 동기화 없이 로컬로 허용하는 요청 수 (워커 몫의 한도를 넘지 않음)."""
+        return min(self.local_burst, max(1, rule.limit // self.workers))
+
+    async def hit(self, rule: RateRule, identifier: str) -> tuple[bool, float]:
+        """요청 1건 판정. 반환: (허용 여부, 거부 시 다음 토큰까지 초)."""
+        now = time.monotonic()
+        key = key_rate_limit(rule.scope, identifier)
+        entry = self._buckets.get(key)
+        if entry is None:
+            bucket = _Bucket(rule.limit, now)
+            self._buckets[key] = (rule, bucket)
+        else:
+            bucket = entry[1]
+            bucket.refill(rule, now)
+        self._maybe_flush(now)
+
+        if bucket.tokens >= 1 and bucket.pending < self.burst(rule):
+            bucket.tokens -= 1
+            bucket.pending += 1
+            RATE_LIMIT_DECISIONS_TOTAL.labels("local").inc()
+            return True, 0.0
+
+        if bucket.tokens < 1 and now - bucket.synced_at < self.sync_interval:
+            # 방금 Redis 에서 소진을 확인함 → 왕복 없이 거부
+            RATE_LIMIT_DECISIONS_TOTAL.labels("denied").inc()
+            return False, (1 - bucket.tokens) / rule.rate
+
+        # 로컬 예산 소진 또는 한도 근처 → 이 키만 즉시 전역 버킷과 맞춘다
+        result = await self._sync([(key, rule, bucket, 1)])
+        if result is None:
+            # Redis 장애: 워커 로컬 버킷만으로 판정
+            bucket.pending = 0
+            allowed = bucket.tokens >= 1
+            if allowed:
+                bucket.tokens -= 1
+            RATE_LIMIT_DECISIONS_TOTAL.labels("fallback").inc()
+        else:
+            allowed = result[0]
+            RATE_LIMIT_DECISIONS_TOTAL.labels("redis" if allowed else "denied").inc()
+        return allowed, 0.0 if allowed else (1 - bucket.tokens) / rule.rate
+
+    def _maybe_flush(self, now: float) -> None:
+        if now - self._last_flush < self.sync_interval:
+            return
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        self._last_flush = now
+        self._flush_task = asyncio.create_task(self.flush())
+
+    async def flush(self) -> int:
+        """로컬 허용 수를 배치로 Redis 에 반영하고 전역 잔량을 받아온다. 반영한 키 수 반환."""
+        now = time.monotonic()
+        dirty = []
+        for key, (rule, bucket) in list(self._buckets.items()):
+            if bucket.pending:
+                dirty.append((key, rule, bucket, 0))
+                continue
+            bucket.refill(rule, now)
+            if bucket.tokens >= rule.limit:
+                # 가득 찬 유휴 버킷은 새로 만드는 것과 같다
+                del self._buckets[key]
+        for start in range(0, len(dirty), SYNC_BATCH):
+            await self._sync(dirty[start:start + SYNC_BATCH])
+        return len(dirty)
+
+    async def _sync(self, items: list[tuple[str, RateRule, _Bucket, int]]) -> Optional[list[bool]]:
+        """Lua 한 번으로 items 의 pending 을 반영한다. 반환: 키별 need 승인 여부 (Redis 장애 시 None)."""
+        spends = [bucket.pending for _, _, bucket, _ in items]
+        for _, _, bucket, _ in items:
+            bucket.pending = 0
         try:
             cache = await get_redis_cache()
-            if cache.client:
-                now_ms = int(time.time() * 1000)
-                k = key_rate_limit("ip", client_ip)
-                result = await cache.client.eval(
-                    SLIDING_WINDOW_LUA, 1, k,
-                    now_ms, WINDOW_MS, RATE_LIMIT
-                )
-                allowed, remaining, reset_ms = result
-                if not allowed:
-                    retry_after = max(1, int((reset_ms - now_ms) / 1000))
-                    return Response(
-                        content='{"detail":"Too Many Requests"}',
-                        status_code=429,
-                        headers={
-                            "Content-Type": "application/json",
-                            "X-RateLimit-Limit": str(RATE_LIMIT),
-                            "X-RateLimit-Remaining": "0",
-                            "X-RateLimit-Reset": str(int(reset_ms / 1000)),
-                            "Retry-After": str(retry_after),
-                        },
-                    )
+            if cache.client is None:
+                raise ConnectionError("redis unavailable")
+            args = []
+            for (_, rule, _, need), spend in zip(items, spends):
+                args += [rule.limit, rule.rate / 1000.0, spend, need]
+            result = await cache.client.eval(
+                GLOBAL_BUCKET_LUA, len(items), *(key for key, _, _, _ in items), *args
+            )
         except Exception as e:
-            # Redis 장애 시 레이트리밋 미적용 (graceful)
-            logger.warning(f"RateLimit Redis error (fallback=allow): {e}")
+            for (_, _, bucket, _), spend in zip(items, spends):
+                bucket.pending += spend
+            logger.debug("RateLimit Redis sync error (local fallback): %s", e)
+            return None
+
+        now = time.monotonic()
+        granted = []
+        for i, (_, _, bucket, _) in enumerate(items):
+            # 왕복 동안 로컬에서 더 허용한 요청(pending)은 다음 동기화에 반영된다
+            bucket.tokens = float(result[2 * i + 1]) - bucket.pending
+            bucket.ts = now
+            bucket.synced_at = now
+            granted.append(int(result[2 * i]) == 1)
+        return granted
+
+
+_limiter: Optional[HybridRateLimiter] = None
+
+
+def get_rate_limiter() -> HybridRateLimiter:
+    """하이브리드 레이트리미터 싱글톤 반환."""
+    global _limiter
+    if _limiter is None:
+        _limiter = HybridRateLimiter()
+    return _limiter
+
+
+class RateLimitMiddleware:
+    """IP 기반 레이트리밋 (기본 100 req/min, ROUTE_RULES 경로는 별도 한도)."""
+
+    def __init__(self, app: ASGIApp, limiter: Optional[HybridRateLimiter] = None):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in _EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        rule = ROUTE_RULES.get(scope["path"], DEFAULT_RULE)
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        allowed, retry_after = await (self.limiter or get_rate_limiter()).hit(rule, client_ip)
+        if not allowed:
+            response = EnvelopeJSONResponse(
+                {"detail": "Too Many Requests"},
+                status_code=429,
+                headers={
+                    "X-RateLimit-Limit": str(rule.limit),
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset": str(int(time.time() + retry_after)),
+                    "Retry-After": str(max(1, math.ceil(retry_after))),
+                },
+            )
+            await response(scope, receive, send)
+            return
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
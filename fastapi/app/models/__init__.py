@@ -7,7 +7,7 @@ from app.models.historical_case import HistoricalCase, CaseStockRelation, CaseMa
 from app.models.tutor import TutorSession, TutorMessage
 from app.models.learning import LearningProgress
 from app.models.report import BrokerReport
-from app.models.portfolio import UserPortfolio, PortfolioHolding, SimulationTrade
+from app.models.portfolio import UserPortfolio, PortfolioHolding, SimulationTrade, PortfolioNavHistory
 from app.models.reward import BriefingReward, DwellReward
 from app.models.narrative import DailyNarrative, NarrativeScenario
 
@@ -27,6 +27,7 @@ __all__ = [
     "UserPortfolio",
     "PortfolioHolding",
     "SimulationTrade",
+    "PortfolioNavHistory",
     "BriefingReward",
     "DwellReward",
     "DailyNarrative",
@@ -1,9 +1,9 @@
 """Portfolio and simulation models."""
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import String, Text, Integer, BigInteger, Numeric, ForeignKey, Index
+from sqlalchemy import String, Text, Integer, BigInteger, Numeric, Float, Date, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -56,6 +56,7 @@ class PortfolioHolding(Base):
     __table_args__ = (
         Index("ix_portfolio_holdings_portfolio_id", "portfolio_id"),
         Index("ix_portfolio_holdings_stock_code", "stock_code"),
+        Index("uq_portfolio_holdings_portfolio_stock", "portfolio_id", "stock_code", unique=True),
     )
 
 
@@ -81,6 +82,36 @@ class SimulationTrade(Base):
     __table_args__ = (
         Index("ix_simulation_trades_portfolio_id", "portfolio_id"),
         Index("ix_simulation_trades_traded_at", "traded_at"),
+        # 거래 내역 키셋 페이지 (portfolio_id, traded_at, id) — 목록 컬럼 포함 커버링 인덱스
+        Index(
+            "ix_simulation_trades_portfolio_traded_at",
+            "portfolio_id", "traded_at", "id",
+            postgresql_include=["trade_type", "stock_code", "stock_name", "quantity", "price", "total_amount"],
+        ),
+    )
+
+
+class PortfolioNavHistory(Base):
+    """일별 포트폴리오 평가액(NAV). 장 마감 후 배치 평가 잡이 포트폴리오당 하루 1행 기록."""
+
+    __tablename__ = "portfolio_nav_history"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    portfolio_id: Mapped[int] = mapped_column(
+        ForeignKey("user_portfolios.id", ondelete="CASCADE"), nullable=False
+    )
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    nav_date: Mapped[date] = mapped_column(Date, nullable=False, comment="평가 기준 거래일 (KST)")
+    cash: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    holdings_value: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    total_value: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    profit_loss: Mapped[int] = mapped_column(BigInteger, nullable=False, comment="보상 제외 손익")
+    profit_loss_pct: Mapped[float] = mapped_column(Float, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("portfolio_id", "nav_date", name="uq_portfolio_nav_history_portfolio_date"),
+        Index("ix_portfolio_nav_history_nav_date", "nav_date"),
     )
 
 
@@ -1,6 +1,6 @@
 """Portfolio, trading, and reward schemas."""
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Literal, Optional
 
 from pydantic import BaseModel, Field
@@ -41,6 +41,19 @@ class PortfolioSummary(BaseModel):
     total_rewards_received: int = 0
 
 
+class PerformancePoint(BaseModel):
+    """일별 평가액 (portfolio_nav_history 1행)."""
+    nav_date: date
+    total_value: int
+    profit_loss: int
+    profit_loss_pct: float
+
+
+class PerformanceResponse(BaseModel):
+    """성과 차트 응답."""
+    points: list[PerformancePoint]
+
+
 class RefreshPortfolioRequest(BaseModel):
     """포트폴리오 수동 업데이트 요청."""
     invalidate_scope: Literal["summary_and_holdings"] = "summary_and_holdings"
@@ -92,6 +105,7 @@ class TradeHistoryResponse(BaseModel):
     """거래 내역 목록."""
     trades: list[TradeResponse]
     total_count: int
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
 
 
 # --- Stock Price ---
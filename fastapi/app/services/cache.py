@@ -1,55 +1,175 @@
-"""캐시 헬퍼 — cache-aside + stampede 방지."""
+"""캐시 헬퍼 — cache-aside + stampede 방지.
 
-import json
+get_or_set 은 값을 {"v": 값, "d": 로드 소요(초), "e": 소프트 만료(epoch), "t": 값 기준 시각(epoch)}
+엔트리로 저장하고,
+호출부마다 CachePolicy 로 stampede 방지 방식을 고른다.
+
+- lock: 같은 키의 미스를 single_flight 로 1회 로드로 합친다 (프로세스 내 Future + Redis 락).
+  락을 못 잡은 워커는 다른 워커가 채운 엔트리를 기다린다.
+- stale_ttl: 소프트 만료 후 이 구간 동안은 지난 값을 바로 내주고 백그라운드에서 갱신한다
+  (stale-while-revalidate). Redis TTL 은 소프트 TTL + stale_ttl.
+- beta: XFetch 확률적 조기 갱신. 만료가 가까울수록, 로드가 느릴수록(d) 갱신 확률이 오른다
+  (now - d·beta·ln(rand) >= e). 0 이면 끈다.
+
+엔트리를 직접 쓰는 write-through 경로(portfolio_summary 등)는 pack_entry 로 같은 형식을 맞춘다.
+"""
+
+import asyncio
 import logging
+import math
 import random
-from typing import Any, Callable, Optional
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
 
+from app.metrics import CACHE_REFRESH_TOTAL
 from app.services.redis_cache import get_redis_cache
+from app.services.single_flight import single_flight
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class CachePolicy:
+    """get_or_set 호출부별 stampede 방지 정책."""
+
+    lock: bool = True          # 키별 single-flight (프로세스 내 + Redis 락)
+    stale_ttl: int = 0         # 소프트 만료 후 지난 값을 내주며 백그라운드 갱신하는 구간 (초)
+    beta: float = 0.0          # XFetch 조기 갱신 강도 (0: 끔, 1: 권장 기본값)
+    negative_ttl: int = 30     # loader_fn 이 None 을 반환했을 때 null 캐시 TTL
+    jitter: float = 0.1        # 소프트 TTL 흔들기 비율 (동시 만료 분산)
+
+
+DEFAULT_POLICY = CachePolicy()
+
+# 같은 키의 백그라운드 갱신은 프로세스당 하나만
+_refreshing: dict[str, asyncio.Task] = {}
+
+
+def pack_entry(value: Any, ttl: float, delta: float = 0.0, as_of: Optional[float] = None) -> dict:
+    """get_or_set 엔트리 형식. ttl 초 뒤 소프트 만료.
+
+    t 는 값이 반영하는 시점 (as_of, 없으면 로드를 시작한 시각). write-through 경로가 더 오래된
+    평가 결과로 새 값을 덮어쓰지 않도록 비교하는 데 쓴다.
+    """
+    now = time.time()
+    return {
+        "v": value,
+        "d": round(delta, 4),
+        "e": round(now + ttl, 3),
+        "t": round(as_of if as_of is not None else now - delta, 3),
+    }
+
+
+def _is_entry(value: Any) -> bool:
+    # 엔트리 형식 이전에 저장된 값은 미스로 취급
+    return isinstance(value, dict) and "v" in value and "e" in value
+
+
+def _should_refresh_early(entry: dict, now: float, beta: float) -> bool:
+    """XFetch: 남은 시간이 로드 소요 × beta × Exp(1) 보다 짧으면 미리 갱신."""
+    delta = entry.get("d") or 0
+    if beta <= 0 or delta <= 0:
+        return False
+    return now - delta * beta * math.log(1.0 - random.random()) >= entry["e"]
+
+
 async def get_or_set(
     key: str,
     ttl: int,
-    loader_fn: Callable,
-    negative_ttl: int = 30,
-    jitter: float = 0.1,
+    loader_fn: Callable[[], Awaitable[Any]],
+    *,
+    name: str = "get_or_set",
+    policy: CachePolicy = DEFAULT_POLICY,
 ) -> Any:
-    """cache-aside with TTL jitter.
+    """cache-aside (L1 → Redis → loader_fn) + single-flight / SWR / XFetch.
 
-    loader_fn이 None을 반환하면 negative_ttl 동안 '__null__' 캐시.
+    loader_fn이 None을 반환하면 policy.negative_ttl 동안 null 캐시.
+    loader_fn 예외(HTTPException 포함)는 그대로 전파되고 캐시하지 않는다.
+    백그라운드 갱신은 요청이 끝난 뒤에도 돌므로 loader_fn 은 요청 DB 세션을 쓰지 말 것.
     Redis 장애 시 loader_fn을 직접 호출하여 graceful fallback.
     """
     cache = await get_redis_cache()
 
-    # 1. 캐시 조회
-    try:
-        raw = await cache.get(key)
-        if raw is not None:
-            return None if raw == "__null__" else json.loads(raw)
-    except Exception as e:
-        logger.warning(f"cache get error [{key}]: {e}")
+    # 1. 캐시 조회 (L1 에 있으면 Redis 왕복/역직렬화 없음)
+    entry = await cache.get_json(key, cache=name)
+    if _is_entry(entry):
+        now = time.time()
+        if now < entry["e"]:
+            if _should_refresh_early(entry, now, policy.beta):
+                _schedule_refresh(cache, key, ttl, loader_fn, name, policy, entry["e"], "early")
+            return entry["v"]
+        if now < entry["e"] + policy.stale_ttl:
+            _schedule_refresh(cache, key, ttl, loader_fn, name, policy, entry["e"], "stale")
+            return entry["v"]
+    else:
+        entry = None
 
-    # 2. 캐시 미스 → DB/외부 호출
-    try:
-        result = await loader_fn()
-    except Exception as e:
-        logger.warning(f"cache loader_fn error [{key}]: {e}")
-        return None
+    # 2. 미스 (또는 stale 구간도 지남) → 키당 한 번만 로드
+    seen = entry["e"] if entry else 0.0
+    entry = await _load(cache, key, ttl, loader_fn, name, policy, seen, "miss")
+    return entry["v"]
 
-    # 3. 캐시 저장 (jitter 적용으로 thundering herd 방지)
-    actual_ttl = int(ttl * (1 + random.uniform(-jitter, jitter)))
-    try:
-        if result is None:
-            await cache.set(key, "__null__", negative_ttl)
+
+async def _load(
+    cache,
+    key: str,
+    ttl: int,
+    loader_fn: Callable[[], Awaitable[Any]],
+    name: str,
+    policy: CachePolicy,
+    seen_expiry: float,
+    reason: str,
+) -> dict:
+    async def compute() -> dict:
+        CACHE_REFRESH_TOTAL.labels(name, reason).inc()
+        started = time.monotonic()
+        value = await loader_fn()
+        delta = time.monotonic() - started
+        if value is None:
+            soft = hard = policy.negative_ttl
         else:
-            await cache.set(key, json.dumps(result, ensure_ascii=False, default=str), actual_ttl)
-    except Exception as e:
-        logger.warning(f"cache set error [{key}]: {e}")
+            # jitter 적용으로 동시 만료(thundering herd) 분산
+            soft = ttl * (1 + random.uniform(-policy.jitter, policy.jitter))
+            hard = soft + policy.stale_ttl
+        entry = pack_entry(value, soft, delta)
+        await cache.set_json(key, entry, max(1, math.ceil(hard)))
+        return entry
+
+    if not policy.lock:
+        return await compute()
+
+    async def read_fresher() -> Optional[dict]:
+        # 다른 워커가 새로 채운 엔트리만 인정 (지금 본 stale 엔트리는 제외)
+        entry = await cache.get_json(key, cache=name)
+        return entry if _is_entry(entry) and entry["e"] > seen_expiry else None
+
+    return await single_flight(name, key, compute, client=cache.client, read_cached=read_fresher)
+
+
+def _schedule_refresh(
+    cache,
+    key: str,
+    ttl: int,
+    loader_fn: Callable[[], Awaitable[Any]],
+    name: str,
+    policy: CachePolicy,
+    seen_expiry: float,
+    reason: str,
+) -> None:
+    flight_key = f"{name}:{key}"
+    if flight_key in _refreshing:
+        return
+
+    async def refresh() -> None:
+        try:
+            await _load(cache, key, ttl, loader_fn, name, policy, seen_expiry, reason)
+        except Exception as e:
+            logger.warning(f"cache background refresh error [{key}]: {e}")
 
-    return result
+    task = asyncio.create_task(refresh())
+    _refreshing[flight_key] = task
+    task.add_done_callback(lambda _: _refreshing.pop(flight_key, None))
 
 
 async def invalidate(key: str) -> bool:
@@ -0,0 +1,69 @@
+"""장 운영시간 기반 시세 캐시 TTL 정책.
+
+가격/일봉 차트/포트폴리오 요약 캐시는 모두 cache_ttl()로 TTL을 정한다.
+- 장중: 종류별 기본 TTL. 등락률을 넘기면 변동성이 클수록 TTL을 줄인다.
+- 장 마감 직후(SETTLE_SECONDS): 종가 확정 전이므로 기본 TTL 유지
+- 장 마감/휴장: 다음 정규장 개장까지 캐시 (종류별 상한 적용).
+  개장 시각에 만료가 몰리지 않도록 0~OPEN_JITTER_SECONDS 만큼 분산한다.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.core.redis_keys import TTL_LONG, TTL_MEDIUM
+from app.services.market_calendar import (
+    KST,
+    is_market_session,
+    next_session_open,
+    session_hours,
+)
+
+TTL_PRICE = "price"                      # stock_price_service 현재가
+TTL_KIS_PRICE = "kis_price"              # KIS 현재가
+TTL_CHART_DAILY = "chart_daily"          # /portfolio/stock/chart 일봉 차트
+TTL_PORTFOLIO_SUMMARY = "portfolio_summary"
+
+# 종류별 (장중 기본 TTL, 장 마감 시 최대 TTL)
+_POLICIES = {
+    TTL_PRICE: (60, 7 * 86400),
+    TTL_KIS_PRICE: (30, 7 * 86400),
+    # 장중에는 당일 봉이 계속 바뀌므로 요약과 같은 5분
+    TTL_CHART_DAILY: (TTL_MEDIUM, 7 * 86400),
+    # 보상 만기 등 시세 외 변경도 있어 장 마감 시에도 1시간까지만
+    TTL_PORTFOLIO_SUMMARY: (TTL_MEDIUM, TTL_LONG),
+}
+
+MIN_SESSION_TTL = 10      # 장중 최소 TTL (초)
+VOLATILITY_SCALE = 2.5    # 등락률 2.5%p마다 TTL을 기본값의 1/(1+n)로 축소
+SETTLE_SECONDS = 1800     # 장 마감 후 종가 확정 대기 (초)
+OPEN_JITTER_SECONDS = 30
+
+
+def _session_ttl(base: int, change_rate: Optional[float]) -> int:
+    if change_rate is None:
+        return base
+    ttl = base / (1 + abs(change_rate) / VOLATILITY_SCALE)
+    return max(MIN_SESSION_TTL, min(base, int(ttl)))
+
+
+def cache_ttl(
+    kind: str,
+    change_rate: Optional[float] = None,
+    now: Optional[datetime] = None,
+) -> int:
+    """캐시 종류와 (선택) 등락률로 TTL(초)을 계산한다."""
+    base, closed_max = _POLICIES[kind]
+    now = now.astimezone(KST) if now else datetime.now(KST)
+
+    if is_market_session(now):
+        return _session_ttl(base, change_rate)
+
+    # 장 마감 직후에는 종가/거래량이 아직 확정되지 않았을 수 있다
+    hours = session_hours(now)
+    if hours is not None and hours[1] <= now < hours[1] + timedelta(seconds=SETTLE_SECONDS):
+        return base
+
+    until_open = int((next_session_open(now) - now).total_seconds())
+    ttl = min(closed_max, until_open + random.randint(0, OPEN_JITTER_SECONDS))
+    return max(1, ttl)
@@ -0,0 +1,218 @@
+"""KIS API 호출 스케줄러 — Redis 토큰 버킷 + 우선순위 레인.
+
+모의투자 API는 초당 2건 제한이 있어 모든 워커가 하나의 토큰 버킷(Redis Lua)을 공유한다.
+요청은 즉시 실패하지 않고 레인별 큐에서 deadline까지 대기한다.
+
+레인 (우선순위 순):
+- order: 주문 체결 가격 조회
+- valuation: 포트폴리오 평가
+- ranking: 랭킹/검색/종목 상세 등 조회성 요청
+
+워커 간 우선순위는 레인별 예약 토큰(reserve)으로 보장한다. 낮은 레인은 버킷에
+토큰이 reserve만큼 더 남아 있을 때만 가져갈 수 있어, 버킷이 빠듯할수록 주문이 먼저 나간다.
+워커 내부에서는 힙으로 레인 → deadline 순서대로 토큰을 배분한다.
+
+사용법:
+    with kis_priority(LANE_ORDER):
+        price = await get_current_price(code)
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from app.core.redis_keys import key_rate_limit
+from app.metrics import (
+    KIS_SCHEDULER_QUEUE_DEPTH,
+    KIS_SCHEDULER_TIMEOUT_TOTAL,
+    KIS_SCHEDULER_WAIT_SECONDS,
+)
+from app.services.redis_cache import get_redis_cache
+
+logger = logging.getLogger(__name__)
+
+LANE_ORDER = "order"
+LANE_VALUATION = "valuation"
+LANE_RANKING = "ranking"
+
+# 레인별 (우선순위, 예약 토큰, 기본 대기 한도 초)
+LANES = {
+    LANE_ORDER: (0, 0.0, 5.0),
+    LANE_VALUATION: (1, 0.5, 3.0),
+    LANE_RANKING: (2, 1.0, 2.0),
+}
+
+KIS_RATE_PER_SEC = 2.0   # 모의투자 초당 2건
+KIS_BURST = 2.0          # 버킷 용량
+
+# 원자적 토큰 버킷: 토큰을 가져가면 0, 부족하면 다음 토큰까지 대기 ms 반환.
+# 워커 간 시계 오차를 피하기 위해 Redis 서버 시각(TIME)을 사용한다.
+TOKEN_BUCKET_LUA = """
+local key = KEYS[1]
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local reserve = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local data = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(data[1]) or capacity
+local ts = tonumber(data[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local need = 1 + reserve
+local wait = 0
+if tokens >= need then
+    tokens = tokens - 1
+else
+    wait = math.ceil((need - tokens) / rate)
+end
+redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', key, math.ceil(capacity / rate) + 1000)
+return wait
+"""
+
+_current_lane: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "kis_lane", default=LANE_VALUATION
+)
+
+
+class KISRateLimitTimeout(Exception):
+    """deadline 안에 KIS 호출 토큰을 얻지 못함."""
+
+
+@contextmanager
+def kis_priority(lane: str):
+    """블록 안에서 발생하는 KIS 호출의 레인을 지정한다."""
+    if lane not in LANES:
+        raise ValueError(f"unknown KIS lane: {lane}")
+    token = _current_lane.set(lane)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+def current_lane() -> str:
+    return _current_lane.get()
+
+
+class _LocalBucket:
+    """Redis 장애 시 사용하는 프로세스 로컬 토큰 버킷 (같은 규칙)."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.ts = time.monotonic()
+
+    def take(self, reserve: float) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.ts) * self.rate)
+        self.ts = now
+        need = 1 + reserve
+        if self.tokens >= need:
+            self.tokens -= 1
+            return 0.0
+        return (need - self.tokens) / self.rate
+
+
+class KISRequestScheduler:
+    """워커 내부 우선순위 큐 + 전 워커 공유 토큰 버킷."""
+
+    def __init__(self, rate_per_sec: float = KIS_RATE_PER_SEC, burst: float = KIS_BURST):
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self._local = _LocalBucket(rate_per_sec, burst)
+        self._heap: list[tuple[int, float, int, str, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    async def acquire(self, lane: Optional[str] = None, timeout: Optional[float] = None) -> None:
+        """토큰을 얻을 때까지 대기한다.
+
+        Raises:
+            KISRateLimitTimeout: deadline 초과
+        """
+        lane = lane or current_lane()
+        priority, _, default_timeout = LANES[lane]
+        deadline = time.monotonic() + (timeout if timeout is not None else default_timeout)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (priority, deadline, next(self._seq), lane, future))
+        KIS_SCHEDULER_QUEUE_DEPTH.labels(lane).inc()
+        self._ensure_dispatcher()
+        self._wakeup.set()
+
+        started = time.monotonic()
+        try:
+            await future
+        finally:
+            KIS_SCHEDULER_QUEUE_DEPTH.labels(lane).dec()
+            KIS_SCHEDULER_WAIT_SECONDS.labels(lane).observe(time.monotonic() - started)
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        while self._heap:
+            _, deadline, _, lane, future = self._heap[0]
+            if future.done():
+                # 호출자가 취소됨
+                heapq.heappop(self._heap)
+                continue
+
+            now = time.monotonic()
+            if now >= deadline:
+                heapq.heappop(self._heap)
+                KIS_SCHEDULER_TIMEOUT_TOTAL.labels(lane).inc()
+                future.set_exception(KISRateLimitTimeout(f"KIS rate limit wait exceeded ({lane})"))
+                continue
+
+            # 예약 토큰은 버킷 용량을 넘을 수 없다 (넘으면 영원히 대기)
+            reserve = min(LANES[lane][1], max(0.0, self.burst - 1))
+            wait = await self._take(reserve)
+            if wait <= 0:
+                heapq.heappop(self._heap)
+                if not future.done():
+                    future.set_result(None)
+                continue
+
+            # 다음 토큰까지 대기. 더 높은 우선순위 요청이 들어오면 즉시 재평가한다.
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=min(wait, deadline - now))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _take(self, reserve: float) -> float:
+        """공유 버킷에서 토큰 1개를 가져온다. 반환값: 대기 필요 초 (0이면 성공)."""
+        try:
+            cache = await get_redis_cache()
+            if cache.client:
+                wait_ms = await cache.client.eval(
+                    TOKEN_BUCKET_LUA, 1, key_rate_limit("kis", "bucket"),
+                    self.rate_per_sec / 1000.0, self.burst, reserve,
+                )
+                return int(wait_ms) / 1000.0
+        except Exception as e:
+            logger.debug("KIS token bucket Redis error (local fallback): %s", e)
+        return self._local.take(reserve)
+
+
+_scheduler: Optional[KISRequestScheduler] = None
+
+
+def get_kis_scheduler() -> KISRequestScheduler:
+    """KIS 스케줄러 싱글톤 반환."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = KISRequestScheduler()
+    return _scheduler
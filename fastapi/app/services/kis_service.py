@@ -1,7 +1,7 @@
 """한국투자증권(KIS) API 서비스.
 
 모의투자 전용 - 실시간 시세, 종목 검색, 차트 데이터 제공.
-Rate limit: 초당 2건 (모의투자) -> Redis 캐싱 + 백그라운드 갱신으로 대응.
+Rate limit: 초당 2건 (모의투자) -> Redis 캐싱 + 전 워커 공유 토큰 버킷(kis_scheduler)으로 대응.
 """
 
 import asyncio
@@ -14,18 +14,25 @@ from typing import Any, Optional
 
 import httpx
 
+from app.services.cache_ttl import TTL_KIS_PRICE, cache_ttl
+from app.services.kis_scheduler import get_kis_scheduler
+from app.services.market_rankings import (
+    RANK_GAINERS,
+    RANK_LOSERS,
+    RANK_VOLUME,
+    load_market_rankings,
+)
 from app.services.redis_cache import get_redis_cache
+from app.services.single_flight import single_flight
+from app.services.stock_search_index import search_stock_index
 from app.metrics import EXTERNAL_API_REQUEST_TOTAL, EXTERNAL_API_LATENCY_SECONDS
 
 logger = logging.getLogger(__name__)
 
-# 캐시 TTL 전략
+RANKING_TOP_N = 10
+
+# 캐시 TTL 전략 (시세 캐시는 장 운영시간 기반 cache_ttl 정책 사용)
 CACHE_TTL = {
-    "price": 30,         # 개별 종목 현재가: 30초
-    "search": 300,       # 종목 검색 결과: 5분
-    "chart_intra": 60,   # 분봉 차트: 1분
-    "chart_daily": 3600, # 일봉 차트: 1시간
-    "ranking": 60,       # 랭킹: 1분
     "token": 86000,      # OAuth 토큰: ~24시간
 }
 
@@ -104,8 +111,13 @@ class KISService:
 
             return self._token
 
-    async def _request(self, method: str, path: str, **kwargs) -> dict:
-        """API 요청 헬퍼."""
+    async def _request(self, method: str, path: str, lane: Optional[str] = None, **kwargs) -> dict:
+        """API 요청 헬퍼.
+
+        호출 전 공유 토큰 버킷에서 토큰을 받는다. lane을 생략하면 호출 컨텍스트의
+        레인(kis_priority)을 따른다. deadline 초과 시 KISRateLimitTimeout.
+        """
+        await get_kis_scheduler().acquire(lane)
         token = await self.get_token()
         headers = {
             "authorization": f"Bearer {token}",
@@ -131,12 +143,37 @@ class KISService:
             EXTERNAL_API_REQUEST_TOTAL.labels("kis", "fail").inc()
             raise
 
-    async def get_current_price(self, stock_code: str) -> Optional[dict]:
-        """실시간 현재가 조회 (캐싱 적용)."""
+    async def get_current_price(self, stock_code: str, fresh: bool = False) -> Optional[dict]:
+        """실시간 현재가 조회 (캐싱 + 동시 요청 병합 적용).
+
+        fresh=True 면 kis:price 캐시를 읽지 않고 바로 조회해 캐시를 덮어쓴다
+        (price_refresher 선갱신용 — 호출부가 이미 종목별 single-flight 로 묶는다).
+        """
         cache = await get_redis_cache()
         cache_key = f"kis:price:{stock_code}"
 
-        # 캐시 확인
+        if not fresh:
+            cached = await self._read_cached_price(cache, cache_key)
+            if cached is not None:
+                return cached
+
+        # API 키가 없으면 KIS 호출 불가
+        if not self.is_configured:
+            return None
+
+        if fresh:
+            return await self._fetch_current_price(cache, cache_key, stock_code)
+
+        return await single_flight(
+            "kis_price",
+            stock_code,
+            lambda: self._fetch_current_price(cache, cache_key, stock_code),
+            client=cache.client,
+            read_cached=lambda: self._read_cached_price(cache, cache_key),
+        )
+
+    @staticmethod
+    async def _read_cached_price(cache, cache_key: str) -> Optional[dict]:
         if cache.client:
             try:
                 cached = await cache.client.get(cache_key)
@@ -144,13 +181,11 @@ class KISService:
                     return json.loads(cached)
             except Exception:
                 pass
+        return None
 
+    async def _fetch_current_price(self, cache, cache_key: str, stock_code: str) -> Optional[dict]:
+        """KIS 현재가 API 호출 후 캐시에 기록."""
         try:
-            # API 키가 없으면 KIS 호출 불가
-            if not self.is_configured:
-                return None
-
-            # KIS 현재가 API 호출
             data = await self._request(
                 "GET",
                 "/uapi/domestic-stock/v1/quotations/inquire-price",
@@ -175,7 +210,9 @@ class KISService:
 
             # 캐시 저장
             if cache.client:
-                await cache.client.setex(cache_key, CACHE_TTL["price"], json.dumps(result))
+                await cache.client.setex(
+                    cache_key, cache_ttl(TTL_KIS_PRICE, result["change_rate"]), json.dumps(result)
+                )
 
             return result
         except Exception as e:
@@ -183,91 +220,25 @@ class KISService:
             return None
 
     async def search_stocks(self, query: str) -> list[dict]:
-        """종목 검색 (캐싱 적용)."""
-        cache = await get_redis_cache()
-        cache_key = f"kis:search:{query}"
-
-        if cache.client:
-            try:
-                cached = await cache.client.get(cache_key)
-                if cached:
-                    return json.loads(cached)
-            except Exception:
-                pass
-
-        # KIS API 종목 검색이 제한적이므로 pykrx ticker list 기반 로컬 검색
+        """종목 검색 (stock_listings 인메모리 인덱스: 코드 접두사/종목명/초성)."""
         try:
-            from pykrx import stock
-            tickers = stock.get_market_ticker_list(datetime.now().strftime("%Y%m%d"))
-            results = []
-            for ticker in tickers:
-                name = stock.get_market_ticker_name(ticker)
-                if query.lower() in name.lower() or query in ticker:
-                    results.append({
-                        "stock_code": ticker,
-                        "stock_name": name,
-                        "market": "KOSPI" if len(ticker) == 6 and ticker[0] in "012345" else "KOSDAQ",
-                    })
-                    if len(results) >= 20:
-                        break
-
-            if cache.client and results:
-                await cache.client.setex(cache_key, CACHE_TTL["search"], json.dumps(results))
-
-            return results
+            return await search_stock_index(query)
         except Exception as e:
             logger.error(f"종목 검색 실패 ({query}): {e}")
             return []
 
     async def get_ranking(self, rank_type: str = "volume") -> list[dict]:
-        """종목 랭킹 (거래량/등락률, 캐싱 적용)."""
-        cache = await get_redis_cache()
-        cache_key = f"kis:ranking:{rank_type}"
-
-        if cache.client:
-            try:
-                cached = await cache.client.get(cache_key)
-                if cached:
-                    return json.loads(cached)
-            except Exception:
-                pass
-
+        """종목 랭킹 (거래량/상승/하락). 전종목 스냅샷에서 사전 계산된 목록을 반환한다."""
         try:
-            from pykrx import stock
-            today = datetime.now().strftime("%Y%m%d")
-
-            if rank_type == "volume":
-                df = stock.get_market_ohlcv_by_ticker(today)
-                if df.empty:
-                    df = stock.get_market_ohlcv_by_ticker((datetime.now() - timedelta(days=1)).strftime("%Y%m%d"))
-                df = df.sort_values("거래량", ascending=False).head(10)
-            else:  # gainers or losers
-                df = stock.get_market_ohlcv_by_ticker(today)
-                if df.empty:
-                    df = stock.get_market_ohlcv_by_ticker((datetime.now() - timedelta(days=1)).strftime("%Y%m%d"))
-                if rank_type == "gainers":
-                    df = df.sort_values("등락률", ascending=False).head(10)
-                else:
-                    df = df.sort_values("등락률", ascending=True).head(10)
-
-            results = []
-            for ticker, row in df.iterrows():
-                name = stock.get_market_ticker_name(ticker)
-                results.append({
-                    "stock_code": ticker,
-                    "stock_name": name,
-                    "current_price": int(row.get("종가", 0)),
-                    "change_rate": round(float(row.get("등락률", 0)), 2),
-                    "volume": int(row.get("거래량", 0)),
-                })
-
-            if cache.client and results:
-                await cache.client.setex(cache_key, CACHE_TTL["ranking"], json.dumps(results))
-
-            return results
+            rankings = await load_market_rankings()
         except Exception as e:
             logger.error(f"랭킹 조회 실패 ({rank_type}): {e}")
             return []
+        if rankings is None:
+            return []
+        if rank_type not in (RANK_VOLUME, RANK_GAINERS):
+            rank_type = RANK_LOSERS
+        return rankings.top(rank_type, RANKING_TOP_N)
 
 
 # 싱글톤
@@ -0,0 +1,46 @@
+"""프로세스 로컬(L1) LRU 캐시 — Redis(L2) 앞단.
+
+역직렬화된 객체를 그대로 보관한다 (반환 객체를 수정하지 말 것).
+이벤트 루프 단일 스레드에서만 쓰므로 잠금이 없다. 워커 간 무효화는
+RedisCacheService 의 pub/sub 리스너가 맡는다.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class L1Cache:
+    """항목 수 제한 LRU + 항목별 만료."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
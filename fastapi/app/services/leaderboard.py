@@ -0,0 +1,295 @@
+"""수익률 리더보드 (Redis ZSET).
+
+- key_leaderboard(): ZSET user_id → 보상 제외 수익률(%)
+- key_leaderboard_meta(): HASH user_id → {"username", "total_value", "profit_loss", "t"} JSON
+  (t: 평가 시각 — 요약 캐시 엔트리의 t 와 같은 순서 규칙)
+
+갱신:
+- 매매 직후 portfolio_summary.write_through_trades() 가 체결 후 상태로 평가한 결과를
+  update_leaderboard_entries() 로 반영 (ZADD + HSET, 요약 캐시와 같은 평가 결과)
+- 보상 지급 직후 credit_leaderboard_entries() 로 메타의 총평가액만 올린다 (수익률/순위 불변)
+- 시세 스냅샷 갱신 잡에서 refresh_leaderboard() 로 전체 재계산. 임시 키에 쓴 뒤
+  RENAME 으로 통째로 교체하며, 워커 중 락을 잡은 한 곳만 수행한다.
+  장 마감 후 NAV 잡은 자신의 일괄 평가 결과로 바로 교체한다.
+- 모든 쓰기는 평가 시각을 비교해 더 새 항목을 덮어쓰지 않는다. 전체 재계산 중에 매매/보상이
+  쓴 항목은 교체 직전에 임시 키로 옮겨 살린다.
+- 평가는 portfolio_valuation 의 일괄(numpy) 평가를 그대로 쓴다.
+
+조회는 ZREVRANGE(페이지) + ZREVRANK(내 순위) + ZCARD(전체)로 사용자 수와 무관하게
+O(log n + 페이지 크기)다. Redis가 없으면 요청 경로에서 전체를 계산한다 (기존 방식).
+동률은 Redis 멤버 순서를 따른다.
+"""
+
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal
+from app.core.redis_keys import key_leaderboard, key_leaderboard_meta, key_single_flight_lock
+from app.services.portfolio_valuation import value_portfolios
+from app.services.redis_cache import get_redis_cache
+from app.services.single_flight import single_flight
+
+logger = logging.getLogger(__name__)
+
+REBUILD_LOCK_MS = 60_000  # 전체 재계산 락 (스냅샷 갱신 주기보다 짧게)
+
+# 메타 JSON 의 평가 시각 (없거나 깨졌으면 0 — 어떤 평가로도 덮어쓸 수 있음)
+_META_T_LUA = """
+local function meta_t(raw)
+    if not raw then return 0 end
+    local ok, meta = pcall(cjson.decode, raw)
+    if ok and type(meta) == 'table' then return tonumber(meta['t']) or 0 end
+    return 0
+end
+"""
+
+# KEYS: ZSET, 메타 HASH. ARGV[1]: 평가 시각, 이후 (user_id, 수익률, 메타 JSON) 세 개씩.
+# 기존 항목이 더 새 평가면 건너뛴다. 쓴 수 반환
+_UPDATE_IF_NEWER_LUA = _META_T_LUA + """
+local written = 0
+for i = 2, #ARGV, 3 do
+    if meta_t(redis.call('HGET', KEYS[2], ARGV[i])) <= tonumber(ARGV[1]) then
+        redis.call('ZADD', KEYS[1], ARGV[i + 1], ARGV[i])
+        redis.call('HSET', KEYS[2], ARGV[i], ARGV[i + 2])
+        written = written + 1
+    end
+end
+return written
+"""
+
+# KEYS: ZSET, 메타 HASH, 임시 ZSET, 임시 HASH. ARGV[1]: 전체 평가 시각.
+# 평가 이후 쓰인 항목(매매/보상)을 임시 키로 옮긴 뒤 RENAME 으로 교체한다. 옮긴 수 반환
+_SWAP_LUA = _META_T_LUA + """
+local kept = 0
+local live = redis.call('HGETALL', KEYS[2])
+for i = 1, #live, 2 do
+    if meta_t(live[i + 1]) > tonumber(ARGV[1]) then
+        local score = redis.call('ZSCORE', KEYS[1], live[i])
+        if score then
+            redis.call('ZADD', KEYS[3], score, live[i])
+            redis.call('HSET', KEYS[4], live[i], live[i + 1])
+            kept = kept + 1
+        end
+    end
+end
+if redis.call('EXISTS', KEYS[3]) == 1 then
+    redis.call('RENAME', KEYS[3], KEYS[1])
+    redis.call('RENAME', KEYS[4], KEYS[2])
+else
+    redis.call('DEL', KEYS[1], KEYS[2])
+end
+return kept
+"""
+
+# KEYS[1]: 메타 HASH, ARGV[1]: 지급 시각, 이후 (user_id, 지급액) 쌍. 있는 항목의 total_value 에만 더하고
+# t 를 지급 시각으로 올려 지급 전에 시작한 전체 재계산이 덮어쓰지 않게 한다
+_CREDIT_META_LUA = """
+for i = 2, #ARGV, 2 do
+    local raw = redis.call('HGET', KEYS[1], ARGV[i])
+    if raw then
+        local ok, meta = pcall(cjson.decode, raw)
+        if ok and type(meta) == 'table' then
+            meta['total_value'] = (tonumber(meta['total_value']) or 0) + tonumber(ARGV[i + 1])
+            meta['t'] = math.max(tonumber(meta['t']) or 0, tonumber(ARGV[1]))
+            redis.call('HSET', KEYS[1], ARGV[i], cjson.encode(meta))
+        end
+    end
+end
+return 1
+"""
+
+
+@dataclass
+class LeaderboardPage:
+    """리더보드 한 페이지 (순위는 1부터)."""
+
+    total: int
+    rows: list[dict] = field(default_factory=list)
+    me: Optional[dict] = None
+
+
+async def compute_entries(db: AsyncSession, user_ids: Optional[Iterable[int]] = None) -> list[dict]:
+    """포트폴리오 평가액/수익률 계산. user_ids가 없으면 전체 사용자 (user_id 순)."""
+    return (await value_portfolios(db, user_ids)).entries()
+
+
+def _meta(entry: dict, valued_at: float) -> str:
+    return json.dumps({
+        "username": entry["username"],
+        "total_value": entry["total_value"],
+        "profit_loss": entry["profit_loss"],
+        "t": valued_at,
+    })
+
+
+def _row(rank: int, user_id, score: float, meta_raw: Optional[str]) -> dict:
+    meta = json.loads(meta_raw) if meta_raw else {}
+    return {
+        "rank": rank,
+        "user_id": int(user_id),
+        "username": meta.get("username", ""),
+        "total_value": meta.get("total_value", 0.0),
+        "profit_loss": meta.get("profit_loss", 0.0),
+        "profit_loss_pct": float(score),
+    }
+
+
+# --- 갱신 ---
+
+
+async def rebuild_leaderboard(
+    db: AsyncSession, entries: Optional[list[dict]] = None, valued_at: Optional[float] = None
+) -> int:
+    """전체 재계산 후 ZSET/HASH를 원자적으로 교체한다. 반영한 사용자 수 반환.
+
+    entries를 넘기면(NAV 잡의 평가 결과) 다시 계산하지 않고 그대로 쓴다 (valued_at 은 그 평가 시각).
+    평가 이후 매매/보상이 쓴 항목은 교체하면서 그대로 남긴다.
+    """
+    cache = await get_redis_cache()
+    client = cache.client
+    if client is None:
+        return 0
+    if valued_at is None:
+        valued_at = time.time()
+    if entries is None:
+        entries = await compute_entries(db)
+    board, meta = key_leaderboard(), key_leaderboard_meta()
+    tmp_board, tmp_meta = f"{board}:tmp", f"{meta}:tmp"
+
+    pipe = client.pipeline(transaction=True)
+    pipe.delete(tmp_board, tmp_meta)
+    if entries:
+        pipe.zadd(tmp_board, {str(e["user_id"]): e["profit_loss_pct"] for e in entries})
+        pipe.hset(tmp_meta, mapping={str(e["user_id"]): _meta(e, valued_at) for e in entries})
+    pipe.eval(_SWAP_LUA, 4, board, meta, tmp_board, tmp_meta, valued_at)
+    await pipe.execute()
+    return len(entries)
+
+
+async def update_leaderboard_entries(entries: list[dict], valued_at: float) -> None:
+    """이미 계산한 평가 결과로 해당 사용자들만 갱신한다 (실패해도 다음 전체 재계산에서 반영).
+
+    더 새 평가로 쓰인 항목은 건너뛴다.
+    """
+    if not entries:
+        return
+    try:
+        cache = await get_redis_cache()
+        client = cache.client
+        if client is None:
+            return
+        args = [
+            x for e in entries
+            for x in (str(e["user_id"]), e["profit_loss_pct"], _meta(e, valued_at))
+        ]
+        await client.eval(_UPDATE_IF_NEWER_LUA, 2, key_leaderboard(), key_leaderboard_meta(), valued_at, *args)
+    except Exception as e:
+        logger.debug("leaderboard update error: %s", e)
+
+
+async def credit_leaderboard_entries(amounts: dict[int, int]) -> None:
+    """보상 지급액(user_id → 원)을 메타 총평가액에 더한다. 보상은 수익률에서 빠지므로 점수는 그대로."""
+    if not amounts:
+        return
+    try:
+        cache = await get_redis_cache()
+        if cache.client is None:
+            return
+        args = [x for user_id, amount in amounts.items() for x in (str(user_id), amount)]
+        await cache.client.eval(_CREDIT_META_LUA, 1, key_leaderboard_meta(), time.time(), *args)
+    except Exception as e:
+        logger.debug("leaderboard credit error: %s", e)
+
+
+async def refresh_leaderboard() -> Optional[int]:
+    """시세 스냅샷 갱신 후 전체 재계산 (워커 중 락을 잡은 한 곳만). 수행 안 했으면 None.
+
+    같은 평가 결과로 전 사용자의 포트폴리오 요약 캐시도 함께 다시 쓴다.
+    """
+    cache = await get_redis_cache()
+    client = cache.client
+    if client is None:
+        return None
+    try:
+        acquired = await client.set(
+            key_single_flight_lock("leaderboard", "rebuild"), "1", nx=True, px=REBUILD_LOCK_MS
+        )
+    except Exception as e:
+        logger.debug("leaderboard rebuild lock error: %s", e)
+        return None
+    if not acquired:
+        return None
+    async with AsyncSessionLocal() as session:
+        valuation = await value_portfolios(session)
+        rebuilt = await rebuild_leaderboard(session, entries=valuation.entries(), valued_at=valuation.valued_at)
+
+    # portfolio_summary 가 이 모듈(update_leaderboard_entries)을 import 하므로 순환을 피해 지연 import
+    from app.services.portfolio_summary import write_summaries
+    await write_summaries(valuation)
+    return rebuilt
+
+
+# --- 조회 ---
+
+
+async def _read_page(client, offset: int, limit: int, user_id: int) -> LeaderboardPage:
+    board, meta = key_leaderboard(), key_leaderboard_meta()
+    pipe = client.pipeline(transaction=False)
+    pipe.zcard(board)
+    pipe.zrevrange(board, offset, offset + limit - 1, withscores=True)
+    pipe.zrevrank(board, str(user_id))
+    pipe.zscore(board, str(user_id))
+    total, members, my_rank, my_score = await pipe.execute()
+
+    ids = [m for m, _ in members]
+    if my_rank is not None:
+        ids.append(str(user_id))
+    metas = await client.hmget(meta, ids) if ids else []
+
+    rows = [
+        _row(offset + i + 1, m, score, metas[i])
+        for i, (m, score) in enumerate(members)
+    ]
+    me = _row(my_rank + 1, user_id, my_score, metas[-1]) if my_rank is not None else None
+    return LeaderboardPage(total=int(total), rows=rows, me=me)
+
+
+def _slice_entries(entries: list[dict], offset: int, limit: int, user_id: int) -> LeaderboardPage:
+    ranked = sorted(entries, key=lambda e: e["profit_loss_pct"], reverse=True)
+    me = None
+    for i, e in enumerate(ranked):
+        if e["user_id"] == user_id:
+            me = {"rank": i + 1, **e}
+            break
+    rows = [{"rank": offset + i + 1, **e} for i, e in enumerate(ranked[offset:offset + limit])]
+    return LeaderboardPage(total=len(ranked), rows=rows, me=me)
+
+
+async def load_leaderboard_page(
+    db: AsyncSession, offset: int, limit: int, user_id: int = 0
+) -> LeaderboardPage:
+    """리더보드 페이지 조회. ZSET이 비어 있으면(콜드 스타트) 한 번 재계산한다."""
+    cache = await get_redis_cache()
+    client = cache.client
+    if client is not None:
+        try:
+            page = await _read_page(client, offset, limit, user_id)
+            if page.total:
+                return page
+
+            async def _rebuild() -> int:
+                return await rebuild_leaderboard(db)
+
+            async def _built() -> Optional[int]:
+                return await client.zcard(key_leaderboard()) or None
+
+            await single_flight("leaderboard", "rebuild", _rebuild, client=client, read_cached=_built)
+            return await _read_page(client, offset, limit, user_id)
+        except Exception as e:
+            logger.warning("리더보드 Redis 조회 실패 (직접 계산): %s", e)
+    return _slice_entries(await compute_entries(db), offset, limit, user_id)
@@ -1,43 +1,27 @@
 """한국 주식시장 영업일 판별 유틸.
 
-pykrx 대신 평일 체크 + KRX 공식 휴장일 목록 기반.
-매년 초 KRX_HOLIDAYS 세트를 갱신해야 한다.
-"""
+pykrx 대신 KRX 휴장일 목록 기반. 다년도 휴장일과 사전 계산 색인은
+shared/trading_calendar.py 에 있고 (datapipeline 과 공유), 여기서는 API 서버용
+인터페이스(장중 여부, 다음 개장 시각)를 제공한다.
 
-import logging
-from datetime import datetime, timezone, timedelta
+shared 패키지는 PYTHONPATH 로 잡는다 (Docker: /app, 로컬: 저장소 루트 — make dev-api-local).
+"""
 
-KST = timezone(timedelta(hours=9))
-logger = logging.getLogger(__name__)
+from datetime import datetime
 
-# 2026년 KRX 휴장일 (평일만 포함, 주말은 이미 제외)
-# 출처: https://www.calendarlabs.com/krx-market-holidays-2026/
-KRX_HOLIDAYS = {
-    # 신정
-    "20260101",
-    # 설날 연휴
-    "20260216", "20260217", "20260218",
-    # 삼일절 대체공휴일 (3/1 일요일 → 3/2 월요일)
-    "20260302",
-    # 근로자의 날
-    "20260501",
-    # 어린이날
-    "20260505",
-    # 부처님오신날 대체공휴일 (5/24 일요일 → 5/25 월요일)
-    "20260525",
-    # 광복절 대체공휴일 (8/15 토요일 → 8/17 월요일)
-    "20260817",
-    # 추석 연휴
-    "20260924", "20260925",
-    # 개천절 대체공휴일 (10/3 토요일 → 10/5 월요일)
-    "20261005",
-    # 한글날
-    "20261009",
-    # 성탄절
-    "20261225",
-    # 연말 휴장
-    "20261231",
-}
+from shared.trading_calendar import (  # noqa: F401  (기존 import 경로 호환)
+    KRX_HOLIDAYS,
+    KST,
+    SESSION_CLOSE,
+    SESSION_OPEN,
+    is_trading_day as _is_trading_day,
+    latest_trading_day,
+    next_trading_day,
+    prev_trading_day,
+    recent_trading_days,
+    session_hours,
+    trading_days_between,
+)
 
 
 def is_trading_day(date_str: str | None = None) -> bool:
@@ -49,23 +33,27 @@ def is_trading_day(date_str: str | None = None) -> bool:
     Returns:
         평일이고 KRX 휴장일이 아니면 True.
     """
-    if date_str is None:
-        date_str = datetime.now(KST).strftime("%Y%m%d")
+    return _is_trading_day(date_str)
 
-    d = datetime.strptime(date_str, "%Y%m%d").date()
 
-    # 주말 체크
-    if d.weekday() >= 5:
-        return False
+async def is_kr_market_open_today() -> bool:
+    """오늘이 한국 주식시장 영업일인지 확인한다 (기존 인터페이스 호환)."""
+    return is_trading_day()
 
-    # KRX 휴장일 체크
-    if date_str in KRX_HOLIDAYS:
-        logger.info("KRX 휴장일: %s", date_str)
-        return False
 
-    return True
+def is_market_session(now: datetime | None = None) -> bool:
+    """지금이 KRX 정규장 시간(영업일 09:00~15:30 KST, 특별 개장일 반영)인지 확인한다."""
+    now = now.astimezone(KST) if now else datetime.now(KST)
+    hours = session_hours(now)
+    if hours is None:
+        return False
+    return hours[0] <= now < hours[1]
 
 
-async def is_kr_market_open_today() -> bool:
-    """오늘이 한국 주식시장 영업일인지 확인한다 (기존 인터페이스 호환)."""
-    return is_trading_day()
+def next_session_open(now: datetime | None = None) -> datetime:
+    """다음 정규장 개장 시각(KST). 지금이 개장 이후면 다음 영업일 개장 시각."""
+    now = now.astimezone(KST) if now else datetime.now(KST)
+    hours = session_hours(now)
+    if hours is not None and now < hours[0]:
+        return hours[0]
+    return session_hours(next_trading_day(now))[0]
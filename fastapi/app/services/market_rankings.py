@@ -0,0 +1,131 @@
+"""시장 랭킹 사전 계산 (거래량/상승/하락/거래량 상위).
+
+전종목 시세 스냅샷(market_snapshot) 한 벌에서 랭킹 목록을 한 번에 계산해 종목명까지
+붙인 상태로 보관한다. /trading/ranking 과 /briefing/today 라이브 폴백은 이 결과만 읽으므로
+요청 경로에서 pykrx 를 호출하지 않는다 (콜드 스타트로 스냅샷이 아직 없을 때만 예외).
+
+랭킹은 스냅샷이 교체될 때 다음 조회 시점에 다시 계산된다 (numpy 정렬, 수 ms).
+지수 요약(KOSPI/KOSDAQ)은 스냅샷 갱신 잡에서 함께 받아 둔다.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+import numpy as np
+
+from app.services.market_snapshot import (
+    MarketSnapshot,
+    ensure_fresh_snapshot,
+    get_market_snapshot,
+    refresh_market_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+RANKING_SIZE = 20  # 목록별 보관 개수
+
+RANK_VOLUME = "volume"
+RANK_GAINERS = "gainers"
+RANK_LOSERS = "losers"
+RANK_HIGH_VOLUME = "high_volume"
+RANK_TYPES = (RANK_VOLUME, RANK_GAINERS, RANK_LOSERS, RANK_HIGH_VOLUME)
+
+MARKET_SUMMARY_TIMEOUT = 15.0
+
+
+class MarketRankings:
+    """스냅샷 하나에서 계산한 랭킹 목록 (불변)."""
+
+    __slots__ = ("trade_date", "lists", "snapshot")
+
+    def __init__(self, snapshot: MarketSnapshot, lists: dict[str, list[dict]]):
+        self.snapshot = snapshot
+        self.trade_date = snapshot.trade_date
+        self.lists = lists
+
+    def top(self, rank_type: str, n: int = 10) -> list[dict]:
+        return self.lists.get(rank_type, [])[:n]
+
+
+def _items(snapshot: MarketSnapshot, rows: np.ndarray) -> list[dict]:
+    return [
+        {
+            "stock_code": snapshot.codes[i],
+            "stock_name": snapshot.names[i] or snapshot.codes[i],
+            "current_price": int(snapshot.close[i]),
+            "change_rate": round(float(snapshot.change_rate[i]), 2),
+            "volume": int(snapshot.volume[i]),
+        }
+        for i in rows
+    ]
+
+
+def compute_rankings(snapshot: MarketSnapshot, size: int = RANKING_SIZE) -> MarketRankings:
+    """스냅샷 컬럼을 정렬해 랭킹 목록을 만든다. 거래량 0(거래정지 등) 종목은 제외."""
+    active = np.flatnonzero(snapshot.volume > 0)
+    by_volume = active[np.argsort(-snapshot.volume[active], kind="stable")][:size]
+    by_rate = active[np.argsort(-snapshot.change_rate[active], kind="stable")]
+
+    volume = _items(snapshot, by_volume)
+    lists = {
+        RANK_VOLUME: volume,
+        RANK_GAINERS: _items(snapshot, by_rate[:size]),
+        RANK_LOSERS: _items(snapshot, by_rate[::-1][:size]),
+        # 브리핑의 high_volume 은 거래량 순위와 같은 목록을 쓴다
+        RANK_HIGH_VOLUME: volume,
+    }
+    return MarketRankings(snapshot, lists)
+
+
+_rankings: Optional[MarketRankings] = None
+_market_summary: dict[str, dict] = {}  # trade_date → {"kospi": ..., "kosdaq": ...}
+
+
+def get_market_rankings() -> Optional[MarketRankings]:
+    """현재 스냅샷 기준 랭킹 (I/O 없음). 스냅샷이 바뀌었으면 다시 계산한다."""
+    global _rankings
+    snapshot = get_market_snapshot()
+    if snapshot is None:
+        return None
+    ensure_fresh_snapshot()
+    rankings = _rankings
+    if rankings is None or rankings.snapshot is not snapshot:
+        rankings = compute_rankings(snapshot)
+        _rankings = rankings
+    return rankings
+
+
+async def load_market_rankings() -> Optional[MarketRankings]:
+    """랭킹 반환. 스냅샷이 아직 없으면(콜드 스타트) 한 번 로드한다."""
+    rankings = get_market_rankings()
+    if rankings is None:
+        await refresh_market_snapshot()
+        rankings = get_market_rankings()
+    return rankings
+
+
+def get_market_summary(trade_date: str) -> Optional[dict]:
+    """스냅샷 갱신 잡이 받아 둔 지수 요약. 없으면 None."""
+    return _market_summary.get(trade_date)
+
+
+async def refresh_market_summary() -> Optional[dict]:
+    """현재 스냅샷 거래일의 KOSPI/KOSDAQ 지수 요약을 받아 둔다 (스케줄러 잡에서 호출)."""
+    snapshot = get_market_snapshot()
+    if snapshot is None:
+        return None
+    try:
+        from datapipeline.collectors.stock_collector import get_market_summary as collect_market_summary
+
+        summary = await asyncio.wait_for(
+            asyncio.to_thread(collect_market_summary, snapshot.trade_date),
+            timeout=MARKET_SUMMARY_TIMEOUT,
+        )
+    except Exception as e:
+        logger.warning("지수 요약 조회 실패 (%s): %s", snapshot.trade_date, e)
+        return _market_summary.get(snapshot.trade_date)
+    # 최근 거래일 것만 유지
+    _market_summary.clear()
+    _market_summary[snapshot.trade_date] = summary
+    return summary
@@ -0,0 +1,249 @@
+"""KRX 전종목 시세 스냅샷 엔진.
+
+pykrx `get_market_ohlcv_by_ticker(market="ALL")` 한 번으로 전 종목 시세를 받아
+종목코드 인덱스가 붙은 컬럼형(numpy) 테이블로 프로세스 메모리에 보관한다.
+get_batch_prices 같은 대량 조회는 종목별 upstream 호출 대신 이 테이블을 읽고,
+스냅샷은 스케줄러가 주기적으로 통째로 교체한다.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Iterable, Optional
+
+import numpy as np
+
+from app.metrics import CACHE_HIT_TOTAL, MARKET_SNAPSHOT_REFRESH_TOTAL
+from app.services.market_calendar import recent_trading_days
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_REFRESH_SECONDS = 300  # 스케줄러 갱신 주기 (5분)
+SNAPSHOT_MAX_AGE = 900          # 이보다 오래되면 요청 경로에서 백그라운드 갱신 트리거
+SNAPSHOT_LOAD_TIMEOUT = 30.0    # 전종목 로드 타임아웃 (초)
+SNAPSHOT_LOOKBACK_DAYS = 2      # 최근 거래일 탐색 범위 (개장 전 당일 보드는 비어 있음)
+
+# pykrx 버전에 따라 영문/한글 컬럼명이 섞여 나온다
+_COLUMN_MAP = {
+    "Open": "시가", "High": "고가", "Low": "저가",
+    "Close": "종가", "Volume": "거래량", "Change": "등락률",
+}
+
+
+class MarketSnapshot:
+    """전종목 시세 컬럼형 테이블 (불변, 교체 방식으로만 갱신)."""
+
+    __slots__ = (
+        "trade_date", "loaded_at", "codes", "names", "_index",
+        "open", "high", "low", "close", "volume", "change_rate",
+    )
+
+    def __init__(
+        self,
+        trade_date: str,
+        codes: list[str],
+        names: list[str],
+        open_: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        change_rate: np.ndarray,
+    ):
+        self.trade_date = trade_date
+        self.loaded_at = time.monotonic()
+        self.codes = tuple(codes)
+        self.names = tuple(names)
+        self._index = {code: i for i, code in enumerate(self.codes)}
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.change_rate = change_rate
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, stock_code: str) -> bool:
+        return stock_code in self._index
+
+    @property
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.loaded_at
+
+    def row(self, stock_code: str) -> Optional[int]:
+        """종목코드의 행 번호. 없으면 None."""
+        return self._index.get(stock_code)
+
+    def get(self, stock_code: str) -> Optional[dict]:
+        """단일 종목 시세를 stock_price_service 표준 포맷으로 반환."""
+        i = self._index.get(stock_code)
+        if i is None:
+            return None
+        return {
+            "stock_code": stock_code,
+            "stock_name": self.names[i] or stock_code,
+            "current_price": int(self.close[i]),
+            "change_rate": round(float(self.change_rate[i]), 2),
+            "volume": int(self.volume[i]),
+            "timestamp": self.trade_date,
+            "source": "krx_snapshot",
+        }
+
+    def get_many(self, stock_codes: Iterable[str]) -> tuple[list[dict], list[str]]:
+        """복수 종목 조회. (찾은 시세 목록, 스냅샷에 없는 코드 목록)을 반환."""
+        found: list[dict] = []
+        missing: list[str] = []
+        for code in stock_codes:
+            item = self.get(code)
+            if item is None:
+                missing.append(code)
+            else:
+                found.append(item)
+        return found, missing
+
+    def price_map(self, stock_codes: Iterable[str]) -> dict[str, int]:
+        """종목코드 → 종가 맵 (평가액 계산용 경량 조회)."""
+        result: dict[str, int] = {}
+        for code in stock_codes:
+            i = self._index.get(code)
+            if i is not None:
+                result[code] = int(self.close[i])
+        return result
+
+    @classmethod
+    def from_dataframe(cls, trade_date: str, df, names: dict[str, str]) -> "MarketSnapshot":
+        """pykrx 전종목 OHLCV DataFrame(index=티커)으로부터 생성."""
+        df = df.rename(columns={k: v for k, v in _COLUMN_MAP.items() if k in df.columns})
+        codes = [str(t) for t in df.index]
+
+        def _col(name: str, dtype) -> np.ndarray:
+            if name not in df.columns:
+                return np.zeros(len(codes), dtype=dtype)
+            return df[name].fillna(0).to_numpy(dtype=dtype)
+
+        return cls(
+            trade_date=trade_date,
+            codes=codes,
+            names=[names.get(code, code) for code in codes],
+            open_=_col("시가", np.int64),
+            high=_col("고가", np.int64),
+            low=_col("저가", np.int64),
+            close=_col("종가", np.int64),
+            volume=_col("거래량", np.int64),
+            change_rate=_col("등락률", np.float64),
+        )
+
+
+def _ticker_names(stock_module, tickers: Iterable[str]) -> dict[str, str]:
+    """pykrx 티커명 조회 (pykrx 내부 티커 캐시를 사용하므로 네트워크 호출은 최초 1회)."""
+    names: dict[str, str] = {}
+    for ticker in tickers:
+        try:
+            names[ticker] = stock_module.get_market_ticker_name(ticker) or ticker
+        except Exception:
+            names[ticker] = ticker
+    return names
+
+
+def _load_snapshot_sync() -> Optional[MarketSnapshot]:
+    """최근 거래일 전종목 시세를 한 번에 로드 (스레드풀에서 실행)."""
+    from pykrx import stock
+
+    for day in recent_trading_days(n=SNAPSHOT_LOOKBACK_DAYS):
+        date_str = day.strftime("%Y%m%d")
+        try:
+            df = stock.get_market_ohlcv_by_ticker(date_str, market="ALL")
+        except Exception as e:
+            logger.debug("전종목 시세 조회 실패 (%s): %s", date_str, e)
+            continue
+        if df is None or df.empty:
+            continue
+        volume_col = "거래량" if "거래량" in df.columns else "Volume"
+        if volume_col in df.columns and int(df[volume_col].sum()) == 0:
+            # 장 시작 전/휴장일에는 0으로 채워진 보드가 내려온다
+            continue
+        names = _ticker_names(stock, df.index)
+        return MarketSnapshot.from_dataframe(date_str, df, names)
+    return None
+
+
+# 현재 스냅샷 (원자적 교체)
+_snapshot: Optional[MarketSnapshot] = None
+_refresh_lock = asyncio.Lock()
+_background_refresh: Optional[asyncio.Task] = None
+
+
+def get_market_snapshot() -> Optional[MarketSnapshot]:
+    """현재 메모리 스냅샷 반환 (I/O 없음)."""
+    return _snapshot
+
+
+def set_market_snapshot(snapshot: Optional[MarketSnapshot]) -> None:
+    """스냅샷 교체 (테스트/외부 로더용)."""
+    global _snapshot
+    _snapshot = snapshot
+
+
+async def refresh_market_snapshot() -> Optional[MarketSnapshot]:
+    """전종목 스냅샷을 새로 로드해 교체한다. 실패 시 기존 스냅샷 유지."""
+    global _snapshot
+    async with _refresh_lock:
+        started = time.perf_counter()
+        try:
+            snapshot = await asyncio.wait_for(
+                asyncio.to_thread(_load_snapshot_sync),
+                timeout=SNAPSHOT_LOAD_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            MARKET_SNAPSHOT_REFRESH_TOTAL.labels("timeout").inc()
+            logger.warning("시장 스냅샷 로드 타임아웃")
+            return _snapshot
+        except Exception as e:
+            MARKET_SNAPSHOT_REFRESH_TOTAL.labels("fail").inc()
+            logger.warning("시장 스냅샷 로드 실패: %s", e)
+            return _snapshot
+
+        if snapshot is None or len(snapshot) == 0:
+            MARKET_SNAPSHOT_REFRESH_TOTAL.labels("empty").inc()
+            return _snapshot
+
+        _snapshot = snapshot
+        MARKET_SNAPSHOT_REFRESH_TOTAL.labels("success").inc()
+        logger.info(
+            "시장 스냅샷 갱신: %s, %d종목, %.2fs",
+            snapshot.trade_date, len(snapshot), time.perf_counter() - started,
+        )
+        return snapshot
+
+
+def ensure_fresh_snapshot() -> None:
+    """스냅샷이 없거나 오래되었으면 백그라운드 갱신을 1회만 예약한다 (논블로킹)."""
+    global _background_refresh
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.age_seconds < SNAPSHOT_MAX_AGE:
+        return
+    if _background_refresh is not None and not _background_refresh.done():
+        return
+    try:
+        _background_refresh = asyncio.get_running_loop().create_task(refresh_market_snapshot())
+    except RuntimeError:
+        # 이벤트 루프 밖에서 호출된 경우 (스크립트 등) — 갱신 생략
+        pass
+
+
+def lookup_prices(stock_codes: Iterable[str]) -> tuple[list[dict], list[str]]:
+    """스냅샷에서 복수 종목 시세를 조회한다. (찾은 시세, 미존재 코드)."""
+    codes = list(stock_codes)
+    snapshot = _snapshot
+    ensure_fresh_snapshot()
+    if snapshot is None:
+        CACHE_HIT_TOTAL.labels("market_snapshot", "l1", "false").inc(len(codes))
+        return [], codes
+    found, missing = snapshot.get_many(codes)
+    if found:
+        CACHE_HIT_TOTAL.labels("market_snapshot", "l1", "true").inc(len(found))
+    if missing:
+        CACHE_HIT_TOTAL.labels("market_snapshot", "l1", "false").inc(len(missing))
+    return found, missing
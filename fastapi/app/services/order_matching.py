@@ -0,0 +1,196 @@
+"""지정가 주문 매칭 엔진.
+
+limit_orders 의 대기 주문을 종목별 호가창(매수/매도 힙)으로 메모리에 들고 있다가,
+가격 선갱신기(price_refresher)가 새 시세를 받을 때마다 그 종목 호가창의 top 만 확인한다.
+체결 조건에 도달한 주문만 꺼내 portfolio_service.settle_limit_fills 로 한 트랜잭션에 정산한다.
+
+- 매수: 현재가 <= 지정가이면 체결 (높은 지정가 우선, 같으면 먼저 들어온 주문)
+- 매도: 현재가 >= 지정가이면 체결 (낮은 지정가 우선)
+- 체결가는 그 시점 현재가 (지정가와 같거나 유리함)
+
+워커마다 자기 호가창을 갖는다. 시작 시 DB 에서 전체를 재구성하고, 이후 매 틱마다
+id > 마지막으로 본 id 인 대기 주문만 읽어 다른 워커에서 들어온 주문을 합친다.
+다른 워커에서 취소/체결된 주문은 정산 시 선점(pending → filled)에 실패하므로 그때 버린다.
+"""
+
+import asyncio
+import heapq
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.core.database import AsyncSessionLocal
+from app.metrics import LIMIT_ORDER_BOOK_SIZE, LIMIT_ORDER_FILLS_TOTAL
+from app.services.portfolio_service import settle_limit_fills
+
+logger = logging.getLogger(__name__)
+
+SYNC_OVERLAP_IDS = 100  # 증분 동기화 시 겹쳐 읽을 id 범위
+
+_PENDING_SQL = text(
+    "SELECT id, user_id, stock_code, stock_name, order_type, target_price, quantity "
+    "FROM limit_orders WHERE status = 'pending' AND id > :after ORDER BY id"
+)
+
+
+@dataclass(frozen=True)
+class LimitOrder:
+    id: int
+    user_id: int
+    stock_code: str
+    stock_name: str
+    order_type: str  # buy / sell
+    target_price: int
+    quantity: int
+
+    def crosses(self, price: int) -> bool:
+        if self.order_type == "buy":
+            return price <= self.target_price
+        return price >= self.target_price
+
+
+class OrderBook:
+    """한 종목의 대기 주문. 힙 top 이 가장 먼저 체결될 주문이다 (취소는 지연 삭제)."""
+
+    def __init__(self):
+        self._buys: list[tuple[int, int]] = []   # (-지정가, id)
+        self._sells: list[tuple[int, int]] = []  # (지정가, id)
+        self._live: dict[int, LimitOrder] = {}
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def add(self, order: LimitOrder) -> None:
+        if order.id in self._live:
+            return
+        self._live[order.id] = order
+        if order.order_type == "buy":
+            heapq.heappush(self._buys, (-order.target_price, order.id))
+        else:
+            heapq.heappush(self._sells, (order.target_price, order.id))
+
+    def discard(self, order_id: int) -> Optional[LimitOrder]:
+        return self._live.pop(order_id, None)
+
+    def _pop_crossing(self, heap: list, price: int) -> list[LimitOrder]:
+        out = []
+        while heap:
+            order = self._live.get(heap[0][1])
+            if order is None:  # 취소/체결로 지연 삭제된 항목
+                heapq.heappop(heap)
+                continue
+            if not order.crosses(price):
+                break
+            heapq.heappop(heap)
+            del self._live[order.id]
+            out.append(order)
+        return out
+
+    def crossing(self, price: int) -> list[LimitOrder]:
+        """현재가로 체결 가능한 주문을 꺼낸다 (top 부터, 조건을 벗어나는 첫 주문에서 멈춤)."""
+        return self._pop_crossing(self._buys, price) + self._pop_crossing(self._sells, price)
+
+
+class MatchingEngine:
+    """종목별 호가창 + 틱 처리."""
+
+    def __init__(self):
+        self._books: dict[str, OrderBook] = {}
+        self._codes: dict[int, str] = {}  # order_id → stock_code
+        self._last_id = 0
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def codes(self) -> set[str]:
+        """대기 주문이 있는 종목 (가격 선갱신 대상에 포함)."""
+        return {code for code, book in self._books.items() if len(book)}
+
+    def add(self, order: LimitOrder) -> None:
+        self._books.setdefault(order.stock_code, OrderBook()).add(order)
+        self._codes[order.id] = order.stock_code
+        LIMIT_ORDER_BOOK_SIZE.set(len(self._codes))
+
+    def cancel(self, order_id: int) -> None:
+        code = self._codes.pop(order_id, None)
+        if code is not None:
+            self._books[code].discard(order_id)
+            LIMIT_ORDER_BOOK_SIZE.set(len(self._codes))
+
+    def crossing(self, prices: dict[str, int]) -> list[tuple[LimitOrder, int]]:
+        """새 시세로 체결 조건에 도달한 (주문, 체결가) 목록. 꺼낸 주문은 호가창에서 빠진다."""
+        fills = []
+        for code, price in prices.items():
+            book = self._books.get(code)
+            if not book or not price:
+                continue
+            for order in book.crossing(price):
+                self._codes.pop(order.id, None)
+                fills.append((order, price))
+        LIMIT_ORDER_BOOK_SIZE.set(len(self._codes))
+        return fills
+
+    async def load(self) -> int:
+        """limit_orders 의 대기 주문으로 호가창을 다시 만든다."""
+        self._books.clear()
+        self._codes.clear()
+        self._last_id = 0
+        self._loaded = False
+        await self.sync()
+        return len(self._codes)
+
+    async def sync(self) -> None:
+        """마지막으로 본 id 이후 들어온 대기 주문을 합친다 (처음이면 전체 로드).
+
+        id 발급 순서와 커밋 순서가 다를 수 있어 SYNC_OVERLAP_IDS 만큼 겹쳐 읽는다
+        (이미 있는 주문은 호가창이 무시한다).
+        """
+        after = max(0, self._last_id - SYNC_OVERLAP_IDS) if self._loaded else 0
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(_PENDING_SQL, {"after": after})).all()
+        for row in rows:
+            self.add(LimitOrder(**row._mapping))
+            self._last_id = max(self._last_id, row.id)
+        if not self._loaded:
+            self._loaded = True
+            logger.info("지정가 호가창 로드: %d건", len(self._codes))
+
+    async def on_prices(self, prices: dict[str, int]) -> dict[int, str]:
+        """새 시세 틱 처리. 정산 결과(order_id → filled/rejected)를 반환한다."""
+        async with self._lock:
+            await self.sync()
+            fills = self.crossing(prices)
+            if not fills:
+                return {}
+
+            try:
+                async with AsyncSessionLocal() as session:
+                    # 요약 캐시/리더보드는 정산 안에서 체결 후 상태로 갱신된다
+                    outcome = await settle_limit_fills(session, fills)
+            except Exception:
+                # 정산 실패(DB 오류)면 다음 틱에 다시 시도
+                for order, _ in fills:
+                    self.add(order)
+                raise
+
+        for result in outcome.values():
+            LIMIT_ORDER_FILLS_TOTAL.labels(result).inc()
+        LIMIT_ORDER_FILLS_TOTAL.labels("stale").inc(len(fills) - len(outcome))
+        if outcome:
+            logger.info("지정가 체결: %s", outcome)
+        return outcome
+
+
+_engine: Optional[MatchingEngine] = None
+
+
+def get_matching_engine() -> MatchingEngine:
+    """지정가 매칭 엔진 싱글톤 반환."""
+    global _engine
+    if _engine is None:
+        _engine = MatchingEngine()
+    return _engine
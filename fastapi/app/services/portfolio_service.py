@@ -1,16 +1,21 @@
 """Portfolio management service - 포트폴리오/거래/보상 비즈니스 로직."""
 
 import logging
+import time
 from datetime import datetime, timedelta
+from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import select, text, tuple_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.portfolio import UserPortfolio, PortfolioHolding, SimulationTrade
 from app.models.reward import BriefingReward
-from app.services.stock_price_service import get_current_price, get_batch_prices
+from app.services.kis_scheduler import LANE_ORDER, kis_priority
+from app.services.portfolio_summary import write_through_trades
+from app.services.stock_price_service import get_current_price
 
 logger = logging.getLogger(__name__)
 
@@ -19,15 +24,33 @@ REWARD_MATURITY_DAYS = 7  # 멀티플라이어 체크까지 대기일
 PROFIT_MULTIPLIER = 1.5  # 수익 시 보너스 배율
 
 
-async def get_or_create_portfolio(db: AsyncSession, user_id: int) -> UserPortfolio:
-    """유저의 기본 포트폴리오를 조회하거나, 없으면 자동 생성한다."""
+# get_or_create_portfolio 로딩 프로필. 거래 내역은 매매할수록 끝없이 늘어나므로
+# 요청 경로에서는 읽지 않고, 필요하면 list_trades 로 페이지 단위 조회한다.
+LOAD_BARE = "bare"          # 포트폴리오 행만 (현금/보상 갱신)
+LOAD_HOLDINGS = "holdings"  # + 보유 종목 (요약/평가)
+LOAD_FULL = "full"          # + 전체 거래 내역 (내보내기 등 관리용)
+
+_LOAD_RELATIONS = {
+    LOAD_BARE: [],
+    LOAD_HOLDINGS: ["holdings"],
+    LOAD_FULL: ["holdings", "trades"],
+}
+
+TRADE_PAGE_MAX = 100
+
+
+async def get_or_create_portfolio(
+    db: AsyncSession, user_id: int, load: str = LOAD_HOLDINGS
+) -> UserPortfolio:
+    """유저의 기본 포트폴리오를 조회하거나, 없으면 자동 생성한다.
+
+    load: LOAD_BARE / LOAD_HOLDINGS / LOAD_FULL 중 함께 읽을 관계.
+    """
+    relations = _LOAD_RELATIONS[load]
     stmt = (
         select(UserPortfolio)
         .where(UserPortfolio.user_id == user_id)
-        .options(
-            selectinload(UserPortfolio.holdings),
-            selectinload(UserPortfolio.trades),
-        )
+        .options(*(selectinload(getattr(UserPortfolio, r)) for r in relations))
     )
     result = await db.execute(stmt)
     portfolio = result.scalars().first()  # 중복 시 에러 대신 첫 번째 반환
@@ -48,11 +71,131 @@ async def get_or_create_portfolio(db: AsyncSession, user_id: int) -> UserPortfol
             portfolio = result.scalars().first()
         else:
             await db.commit()
-            await db.refresh(portfolio, attribute_names=["holdings", "trades"])
+            if relations:
+                await db.refresh(portfolio, attribute_names=relations)
 
     return portfolio
 
 
+def encode_trade_cursor(trade) -> str:
+    """거래 내역 다음 페이지 커서 (마지막 행의 traded_at, id)."""
+    return f"{trade.traded_at.isoformat()}_{trade.id}"
+
+
+def decode_trade_cursor(cursor: str) -> tuple[datetime, int]:
+    """Raises: ValueError: 형식이 잘못된 커서"""
+    traded_at, _, trade_id = cursor.rpartition("_")
+    return datetime.fromisoformat(traded_at), int(trade_id)
+
+
+async def list_trades(
+    db: AsyncSession, portfolio_id: int, limit: int = 20, cursor: Optional[str] = None
+) -> tuple[list, Optional[str]]:
+    """거래 내역 한 페이지 (최신순)와 다음 페이지 커서.
+
+    (traded_at, id) 키셋 페이지네이션 — OFFSET 없이 ix_simulation_trades_portfolio_traded_at
+    인덱스에서 커서 위치로 바로 찾아 limit 행만 읽는다. 마지막 페이지면 커서는 None.
+    """
+    limit = min(limit, TRADE_PAGE_MAX)
+    stmt = (
+        select(
+            SimulationTrade.id,
+            SimulationTrade.trade_type,
+            SimulationTrade.stock_code,
+            SimulationTrade.stock_name,
+            SimulationTrade.quantity,
+            SimulationTrade.price,
+            SimulationTrade.total_amount,
+            SimulationTrade.trade_reason,
+            SimulationTrade.traded_at,
+        )
+        .where(SimulationTrade.portfolio_id == portfolio_id)
+        .order_by(SimulationTrade.traded_at.desc(), SimulationTrade.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        traded_at, trade_id = decode_trade_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(SimulationTrade.traded_at, SimulationTrade.id) < tuple_(traded_at, trade_id)
+        )
+    rows = (await db.execute(stmt)).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_trade_cursor(rows[-1])
+    return rows, None
+
+
+# 매매 문장 결과: 체결 후 포트폴리오 상태 (portfolio_valuation.value_trade_rows 로 바로 평가).
+# 같은 문장의 CTE 는 문장 시작 스냅샷을 보므로 보유 종목은 나머지 종목 + 바뀐 행({changed})으로 만든다.
+_POST_TRADE_COLUMNS = """
+        cash.id, cash.user_id, cash.initial_cash, cash.current_cash, cash.total_rewards_received,
+        trade.id AS trade_id,
+        (SELECT username FROM users WHERE users.id = cash.user_id) AS username,
+        (SELECT COALESCE(json_agg(json_build_array(h.stock_code, h.quantity, h.avg_buy_price)), '[]')
+         FROM (SELECT stock_code, quantity, avg_buy_price FROM portfolio_holdings
+               WHERE portfolio_id = :portfolio_id AND stock_code <> :stock_code
+               UNION ALL SELECT stock_code, quantity, avg_buy_price FROM {changed}) h) AS holdings"""
+
+# 매수: 잔액 조건부 차감 → 보유 종목 upsert(가중 평균단가) → 거래 기록
+_BUY_SQL = text("""
+    WITH cash AS (
+        UPDATE user_portfolios
+        SET current_cash = current_cash - :cash_delta, updated_at = :now
+        WHERE id = :portfolio_id AND current_cash >= :cash_delta
+        RETURNING id, user_id, initial_cash, current_cash, total_rewards_received
+    ), holding AS (
+        INSERT INTO portfolio_holdings
+            (portfolio_id, stock_code, stock_name, quantity, avg_buy_price, created_at, updated_at)
+        SELECT id, :stock_code, :stock_name, :quantity, :price, :now, :now FROM cash
+        ON CONFLICT (portfolio_id, stock_code) DO UPDATE SET
+            avg_buy_price = (portfolio_holdings.avg_buy_price * portfolio_holdings.quantity
+                             + EXCLUDED.avg_buy_price * EXCLUDED.quantity)
+                            / (portfolio_holdings.quantity + EXCLUDED.quantity),
+            quantity = portfolio_holdings.quantity + EXCLUDED.quantity,
+            updated_at = EXCLUDED.updated_at
+        RETURNING stock_code, quantity, avg_buy_price
+    ), trade AS (
+        INSERT INTO simulation_trades
+            (portfolio_id, trade_type, stock_code, stock_name, quantity, price, total_amount,
+             trade_reason, traded_at)
+        SELECT id, 'buy', :stock_code, :stock_name, :quantity, :price, :total, :trade_reason, :now
+        FROM cash
+        RETURNING id
+    )
+    SELECT {post_trade_columns}
+    FROM cash, trade
+""".format(post_trade_columns=_POST_TRADE_COLUMNS.format(changed="holding")))
+
+# 매도: 보유 수량 조건부 차감(전량이면 삭제) → 현금 입금 → 거래 기록.
+# 같은 문장의 CTE는 한 스냅샷을 보므로 DELETE/UPDATE 조건을 겹치지 않게 나눈다.
+_SELL_SQL = text("""
+    WITH sold_out AS (
+        DELETE FROM portfolio_holdings
+        WHERE portfolio_id = :portfolio_id AND stock_code = :stock_code AND quantity = :quantity
+        RETURNING portfolio_id
+    ), reduced AS (
+        UPDATE portfolio_holdings
+        SET quantity = quantity - :quantity, updated_at = :now
+        WHERE portfolio_id = :portfolio_id AND stock_code = :stock_code AND quantity > :quantity
+        RETURNING portfolio_id, stock_code, quantity, avg_buy_price
+    ), cash AS (
+        UPDATE user_portfolios
+        SET current_cash = current_cash + :cash_delta, updated_at = :now
+        WHERE id IN (SELECT portfolio_id FROM sold_out UNION ALL SELECT portfolio_id FROM reduced)
+        RETURNING id, user_id, initial_cash, current_cash, total_rewards_received
+    ), trade AS (
+        INSERT INTO simulation_trades
+            (portfolio_id, trade_type, stock_code, stock_name, quantity, price, total_amount,
+             trade_reason, traded_at)
+        SELECT id, 'sell', :stock_code, :stock_name, :quantity, :price, :total, :trade_reason, :now
+        FROM cash
+        RETURNING id
+    )
+    SELECT {post_trade_columns}
+    FROM cash, trade
+""".format(post_trade_columns=_POST_TRADE_COLUMNS.format(changed="reduced")))
+
+
 async def execute_trade(
     db: AsyncSession,
     portfolio: UserPortfolio,
@@ -64,59 +207,47 @@ async def execute_trade(
 ) -> SimulationTrade:
     """매수 또는 매도를 실행한다.
 
+    현금/보유 종목/거래 기록을 데이터 수정 CTE 한 문장으로 반영한다 (가격 조회 후 DB 왕복 1회).
+    문장이 체결 후 포트폴리오 상태도 돌려주므로 요약 캐시/리더보드는 그걸로 바로 갱신한다.
+    잔액·보유 수량 조건이 UPDATE 의 WHERE 에 있어 행 잠금 후 최신 값으로 다시 평가되므로,
+    같은 포트폴리오에 동시에 들어온 주문도 잔액/수량을 넘겨 체결되지 않는다.
+
     Raises:
         ValueError: 잔액 부족, 보유 수량 부족, 또는 휴장일 시
     """
+    if trade_type not in ("buy", "sell"):
+        raise ValueError(f"잘못된 거래 타입: {trade_type}")
+
     # 휴장일 체크
     from app.services.market_calendar import is_kr_market_open_today
     if not await is_kr_market_open_today():
         raise ValueError("오늘은 한국 주식시장 휴장일입니다")
 
-    price_data = await get_current_price(stock_code)
+    # 주문 체결가 조회는 KIS 호출 최우선 레인
+    with kis_priority(LANE_ORDER):
+        price_data = await get_current_price(stock_code)
     if not price_data:
         raise ValueError(f"종목 {stock_code}의 가격을 조회할 수 없습니다")
 
     price = price_data["current_price"]
     total = price * quantity
+    now = datetime.utcnow()
+    valued_at = time.time()
 
-    if trade_type == "buy":
-        if portfolio.current_cash < total:
-            raise ValueError(
-                f"잔액 부족: 필요 {total:,.0f}원, 보유 {portfolio.current_cash:,.0f}원"
-            )
-        portfolio.current_cash -= int(total)
-
-        # 기존 보유 종목이면 평균단가 재계산, 없으면 신규 생성
-        holding = await _get_holding(db, portfolio.id, stock_code)
-        if holding:
-            old_total = float(holding.avg_buy_price) * holding.quantity
-            new_total = old_total + total
-            holding.quantity += quantity
-            holding.avg_buy_price = new_total / holding.quantity
-        else:
-            holding = PortfolioHolding(
-                portfolio_id=portfolio.id,
-                stock_code=stock_code,
-                stock_name=stock_name,
-                quantity=quantity,
-                avg_buy_price=price,
-            )
-            db.add(holding)
-
-    elif trade_type == "sell":
-        holding = await _get_holding(db, portfolio.id, stock_code)
-        if not holding or holding.quantity < quantity:
-            available = holding.quantity if holding else 0
-            raise ValueError(f"보유 수량 부족: 보유 {available}주")
-        holding.quantity -= quantity
-        portfolio.current_cash += int(total)
-
-        if holding.quantity == 0:
-            await db.delete(holding)
-    else:
-        raise ValueError(f"잘못된 거래 타입: {trade_type}")
+    row = await _apply_trade(
+        db, portfolio.id, trade_type, stock_code, stock_name, quantity, price, trade_reason, now
+    )
+    if row is None:
+        await db.rollback()
+        raise ValueError(await _rejection_reason(db, portfolio.id, trade_type, stock_code, total))
+    await db.commit()
+    # 요약 캐시/리더보드는 문장이 돌려준 체결 후 상태로 갱신 (재조회 없음)
+    await write_through_trades([row], valued_at)
 
-    trade = SimulationTrade(
+    # DB가 계산한 잔액으로 맞춰 둔다 (dirty 표시 없이 — 다음 flush 에서 덮어쓰지 않도록)
+    set_committed_value(portfolio, "current_cash", row.current_cash)
+    return SimulationTrade(
+        id=row.trade_id,
         portfolio_id=portfolio.id,
         trade_type=trade_type,
         stock_code=stock_code,
@@ -125,22 +256,120 @@ async def execute_trade(
         price=price,
         total_amount=total,
         trade_reason=trade_reason,
+        traded_at=now,
     )
-    db.add(trade)
-    await db.commit()
-    await db.refresh(trade)
-    return trade
 
 
-async def _get_holding(
-    db: AsyncSession, portfolio_id: int, stock_code: str
-) -> PortfolioHolding | None:
-    stmt = select(PortfolioHolding).where(
-        PortfolioHolding.portfolio_id == portfolio_id,
-        PortfolioHolding.stock_code == stock_code,
+async def _apply_trade(
+    db: AsyncSession,
+    portfolio_id: int,
+    trade_type: str,
+    stock_code: str,
+    stock_name: str,
+    quantity: int,
+    price: int,
+    trade_reason: Optional[str],
+    now: datetime,
+):
+    """주문 한 건을 반영한다 (커밋 없음). 잔액/수량 부족이면 아무것도 바꾸지 않고 None."""
+    total = price * quantity
+    result = await db.execute(
+        _BUY_SQL if trade_type == "buy" else _SELL_SQL,
+        {
+            "portfolio_id": portfolio_id,
+            "stock_code": stock_code,
+            "stock_name": stock_name,
+            "quantity": quantity,
+            "price": price,
+            "total": total,
+            "cash_delta": int(total),
+            "trade_reason": trade_reason,
+            "now": now,
+        },
+    )
+    return result.first()
+
+
+async def _rejection_reason(
+    db: AsyncSession, portfolio_id: int, trade_type: str, stock_code: str, total: float
+) -> str:
+    """조건부 UPDATE 가 0행일 때 사용자에게 보여줄 사유 (실패 경로에서만 조회)."""
+    if trade_type == "buy":
+        cash = await db.scalar(
+            select(UserPortfolio.current_cash).where(UserPortfolio.id == portfolio_id)
+        )
+        return f"잔액 부족: 필요 {total:,.0f}원, 보유 {cash or 0:,.0f}원"
+    available = await db.scalar(
+        select(PortfolioHolding.quantity).where(
+            PortfolioHolding.portfolio_id == portfolio_id,
+            PortfolioHolding.stock_code == stock_code,
+        )
     )
-    result = await db.execute(stmt)
-    return result.scalar_one_or_none()
+    return f"보유 수량 부족: 보유 {available or 0}주"
+
+
+_CLAIM_LIMIT_ORDERS_SQL = text("""
+    UPDATE limit_orders lo
+    SET status = 'filled', filled_at = NOW()
+    FROM user_portfolios p
+    WHERE lo.id = ANY(:ids) AND lo.status = 'pending' AND p.user_id = lo.user_id
+    RETURNING lo.id, p.id AS portfolio_id
+""")
+
+_REJECT_LIMIT_ORDERS_SQL = text(
+    "UPDATE limit_orders SET status = 'rejected', filled_at = NULL WHERE id = ANY(:ids)"
+)
+
+# 포트폴리오가 없는 사용자의 주문은 선점 조인에 걸리지 않아 영원히 대기로 남으므로 바로 닫는다
+_REJECT_ORPHAN_LIMIT_ORDERS_SQL = text("""
+    UPDATE limit_orders lo
+    SET status = 'rejected'
+    WHERE lo.id = ANY(:ids) AND lo.status = 'pending'
+      AND NOT EXISTS (SELECT 1 FROM user_portfolios p WHERE p.user_id = lo.user_id)
+    RETURNING lo.id
+""")
+
+
+async def settle_limit_fills(db: AsyncSession, fills: list) -> dict[int, str]:
+    """체결 조건에 도달한 지정가 주문들을 한 트랜잭션으로 정산한다.
+
+    fills: (order, fill_price) 목록. order 는 id/user_id/stock_code/stock_name/order_type/quantity 속성.
+    대기 중인 주문만 한 번에 선점(pending → filled, 행 잠금)하므로 그 사이 취소되었거나 다른
+    워커가 이미 체결한 주문은 건너뛴다. 잔액/수량 부족이거나 포트폴리오가 없으면 rejected 로 닫는다.
+
+    Returns: order_id → "filled" | "rejected" (선점하지 못한 주문은 포함하지 않음)
+    """
+    if not fills:
+        return {}
+    ids = [o.id for o, _ in fills]
+    claimed = {row.id: row.portfolio_id for row in await db.execute(_CLAIM_LIMIT_ORDERS_SQL, {"ids": ids})}
+    now = datetime.utcnow()
+    valued_at = time.time()
+    outcome: dict[int, str] = {}
+    filled_rows = []
+    unclaimed = [oid for oid in ids if oid not in claimed]
+    if unclaimed:
+        for row in await db.execute(_REJECT_ORPHAN_LIMIT_ORDERS_SQL, {"ids": unclaimed}):
+            outcome[row.id] = "rejected"
+    for order, price in fills:
+        portfolio_id = claimed.get(order.id)
+        if portfolio_id is None:
+            continue
+        row = await _apply_trade(
+            db, portfolio_id, order.order_type, order.stock_code, order.stock_name,
+            order.quantity, price, f"지정가 체결 (주문 #{order.id})", now,
+        )
+        outcome[order.id] = "filled" if row is not None else "rejected"
+        if row is not None:
+            filled_rows.append(row)
+
+    rejected = [oid for oid, result in outcome.items() if result == "rejected"]
+    if rejected:
+        await db.execute(_REJECT_LIMIT_ORDERS_SQL, {"ids": rejected})
+    await db.commit()
+    if filled_rows:
+        await write_through_trades(filled_rows, valued_at)
+    return outcome
 
 
 async def complete_briefing_reward(
@@ -154,7 +383,7 @@ async def complete_briefing_reward(
     Raises:
         ValueError: 이미 해당 브리핑에 대한 보상을 받은 경우
     """
-    portfolio = await get_or_create_portfolio(db, user_id)
+    portfolio = await get_or_create_portfolio(db, user_id, load=LOAD_BARE)
 
     # 중복 보상 방지
     existing = await db.execute(
@@ -184,58 +413,3 @@ async def complete_briefing_reward(
     await db.commit()
     await db.refresh(reward)
     return reward
-
-
-async def check_and_apply_multiplier(
-    db: AsyncSession, reward: BriefingReward
-) -> BriefingReward:
-    """만기가 지난 보상의 멀티플라이어를 체크하고 적용/소멸 처리한다.
-
-    - 포트폴리오 수익(+): 보너스 0.5배분 추가 지급 → status=applied
-    - 포트폴리오 손실(-): 보너스 소멸 → status=expired
-    """
-    if reward.status != "pending":
-        return reward
-    if datetime.utcnow() < reward.maturity_at:
-        return reward
-
-    portfolio = await get_or_create_portfolio(db, reward.user_id)
-
-    # 전체 포트폴리오 평가액 계산
-    total_holdings_value = 0
-    stmt = select(PortfolioHolding).where(
-        PortfolioHolding.portfolio_id == portfolio.id
-    )
-    result = await db.execute(stmt)
-    holdings = result.scalars().all()
-
-    # 배치 가격 조회 (N+1 방지)
-    codes = [h.stock_code for h in holdings]
-    batch_results = await get_batch_prices(codes) if codes else []
-    price_map = {p["stock_code"]: p["current_price"] for p in batch_results}
-
-    for h in holdings:
-        cp = price_map.get(h.stock_code) or int(h.avg_buy_price)
-        total_holdings_value += cp * h.quantity
-
-    total_value = portfolio.current_cash + total_holdings_value
-    # 누적 보상액 차감하여 순수 투자 수익만 평가
-    rewards = portfolio.total_rewards_received or 0
-    profit = total_value - portfolio.initial_cash - rewards
-
-    if profit > 0:
-        # 수익: 1.5배 보너스 (추가분만 지급)
-        bonus = int(reward.base_reward * (PROFIT_MULTIPLIER - 1.0))
-        reward.multiplier = PROFIT_MULTIPLIER
-        reward.final_reward = reward.base_reward + bonus
-        portfolio.current_cash += bonus
-        portfolio.total_rewards_received += bonus
-        reward.status = "applied"
-    else:
-        # 손실: 보너스 소멸
-        reward.multiplier = 1.0
-        reward.status = "expired"
-
-    reward.applied_at = datetime.utcnow()
-    await db.commit()
-    return reward
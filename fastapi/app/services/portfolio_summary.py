@@ -0,0 +1,178 @@
+"""포트폴리오 요약 캐시 write-through (BottomNav 뱃지용 /portfolio/summary).
+
+무효화만 하면 바로 다음 뱃지 폴링이 DB + 시세 조회로 요약을 다시 만든다. 대신 값이 바뀌는
+시점에 이미 계산한 평가 결과(portfolio_valuation)로 새 요약을 key_portfolio_summary 에 바로 쓴다.
+
+- 매매/지정가 체결 직후: write_through_trades() — 매매 문장이 RETURNING 한 체결 후 상태
+  (현금/보유 종목)로 평가해 요약 캐시와 리더보드를 함께 갱신 (포트폴리오/보유 종목 재조회 없음)
+- 보상/퀴즈 지급 직후: credit_rewards() — 보상은 현금과 누적 보상만 늘리고 수익률 계산에서
+  빠지므로, 캐시된 요약/리더보드 항목의 총평가액·누적 보상에 지급액만 더한다 (평가 없음)
+- 시세 스냅샷 갱신(leaderboard.refresh_leaderboard): 전체 평가 결과로 write_summaries()
+- /portfolio/refresh: 실시간 시세로 다시 계산한 요약을 write_summary() 로
+
+전체 평가는 수 초가 걸리므로 그 사이 매매한 사용자의 요약(write-through)이 이미 더 새 값일 수
+있다. 그래서 엔트리의 t(평가 시작 시각)를 비교해 더 오래된 평가 결과로는 덮어쓰지 않는다 (Lua).
+모든 쓰기 경로가 같은 규칙을 따른다.
+
+요약 TTL 은 조회 경로와 같은 cache_ttl(TTL_PORTFOLIO_SUMMARY) 를 쓴다. 스냅샷 갱신 주기가
+장중 TTL 보다 짧으므로 뱃지 조회는 거의 항상 캐시에서 끝난다. 조회 경로(cache.get_or_set)와
+같은 엔트리 형식(pack_entry)으로 쓰고, SUMMARY_CACHE_POLICY 의 stale 구간만큼 더 남겨 둔다.
+"""
+
+import json
+import logging
+import time
+from typing import Iterable
+
+from app.core.redis_keys import key_portfolio_summary
+from app.services.cache import CachePolicy, pack_entry
+from app.services.cache_ttl import TTL_PORTFOLIO_SUMMARY, cache_ttl
+from app.services.leaderboard import credit_leaderboard_entries, update_leaderboard_entries
+from app.services.portfolio_valuation import PortfolioValuation, value_trade_rows
+from app.services.redis_cache import get_redis_cache
+
+logger = logging.getLogger(__name__)
+
+WRITE_CHUNK = 1000  # 파이프라인 한 번에 보낼 SET 수
+
+# /portfolio/summary 조회 정책: 만료 후 1분은 지난 요약을 내주며 백그라운드 재계산
+SUMMARY_CACHE_POLICY = CachePolicy(stale_ttl=60, beta=1.0)
+
+# KEYS[1]: 요약 키, ARGV: 엔트리 JSON, 만료(초), 평가 시각. 기존 엔트리가 더 새 평가면 건너뜀
+_SET_IF_NEWER_LUA = """
+local cur = redis.call('GET', KEYS[1])
+if cur then
+    local ok, entry = pcall(cjson.decode, cur)
+    if ok and type(entry) == 'table' and tonumber(entry['t']) and tonumber(entry['t']) > tonumber(ARGV[3]) then
+        return 0
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return 1
+"""
+
+# KEYS: 요약 키들, ARGV[1]: 지급 시각, ARGV[i + 1]: KEYS[i] 지급액.
+# 캐시된 요약에만 더한다 (없으면 다음 조회에서 DB 로 계산). 만료는 그대로 두고 t 는 지급 시각으로 올려
+# 지급 전에 시작한 평가가 덮어쓰지 않게 한다.
+_CREDIT_LUA = """
+local credited = 0
+for i, key in ipairs(KEYS) do
+    local cur = redis.call('GET', key)
+    if cur then
+        local ok, entry = pcall(cjson.decode, cur)
+        if ok and type(entry) == 'table' and type(entry['v']) == 'table' then
+            local amount = tonumber(ARGV[i + 1])
+            local v = entry['v']
+            v['total_value'] = (tonumber(v['total_value']) or 0) + amount
+            v['total_rewards_received'] = (tonumber(v['total_rewards_received']) or 0) + amount
+            entry['t'] = math.max(tonumber(entry['t']) or 0, tonumber(ARGV[1]))
+            redis.call('SET', key, cjson.encode(entry), 'KEEPTTL')
+            credited = credited + 1
+        end
+    end
+end
+return credited
+"""
+
+
+def _queue_summary(pipe, user_id: int, summary: dict, ttl: int, valued_at: float) -> None:
+    entry = pack_entry(summary, ttl, as_of=valued_at)
+    pipe.eval(
+        _SET_IF_NEWER_LUA, 1, key_portfolio_summary(user_id),
+        json.dumps(entry), ttl + SUMMARY_CACHE_POLICY.stale_ttl, valued_at,
+    )
+
+
+async def write_summaries(valuation: PortfolioValuation) -> int:
+    """평가 결과를 요약 캐시에 쓴다.
+
+    평가 이후 다른 경로가 더 새 평가로 쓴 키는 건너뛴다. 실제로 쓴 수 반환.
+    """
+    written = 0
+    try:
+        cache = await get_redis_cache()
+        client = cache.client
+        if client is None:
+            return 0
+        ttl = cache_ttl(TTL_PORTFOLIO_SUMMARY)
+        items = list(valuation.summaries().items())
+        for start in range(0, len(items), WRITE_CHUNK):
+            chunk = items[start:start + WRITE_CHUNK]
+            pipe = client.pipeline(transaction=False)
+            for user_id, summary in chunk:
+                _queue_summary(pipe, user_id, summary, ttl, valuation.valued_at)
+            # 워커 L1 무효화는 청크당 메시지 하나
+            cache.queue_invalidation(pipe, *(key_portfolio_summary(user_id) for user_id, _ in chunk))
+            results = await pipe.execute()
+            written += sum(int(r) for r in results[:len(chunk)])
+    except Exception as e:
+        logger.debug("portfolio summary write error: %s", e)
+    return written
+
+
+async def write_summary(user_id: int, summary: dict, valued_at: float) -> bool:
+    """요약 한 건을 write_summaries 와 같은 규칙으로 쓴다 (더 새 요약이 있으면 건너뜀)."""
+    try:
+        cache = await get_redis_cache()
+        if cache.client is None:
+            return False
+        pipe = cache.client.pipeline(transaction=False)
+        _queue_summary(pipe, user_id, summary, cache_ttl(TTL_PORTFOLIO_SUMMARY), valued_at)
+        cache.queue_invalidation(pipe, key_portfolio_summary(user_id))
+        results = await pipe.execute()
+        return bool(int(results[0]))
+    except Exception as e:
+        logger.debug("portfolio summary write error: %s", e)
+        return False
+
+
+async def _delete_summaries(cache, user_ids: Iterable[int]) -> None:
+    """요약 키 삭제 + 모든 워커 L1 무효화 (한 파이프라인, 무효화 메시지 하나)."""
+    keys = [key_portfolio_summary(user_id) for user_id in user_ids]
+    pipe = cache.client.pipeline(transaction=False)
+    for key in keys:
+        pipe.delete(key)
+    cache.queue_invalidation(pipe, *keys)
+    await pipe.execute()
+
+
+async def write_through_trades(rows: list, valued_at: float) -> None:
+    """매매 직후: 매매 문장이 돌려준 체결 후 상태(rows)로 요약 캐시와 리더보드를 함께 갱신한다."""
+    try:
+        valuation = await value_trade_rows(rows, valued_at)
+    except Exception as e:
+        # 시세 조회 실패 시 기존 요약은 더 이상 맞지 않으므로 지운다 (다음 조회에서 재계산)
+        logger.warning("체결 후 평가 실패 (요약 캐시 무효화): %s", e)
+        try:
+            cache = await get_redis_cache()
+            if cache.client:
+                await _delete_summaries(cache, {r.user_id for r in rows})
+        except Exception:
+            pass
+        return
+    await write_summaries(valuation)
+    await update_leaderboard_entries(valuation.entries(), valuation.valued_at)
+
+
+async def credit_rewards(amounts: dict[int, int]) -> None:
+    """보상 지급 직후: user_id → 지급액을 캐시된 요약/리더보드 항목에 더한다.
+
+    보상은 수익률 계산에서 빠지므로 손익·수익률(순위)은 그대로이고 총평가액만 늘어난다.
+    """
+    amounts = {u: a for u, a in amounts.items() if a}
+    if not amounts:
+        return
+    now = time.time()
+    try:
+        cache = await get_redis_cache()
+        client = cache.client
+        if client is None:
+            return
+        keys = [key_portfolio_summary(u) for u in amounts]
+        pipe = client.pipeline(transaction=False)
+        pipe.eval(_CREDIT_LUA, len(keys), *keys, now, *amounts.values())
+        cache.queue_invalidation(pipe, *keys)
+        await pipe.execute()
+    except Exception as e:
+        logger.debug("portfolio summary credit error: %s", e)
+    await credit_leaderboard_entries(amounts)
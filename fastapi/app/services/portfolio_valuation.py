@@ -0,0 +1,309 @@
+"""포트폴리오 일괄 평가 + 일별 NAV 기록.
+
+전 포트폴리오의 현금/보유 종목을 컬럼 단위로 읽어 numpy 한 번으로 평가한다.
+가격은 포트폴리오 API 조회 경로와 같은 get_batch_prices (가격 캐시 → 전종목 시장 스냅샷 →
+종목별 조회) 로 받는다 — 일괄 평가로 쓴 요약과 조회 시 계산한 요약의 시세 기준을 맞춘다. 평가 결과는
+
+- 리더보드 재계산 (leaderboard.compute_entries)
+- 포트폴리오 요약 캐시 write-through (portfolio_summary)
+- 장 마감 후 NAV 잡 → portfolio_nav_history (포트폴리오당 거래일 1행, upsert)
+
+에서 함께 쓰고, NAV 행은 성과 차트, 장 마감 후 요약, 보상 만기 판정이 읽는다.
+"""
+
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from typing import Iterable, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal
+from app.core.redis_keys import key_single_flight_lock
+from app.models.portfolio import PortfolioHolding, PortfolioNavHistory, UserPortfolio
+from app.models.user import User
+from app.services.market_calendar import (
+    KST,
+    is_market_session,
+    latest_trading_day,
+)
+from app.services.market_snapshot import refresh_market_snapshot
+from app.services.redis_cache import get_redis_cache
+from app.services.stock_price_service import get_batch_prices
+
+logger = logging.getLogger(__name__)
+
+NAV_JOB_LOCK_MS = 10 * 60 * 1000  # NAV 잡 워커 간 중복 실행 방지
+NAV_UPSERT_CHUNK = 1000
+
+
+@dataclass
+class PortfolioValuation:
+    """포트폴리오별 평가 결과 (같은 길이의 컬럼 배열)."""
+
+    portfolio_ids: np.ndarray
+    user_ids: np.ndarray
+    usernames: list[str]
+    cash: np.ndarray
+    rewards: np.ndarray
+    holdings_value: np.ndarray
+    total_value: np.ndarray
+    profit_loss: np.ndarray
+    profit_loss_pct: np.ndarray
+    valued_at: float = 0.0  # 포트폴리오/보유 종목을 읽기 시작한 시각 (epoch)
+
+    def __len__(self) -> int:
+        return len(self.portfolio_ids)
+
+    def entries(self) -> list[dict]:
+        """리더보드 항목 형식으로 변환."""
+        return [
+            {
+                "user_id": int(self.user_ids[i]),
+                "username": self.usernames[i],
+                "total_value": float(self.total_value[i]),
+                "profit_loss": float(self.profit_loss[i]),
+                "profit_loss_pct": round(float(self.profit_loss_pct[i]), 2),
+            }
+            for i in range(len(self))
+        ]
+
+    def summaries(self) -> dict[int, dict]:
+        """user_id → PortfolioSummary 필드 (요약 캐시 write-through 용)."""
+        return {
+            int(self.user_ids[i]): {
+                "total_value": int(self.total_value[i]),
+                "total_profit_loss": int(self.profit_loss[i]),
+                "total_profit_loss_pct": round(float(self.profit_loss_pct[i]), 2),
+                "total_rewards_received": int(self.rewards[i]),
+            }
+            for i in range(len(self))
+        }
+
+
+def valuate(
+    portfolios: list, holdings: list, price_map: dict[str, int]
+) -> PortfolioValuation:
+    """portfolios: (id, user_id, username, initial_cash, current_cash, total_rewards_received) 행,
+    holdings: (portfolio_id, stock_code, quantity, avg_buy_price) 행.
+
+    가격이 없는 종목은 평균 매입가로 평가한다. 같은 user_id의 두 번째 포트폴리오부터는
+    제외한다 (UNIQUE 제약 이전 데이터 방어).
+    """
+    seen: set[int] = set()
+    rows = []
+    for p in portfolios:
+        if p.user_id not in seen:
+            seen.add(p.user_id)
+            rows.append(p)
+
+    n = len(rows)
+    index = {p.id: i for i, p in enumerate(rows)}
+    owner = np.fromiter((index.get(h.portfolio_id, -1) for h in holdings), dtype=np.int64, count=len(holdings))
+    quantity = np.fromiter((h.quantity for h in holdings), dtype=np.float64, count=len(holdings))
+    price = np.fromiter(
+        (price_map.get(h.stock_code) or float(h.avg_buy_price) for h in holdings),
+        dtype=np.float64, count=len(holdings),
+    )
+    mine = owner >= 0
+    holdings_value = np.bincount(owner[mine], weights=(price * quantity)[mine], minlength=n)
+
+    initial = np.fromiter((p.initial_cash for p in rows), dtype=np.float64, count=n)
+    cash = np.fromiter((p.current_cash for p in rows), dtype=np.float64, count=n)
+    rewards = np.fromiter((p.total_rewards_received or 0 for p in rows), dtype=np.float64, count=n)
+    total_value = cash + holdings_value
+    # 수익률 계산: 누적 보상액 제외
+    profit_loss = total_value - initial - rewards
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(initial > 0, profit_loss / initial * 100, 0.0)
+
+    return PortfolioValuation(
+        portfolio_ids=np.fromiter((p.id for p in rows), dtype=np.int64, count=n),
+        user_ids=np.fromiter((p.user_id for p in rows), dtype=np.int64, count=n),
+        usernames=[p.username for p in rows],
+        cash=cash,
+        rewards=rewards,
+        holdings_value=holdings_value,
+        total_value=total_value,
+        profit_loss=profit_loss,
+        profit_loss_pct=pct,
+    )
+
+
+async def _price_map(codes: list[str]) -> dict[str, int]:
+    """조회 경로(routes/portfolio)와 같은 시세 소스."""
+    return {p["stock_code"]: p["current_price"] for p in await get_batch_prices(codes)}
+
+
+async def value_portfolios(
+    db: AsyncSession, user_ids: Optional[Iterable[int]] = None
+) -> PortfolioValuation:
+    """포트폴리오 평가 (user_ids가 없으면 전체, user_id 순)."""
+    valued_at = time.time()
+    stmt = (
+        select(
+            UserPortfolio.id,
+            UserPortfolio.user_id,
+            User.username,
+            UserPortfolio.initial_cash,
+            UserPortfolio.current_cash,
+            UserPortfolio.total_rewards_received,
+        )
+        .join(User, User.id == UserPortfolio.user_id)
+        .order_by(UserPortfolio.user_id, UserPortfolio.id)
+    )
+    if user_ids is not None:
+        stmt = stmt.where(UserPortfolio.user_id.in_(list(user_ids)))
+    portfolios = (await db.execute(stmt)).all()
+
+    holdings = []
+    if portfolios:
+        holdings_stmt = select(
+            PortfolioHolding.portfolio_id,
+            PortfolioHolding.stock_code,
+            PortfolioHolding.quantity,
+            PortfolioHolding.avg_buy_price,
+        )
+        if user_ids is not None:
+            holdings_stmt = holdings_stmt.where(
+                PortfolioHolding.portfolio_id.in_([p.id for p in portfolios])
+            )
+        holdings = (await db.execute(holdings_stmt)).all()
+
+    return await _value_rows(portfolios, holdings, valued_at)
+
+
+async def value_trade_rows(rows: list, valued_at: float) -> PortfolioValuation:
+    """매매 문장(portfolio_service 매수/매도 SQL)이 RETURNING 한 체결 후 상태로 평가한다.
+
+    포트폴리오/보유 종목을 다시 읽지 않는다. 같은 포트폴리오가 여러 번 체결됐으면 마지막 행을 쓴다.
+    """
+    latest = {r.id: r for r in rows}
+    holdings = [
+        SimpleNamespace(portfolio_id=r.id, stock_code=code, quantity=quantity, avg_buy_price=avg)
+        for r in latest.values()
+        for code, quantity, avg in (json.loads(r.holdings) if isinstance(r.holdings, str) else r.holdings)
+    ]
+    return await _value_rows(list(latest.values()), holdings, valued_at)
+
+
+async def _value_rows(portfolios: list, holdings: list, valued_at: float) -> PortfolioValuation:
+    codes = sorted({h.stock_code for h in holdings})
+    price_map = await _price_map(codes) if codes else {}
+    valuation = valuate(portfolios, holdings, price_map)
+    valuation.valued_at = valued_at
+    return valuation
+
+
+# --- NAV 기록 ---
+
+
+async def write_nav_history(db: AsyncSession, valuation: PortfolioValuation, nav_date: date) -> int:
+    """평가 결과를 nav_date 행으로 upsert 한다. 기록한 행 수 반환."""
+    now = datetime.utcnow()
+    rows = [
+        {
+            "portfolio_id": int(valuation.portfolio_ids[i]),
+            "user_id": int(valuation.user_ids[i]),
+            "nav_date": nav_date,
+            "cash": int(valuation.cash[i]),
+            "holdings_value": int(round(valuation.holdings_value[i])),
+            "total_value": int(round(valuation.total_value[i])),
+            "profit_loss": int(round(valuation.profit_loss[i])),
+            "profit_loss_pct": round(float(valuation.profit_loss_pct[i]), 4),
+            "created_at": now,
+        }
+        for i in range(len(valuation))
+    ]
+    for start in range(0, len(rows), NAV_UPSERT_CHUNK):
+        stmt = pg_insert(PortfolioNavHistory).values(rows[start:start + NAV_UPSERT_CHUNK])
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_portfolio_nav_history_portfolio_date",
+            set_={
+                col: stmt.excluded[col]
+                for col in ("cash", "holdings_value", "total_value", "profit_loss",
+                            "profit_loss_pct", "created_at")
+            },
+        )
+        await db.execute(stmt)
+    await db.commit()
+    return len(rows)
+
+
+async def run_nav_job(nav_date: Optional[date] = None) -> Optional[int]:
+    """장 마감 후 전 포트폴리오를 평가해 NAV를 기록하고 리더보드/요약 캐시도 같은 결과로 교체한다.
+
+    워커 중 락을 잡은 한 곳만 종가 스냅샷을 다시 받고 평가한다. 수행하지 않았으면 None.
+    """
+    nav_date = nav_date or latest_trading_day()
+    cache = await get_redis_cache()
+    if cache.client is not None:
+        try:
+            acquired = await cache.client.set(
+                key_single_flight_lock("nav_job", nav_date.isoformat()), "1",
+                nx=True, px=NAV_JOB_LOCK_MS,
+            )
+        except Exception as e:
+            logger.debug("NAV job lock error: %s", e)
+            acquired = True
+        if not acquired:
+            return None
+
+    started = time.monotonic()
+    # 종가 반영된 스냅샷으로 평가 (전종목 보드 조회는 락을 잡은 워커만)
+    await refresh_market_snapshot()
+    async with AsyncSessionLocal() as session:
+        valuation = await value_portfolios(session)
+        written = await write_nav_history(session, valuation, nav_date)
+
+        # leaderboard / portfolio_summary 가 이 모듈(value_portfolios)을 import 하므로 지연 import
+        from app.services.leaderboard import rebuild_leaderboard
+        from app.services.portfolio_summary import write_summaries
+        await rebuild_leaderboard(session, entries=valuation.entries(), valued_at=valuation.valued_at)
+        await write_summaries(valuation)
+
+    logger.info("NAV 기록 완료: %s, %d개 포트폴리오 (%.2fs)", nav_date, written, time.monotonic() - started)
+    return written
+
+
+# --- NAV 조회 ---
+
+
+async def get_nav_history(db: AsyncSession, user_id: int, days: int) -> list[PortfolioNavHistory]:
+    """최근 days일 NAV (날짜 오름차순). (portfolio_id, nav_date) 유니크 인덱스 범위 스캔.
+
+    user_id 로는 인덱스가 없으므로 사용자 포트폴리오 id(ix_user_portfolios_user_id)를 먼저 풀어 건다.
+    """
+    since = datetime.now(KST).date() - timedelta(days=days)
+    portfolio_id = (
+        select(UserPortfolio.id).where(UserPortfolio.user_id == user_id).scalar_subquery()
+    )
+    stmt = (
+        select(PortfolioNavHistory)
+        .where(PortfolioNavHistory.portfolio_id == portfolio_id, PortfolioNavHistory.nav_date >= since)
+        .order_by(PortfolioNavHistory.nav_date)
+    )
+    return list((await db.execute(stmt)).scalars().all())
+
+
+async def get_current_nav(db: AsyncSession, user_id: int) -> Optional[PortfolioNavHistory]:
+    """장 마감 후 아직 유효한 NAV (마지막 거래일 종가 기준, 이후 매매/보상 없음). 장중이면 None."""
+    if is_market_session():
+        return None
+    stmt = (
+        select(PortfolioNavHistory)
+        .join(UserPortfolio, UserPortfolio.id == PortfolioNavHistory.portfolio_id)
+        .where(
+            UserPortfolio.user_id == user_id,
+            PortfolioNavHistory.nav_date == latest_trading_day(),
+            PortfolioNavHistory.created_at >= UserPortfolio.updated_at,
+        )
+        .limit(1)
+    )
+    return (await db.execute(stmt)).scalars().first()
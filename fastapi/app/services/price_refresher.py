@@ -0,0 +1,236 @@
+"""Hot set 종목 가격 백그라운드 선갱신.
+
+요청 경로에서 캐시가 만료되면 마침 그 요청을 보낸 사용자가 upstream 지연을 떠안는다.
+자주 조회되는 종목(hot set)의 가격 캐시를 만료 전에 미리 갱신해 이를 없앤다.
+
+hot set 구성:
+- portfolio_holdings 보유 종목, watchlists 관심종목 (DB, HOT_SET_RELOAD_SECONDS 주기)
+- 최근 /trading/stocks/{code} 조회 종목 (Redis ZSET, HOT_HIT_WINDOW 이내)
+- 지정가 대기 주문 종목 (order_matching 호가창)
+
+갱신된 시세는 지정가 매칭 엔진에 틱으로 넘겨 체결 조건에 도달한 주문을 정산한다.
+KIS 가 설정되지 않았으면 선갱신은 하지 않고, 전종목 시장 스냅샷(market_snapshot, pykrx) 시세를
+대기 주문 종목의 틱으로 넘긴다 — 지정가 주문은 어느 환경에서든 체결된다.
+
+워커가 여러 개여도 사이클마다 Redis 리더 락을 잡은 워커 하나만 갱신한다. 정상 종료한
+사이클의 락은 TTL(주기의 90%)로 만료되어 주기당 한 번만 돌게 하고, 사이클이 실패하거나
+취소(종료)되면 바로 풀어 다른 워커가 다음 사이클을 기다리지 않고 이어받게 한다.
+갱신 호출은 KIS 최하위 레인(ranking)으로 나가며, 사이클당 KIS 예산의 일부만 사용한다.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.core.database import AsyncSessionLocal
+from app.core.redis_keys import key_price_hot_set, key_price_refresher_leader
+from app.metrics import PRICE_REFRESH_TOTAL
+from app.services.kis_scheduler import KIS_RATE_PER_SEC, LANE_RANKING, kis_priority
+from app.services.kis_service import get_kis_service
+from app.services.market_calendar import is_market_session
+from app.services.market_snapshot import lookup_prices
+from app.services.order_matching import get_matching_engine
+from app.services.redis_cache import get_redis_cache
+from app.services.single_flight import RELEASE_LOCK_LUA
+from app.services.stock_price_service import price_cache_key, refresh_price
+
+logger = logging.getLogger(__name__)
+
+REFRESH_INTERVAL = 15          # 사이클 주기 (초)
+CLOSED_INTERVAL = 60           # 장 마감 시 확인 주기 (초)
+REFRESH_AHEAD = 20             # 남은 TTL이 이보다 짧으면 갱신 (초)
+KIS_BUDGET_SHARE = 0.5         # 사이클당 사용할 KIS 예산 비율
+HOT_HIT_WINDOW = 600           # 최근 조회 종목 유지 시간 (초)
+HOT_SET_RELOAD_SECONDS = 300   # DB hot set 재로드 주기 (초)
+
+_HOT_SET_SQL = text(
+    "SELECT DISTINCT stock_code FROM portfolio_holdings "
+    "UNION SELECT DISTINCT stock_code FROM watchlists"
+)
+
+
+async def record_price_hit(stock_code: str) -> None:
+    """종목 상세 조회를 hot set에 기록한다 (실패해도 무시)."""
+    try:
+        cache = await get_redis_cache()
+        if cache.client:
+            await cache.client.zadd(key_price_hot_set(), {stock_code: time.time()})
+    except Exception as e:
+        logger.debug("hot set record error (%s): %s", stock_code, e)
+
+
+class PriceRefresher:
+    """hot set 가격 캐시 선갱신 루프."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._db_codes: set[str] = set()
+        self._db_loaded_at = 0.0
+
+    @property
+    def budget_per_cycle(self) -> int:
+        return max(1, int(KIS_RATE_PER_SEC * REFRESH_INTERVAL * KIS_BUDGET_SHARE))
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            interval = REFRESH_INTERVAL
+            try:
+                if is_market_session():
+                    await self.run_cycle()
+                else:
+                    interval = CLOSED_INTERVAL
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("가격 선갱신 사이클 실패: %s", e)
+            await asyncio.sleep(interval)
+
+    async def _load_db_codes(self) -> set[str]:
+        if time.monotonic() - self._db_loaded_at < HOT_SET_RELOAD_SECONDS:
+            return self._db_codes
+        try:
+            async with AsyncSessionLocal() as session:
+                rows = await session.execute(_HOT_SET_SQL)
+                self._db_codes = {r[0] for r in rows if r[0]}
+            self._db_loaded_at = time.monotonic()
+        except Exception as e:
+            logger.warning("hot set DB 로드 실패 (이전 목록 사용): %s", e)
+        return self._db_codes
+
+    async def hot_codes(self, client) -> set[str]:
+        codes = set(await self._load_db_codes())
+        now = time.time()
+        pipe = client.pipeline(transaction=False)
+        pipe.zremrangebyscore(key_price_hot_set(), 0, now - HOT_HIT_WINDOW)
+        pipe.zrange(key_price_hot_set(), 0, -1)
+        _, recent = await pipe.execute()
+        codes.update(recent)
+        return codes
+
+    async def run_cycle(self) -> int:
+        """한 사이클 실행. 갱신한 종목 수를 반환한다 (KIS 미설정이면 스냅샷 틱만, 0)."""
+        cache = await get_redis_cache()
+        client = cache.client
+        if client is None:
+            return 0
+
+        # 사이클당 한 워커만 갱신
+        token = uuid.uuid4().hex
+        leader = await client.set(
+            key_price_refresher_leader(), token, nx=True, px=int(REFRESH_INTERVAL * 1000 * 0.9)
+        )
+        if not leader:
+            return 0
+        try:
+            return await self._refresh(client)
+        except BaseException:
+            await _release_leader(client, token)
+            raise
+
+    async def _refresh(self, client) -> int:
+        engine = get_matching_engine()
+        try:
+            await engine.sync()
+        except Exception as e:
+            logger.warning("지정가 호가창 동기화 실패: %s", e)
+        if not get_kis_service().is_configured:
+            await self._snapshot_tick(engine)
+            return 0
+        codes = sorted(await self.hot_codes(client) | engine.codes())
+        if not codes:
+            return 0
+
+        # 남은 TTL을 파이프라인 한 번으로 조회
+        pipe = client.pipeline(transaction=False)
+        for code in codes:
+            pipe.pttl(price_cache_key(code))
+        ttls = await pipe.execute()
+
+        # 만료 임박(또는 없음) 순으로 예산만큼만 갱신
+        due = sorted(
+            (ttl if ttl >= 0 else -1, code)
+            for code, ttl in zip(codes, ttls)
+            if ttl < REFRESH_AHEAD * 1000
+        )[: self.budget_per_cycle]
+
+        refreshed = 0
+        ticks: dict[str, int] = {}
+        with kis_priority(LANE_RANKING):
+            for _, code in due:
+                try:
+                    price = await refresh_price(code)
+                    if price:
+                        refreshed += 1
+                        ticks[code] = price.get("current_price")
+                        PRICE_REFRESH_TOTAL.labels("success").inc()
+                    else:
+                        PRICE_REFRESH_TOTAL.labels("empty").inc()
+                except Exception as e:
+                    PRICE_REFRESH_TOTAL.labels("fail").inc()
+                    logger.debug("가격 선갱신 실패 (%s): %s", code, e)
+
+        if due:
+            logger.debug("가격 선갱신: hot=%d due=%d refreshed=%d", len(codes), len(due), refreshed)
+        await _match(engine, ticks)
+        return refreshed
+
+    async def _snapshot_tick(self, engine) -> None:
+        """KIS 없이 대기 주문 종목의 스냅샷 시세를 틱으로 넘긴다 (메모리 조회, upstream 호출 없음)."""
+        codes = engine.codes()
+        if not codes:
+            return
+        found, _ = lookup_prices(sorted(codes))
+        await _match(engine, {p["stock_code"]: p["current_price"] for p in found})
+
+
+async def _match(engine, ticks: dict[str, int]) -> None:
+    if not ticks:
+        return
+    try:
+        await engine.on_prices(ticks)
+    except Exception as e:
+        logger.warning("지정가 매칭 실패 (다음 틱 재시도): %s", e)
+
+
+async def _release_leader(client, token: str) -> None:
+    try:
+        await client.eval(RELEASE_LOCK_LUA, 1, key_price_refresher_leader(), token)
+    except Exception as e:
+        logger.debug("가격 선갱신 리더 락 해제 실패: %s", e)
+
+
+_refresher: Optional[PriceRefresher] = None
+
+
+def get_price_refresher() -> PriceRefresher:
+    """가격 선갱신기 싱글톤 반환."""
+    global _refresher
+    if _refresher is None:
+        _refresher = PriceRefresher()
+    return _refresher
+
+
+def start_price_refresher() -> None:
+    get_price_refresher().start()
+
+
+async def stop_price_refresher() -> None:
+    if _refresher is not None:
+        await _refresher.stop()
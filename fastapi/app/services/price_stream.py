@@ -0,0 +1,291 @@
+"""실시간 시세 스트리밍 허브 (SSE /trading/stream).
+
+탭마다 /portfolio/stock/price/{code} 를 폴링하면 upstream 호출이 탭 수만큼 늘어난다.
+허브는 구독 중인 종목만 주기적으로 한 번씩 조회해 모든 구독자에게 나눠 준다.
+
+- 워커 간 중복 제거: 종목별 폴링 권한을 Redis SET NX PX(주기만큼)로 나눠 가져,
+  한 주기에 한 종목은 전체 워커 중 한 곳에서만 조회한다.
+- 조회: 캐시(stock_price 최대 60초)가 아니라 upstream 현재가를 직접 받는다(refresh_price —
+  받은 값으로 가격 캐시도 갱신). KIS 미설정이면 pykrx 일봉뿐이라 캐시 경유 조회를 쓴다.
+- 워커 간 전달: 조회 결과는 항상 Redis pub/sub 채널로 발행하고, 각 워커의 리스너가 받아
+  로컬 구독자에게 fan-out 한다. 이 워커의 리스너가 아직 구독 전이면 로컬에도 바로 전달한다
+  (리스너로 다시 받아도 값이 같아 deliver 에서 걸러진다). Redis가 없으면 로컬 fan-out만 한다.
+- 느린 클라이언트: 구독자별로 종목당 최신 값 1개만 보관(conflation)하므로 메모리가
+  늘지 않는다. SLOW_CLIENT_SECONDS 동안 한 번도 가져가지 않으면 연결을 끊는다.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Iterable, Optional
+
+from app.core.redis_keys import key_price_stream_channel, key_single_flight_lock
+from app.metrics import PRICE_STREAM_CONNECTIONS, PRICE_STREAM_EVENTS_TOTAL
+from app.services.kis_scheduler import LANE_RANKING, kis_priority
+from app.services.kis_service import get_kis_service
+from app.services.market_calendar import is_market_session
+from app.services.price_refresher import record_price_hit
+from app.services.redis_cache import get_redis_cache
+from app.services.stock_price_service import get_current_price, refresh_price
+
+logger = logging.getLogger(__name__)
+
+MAX_CODES_PER_CONNECTION = 20
+POLL_INTERVAL = 3.0          # 장중 종목별 조회 주기 (초)
+CLOSED_POLL_INTERVAL = 60.0  # 장 마감 시 조회 주기 (초)
+POLL_CONCURRENCY = 8
+HEARTBEAT_SECONDS = 15.0
+SLOW_CLIENT_SECONDS = 60.0
+
+
+async def fetch_live_price(code: str) -> Optional[dict]:
+    """스트림용 현재가 — KIS 설정 시 캐시를 건너뛰고 upstream 에서 직접 조회."""
+    if get_kis_service().is_configured:
+        return await refresh_price(code)
+    return await get_current_price(code)
+
+
+class PriceSubscription:
+    """SSE 연결 하나의 구독 상태. 종목별 최신 값만 보관한다."""
+
+    def __init__(self, codes: Iterable[str]):
+        self.codes = frozenset(codes)
+        self.closed = False
+        self.detached = False
+        self._pending: dict[str, dict] = {}
+        self._event = asyncio.Event()
+        self._last_drain = time.monotonic()
+
+    def offer(self, code: str, payload: dict) -> None:
+        if self.closed:
+            return
+        if self._pending and time.monotonic() - self._last_drain > SLOW_CLIENT_SECONDS:
+            # 오래 가져가지 않는 클라이언트 → 연결 종료
+            self.close()
+            PRICE_STREAM_EVENTS_TOTAL.labels("slow_client").inc()
+            return
+        if code in self._pending:
+            PRICE_STREAM_EVENTS_TOTAL.labels("conflated").inc()
+        self._pending[code] = payload
+        self._event.set()
+
+    def close(self) -> None:
+        self.closed = True
+        self._event.set()
+
+    async def next_batch(self, timeout: float) -> list[dict]:
+        """새 시세가 올 때까지(최대 timeout) 기다렸다가 쌓인 값을 모두 가져간다."""
+        if not self._pending and not self.closed:
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._event.clear()
+        batch = list(self._pending.values())
+        self._pending.clear()
+        self._last_drain = time.monotonic()
+        return batch
+
+
+class PriceStreamHub:
+    """워커 내 구독자 관리 + 종목별 upstream 폴링 + Redis pub/sub 브리지."""
+
+    def __init__(self):
+        self._subs: dict[str, set[PriceSubscription]] = {}
+        self._last: dict[str, dict] = {}
+        self._poller: Optional[asyncio.Task] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._listening = False
+
+    @property
+    def subscribed_codes(self) -> list[str]:
+        return list(self._subs)
+
+    def subscribe(self, codes: Iterable[str]) -> PriceSubscription:
+        sub = PriceSubscription(codes)
+        for code in sub.codes:
+            self._subs.setdefault(code, set()).add(sub)
+            # 이미 받은 시세가 있으면 즉시 전달
+            if code in self._last:
+                sub.offer(code, self._last[code])
+        PRICE_STREAM_CONNECTIONS.inc()
+        self._ensure_tasks()
+        return sub
+
+    async def prime(self, sub: PriceSubscription) -> None:
+        """아직 받은 시세가 없는 종목은 구독 직후 한 번 조회해 이 구독자에게만 보낸다."""
+        missing = [code for code in sub.codes if code not in self._last]
+        if not missing:
+            return
+        with kis_priority(LANE_RANKING):
+            prices = await asyncio.gather(
+                *(get_current_price(code) for code in missing), return_exceptions=True
+            )
+        for code, price in zip(missing, prices):
+            if price and not isinstance(price, Exception):
+                sub.offer(code, price)
+
+    def unsubscribe(self, sub: PriceSubscription) -> None:
+        sub.close()
+        if sub.detached:
+            return
+        sub.detached = True
+        for code in sub.codes:
+            subs = self._subs.get(code)
+            if subs is None:
+                continue
+            subs.discard(sub)
+            if not subs:
+                del self._subs[code]
+                self._last.pop(code, None)
+        PRICE_STREAM_CONNECTIONS.dec()
+
+    def deliver(self, code: str, payload: dict) -> int:
+        """로컬 구독자에게 fan-out. 값이 바뀌지 않았으면 건너뛴다. 전달한 구독자 수 반환."""
+        subs = self._subs.get(code)
+        if not subs:
+            return 0
+        last = self._last.get(code)
+        if last is not None and last.get("current_price") == payload.get("current_price") \
+                and last.get("volume") == payload.get("volume"):
+            return 0
+        self._last[code] = payload
+        delivered = 0
+        for sub in list(subs):
+            sub.offer(code, payload)
+            if sub.closed:
+                self.unsubscribe(sub)
+            else:
+                delivered += 1
+        PRICE_STREAM_EVENTS_TOTAL.labels("delivered").inc(delivered)
+        return delivered
+
+    # --- 백그라운드 작업 ---
+
+    def _ensure_tasks(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._poller is None or self._poller.done():
+            self._poller = loop.create_task(self._poll_loop())
+        if self._listener is None or self._listener.done():
+            self._listener = loop.create_task(self._listen())
+
+    async def stop(self) -> None:
+        for task in (self._poller, self._listener):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._poller = self._listener = None
+        self._listening = False
+
+    async def _poll_loop(self) -> None:
+        while self._subs:
+            interval = POLL_INTERVAL if is_market_session() else CLOSED_POLL_INTERVAL
+            try:
+                await self.poll_once(interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("시세 스트림 폴링 실패: %s", e)
+            await asyncio.sleep(interval)
+
+    async def _claim(self, client, codes: list[str], interval: float) -> list[str]:
+        """이번 주기에 이 워커가 조회할 종목 (Redis 없으면 전부)."""
+        if client is None:
+            return codes
+        try:
+            pipe = client.pipeline(transaction=False)
+            for code in codes:
+                pipe.set(
+                    key_single_flight_lock("price_stream", code), "1",
+                    nx=True, px=max(1, int(interval * 1000 * 0.9)),
+                )
+            claimed = await pipe.execute()
+        except Exception as e:
+            logger.debug("price stream claim error (local polling): %s", e)
+            return codes
+        return [code for code, ok in zip(codes, claimed) if ok]
+
+    async def poll_once(self, interval: float = POLL_INTERVAL) -> int:
+        """구독 종목 중 이번 주기 담당분을 조회해 발행한다. 발행 건수 반환."""
+        codes = self.subscribed_codes
+        if not codes:
+            return 0
+        cache = await get_redis_cache()
+        client = cache.client
+        mine = await self._claim(client, codes, interval)
+        semaphore = asyncio.Semaphore(POLL_CONCURRENCY)
+
+        async def _fetch(code: str) -> Optional[dict]:
+            async with semaphore:
+                # 스트림 종목은 hot set에 올려 가격 선갱신 대상으로 유지
+                await record_price_hit(code)
+                with kis_priority(LANE_RANKING):
+                    return await fetch_live_price(code)
+
+        results = await asyncio.gather(*(_fetch(c) for c in mine), return_exceptions=True)
+        published = 0
+        for code, price in zip(mine, results):
+            if isinstance(price, Exception) or not price:
+                continue
+            await self._publish(client, code, price)
+            published += 1
+        return published
+
+    async def _publish(self, client, code: str, price: dict) -> None:
+        # 다른 워커 구독자를 위해 리스너 준비 여부와 무관하게 항상 발행
+        if client is not None:
+            try:
+                await client.publish(key_price_stream_channel(), json.dumps({"code": code, "price": price}))
+                if self._listening:
+                    return
+            except Exception as e:
+                logger.debug("price stream publish error (local fan-out): %s", e)
+        self.deliver(code, price)
+
+    async def _listen(self) -> None:
+        """다른 워커(및 자신)가 발행한 시세를 받아 로컬 구독자에게 전달한다."""
+        cache = await get_redis_cache()
+        if cache.client is None:
+            return
+        pubsub = cache.client.pubsub()
+        try:
+            await pubsub.subscribe(key_price_stream_channel())
+            self._listening = True
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    data = json.loads(message["data"])
+                    self.deliver(data["code"], data["price"])
+                except Exception as e:
+                    logger.debug("price stream message error: %s", e)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("시세 스트림 pub/sub 리스너 종료 (로컬 fan-out 전환): %s", e)
+        finally:
+            self._listening = False
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+
+_hub: Optional[PriceStreamHub] = None
+
+
+def get_price_stream_hub() -> PriceStreamHub:
+    """시세 스트리밍 허브 싱글톤 반환."""
+    global _hub
+    if _hub is None:
+        _hub = PriceStreamHub()
+    return _hub
+
+
+async def stop_price_stream_hub() -> None:
+    if _hub is not None:
+        await _hub.stop()
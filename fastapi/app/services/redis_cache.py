@@ -2,6 +2,15 @@
 # [2026-02-06] Redis 캐싱 서비스
 AI Tutor 단어 설명, Glossary 조회를 위한 캐싱 레이어.
 
+JSON 캐시(get_json/set_json, glossary/user_settings, cache.get_or_set)는 2단:
+- L1: 워커 프로세스 LRU (역직렬화된 객체, L1_MAX_ENTRIES / L1_MAX_TTL 제한)
+- L2: Redis
+set/delete 는 같은 파이프라인으로 무효화 채널에 키를 발행하고, 각 워커의 리스너가
+자기 L1 에서 그 키를 지운다. 리스너가 구독 중일 때만 L1 을 쓴다 (메시지 유실 방지).
+
+파이프라인 산출물 캐시는 키에 태그 세대(get_generation)를 넣는다. 파이프라인이 끝나면
+bump_generations() 로 세대만 올리고, 이전 세대 키는 TTL 로 만료된다 (SCAN/DEL 없음).
+
 캐시 키 패턴:
 - term:{term_name} - AI Tutor 용어 설명 (TTL: 24시간)
 - glossary:{term_id} - 용어집 조회 (TTL: 24시간)
@@ -10,14 +19,19 @@ AI Tutor 단어 설명, Glossary 조회를 위한 캐싱 레이어.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import time
+import uuid
 from typing import Any, Optional
 
 import redis.asyncio as redis
 
 from ..core.config import settings
+from app.core.redis_keys import key_cache_generation, key_cache_invalidation_channel
 from app.metrics import CACHE_HIT_TOTAL
+from app.services.l1_cache import L1Cache
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +41,20 @@ TTL_GLOSSARY = 60 * 60 * 24  # 24시간
 TTL_USER_SETTINGS = 60 * 60 * 2  # 2시간 (세션)
 TTL_CHAT_MESSAGES = 60 * 60  # 1시간
 
+# L1 (프로세스 로컬) 설정
+L1_MAX_ENTRIES = 2048
+L1_MAX_TTL = 300  # pub/sub 메시지 유실 대비 L1 최대 보관 (초)
+LISTENER_RETRY_SECONDS = 5.0
+
+# 캐시 세대 태그 — 태그 세대를 키에 넣는 캐시는 세대를 올리는 것만으로 무효화된다
+TAG_KEYWORDS = "keywords"      # /keywords/today
+TAG_BRIEFINGS = "briefings"    # /briefings/latest
+TAG_PIPELINE = "pipeline"      # 파이프라인 산출물 전체 (조건부 GET ETag)
+PIPELINE_CACHE_TAGS = (TAG_KEYWORDS, TAG_BRIEFINGS, TAG_PIPELINE)
+
+_INVALIDATE_ALL = "*"
+_MISSING = object()
+
 
 class RedisCacheService:
     """Redis 캐싱 서비스."""
@@ -34,6 +62,12 @@ class RedisCacheService:
     def __init__(self):
         self._pool: Optional[redis.ConnectionPool] = None
         self._client: Optional[redis.Redis] = None
+        self._l1 = L1Cache(L1_MAX_ENTRIES)
+        self._l1_ready = False
+        self._origin = uuid.uuid4().hex[:12]
+        self._invalidations = 0
+        self._listener: Optional[asyncio.Task] = None
+        self._listener_retry_at = 0.0
 
     async def connect(self) -> None:
         """Redis 연결 초기화."""
@@ -54,6 +88,13 @@ class RedisCacheService:
 
     async def disconnect(self) -> None:
         """Redis 연결 해제."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
         if self._client:
             await self._client.close()
             self._client = None
@@ -77,7 +118,7 @@ class RedisCacheService:
         key = f"term:{difficulty}:{term.lower()}"
         try:
             data = await self._client.get(key)
-            CACHE_HIT_TOTAL.labels("term_explanation", "true" if data else "false").inc()
+            CACHE_HIT_TOTAL.labels("term_explanation", "l2", "true" if data else "false").inc()
             return data
         except Exception as e:
             logger.warning(f"Redis get_term_explanation error: {e}")
@@ -101,92 +142,33 @@ class RedisCacheService:
 
     async def get_glossary(self, term_id: int) -> Optional[dict]:
         """용어집 캐시 조회."""
-        if not self._is_available():
-            return None
-        key = f"glossary:{term_id}"
-        try:
-            data = await self._client.get(key)
-            CACHE_HIT_TOTAL.labels("glossary", "true" if data else "false").inc()
-            return json.loads(data) if data else None
-        except Exception as e:
-            logger.warning(f"Redis get_glossary error: {e}")
-            return None
+        return await self.get_json(f"glossary:{term_id}", cache="glossary")
 
     async def set_glossary(self, term_id: int, data: dict) -> bool:
         """용어집 캐시 저장."""
-        if not self._is_available():
-            return False
-        key = f"glossary:{term_id}"
-        try:
-            await self._client.setex(key, TTL_GLOSSARY, json.dumps(data, ensure_ascii=False))
-            return True
-        except Exception as e:
-            logger.warning(f"Redis set_glossary error: {e}")
-            return False
+        return await self.set_json(f"glossary:{term_id}", data, TTL_GLOSSARY)
 
     async def get_glossary_by_term(self, term_name: str) -> Optional[dict]:
         """용어명으로 용어집 캐시 조회."""
-        if not self._is_available():
-            return None
-        key = f"glossary:name:{term_name.lower()}"
-        try:
-            data = await self._client.get(key)
-            CACHE_HIT_TOTAL.labels("glossary_by_term", "true" if data else "false").inc()
-            return json.loads(data) if data else None
-        except Exception as e:
-            logger.warning(f"Redis get_glossary_by_term error: {e}")
-            return None
+        return await self.get_json(f"glossary:name:{term_name.lower()}", cache="glossary_by_term")
 
     async def set_glossary_by_term(self, term_name: str, data: dict) -> bool:
         """용어명으로 용어집 캐시 저장."""
-        if not self._is_available():
-            return False
-        key = f"glossary:name:{term_name.lower()}"
-        try:
-            await self._client.setex(key, TTL_GLOSSARY, json.dumps(data, ensure_ascii=False))
-            return True
-        except Exception as e:
-            logger.warning(f"Redis set_glossary_by_term error: {e}")
-            return False
+        return await self.set_json(f"glossary:name:{term_name.lower()}", data, TTL_GLOSSARY)
 
     # ==================== User Settings ====================
 
     async def get_user_settings(self, user_id: int) -> Optional[dict]:
         """사용자 설정 캐시 조회."""
-        if not self._is_available():
-            return None
-        key = f"user_settings:{user_id}"
-        try:
-            data = await self._client.get(key)
-            CACHE_HIT_TOTAL.labels("user_settings", "true" if data else "false").inc()
-            return json.loads(data) if data else None
-        except Exception as e:
-            logger.warning(f"Redis get_user_settings error: {e}")
-            return None
+        return await self.get_json(f"user_settings:{user_id}", cache="user_settings")
 
     async def set_user_settings(self, user_id: int, data: dict) -> bool:
         """사용자 설정 캐시 저장."""
-        if not self._is_available():
-            return False
-        key = f"user_settings:{user_id}"
-        try:
-            await self._client.setex(key, TTL_USER_SETTINGS, json.dumps(data, ensure_ascii=False))
-            return True
-        except Exception as e:
-            logger.warning(f"Redis set_user_settings error: {e}")
-            return False
+        return await self.set_json(f"user_settings:{user_id}", data, TTL_USER_SETTINGS)
 
     async def invalidate_user_settings(self, user_id: int) -> bool:
         """사용자 설정 캐시 무효화."""
-        if not self._is_available():
-            return False
-        key = f"user_settings:{user_id}"
-        try:
-            await self._client.delete(key)
-            return True
-        except Exception as e:
-            logger.warning(f"Redis invalidate_user_settings error: {e}")
-            return False
+        return await self.delete(f"user_settings:{user_id}")
 
     # ==================== Chat Session Messages ====================
 
@@ -197,7 +179,7 @@ class RedisCacheService:
         key = f"chat_messages:{session_id}"
         try:
             data = await self._client.get(key)
-            CACHE_HIT_TOTAL.labels("chat_messages", "true" if data else "false").inc()
+            CACHE_HIT_TOTAL.labels("chat_messages", "l2", "true" if data else "false").inc()
             return data
         except Exception as e:
             logger.warning(f"Redis get_chat_messages error: {e}")
@@ -227,39 +209,59 @@ class RedisCacheService:
             logger.warning(f"Redis invalidate_session_cache error: {e}")
             return False
 
-    # ==================== Pipeline Cache Invalidation ====================
+    # ==================== Generation (태그별 캐시 세대) ====================
 
-    async def invalidate_pipeline_caches(self) -> int:
-        """파이프라인 실행 후 API 응답 캐시 일괄 무효화.
+    async def get_generation(self, tag: str) -> Optional[int]:
+        """태그의 현재 캐시 세대 (L1 → Redis). Redis 미연결/오류 시 None.
 
-        Returns: 삭제된 키 수
+        세대를 키에 넣어 두면 bump_generations() 한 번으로 그 태그의 캐시 전체가 바뀐다.
         """
         if not self._is_available():
+            return None
+        key = key_cache_generation(tag)
+        generation = await self.get_json(key, cache="generation", default=_MISSING)
+        if generation is _MISSING:
+            # 아직 한 번도 올리지 않은 태그 → 0 으로 만들어 두어 다음 조회부터 L1 에 남게 한다
+            try:
+                await self._client.set(key, 0, nx=True)
+            except Exception as e:
+                logger.warning(f"Redis get_generation error [{tag}]: {e}")
+                return None
             return 0
+        try:
+            return int(generation)
+        except (TypeError, ValueError):
+            return None
+
+    async def bump_generations(self, *tags: str) -> dict[str, int]:
+        """태그 세대를 원자적으로(MULTI) 올리고 모든 워커의 L1 에서 이전 세대를 지운다.
+
+        이전 세대 키는 지우지 않는다 — 더 이상 조회되지 않고 TTL 로 만료된다.
+        """
+        if not self._is_available() or not tags:
+            return {}
+        keys = [key_cache_generation(tag) for tag in tags]
+        pipe = self._client.pipeline(transaction=True)
+        for key in keys:
+            pipe.incr(key)
+        for key in keys:
+            self.queue_invalidation(pipe, key)
+        results = await pipe.execute()
+        return {tag: int(value) for tag, value in zip(tags, results)}
+
+    async def invalidate_pipeline_caches(self) -> int:
+        """파이프라인 실행 후 산출물 캐시 세대를 올린다 (키 수와 무관하게 O(1)).
 
-        deleted = 0
+        Returns: 세대를 올린 태그 수
+        """
         try:
-            # 키워드 캐시: api:keywords:today:* 패턴 삭제
-            cursor = b"0"
-            while True:
-                cursor, keys = await self._client.scan(
-                    cursor=cursor, match="api:keywords:today:*", count=100
-                )
-                if keys:
-                    deleted += await self._client.delete(*keys)
-                if cursor == b"0" or cursor == 0:
-                    break
-
-            # 브리핑 캐시 삭제
-            for key in ["api:briefings:latest"]:
-                result = await self._client.delete(key)
-                deleted += result
-
-            logger.info(f"파이프라인 캐시 무효화 완료: {deleted}개 키 삭제")
+            generations = await self.bump_generations(*PIPELINE_CACHE_TAGS)
         except Exception as e:
             logger.warning(f"Redis invalidate_pipeline_caches error: {e}")
-
-        return deleted
+            return 0
+        if generations:
+            logger.info(f"파이프라인 캐시 세대 갱신: {generations}")
+        return len(generations)
 
     # ==================== Generic Cache ====================
 
@@ -274,27 +276,131 @@ class RedisCacheService:
             return None
 
     async def set(self, key: str, value: str, ttl: int = 3600) -> bool:
-        """일반 캐시 저장."""
+        """일반 캐시 저장 (모든 워커의 L1 에서 해당 키 무효화)."""
         if not self._is_available():
             return False
         try:
-            await self._client.setex(key, ttl, value)
+            pipe = self._client.pipeline(transaction=False)
+            pipe.setex(key, ttl, value)
+            self.queue_invalidation(pipe, key)
+            await pipe.execute()
             return True
         except Exception as e:
             logger.warning(f"Redis set error: {e}")
             return False
 
     async def delete(self, key: str) -> bool:
-        """캐시 삭제."""
+        """캐시 삭제 (모든 워커의 L1 에서 해당 키 무효화)."""
         if not self._is_available():
             return False
         try:
-            await self._client.delete(key)
+            pipe = self._client.pipeline(transaction=False)
+            pipe.delete(key)
+            self.queue_invalidation(pipe, key)
+            await pipe.execute()
             return True
         except Exception as e:
             logger.warning(f"Redis delete error: {e}")
             return False
 
+    async def get_json(self, key: str, cache: str = "generic", default: Any = None) -> Any:
+        """JSON 캐시 조회 (L1 → Redis). 역직렬화된 객체를 반환하고 L1 에 채운다.
+
+        반환 객체는 다른 요청과 공유되므로 수정하지 말 것.
+        """
+        if not self._is_available():
+            return default
+        self._ensure_listener()
+        if self._l1_ready:
+            value = self._l1.get(key, _MISSING)
+            if value is not _MISSING:
+                CACHE_HIT_TOTAL.labels(cache, "l1", "true").inc()
+                return value
+            CACHE_HIT_TOTAL.labels(cache, "l1", "false").inc()
+
+        epoch = self._invalidations
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.pttl(key)
+            raw, pttl = await pipe.execute()
+            CACHE_HIT_TOTAL.labels(cache, "l2", "true" if raw is not None else "false").inc()
+            if raw is None:
+                return default
+            value = json.loads(raw)
+        except Exception as e:
+            logger.warning(f"Redis get_json error [{key}]: {e}")
+            return default
+
+        # 읽는 동안 무효화가 없었을 때만 채우고, Redis 에 남은 TTL 을 넘기지 않는다
+        if self._l1_ready and epoch == self._invalidations:
+            ttl = min(L1_MAX_TTL, pttl / 1000) if pttl and pttl > 0 else L1_MAX_TTL
+            self._l1.set(key, value, ttl)
+        return value
+
+    async def set_json(self, key: str, value: Any, ttl: int = 3600) -> bool:
+        """JSON 캐시 저장. L1 은 다음 조회 때 Redis 값으로 채워진다."""
+        return await self.set(key, json.dumps(value, ensure_ascii=False, default=str), ttl)
+
+    # ==================== L1 무효화 (pub/sub) ====================
+
+    def _drop_local(self, *keys: str) -> None:
+        # 무효화 한 건(메시지 하나)당 세대 1 증가 — 읽는 중이던 값은 L1 에 채우지 않는다
+        self._invalidations += 1
+        for key in keys:
+            if key == _INVALIDATE_ALL:
+                self._l1.clear()
+            else:
+                self._l1.delete(key)
+
+    def queue_invalidation(self, pipe, *keys: str) -> None:
+        """쓰기와 같은 파이프라인에 무효화 발행을 싣는다 (추가 왕복 없음).
+
+        여러 키는 메시지 하나로 묶는다 (키는 줄바꿈으로 구분). 파이프라인으로 직접 쓰는
+        경로(portfolio_summary.write_summaries)는 청크마다 한 번 호출해 워커별 발행/세대 증가를
+        청크당 1회로 줄인다.
+        """
+        if not keys:
+            return
+        self._drop_local(*keys)
+        pipe.publish(key_cache_invalidation_channel(), f"{self._origin} " + "\n".join(keys))
+
+    def _ensure_listener(self) -> None:
+        if self._listener is not None and not self._listener.done():
+            return
+        now = time.monotonic()
+        if now < self._listener_retry_at:
+            return
+        self._listener_retry_at = now + LISTENER_RETRY_SECONDS
+        self._listener = asyncio.get_running_loop().create_task(self._listen_invalidations())
+
+    async def _listen_invalidations(self) -> None:
+        """다른 워커가 발행한 키 무효화를 받아 L1 에서 지운다."""
+        pubsub = self._client.pubsub()
+        try:
+            await pubsub.subscribe(key_cache_invalidation_channel())
+            async for message in pubsub.listen():
+                kind = message.get("type")
+                if kind == "subscribe":
+                    # 구독 확정 전에 놓친 무효화가 있을 수 있으므로 비우고 시작
+                    self._drop_local(_INVALIDATE_ALL)
+                    self._l1_ready = True
+                elif kind == "message":
+                    origin, _, keys = message["data"].partition(" ")
+                    if origin != self._origin:
+                        self._drop_local(*keys.split("\n"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("L1 캐시 무효화 리스너 종료 (L1 비활성화): %s", e)
+        finally:
+            self._l1_ready = False
+            self._l1.clear()
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
 
 # 싱글톤 인스턴스
 _redis_cache: Optional[RedisCacheService] = None
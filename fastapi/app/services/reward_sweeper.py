@@ -0,0 +1,247 @@
+"""브리핑 보상 만기 일괄 처리 (멀티플라이어 적용/소멸).
+
+보상을 한 건씩 처리하면 건마다 포트폴리오(+거래 내역) 로드, 보유 종목 재평가, 커밋이
+반복된다. 스위퍼는
+
+1. 만기 지난 pending 보상을 ix_briefing_rewards_maturity 범위 조회로 한 번에 고르고
+2. 포트폴리오별 수익 여부를 한 번만 판정한 뒤 — 만기 세션(만기일 이하 마지막 거래일)의 종가
+   NAV, 그 행이 없으면(잡 누락) 일괄 현재가 평가. 현재가 조회(네트워크)는 행 잠금 전에 끝낸다.
+3. 같은 보상을 FOR UPDATE SKIP LOCKED 로 다시 잠가(여러 워커가 동시에 돌아도 같은 보상을
+   두 번 처리하지 않음) 보상 상태/포트폴리오 현금 갱신을 executemany UPDATE 두 번으로
+   한 트랜잭션에 반영한다.
+
+판정 기준은 만기 세션 종가 NAV 다 (이전에는 만기 처리 시점의 실시간 평가). 그래서 오늘이
+거래일이면 오늘 만기분은 장 마감 후 오늘 NAV 가 기록될 때까지(portfolio_nav_job 직후 스윕)
+처리하지 않고 남겨 둔다 — 장중 10분 주기 스윕이 전일 NAV 로 판정하지 않도록.
+"""
+
+import bisect
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal
+from app.metrics import REWARD_SWEEP_SECONDS, REWARD_SWEEP_TOTAL
+from app.models.portfolio import PortfolioNavHistory, UserPortfolio
+from app.models.reward import BriefingReward
+from app.services.market_calendar import is_trading_day, latest_trading_day
+from app.services.portfolio_service import PROFIT_MULTIPLIER
+from app.services.portfolio_summary import credit_rewards
+from app.services.portfolio_valuation import value_portfolios
+
+logger = logging.getLogger(__name__)
+
+SWEEP_BATCH = 1000             # 한 트랜잭션에서 처리할 최대 보상 수
+SWEEP_INTERVAL_SECONDS = 600  # 스케줄러 실행 주기
+
+
+@dataclass
+class SweepResult:
+    applied: int = 0
+    expired: int = 0
+    portfolios: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def processed(self) -> int:
+        return self.applied + self.expired
+
+
+def _kst_day(ts: datetime) -> date:
+    """maturity_at(UTC naive) → KST 날짜."""
+    return (ts + timedelta(hours=9)).date()
+
+
+def nav_profit_on_or_before(
+    navs: dict[int, tuple[list[date], list[int]]], portfolio_id: int, day: date
+) -> Optional[int]:
+    """portfolio_id 의 만기 세션(day 이하 마지막 거래일) NAV 손익. 그 행이 없으면(잡 누락) None."""
+    dates, profits = navs.get(portfolio_id, ((), ()))
+    i = bisect.bisect_right(dates, day) - 1
+    if i < 0 or dates[i] < latest_trading_day(day):
+        return None
+    return profits[i]
+
+
+def decide(rewards: list, profit_of, now: datetime) -> tuple[list[dict], dict[int, int]]:
+    """보상별 UPDATE 파라미터와 포트폴리오별 보너스 합계를 계산한다.
+
+    profit_of(reward) → 손익(보상 제외). 0 초과면 보너스 지급(applied), 아니면 소멸(expired).
+    """
+    updates: list[dict] = []
+    bonuses: dict[int, int] = {}
+    for r in rewards:
+        if profit_of(r) > 0:
+            # 수익: 1.5배 보너스 (추가분만 지급)
+            bonus = int(r.base_reward * (PROFIT_MULTIPLIER - 1.0))
+            updates.append({
+                "b_id": r.id, "b_status": "applied", "b_multiplier": PROFIT_MULTIPLIER,
+                "b_final": r.base_reward + bonus, "b_applied_at": now,
+            })
+            bonuses[r.portfolio_id] = bonuses.get(r.portfolio_id, 0) + bonus
+        else:
+            # 손실: 보너스 소멸
+            updates.append({
+                "b_id": r.id, "b_status": "expired", "b_multiplier": 1.0,
+                "b_final": r.final_reward, "b_applied_at": now,
+            })
+    return updates, bonuses
+
+
+async def _load_navs(
+    db: AsyncSession, portfolio_ids: list[int], since: date, until: date
+) -> dict[int, tuple[list[date], list[int]]]:
+    stmt = (
+        select(PortfolioNavHistory.portfolio_id, PortfolioNavHistory.nav_date, PortfolioNavHistory.profit_loss)
+        .where(
+            PortfolioNavHistory.portfolio_id.in_(portfolio_ids),
+            PortfolioNavHistory.nav_date.between(since, until),
+        )
+        .order_by(PortfolioNavHistory.portfolio_id, PortfolioNavHistory.nav_date)
+    )
+    navs: dict[int, tuple[list[date], list[int]]] = {}
+    for pid, nav_date, profit in (await db.execute(stmt)).all():
+        dates, profits = navs.setdefault(pid, ([], []))
+        dates.append(nav_date)
+        profits.append(profit)
+    return navs
+
+
+async def _settle_cutoff(db: AsyncSession, now: datetime) -> datetime:
+    """이 시각 이전 만기분만 처리한다. 오늘이 거래일인데 오늘 NAV 가 아직 없으면 오늘 0시(KST)."""
+    today = _kst_day(now)
+    if not is_trading_day(today):
+        return now
+    stmt = select(PortfolioNavHistory.id).where(PortfolioNavHistory.nav_date == today).limit(1)
+    if (await db.execute(stmt)).first() is not None:
+        return now
+    return datetime.combine(today, datetime.min.time()) - timedelta(hours=9)
+
+
+async def sweep_matured_rewards(
+    db: AsyncSession,
+    user_ids: Optional[Iterable[int]] = None,
+    batch: int = SWEEP_BATCH,
+) -> SweepResult:
+    """만기 지난 pending 보상을 한 트랜잭션으로 처리한다 (user_ids로 대상 사용자 한정 가능)."""
+    started = time.monotonic()
+    now = datetime.utcnow()
+    cutoff = await _settle_cutoff(db, now)
+    stmt = (
+        select(
+            BriefingReward.id,
+            BriefingReward.user_id,
+            BriefingReward.portfolio_id,
+            BriefingReward.base_reward,
+            BriefingReward.final_reward,
+            BriefingReward.maturity_at,
+        )
+        .where(BriefingReward.status == "pending", BriefingReward.maturity_at <= cutoff)
+        .order_by(BriefingReward.maturity_at)
+        .limit(batch)
+    )
+    if user_ids is not None:
+        stmt = stmt.where(BriefingReward.user_id.in_(list(user_ids)))
+    candidates = (await db.execute(stmt)).all()
+    if not candidates:
+        await db.rollback()
+        return SweepResult()
+
+    portfolio_ids = sorted({r.portfolio_id for r in candidates})
+    days = [_kst_day(r.maturity_at) for r in candidates]
+    navs = await _load_navs(db, portfolio_ids, min(days) - timedelta(days=10), max(days))
+
+    # NAV가 없는 포트폴리오만 현재가로 한 번에 평가 (시세 조회는 잠금 전에)
+    profits: dict[int, Optional[int]] = {}
+    live_users = set()
+    for r, day in zip(candidates, days):
+        profits[r.id] = nav_profit_on_or_before(navs, r.portfolio_id, day)
+        if profits[r.id] is None:
+            live_users.add(r.user_id)
+    live: dict[int, float] = {}
+    if live_users:
+        valuation = await value_portfolios(db, live_users)
+        live = dict(zip(valuation.user_ids.tolist(), valuation.profit_loss.tolist()))
+
+    # 판정이 끝난 보상만 잠근다 — 그 사이 다른 워커가 처리한 보상은 빠진다
+    rewards = (await db.execute(
+        stmt.where(BriefingReward.id.in_([r.id for r in candidates]))
+        .with_for_update(skip_locked=True)
+    )).all()
+    if not rewards:
+        await db.rollback()
+        return SweepResult()
+    portfolio_ids = sorted({r.portfolio_id for r in rewards})
+
+    def _profit(r) -> float:
+        p = profits[r.id]
+        return p if p is not None else live.get(r.user_id, 0)
+
+    updates, bonuses = decide(rewards, _profit, now)
+
+    # ORM 일괄 UPDATE(PK 기준)가 아닌 WHERE 조건 executemany 이므로 Core 테이블로 실행
+    rewards_t, portfolios_t = BriefingReward.__table__, UserPortfolio.__table__
+    await db.execute(
+        update(rewards_t)
+        .where(rewards_t.c.id == bindparam("b_id"), rewards_t.c.status == "pending")
+        .values(
+            status=bindparam("b_status"),
+            multiplier=bindparam("b_multiplier"),
+            final_reward=bindparam("b_final"),
+            applied_at=bindparam("b_applied_at"),
+        ),
+        updates,
+    )
+    if bonuses:
+        await db.execute(
+            update(portfolios_t)
+            .where(portfolios_t.c.id == bindparam("b_pid"))
+            .values(
+                current_cash=portfolios_t.c.current_cash + bindparam("b_bonus"),
+                total_rewards_received=portfolios_t.c.total_rewards_received + bindparam("b_bonus"),
+                updated_at=now,
+            ),
+            [{"b_pid": pid, "b_bonus": bonus} for pid, bonus in bonuses.items()],
+        )
+    await db.commit()
+
+    result = SweepResult(
+        applied=sum(1 for u in updates if u["b_status"] == "applied"),
+        expired=sum(1 for u in updates if u["b_status"] == "expired"),
+        portfolios=len(portfolio_ids),
+        elapsed=time.monotonic() - started,
+    )
+    REWARD_SWEEP_TOTAL.labels("applied").inc(result.applied)
+    REWARD_SWEEP_TOTAL.labels("expired").inc(result.expired)
+    REWARD_SWEEP_SECONDS.observe(result.elapsed)
+
+    # 보너스는 보상이라 수익률은 그대로 — 캐시된 요약/리더보드에 지급액만 더한다
+    owner = {r.portfolio_id: r.user_id for r in rewards}
+    await credit_rewards({owner[pid]: bonus for pid, bonus in bonuses.items()})
+    return result
+
+
+async def run_reward_sweeper() -> SweepResult:
+    """스케줄러 잡: 만기 보상이 남지 않을 때까지 배치 단위로 처리한다."""
+    total = SweepResult()
+    while True:
+        async with AsyncSessionLocal() as session:
+            result = await sweep_matured_rewards(session)
+        total.applied += result.applied
+        total.expired += result.expired
+        total.portfolios += result.portfolios
+        total.elapsed += result.elapsed
+        if result.processed < SWEEP_BATCH:
+            break
+    if total.processed:
+        logger.info(
+            "보상 만기 처리: applied=%d expired=%d portfolios=%d (%.2fs, %.0f건/s)",
+            total.applied, total.expired, total.portfolios, total.elapsed,
+            total.processed / total.elapsed if total.elapsed else 0,
+        )
+    return total
@@ -0,0 +1,150 @@
+"""요청 병합(single-flight) 헬퍼 — 같은 키의 동시 upstream 조회를 1회로 합친다.
+
+- 프로세스 내부: 키별 Future 맵. 먼저 온 요청만 fetch하고 나머지는 같은 Future를 기다린다.
+  fetch 하던 요청이 취소되면(클라이언트 연결 종료 등) 대기자는 실패하지 않고 다시 시도한다.
+- 워커 간: Redis 단기 락(SET NX PX). 락을 못 잡은 워커는 캐시에 결과가 채워질 때까지
+  짧게 폴링하고, 대기 시간이 지나면 직접 조회한다 (락 보유 워커 장애 대비).
+
+fetch 함수는 결과를 공용 캐시(Redis)에 기록해야 다른 워커의 대기자가 결과를 읽을 수 있다.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+
+from app.core.redis_keys import key_single_flight_lock
+from app.metrics import SINGLE_FLIGHT_TOTAL
+
+logger = logging.getLogger(__name__)
+
+LOCK_TTL_MS = 5_000        # 락 최대 보유 시간 (fetch 타임아웃보다 약간 길게)
+WAIT_TIMEOUT = 5.0         # 다른 워커 결과 대기 한도 (초)
+POLL_INTERVAL = 0.05       # 다른 워커 결과 폴링 간격 (초)
+
+# 본인 토큰일 때만 삭제 (다른 워커가 재획득한 락을 지우지 않도록)
+RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_inflight: dict[str, asyncio.Future] = {}
+
+
+class _LeaderCancelled(Exception):
+    """fetch 하던 요청이 취소됨 — 대기자는 이 예외를 받으면 다시 시도한다 (외부로 나가지 않음)."""
+
+
+async def _acquire_lock(client, lock_key: str, token: str, ttl_ms: int) -> Optional[bool]:
+    """Redis 락 획득 시도. Redis 미사용/장애 시 None."""
+    if client is None:
+        return None
+    try:
+        return bool(await client.set(lock_key, token, nx=True, px=ttl_ms))
+    except Exception as e:
+        logger.debug("single-flight lock error [%s]: %s", lock_key, e)
+        return None
+
+
+async def _release_lock(client, lock_key: str, token: str) -> None:
+    try:
+        await client.eval(RELEASE_LOCK_LUA, 1, lock_key, token)
+    except Exception as e:
+        logger.debug("single-flight unlock error [%s]: %s", lock_key, e)
+
+
+async def _wait_remote(
+    read_cached: Callable[[], Awaitable[Any]], wait_timeout: float
+) -> Any:
+    """다른 워커가 채울 캐시 결과를 폴링한다. 시간 초과 시 None."""
+    deadline = time.monotonic() + wait_timeout
+    while time.monotonic() < deadline:
+        await asyncio.sleep(POLL_INTERVAL)
+        try:
+            cached = await read_cached()
+        except Exception:
+            cached = None
+        if cached is not None:
+            return cached
+    return None
+
+
+async def single_flight(
+    name: str,
+    key: str,
+    fetch: Callable[[], Awaitable[Any]],
+    *,
+    client=None,
+    read_cached: Optional[Callable[[], Awaitable[Any]]] = None,
+    lock_ttl_ms: int = LOCK_TTL_MS,
+    wait_timeout: float = WAIT_TIMEOUT,
+) -> Any:
+    """key 단위로 fetch를 한 번만 실행하고 동시 호출자에게 같은 결과를 돌려준다.
+
+    Args:
+        name: 메트릭 라벨 (예: "stock_price")
+        key: 병합 단위 키 (예: 종목코드)
+        fetch: 실제 upstream 조회 코루틴 함수 (결과를 캐시에 기록해야 함)
+        client: Redis 클라이언트. None이면 프로세스 내부 병합만 수행
+        read_cached: 다른 워커가 채운 결과를 읽는 함수. None이면 워커 간 대기 생략
+    """
+    flight_key = f"{name}:{key}"
+    while (existing := _inflight.get(flight_key)) is not None:
+        SINGLE_FLIGHT_TOTAL.labels(name, "coalesced_local").inc()
+        try:
+            return await asyncio.shield(existing)
+        except _LeaderCancelled:
+            # 다른 요청의 취소가 이 요청을 실패시키지 않도록 직접 조회하거나 새 조회에 합류
+            continue
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[flight_key] = future
+    try:
+        result = await _fetch_across_workers(
+            name, key, fetch, client, read_cached, lock_ttl_ms, wait_timeout
+        )
+    except asyncio.CancelledError:
+        future.set_exception(_LeaderCancelled(flight_key))
+        future.exception()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # 대기자가 없을 때 "exception was never retrieved" 경고 방지
+        future.exception()
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(flight_key, None)
+
+
+async def _fetch_across_workers(
+    name: str,
+    key: str,
+    fetch: Callable[[], Awaitable[Any]],
+    client,
+    read_cached: Optional[Callable[[], Awaitable[Any]]],
+    lock_ttl_ms: int,
+    wait_timeout: float,
+) -> Any:
+    lock_key = key_single_flight_lock(name, key)
+    token = uuid.uuid4().hex
+    acquired = await _acquire_lock(client, lock_key, token, lock_ttl_ms)
+
+    if acquired is False and read_cached is not None:
+        # 다른 워커가 조회 중 → 결과가 캐시에 채워지길 기다린다
+        cached = await _wait_remote(read_cached, wait_timeout)
+        if cached is not None:
+            SINGLE_FLIGHT_TOTAL.labels(name, "coalesced_remote").inc()
+            return cached
+
+    SINGLE_FLIGHT_TOTAL.labels(name, "upstream").inc()
+    try:
+        return await fetch()
+    finally:
+        if acquired:
+            await _release_lock(client, lock_key, token)
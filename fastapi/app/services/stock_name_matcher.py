@@ -0,0 +1,93 @@
+"""종목명 다중 패턴 매처 (Aho-Corasick).
+
+KRX 전체 종목명(+별칭)으로 오토마톤을 한 번 만들어 두고, 메시지를 한 번만 훑어
+모든 종목명 출현 위치를 찾는다. 겹치는 후보는 왼쪽 우선 → 긴 이름 우선으로 고른다.
+
+생성 후에는 변경하지 않는다. 목록이 갱신되면 새 인스턴스를 만들어 통째로 교체한다.
+"""
+
+from typing import Iterator, Optional
+
+MIN_NAME_LENGTH = 2
+
+
+class StockNameMatcher:
+    """불변 Aho-Corasick 오토마톤.
+
+    Args:
+        patterns: 패턴 문자열(종목명/별칭) → 종목코드
+        names: 종목코드 → 공식 종목명 (별칭 매칭 결과를 공식명으로 돌려줄 때 사용)
+    """
+
+    __slots__ = ("_goto", "_fail", "_output", "_patterns", "_names", "size")
+
+    def __init__(self, patterns: dict[str, str], names: Optional[dict[str, str]] = None):
+        goto: list[dict[str, int]] = [{}]
+        output: list[tuple[int, ...]] = [()]
+        words: list[tuple[str, str]] = []
+
+        for word, code in patterns.items():
+            if len(word) < MIN_NAME_LENGTH or not code:
+                continue
+            node = 0
+            for ch in word:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    output.append(())
+                node = nxt
+            output[node] = (len(words),)
+            words.append((word, code))
+
+        # BFS로 실패 링크 계산, 출력은 실패 링크를 따라 합친다
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for node in queue:
+            for ch, nxt in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                output[nxt] = output[nxt] + output[fail[nxt]]
+                queue.append(nxt)
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+        self._patterns = tuple(words)
+        self._names = names or {}
+        self.size = len(words)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, str, str]]:
+        """모든 출현을 (시작, 끝, 패턴, 코드)로 반환한다 (겹침 포함)."""
+        goto, fail, output, patterns = self._goto, self._fail, self._output, self._patterns
+        node = 0
+        for pos, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for idx in output[node]:
+                word, code = patterns[idx]
+                yield pos - len(word) + 1, pos + 1, word, code
+
+    def name_of(self, code: str) -> str:
+        return self._names.get(code, code)
+
+    def find_all(self, text: str) -> list[tuple[str, str]]:
+        """겹치지 않는 최장 매칭을 등장 순서대로 (공식 종목명, 코드) 리스트로 반환한다."""
+        hits = sorted(self.iter_matches(text), key=lambda m: (m[0], m[0] - m[1]))
+        result = []
+        cursor = 0
+        for start, end, word, code in hits:
+            if start >= cursor:
+                result.append((self._names.get(code, word), code))
+                cursor = end
+        return result
+
+    def contains_any(self, text: str) -> bool:
+        return next(self.iter_matches(text), None) is not None
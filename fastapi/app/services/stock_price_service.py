@@ -3,25 +3,27 @@
 import asyncio
 import json
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional
 
 from pykrx import stock
 
+from app.services.cache_ttl import TTL_PRICE, cache_ttl
 from app.services.kis_service import get_kis_service
+from app.services.market_calendar import recent_trading_days
+from app.services.market_snapshot import lookup_prices
 from app.services.redis_cache import get_redis_cache
+from app.services.single_flight import single_flight
 
 logger = logging.getLogger(__name__)
 
-TTL_STOCK_PRICE = 60  # 1분 캐시 (장중 실시간성 확보)
 PYKRX_TIMEOUT = 5.0   # pykrx 동기 호출 타임아웃 (초)
 
 
 def _fetch_price_sync(stock_code: str) -> Optional[dict]:
     """동기 pykrx 호출 (스레드풀에서 실행)."""
-    today = datetime.now()
-    for days_back in range(5):
-        try_date = today - timedelta(days=days_back)
+    # 당일 봉은 개장 전에는 비어 있으므로 최근 거래일 2개까지만 확인
+    for try_date in recent_trading_days(n=2):
         try_date_str = try_date.strftime("%Y%m%d")
 
         df = stock.get_market_ohlcv_by_date(try_date_str, try_date_str, stock_code)
@@ -51,14 +53,14 @@ def _fetch_price_sync(stock_code: str) -> Optional[dict]:
     return None
 
 
-async def _fetch_price_from_kis(stock_code: str) -> Optional[dict]:
-    """KIS 시세 조회를 표준 응답 포맷으로 정규화."""
+async def _fetch_price_from_kis(stock_code: str, fresh: bool = False) -> Optional[dict]:
+    """KIS 시세 조회를 표준 응답 포맷으로 정규화. fresh=True 면 kis:price 캐시를 건너뛴다."""
     try:
         kis = get_kis_service()
         if not kis.is_configured:
             return None
 
-        result = await kis.get_current_price(stock_code)
+        result = await kis.get_current_price(stock_code, fresh=fresh)
         if not result:
             return None
 
@@ -76,26 +78,25 @@ async def _fetch_price_from_kis(stock_code: str) -> Optional[dict]:
         return None
 
 
-async def get_current_price(stock_code: str) -> Optional[dict]:
-    """단일 종목의 현재가(최신 종가)를 조회한다.
+async def _read_cached_price(cache, cache_key: str) -> Optional[dict]:
+    """Redis 가격 캐시 조회. 미스/장애 시 None."""
+    if not cache.client:
+        return None
+    try:
+        cached = await cache.client.get(cache_key)
+        if cached:
+            return json.loads(cached)
+    except Exception as e:
+        logger.warning(f"Redis cache read error: {e}")
+    return None
 
-    Redis 캐시(60초 TTL)를 우선 확인하고, 없으면 KIS 우선/pykrx 폴백으로 조회한다.
-    pykrx는 동기 HTTP 호출이므로 asyncio.to_thread로 스레드풀에서 실행한다.
-    """
-    cache = await get_redis_cache()
-    cache_key = f"stock_price:{stock_code}"
-
-    # 캐시 조회
-    if cache.client:
-        try:
-            cached = await cache.client.get(cache_key)
-            if cached:
-                return json.loads(cached)
-        except Exception as e:
-            logger.warning(f"Redis cache read error: {e}")
 
+async def _fetch_and_cache_price(
+    cache, cache_key: str, stock_code: str, fresh: bool = False
+) -> Optional[dict]:
+    """upstream(KIS 우선/pykrx 폴백) 조회 후 Redis에 기록."""
     # 1) KIS 조회 우선
-    result = await _fetch_price_from_kis(stock_code)
+    result = await _fetch_price_from_kis(stock_code, fresh=fresh)
 
     # 2) pykrx 폴백 (스레드풀 + 타임아웃)
     if not result:
@@ -109,23 +110,102 @@ async def get_current_price(stock_code: str) -> Optional[dict]:
         except Exception as e:
             logger.error(f"Failed to get price for {stock_code}: {e}")
 
-    if result:
-        if cache.client:
+    if result and cache.client:
+        try:
+            await cache.client.setex(
+                cache_key, cache_ttl(TTL_PRICE, result.get("change_rate")), json.dumps(result)
+            )
+        except Exception as e:
+            logger.warning(f"Redis cache write error: {e}")
+    return result
+
+
+def price_cache_key(stock_code: str) -> str:
+    return f"stock_price:{stock_code}"
+
+
+async def _read_cached_prices_bulk(cache, stock_codes: list[str]) -> dict[str, dict]:
+    """복수 종목 가격 캐시를 MGET 한 번으로 조회한다."""
+    if not cache.client or not stock_codes:
+        return {}
+    try:
+        raw_values = await cache.client.mget([price_cache_key(c) for c in stock_codes])
+    except Exception as e:
+        logger.warning(f"Redis cache mget error: {e}")
+        return {}
+    cached: dict[str, dict] = {}
+    for code, raw in zip(stock_codes, raw_values):
+        if raw:
             try:
-                await cache.client.setex(cache_key, TTL_STOCK_PRICE, json.dumps(result))
-            except Exception as e:
-                logger.warning(f"Redis cache write error: {e}")
-        return result
+                cached[code] = json.loads(raw)
+            except ValueError:
+                continue
+    return cached
 
-    return None
 
+async def refresh_price(stock_code: str) -> Optional[dict]:
+    """캐시를 건너뛰고 upstream에서 다시 조회해 캐시에 기록한다 (백그라운드 선갱신용).
+
+    stock_price / kis:price 두 캐시 모두 읽지 않는다 — 만료 직전 값을 새 TTL 로 다시 쓰지 않도록.
+    다른 워커가 같은 종목을 조회 중이어도 남은 캐시를 결과로 받지 않고 직접 조회한다.
+    조회 경로(get_current_price)와는 flight 이름을 나눠, 캐시를 읽는 조회에 합류하지 않는다.
+    """
+    cache = await get_redis_cache()
+    cache_key = price_cache_key(stock_code)
+    return await single_flight(
+        "stock_price_refresh",
+        stock_code,
+        lambda: _fetch_and_cache_price(cache, cache_key, stock_code, fresh=True),
+        client=cache.client,
+    )
+
+
+async def get_current_price(stock_code: str) -> Optional[dict]:
+    """단일 종목의 현재가(최신 종가)를 조회한다.
+
+    Redis 캐시(60초 TTL)를 우선 확인하고, 없으면 KIS 우선/pykrx 폴백으로 조회한다.
+    pykrx는 동기 HTTP 호출이므로 asyncio.to_thread로 스레드풀에서 실행한다.
+    캐시 미스가 동시에 몰려도 종목당 upstream 조회는 1회만 수행한다
+    (프로세스 내부 Future 공유 + 워커 간 Redis 락, single_flight 참고).
+    """
+    cache = await get_redis_cache()
+    cache_key = price_cache_key(stock_code)
+
+    cached = await _read_cached_price(cache, cache_key)
+    if cached is not None:
+        return cached
 
-async def get_batch_prices(stock_codes: list[str]) -> list[dict]:
-    """복수 종목의 현재가를 일괄 조회한다."""
-    tasks = [get_current_price(code) for code in stock_codes]
-    results_raw = await asyncio.gather(*tasks, return_exceptions=True)
-    results = []
-    for r in results_raw:
-        if isinstance(r, dict):
-            results.append(r)
-    return results
+    return await single_flight(
+        "stock_price",
+        stock_code,
+        lambda: _fetch_and_cache_price(cache, cache_key, stock_code),
+        client=cache.client,
+        read_cached=lambda: _read_cached_price(cache, cache_key),
+    )
+
+
+async def get_batch_prices(stock_codes: list[str], realtime: bool = False) -> list[dict]:
+    """복수 종목의 현재가를 일괄 조회한다.
+
+    1) Redis 가격 캐시를 MGET 한 번으로 읽는다 (hot set은 price_refresher가 선갱신).
+    2) 캐시 미스는 전종목 시장 스냅샷(market_snapshot)에서 메모리 조회한다.
+    3) 그래도 없는 종목만 종목별 조회(KIS 우선/pykrx 폴백)로 보완한다.
+    realtime=True면 장중 실시간성이 필요한 경우로 보고 스냅샷을 건너뛴다.
+    """
+    codes = list(dict.fromkeys(stock_codes))
+    cache = await get_redis_cache()
+    cached = await _read_cached_prices_bulk(cache, codes)
+    found = [cached[c] for c in codes if c in cached]
+    missing = [c for c in codes if c not in cached]
+
+    if missing and not realtime:
+        snapshot_found, missing = lookup_prices(missing)
+        found.extend(snapshot_found)
+
+    if missing:
+        tasks = [get_current_price(code) for code in missing]
+        results_raw = await asyncio.gather(*tasks, return_exceptions=True)
+        for r in results_raw:
+            if isinstance(r, dict):
+                found.append(r)
+    return found
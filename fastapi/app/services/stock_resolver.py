@@ -9,6 +9,8 @@ import re
 import threading
 from typing import Optional
 
+from app.services.stock_name_matcher import StockNameMatcher
+
 logger = logging.getLogger("narrative.stock_resolver")
 
 # --- 외부 모듈 임포트 (선택적) ---
@@ -21,31 +23,68 @@ if _PIPELINE_PATH not in _sys.path:
     _sys.path.insert(0, _PIPELINE_PATH)
 
 try:
-    from collectors.stock_collector import get_stock_history
+    from datapipeline.collectors.stock_collector import get_stock_history
     _PYKRX_AVAILABLE = True
 except ImportError:
     _PYKRX_AVAILABLE = False
 
 try:
-    from collectors.financial_collector import format_fundamentals_for_llm
+    from datapipeline.collectors.financial_collector import format_fundamentals_for_llm
     _FDR_AVAILABLE = True
 except ImportError:
     _FDR_AVAILABLE = False
 
 # --- KRX 종목 캐시 ---
+# 별칭 → 종목코드 (구어체/약칭). 공식 종목명은 코드로 역조회한다.
+STOCK_ALIASES: dict[str, str] = {
+    "삼전": "005930",
+    "삼성전자우선주": "005935",
+    "하이닉스": "000660",
+    "하닉": "000660",
+    "엘지엔솔": "373220",
+    "엘엔솔": "373220",
+    "현대자동차": "005380",
+    "네이버": "035420",
+    "카뱅": "323410",
+}
+
+_FALLBACK_LISTING = {
+    "삼성전자": "005930", "SK하이닉스": "000660", "LG에너지솔루션": "373220",
+    "현대차": "005380", "NAVER": "035420", "카카오": "035720",
+}
+
 _krx_cache: dict[str, str] = {}  # 종목명 → 코드
+_matcher: Optional[StockNameMatcher] = None
 _krx_cache_lock = threading.Lock()
 _krx_loaded = False
 
 
+def set_krx_listing(listing: dict[str, str]) -> None:
+    """종목명 → 코드 목록으로 매처를 새로 만들어 원자적으로 교체한다.
+
+    매처를 다 만든 뒤 전역 참조만 바꾸므로, 진행 중인 감지는 이전 매처로 끝까지 수행된다.
+    """
+    global _krx_cache, _matcher, _krx_loaded
+    if not listing:
+        return
+    code_to_name = {code: name for name, code in listing.items()}
+    patterns = dict(listing)
+    for alias, code in STOCK_ALIASES.items():
+        if code in code_to_name:
+            patterns.setdefault(alias, code)
+    matcher = StockNameMatcher(patterns, names=code_to_name)
+    _krx_cache, _matcher = dict(listing), matcher
+    _krx_loaded = True
+
+
 def _load_krx_listing():
     """pykrx로 KRX 전체 종목 목록을 로드하여 캐시 (최초 1회, 이후 재사용)."""
-    global _krx_loaded
     if _krx_loaded:
         return
     with _krx_cache_lock:
         if _krx_loaded:
             return
+        listing: dict[str, str] = {}
         try:
             from pykrx import stock as pykrx_stock
             from datetime import datetime
@@ -56,19 +95,15 @@ def _load_krx_listing():
                     try:
                         name = pykrx_stock.get_market_ticker_name(ticker)
                         if name:
-                            _krx_cache[name] = ticker
+                            listing[name] = ticker
                     except Exception:
                         pass
-            _krx_loaded = True
-            logger.info("KRX 종목 목록 로드 완료: %d종목", len(_krx_cache))
+            logger.info("KRX 종목 목록 로드 완료: %d종목", len(listing))
         except Exception as e:
             logger.warning("KRX 종목 목록 로드 실패: %s (fallback 사용)", e)
-            for name, code in {
-                "삼성전자": "005930", "SK하이닉스": "000660", "LG에너지솔루션": "373220",
-                "현대차": "005380", "NAVER": "035420", "카카오": "035720",
-            }.items():
-                _krx_cache[name] = code
-            _krx_loaded = True
+        if not listing:
+            listing = dict(_FALLBACK_LISTING)
+        set_krx_listing(listing)
 
 
 def detect_stock_codes(message: str) -> list[tuple[str, str]]:
@@ -83,10 +118,10 @@ def detect_stock_codes(message: str) -> list[tuple[str, str]]:
             found.append((code, code))
             seen_codes.add(code)
 
-    # 2) KRX 종목명 매칭 (긴 이름부터)
-    for name in sorted(_krx_cache.keys(), key=len, reverse=True):
-        if len(name) >= 2 and name in message:
-            code = _krx_cache[name]
+    # 2) 종목명/별칭 매칭 (한 번의 스캔, 겹치면 긴 이름 우선)
+    matcher = _matcher
+    if matcher is not None:
+        for name, code in matcher.find_all(message):
             if code not in seen_codes:
                 found.append((name, code))
                 seen_codes.add(code)
@@ -113,7 +148,8 @@ def should_auto_visualize(message: str, stock_detected: bool, prev_messages: lis
     # 3) 이전 대화에서 종목이 언급된 경우 + 시각화 키워드
     if prev_messages:
         recent_text = " ".join(m.get("content", "") for m in prev_messages[-4:])
-        has_prior_stock = any(name in recent_text for name in list(_krx_cache.keys())[:100])
+        matcher = _matcher
+        has_prior_stock = matcher is not None and matcher.contains_any(recent_text)
         if has_prior_stock and any(s in msg for s in viz_signals):
             return True
 
@@ -153,14 +189,16 @@ def fetch_stock_data_for_context(stock_codes: list[tuple[str, str]]) -> tuple[st
     return "\n".join(context_lines), chart_data
 
 
-def get_fundamentals_text(code: str) -> Optional[str]:
-    """FinanceDataReader로 재무 지표 텍스트 반환. 실패 시 None."""
+def get_fundamentals_text(code: str, name: Optional[str] = None) -> Optional[str]:
+    """일별 재무 지표 스냅샷에서 종목 지표 텍스트 반환. 실패 시 None."""
     if not _FDR_AVAILABLE:
         return None
+    if name is None and _matcher is not None:
+        name = _matcher.name_of(code)
     try:
-        text = format_fundamentals_for_llm(code)
+        text = format_fundamentals_for_llm(code, name)
         if text and "찾을 수 없습니다" not in text:
             return text
     except Exception as e:
-        logger.debug("FDR 재무 지표 실패 (%s): %s", code, e)
+        logger.debug("재무 지표 조회 실패 (%s): %s", code, e)
     return None
@@ -0,0 +1,254 @@
+"""종목 검색 인메모리 인덱스 (/trading/search).
+
+stock_listings 전체(약 2,700종목)를 프로세스 메모리에 올려 두고 다음 검색을 지원한다.
+- 종목코드 접두사: 정렬된 코드 배열 + bisect
+- 종목명 부분 문자열: 1/2-gram 역색인 후보 교집합 → 실제 포함 여부 확인
+- 초성 검색 ("ㅅㅅㅈㅈ" → 삼성전자): 종목명 초성 문자열에 같은 역색인 적용
+
+앱 시작 시 로드하고, init_stock_listings.py가 실행되면 Redis 버전 키가 올라가
+각 워커가 RELOAD_CHECK_SECONDS 이내에 인덱스를 다시 만든다.
+로드할 때마다 튜터 종목명 감지 매처(stock_resolver)도 같은 목록으로 교체한다.
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.core.redis_keys import key_stock_listings_version
+from app.models.stock_listing import StockListing
+from app.services.redis_cache import get_redis_cache
+from app.services.stock_resolver import set_krx_listing
+
+logger = logging.getLogger(__name__)
+
+SEARCH_LIMIT = 20
+RELOAD_CHECK_SECONDS = 30
+
+_CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_CHOSUNG_SET = frozenset(_CHOSUNG)
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+
+# 순위 (낮을수록 상위)
+_RANK_EXACT = 0
+_RANK_PREFIX = 1
+_RANK_CHOSUNG_PREFIX = 2
+_RANK_SUBSTRING = 3
+_RANK_CHOSUNG_SUBSTRING = 4
+
+
+def _normalize(text: str) -> str:
+    return "".join(text.lower().split())
+
+
+def to_chosung(text: str) -> str:
+    """한글 음절을 초성으로 바꾼다. 한글이 아닌 문자는 소문자로 유지."""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            out.append(_CHOSUNG[(code - _HANGUL_BASE) // 588])
+        else:
+            out.append(ch.lower())
+    return "".join(out)
+
+
+def _is_chosung_query(query: str) -> bool:
+    return any(ch in _CHOSUNG_SET for ch in query) and all(
+        ch in _CHOSUNG_SET or not ("가" <= ch <= "힣") for ch in query
+    )
+
+
+def _grams(text: str) -> set[str]:
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+def _build_gram_index(texts: list[str]) -> dict[str, tuple[int, ...]]:
+    index: dict[str, list[int]] = {}
+    for i, text in enumerate(texts):
+        for gram in _grams(text):
+            index.setdefault(gram, []).append(i)
+    return {gram: tuple(ids) for gram, ids in index.items()}
+
+
+def _candidates(index: dict[str, tuple[int, ...]], query: str) -> Iterable[int]:
+    """query의 모든 gram을 포함하는 후보 id (posting list 교집합)."""
+    if len(query) == 1:
+        return index.get(query, ())
+    grams = {query[i:i + 2] for i in range(len(query) - 1)}
+    postings = sorted((index.get(g, ()) for g in grams), key=len)
+    if not postings or not postings[0]:
+        return ()
+    result = set(postings[0])
+    for posting in postings[1:]:
+        result.intersection_update(posting)
+        if not result:
+            break
+    return result
+
+
+class StockSearchIndex:
+    """불변 검색 인덱스. 재로드 시 통째로 교체한다."""
+
+    def __init__(self, listings: list[tuple[str, str, str]], version: Optional[str] = None):
+        self.version = version
+        self.codes = [code for code, _, _ in listings]
+        self.names = [name for _, name, _ in listings]
+        self.markets = [market for _, _, market in listings]
+        self._norm_names = [_normalize(name) for name in self.names]
+        self._chosung_names = [to_chosung(n) for n in self._norm_names]
+        self._name_index = _build_gram_index(self._norm_names)
+        self._chosung_index = _build_gram_index(self._chosung_names)
+        self._sorted_codes = sorted((code, i) for i, code in enumerate(self.codes))
+        self._sorted_code_keys = [code for code, _ in self._sorted_codes]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def _item(self, i: int) -> dict:
+        return {
+            "stock_code": self.codes[i],
+            "stock_name": self.names[i],
+            "market": self.markets[i],
+        }
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT) -> list[dict]:
+        q = _normalize(query)
+        if not q:
+            return []
+        ranked: dict[int, int] = {}
+
+        def _add(i: int, rank: int) -> None:
+            if rank < ranked.get(i, 99):
+                ranked[i] = rank
+
+        # 종목코드 접두사
+        if q.isdigit():
+            start = bisect.bisect_left(self._sorted_code_keys, q)
+            for code, i in self._sorted_codes[start:]:
+                if not code.startswith(q):
+                    break
+                _add(i, _RANK_EXACT if code == q else _RANK_PREFIX)
+
+        # 종목명 부분 문자열
+        for i in _candidates(self._name_index, q):
+            name = self._norm_names[i]
+            if name == q:
+                _add(i, _RANK_EXACT)
+            elif name.startswith(q):
+                _add(i, _RANK_PREFIX)
+            elif q in name:
+                _add(i, _RANK_SUBSTRING)
+
+        # 초성 검색
+        if _is_chosung_query(q):
+            cq = to_chosung(q)
+            for i in _candidates(self._chosung_index, cq):
+                chosung = self._chosung_names[i]
+                if chosung.startswith(cq):
+                    _add(i, _RANK_CHOSUNG_PREFIX)
+                elif cq in chosung:
+                    _add(i, _RANK_CHOSUNG_SUBSTRING)
+
+        order = sorted(ranked, key=lambda i: (ranked[i], len(self._norm_names[i]), self.names[i]))
+        return [self._item(i) for i in order[:limit]]
+
+
+_index: Optional[StockSearchIndex] = None
+_load_lock = asyncio.Lock()
+_last_version_check = 0.0
+
+
+def _market_of(code: str) -> str:
+    return "KOSPI" if len(code) == 6 and code[0] in "012345" else "KOSDAQ"
+
+
+async def _load_listings_from_db() -> list[tuple[str, str, str]]:
+    async with AsyncSessionLocal() as session:
+        rows = await session.execute(
+            select(StockListing.stock_code, StockListing.stock_name, StockListing.market)
+            .where(StockListing.is_active.isnot(False))
+        )
+        return [(r.stock_code, r.stock_name, r.market or _market_of(r.stock_code)) for r in rows]
+
+
+def _load_listings_from_pykrx() -> list[tuple[str, str, str]]:
+    """stock_listings가 비어 있을 때의 폴백 (스레드풀에서 실행)."""
+    from pykrx import stock
+
+    today = datetime.now().strftime("%Y%m%d")
+    listings = []
+    for market in ["KOSPI", "KOSDAQ"]:
+        for ticker in stock.get_market_ticker_list(today, market=market):
+            name = stock.get_market_ticker_name(ticker)
+            if name:
+                listings.append((ticker, name, market))
+    return listings
+
+
+async def _current_version() -> Optional[str]:
+    try:
+        cache = await get_redis_cache()
+        return await cache.get(key_stock_listings_version())
+    except Exception:
+        return None
+
+
+async def load_stock_search_index() -> Optional[StockSearchIndex]:
+    """stock_listings로 인덱스를 (재)생성한다. 실패 시 기존 인덱스 유지."""
+    global _index, _last_version_check
+    async with _load_lock:
+        version = await _current_version()
+        started = time.perf_counter()
+        try:
+            listings = await _load_listings_from_db()
+            if not listings:
+                listings = await asyncio.to_thread(_load_listings_from_pykrx)
+        except Exception as e:
+            logger.warning("종목 검색 인덱스 로드 실패: %s", e)
+            return _index
+        if listings:
+            _index = StockSearchIndex(listings, version=version)
+            # 튜터 종목명 감지 매처도 같은 목록으로 교체
+            set_krx_listing({name: code for code, name, _ in listings})
+            logger.info(
+                "종목 검색 인덱스 로드: %d종목, %.0fms",
+                len(_index), (time.perf_counter() - started) * 1000,
+            )
+        _last_version_check = time.monotonic()
+        return _index
+
+
+async def get_stock_search_index() -> Optional[StockSearchIndex]:
+    """현재 인덱스 반환. 없으면 로드하고, stock_listings 버전이 바뀌었으면 재로드한다."""
+    global _last_version_check
+    if _index is None:
+        return await load_stock_search_index()
+    if time.monotonic() - _last_version_check >= RELOAD_CHECK_SECONDS:
+        _last_version_check = time.monotonic()
+        version = await _current_version()
+        if version is not None and version != _index.version:
+            return await load_stock_search_index()
+    return _index
+
+
+async def search_stock_index(query: str, limit: int = SEARCH_LIMIT) -> list[dict]:
+    index = await get_stock_search_index()
+    if index is None:
+        return []
+    return index.search(query, limit)
+
+
+async def bump_stock_listings_version() -> None:
+    """stock_listings 갱신을 알린다 (init_stock_listings.py 등에서 호출)."""
+    cache = await get_redis_cache()
+    if cache.client:
+        await cache.client.incr(key_stock_listings_version())
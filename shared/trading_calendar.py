@@ -0,0 +1,220 @@
+"""KRX 거래일 달력 (다년도 휴장일 + 사전 계산 색인).
+
+"최근 거래일"을 찾으려고 하루씩 거슬러 upstream을 두드리던 루프를 대신한다.
+모듈 로드 시 CALENDAR_START ~ CALENDAR_END 구간의 거래일 목록과 날짜별 색인을 한 번
+만들어 두므로 아래 조회는 모두 O(1)이다 (리스트 인덱싱만 사용).
+
+- is_trading_day / prev_trading_day / next_trading_day / latest_trading_day
+- trading_days_between(start, end): 양 끝 포함 거래일 수
+- recent_trading_days(day, n): day 이하 최근 거래일 n개 (최신순)
+- session_hours(day): 정규장 개장/마감 시각 (연초 개장일·수능일 지연 개장 반영)
+
+구간 밖 날짜는 평일=거래일로 보고 한 번 경고를 남긴다. 매년 말 다음 해 휴장일을
+KRX 공지(정보데이터시스템 > 휴장일)로 확인해 KRX_HOLIDAYS에 추가해야 한다.
+"""
+
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+KST = timezone(timedelta(hours=9))
+# KRX 정규장 (KST)
+SESSION_OPEN = time(9, 0)
+SESSION_CLOSE = time(15, 30)
+
+# KRX 휴장일 (평일만 포함, 주말은 이미 제외)
+KRX_HOLIDAYS = frozenset({
+    # 2024
+    "20240101",                          # 신정
+    "20240209", "20240212",              # 설날 연휴 (+대체공휴일)
+    "20240301",                          # 삼일절
+    "20240410",                          # 국회의원 선거
+    "20240501",                          # 근로자의 날
+    "20240506",                          # 어린이날 대체공휴일
+    "20240515",                          # 부처님오신날
+    "20240606",                          # 현충일
+    "20240815",                          # 광복절
+    "20240916", "20240917", "20240918",  # 추석 연휴
+    "20241001",                          # 국군의 날 (임시공휴일)
+    "20241003",                          # 개천절
+    "20241009",                          # 한글날
+    "20241225",                          # 성탄절
+    "20241231",                          # 연말 휴장
+    # 2025
+    "20250101",                          # 신정
+    "20250127",                          # 임시공휴일
+    "20250128", "20250129", "20250130",  # 설날 연휴
+    "20250303",                          # 삼일절 대체공휴일
+    "20250501",                          # 근로자의 날
+    "20250505", "20250506",              # 어린이날·부처님오신날 (+대체공휴일)
+    "20250603",                          # 대통령 선거
+    "20250606",                          # 현충일
+    "20250815",                          # 광복절
+    "20251003",                          # 개천절
+    "20251006", "20251007", "20251008",  # 추석 연휴 (+대체공휴일)
+    "20251009",                          # 한글날
+    "20251225",                          # 성탄절
+    "20251231",                          # 연말 휴장
+    # 2026 (출처: https://www.calendarlabs.com/krx-market-holidays-2026/)
+    "20260101",                          # 신정
+    "20260216", "20260217", "20260218",  # 설날 연휴
+    "20260302",                          # 삼일절 대체공휴일
+    "20260501",                          # 근로자의 날
+    "20260505",                          # 어린이날
+    "20260525",                          # 부처님오신날 대체공휴일
+    "20260603",                          # 지방선거
+    "20260817",                          # 광복절 대체공휴일
+    "20260924", "20260925",              # 추석 연휴
+    "20261005",                          # 개천절 대체공휴일
+    "20261009",                          # 한글날
+    "20261225",                          # 성탄절
+    "20261231",                          # 연말 휴장
+    # 2027 (법정 공휴일 기준 예상치 — KRX 공지 후 확인 필요)
+    "20270101",                          # 신정
+    "20270208", "20270209",              # 설날 연휴 (+대체공휴일)
+    "20270301",                          # 삼일절
+    "20270505",                          # 어린이날
+    "20270513",                          # 부처님오신날
+    "20270816",                          # 광복절 대체공휴일
+    "20270914", "20270915", "20270916",  # 추석 연휴
+    "20271004",                          # 개천절 대체공휴일
+    "20271011",                          # 한글날 대체공휴일
+    "20271227",                          # 성탄절 대체공휴일
+    "20271231",                          # 연말 휴장
+})
+
+# 정규장 시간이 다른 날 (개장, 마감). 연초 개장일은 10시 개장, 수능일은 1시간씩 늦춘다.
+SPECIAL_SESSIONS: dict[str, tuple[time, time]] = {
+    "20240102": (time(10, 0), SESSION_CLOSE),
+    "20241114": (time(10, 0), time(16, 30)),
+    "20250102": (time(10, 0), SESSION_CLOSE),
+    "20251113": (time(10, 0), time(16, 30)),
+    "20260102": (time(10, 0), SESSION_CLOSE),
+    "20261119": (time(10, 0), time(16, 30)),
+    "20270104": (time(10, 0), SESSION_CLOSE),
+}
+
+CALENDAR_START = date(2024, 1, 1)
+CALENDAR_END = date(2027, 12, 31)
+
+DateLike = Union[date, datetime, str, None]
+
+
+def _as_date(value: DateLike) -> date:
+    """date/datetime/"YYYYMMDD"/"YYYY-MM-DD"/None(오늘, KST) → date."""
+    if value is None:
+        return datetime.now(KST).date()
+    if isinstance(value, datetime):
+        return (value.astimezone(KST) if value.tzinfo else value).date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value).replace("-", "")[:8], "%Y%m%d").date()
+
+
+def _build_index() -> tuple[list[date], list[int]]:
+    """거래일 목록과, 구간 내 날짜별 "그날 이하 마지막 거래일"의 목록 위치(-1=없음)."""
+    days: list[date] = []
+    floor: list[int] = []
+    d = CALENDAR_START
+    while d <= CALENDAR_END:
+        if d.weekday() < 5 and d.strftime("%Y%m%d") not in KRX_HOLIDAYS:
+            days.append(d)
+        floor.append(len(days) - 1)
+        d += timedelta(days=1)
+    return days, floor
+
+
+_TRADING_DAYS, _FLOOR = _build_index()
+_BASE = CALENDAR_START.toordinal()
+_warned_out_of_range = False
+
+
+def _in_range(d: date) -> bool:
+    if CALENDAR_START <= d <= CALENDAR_END:
+        return True
+    global _warned_out_of_range
+    if not _warned_out_of_range:
+        _warned_out_of_range = True
+        logger.warning("거래일 달력 범위(%s~%s) 밖 날짜: %s (평일=거래일로 간주)",
+                       CALENDAR_START, CALENDAR_END, d)
+    return False
+
+
+def _floor_index(d: date) -> int:
+    """d 이하 마지막 거래일의 _TRADING_DAYS 위치 (구간 내 날짜만)."""
+    return _FLOOR[d.toordinal() - _BASE]
+
+
+def is_trading_day(day: DateLike = None) -> bool:
+    """평일이고 KRX 휴장일이 아니면 True. None이면 오늘(KST)."""
+    d = _as_date(day)
+    if not _in_range(d):
+        return d.weekday() < 5
+    i = _floor_index(d)
+    return i >= 0 and _TRADING_DAYS[i] == d
+
+
+def latest_trading_day(day: DateLike = None) -> date:
+    """day 이하(당일 포함) 가장 최근 거래일."""
+    d = _as_date(day)
+    if _in_range(d) and (i := _floor_index(d)) >= 0:
+        return _TRADING_DAYS[i]
+    while not is_trading_day(d):
+        d -= timedelta(days=1)
+    return d
+
+
+def prev_trading_day(day: DateLike = None) -> date:
+    """day 직전(당일 제외) 거래일."""
+    return latest_trading_day(_as_date(day) - timedelta(days=1))
+
+
+def next_trading_day(day: DateLike = None) -> date:
+    """day 다음(당일 제외) 거래일."""
+    d = _as_date(day)
+    if _in_range(d):
+        i = _floor_index(d) + 1
+        if i < len(_TRADING_DAYS):
+            return _TRADING_DAYS[i]
+    d += timedelta(days=1)
+    while not is_trading_day(d):
+        d += timedelta(days=1)
+    return d
+
+
+def trading_days_between(start: DateLike, end: DateLike) -> int:
+    """start ~ end (양 끝 포함) 거래일 수. start > end 이면 0."""
+    s, e = _as_date(start), _as_date(end)
+    if s > e:
+        return 0
+    if _in_range(s) and _in_range(e):
+        return _floor_index(e) - _floor_index(s) + is_trading_day(s)
+    count, d = 0, s
+    while d <= e:
+        count += is_trading_day(d)
+        d += timedelta(days=1)
+    return count
+
+
+def recent_trading_days(day: DateLike = None, n: int = 1) -> list[date]:
+    """day 이하 최근 거래일 n개 (최신순)."""
+    d = latest_trading_day(day)
+    if _in_range(d):
+        i = _floor_index(d)
+        if i + 1 >= n:
+            return _TRADING_DAYS[i - n + 1:i + 1][::-1]
+    days = [d]
+    while len(days) < n:
+        days.append(prev_trading_day(days[-1]))
+    return days
+
+
+def session_hours(day: DateLike = None) -> Optional[tuple[datetime, datetime]]:
+    """정규장 (개장, 마감) 시각(KST). 휴장일이면 None."""
+    d = _as_date(day)
+    if not is_trading_day(d):
+        return None
+    open_t, close_t = SPECIAL_SESSIONS.get(d.strftime("%Y%m%d"), (SESSION_OPEN, SESSION_CLOSE))
+    return datetime.combine(d, open_t, tzinfo=KST), datetime.combine(d, close_t, tzinfo=KST)
@@ -0,0 +1,146 @@
+"""응답 envelope / 미들웨어 스택 요청당 오버헤드 벤치마크.
+
+이전 방식(BaseHTTPMiddleware 3단 + 응답 본문 재파싱 시도)과
+현재 방식(EnvelopeJSONResponse 직렬화 시점 적용 + 순수 ASGI 미들웨어)을
+같은 라우트로 비교한다. 네트워크/Redis 없이 ASGI 앱을 직접 호출하므로
+차이는 곧 요청당 미들웨어·직렬화 비용이다 (Redis 는 미연결 상태로 고정).
+
+사용법:
+  python tests/load/bench_envelope.py [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import StreamingResponse
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "fastapi"))
+
+from app.core.responses import EnvelopeJSONResponse
+from app.middleware import rate_limit
+from app.middleware.csrf import CSRFMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
+
+SMALL = {"unread_count": 3}
+LARGE = {
+    "keywords": [
+        {
+            "id": i,
+            "title": f"키워드 {i}",
+            "description": "반도체 업황 회복 기대감에 외국인 순매수가 이어졌다. " * 4,
+            "stocks": [{"stock_code": f"{i:06d}", "stock_name": "삼성전자", "change_rate": 1.23}] * 5,
+        }
+        for i in range(300)
+    ]
+}
+
+
+async def _no_redis():
+    return SimpleNamespace(client=None)
+
+
+def _routes(app: FastAPI) -> FastAPI:
+    @app.get("/small")
+    async def small():
+        return SMALL
+
+    @app.get("/large")
+    async def large():
+        return LARGE
+
+    @app.post("/write")
+    async def write():
+        return SMALL
+
+    return app
+
+
+def legacy_app() -> FastAPI:
+    """이전 main.py 스택: RateLimit(BaseHTTPMiddleware) → csrf → envelope 재파싱."""
+
+    class LegacyRateLimit(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            await rate_limit.get_redis_cache()
+            return await call_next(request)
+
+    app = _routes(FastAPI())
+    app.add_middleware(LegacyRateLimit)
+
+    @app.middleware("http")
+    async def csrf_middleware(request: Request, call_next):
+        if request.method in {"GET", "HEAD", "OPTIONS"}:
+            return await call_next(request)
+        request.cookies.get("csrfToken")
+        return await call_next(request)
+
+    @app.middleware("http")
+    async def response_envelope_middleware(request: Request, call_next):
+        response = await call_next(request)
+        if isinstance(response, StreamingResponse):
+            return response
+        if "application/json" not in response.headers.get("content-type", ""):
+            return response
+        try:
+            body = response.body
+            payload = json.loads(body.decode("utf-8")) if body else None
+        except Exception:
+            return response
+        if isinstance(payload, dict) and payload.get("status") in {"success", "error"}:
+            return response
+        if response.status_code >= 400:
+            wrapped = {"status": "error", "message": "Request failed", "error": payload}
+        else:
+            wrapped = {"status": "success", "data": payload}
+        headers = dict(response.headers)
+        headers.pop("content-length", None)
+        return JSONResponse(content=wrapped, status_code=response.status_code, headers=headers)
+
+    return app
+
+
+def current_app() -> FastAPI:
+    """현재 main.py 스택: 직렬화 시점 envelope + 순수 ASGI 미들웨어."""
+    app = _routes(FastAPI(default_response_class=EnvelopeJSONResponse))
+    app.add_middleware(RateLimitMiddleware)
+    app.add_middleware(CSRFMiddleware)
+    return app
+
+
+async def _bench(app: FastAPI, method: str, path: str, n: int) -> tuple[float, bytes]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):  # warm-up
+            await client.request(method, path)
+        start = time.perf_counter()
+        for _ in range(n):
+            response = await client.request(method, path)
+        elapsed = time.perf_counter() - start
+    return elapsed / n * 1e6, response.content
+
+
+async def main(n: int) -> None:
+    rate_limit.get_redis_cache = _no_redis
+    # 한도에 여유가 있는 요청 경로를 잰다
+    rate_limit.DEFAULT_RULE = rate_limit.RateRule("ip", 10**9, 60)
+    legacy, current = legacy_app(), current_app()
+    print(f"{'route':<14}{'before(us)':>12}{'after(us)':>12}{'speedup':>10}")
+    for method, path in (("GET", "/small"), ("GET", "/large"), ("POST", "/write")):
+        before, old_body = await _bench(legacy, method, path, n)
+        after, new_body = await _bench(current, method, path, n)
+        assert json.loads(old_body) == json.loads(new_body), path
+        print(f"{method + ' ' + path:<14}{before:>12.1f}{after:>12.1f}{before / after:>9.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    asyncio.run(main(parser.parse_args().requests))
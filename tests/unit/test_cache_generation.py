@@ -0,0 +1,81 @@
+"""Unit tests for generation-versioned cache namespaces."""
+
+from app.core.redis_keys import key_briefings_latest, key_cache_generation, key_keywords_today
+from app.services.redis_cache import PIPELINE_CACHE_TAGS, TAG_KEYWORDS, RedisCacheService
+
+
+class _FakePipeline:
+    def __init__(self, client, transaction):
+        self.client = client
+        self.transaction = transaction
+        self.ops = []
+
+    def __getattr__(self, name):
+        def _queue(*args, **kwargs):
+            self.ops.append((name, args))
+        return _queue
+
+    async def execute(self):
+        self.client.pipelines.append((self.transaction, [name for name, _ in self.ops]))
+        out = []
+        for name, args in self.ops:
+            if name == "incr":
+                self.client.store[args[0]] = str(int(self.client.store.get(args[0], 0)) + 1)
+                out.append(int(self.client.store[args[0]]))
+            elif name == "get":
+                out.append(self.client.store.get(args[0]))
+            elif name == "pttl":
+                out.append(-1 if args[0] in self.client.store else -2)
+            else:
+                out.append(1)
+        return out
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.pipelines = []
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self, transaction)
+
+    async def set(self, key, value, nx=False):
+        if nx and key in self.store:
+            return None
+        self.store[key] = str(value)
+        return True
+
+    async def scan(self, *args, **kwargs):
+        raise AssertionError("pipeline invalidation must not SCAN")
+
+
+def _service():
+    svc = RedisCacheService()
+    svc._client = _FakeRedis()
+    svc._listener_retry_at = float("inf")  # pub/sub 리스너 없이 L2 만
+    return svc
+
+
+def test_versioned_keys_embed_generation():
+    assert key_keywords_today("20260220", 3) != key_keywords_today("20260220", 4)
+    assert key_keywords_today("20260220", 3).endswith(":g3:20260220")
+    assert key_briefings_latest(7).endswith(":g7")
+
+
+async def test_unknown_tag_starts_at_zero():
+    svc = _service()
+    assert await svc.get_generation(TAG_KEYWORDS) == 0
+    assert svc.client.store[key_cache_generation(TAG_KEYWORDS)] == "0"
+
+
+async def test_pipeline_invalidation_bumps_all_tags_in_one_transaction():
+    svc = _service()
+    svc.client.store[key_cache_generation(TAG_KEYWORDS)] = "4"
+
+    assert await svc.invalidate_pipeline_caches() == len(PIPELINE_CACHE_TAGS)
+
+    transaction, ops = svc.client.pipelines[-1]
+    assert transaction is True
+    assert ops.count("incr") == len(PIPELINE_CACHE_TAGS)
+    assert ops.count("publish") == len(PIPELINE_CACHE_TAGS)  # 각 워커 L1 의 세대 무효화
+    assert await svc.get_generation(TAG_KEYWORDS) == 5
@@ -0,0 +1,114 @@
+"""Unit tests for stampede-proof cache.get_or_set (single-flight, SWR, XFetch)."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services import cache as cache_module
+from app.services.cache import CachePolicy, get_or_set, pack_entry
+
+
+class _FakeCache:
+    client = None  # Redis 락 없이 프로세스 내 병합만
+
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+
+    async def get_json(self, key, cache="generic", default=None):
+        return self.store.get(key, default)
+
+    async def set_json(self, key, value, ttl=3600):
+        self.store[key] = value
+        self.ttls[key] = ttl
+        return True
+
+
+@pytest.fixture
+def fake_cache(monkeypatch):
+    fake = _FakeCache()
+
+    async def _get():
+        return fake
+
+    monkeypatch.setattr(cache_module, "get_redis_cache", _get)
+    return fake
+
+
+def _counting_loader(value, delay=0.0):
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return value
+
+    return load, calls
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_concurrent_misses_run_loader_once(fake_cache):
+    load, calls = _counting_loader({"n": 1}, delay=0.01)
+    policy = CachePolicy(stale_ttl=60, jitter=0)
+
+    results = await asyncio.gather(*(get_or_set("k", 300, load, policy=policy) for _ in range(20)))
+
+    assert calls == [1] and all(r == {"n": 1} for r in results)
+    assert fake_cache.store["k"]["v"] == {"n": 1}
+    assert fake_cache.ttls["k"] == 360  # 소프트 TTL + stale 구간
+
+
+async def test_stale_entry_served_while_one_background_refresh_runs(fake_cache):
+    fake_cache.store["k"] = pack_entry("old", ttl=-1)
+    load, calls = _counting_loader("new")
+    policy = CachePolicy(stale_ttl=60)
+
+    results = await asyncio.gather(*(get_or_set("k", 300, load, policy=policy) for _ in range(5)))
+    await _settle()
+
+    assert results == ["old"] * 5
+    assert calls == [1] and fake_cache.store["k"]["v"] == "new"
+
+
+async def test_entry_past_stale_window_loads_in_foreground(fake_cache):
+    fake_cache.store["k"] = pack_entry("old", ttl=-120)
+    load, _ = _counting_loader("new")
+
+    assert await get_or_set("k", 300, load, policy=CachePolicy(stale_ttl=60)) == "new"
+
+
+async def test_xfetch_refreshes_early_only_when_enabled(fake_cache, monkeypatch):
+    # rand → 1 이면 -ln(1-rand) ≈ 27.6 → d·beta 배 (≈14초) 안쪽 만료는 반드시 조기 갱신
+    monkeypatch.setattr(cache_module.random, "random", lambda: 1 - 1e-12)
+    fresh = {"v": "old", "d": 0.5, "e": time.time() + 5}
+    load, calls = _counting_loader("new")
+
+    fake_cache.store["k"] = dict(fresh)
+    assert await get_or_set("k", 300, load, policy=CachePolicy(beta=0)) == "old"
+    await _settle()
+    assert calls == []
+
+    assert await get_or_set("k", 300, load, policy=CachePolicy(beta=1.0)) == "old"
+    await _settle()
+    assert calls == [1] and fake_cache.store["k"]["v"] == "new"
+
+
+async def test_none_is_negative_cached_and_errors_propagate(fake_cache):
+    load, calls = _counting_loader(None)
+    policy = CachePolicy(negative_ttl=7, stale_ttl=60)
+
+    assert await get_or_set("none", 300, load, policy=policy) is None
+    assert await get_or_set("none", 300, load, policy=policy) is None
+    assert calls == [1] and fake_cache.ttls["none"] == 7
+
+    async def boom():
+        raise LookupError("no briefing")
+
+    with pytest.raises(LookupError):
+        await get_or_set("err", 300, boom)
+    assert "err" not in fake_cache.store
@@ -0,0 +1,52 @@
+"""Unit tests for the market-hours-aware cache TTL policy."""
+
+from datetime import datetime
+
+from app.services import cache_ttl as ttl_module
+from app.services.cache_ttl import (
+    MIN_SESSION_TTL,
+    OPEN_JITTER_SECONDS,
+    TTL_CHART_DAILY,
+    TTL_KIS_PRICE,
+    TTL_PORTFOLIO_SUMMARY,
+    TTL_PRICE,
+    cache_ttl,
+)
+from app.services.market_calendar import KST, next_session_open
+
+
+def _kst(*args) -> datetime:
+    return datetime(*args, tzinfo=KST)
+
+
+def test_session_ttl_shrinks_with_volatility():
+    now = _kst(2026, 2, 19, 10, 0)  # 목요일 장중
+    assert cache_ttl(TTL_PRICE, now=now) == 60
+    assert cache_ttl(TTL_PRICE, change_rate=0.0, now=now) == 60
+    assert cache_ttl(TTL_PRICE, change_rate=5.0, now=now) == 20
+    assert cache_ttl(TTL_PRICE, change_rate=-29.9, now=now) == MIN_SESSION_TTL
+    assert cache_ttl(TTL_KIS_PRICE, change_rate=2.5, now=now) == 15
+    assert cache_ttl(TTL_CHART_DAILY, now=now) == 300  # 당일 봉이 바뀌는 동안 5분
+
+
+def test_closed_market_cached_until_next_open(monkeypatch):
+    monkeypatch.setattr(ttl_module.random, "randint", lambda a, b: 0)
+
+    # 금요일 20:00 → 월요일 09:00
+    assert cache_ttl(TTL_PRICE, now=_kst(2026, 2, 20, 20, 0)) == 61 * 3600
+    # 설 연휴 직전 금요일 밤 → 2/19(목) 09:00
+    friday = _kst(2026, 2, 13, 20, 0)
+    assert next_session_open(friday) == _kst(2026, 2, 19, 9, 0)
+    # 개장 전 → 당일 개장까지
+    assert cache_ttl(TTL_PRICE, change_rate=10.0, now=_kst(2026, 2, 19, 8, 59)) == 60
+
+
+def test_settle_window_and_summary_cap(monkeypatch):
+    monkeypatch.setattr(ttl_module.random, "randint", lambda a, b: b)
+
+    # 장 마감 직후는 종가 확정 전 → 기본 TTL
+    assert cache_ttl(TTL_PRICE, now=_kst(2026, 2, 19, 15, 40)) == 60
+    # 포트폴리오 요약은 장 마감 시 1시간 상한
+    assert cache_ttl(TTL_PORTFOLIO_SUMMARY, now=_kst(2026, 2, 21, 12, 0)) == 3600
+    # 개장 시각 만료 분산
+    assert cache_ttl(TTL_PRICE, now=_kst(2026, 2, 19, 8, 0)) == 3600 + OPEN_JITTER_SECONDS
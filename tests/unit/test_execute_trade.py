@@ -0,0 +1,113 @@
+"""Unit tests for single-statement trade execution."""
+
+import pytest
+
+from app.models.portfolio import UserPortfolio
+from app.services import market_calendar, portfolio_service
+from app.services.portfolio_service import execute_trade
+
+
+class _Row:
+    def __init__(self, current_cash, trade_id):
+        self.current_cash = current_cash
+        self.trade_id = trade_id
+
+
+class _Result:
+    def __init__(self, row):
+        self._row = row
+
+    def first(self):
+        return self._row
+
+
+class _FakeSession:
+    def __init__(self, row=None, scalar=None):
+        self.row = row
+        self.scalar_value = scalar
+        self.executed = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, stmt, params=None):
+        self.executed.append((str(stmt), params))
+        return _Result(self.row)
+
+    async def scalar(self, stmt):
+        return self.scalar_value
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture(autouse=True)
+def _market(monkeypatch):
+    async def _open():
+        return True
+
+    async def _price(code):
+        return {"stock_code": code, "current_price": 70_000}
+
+    monkeypatch.setattr(market_calendar, "is_kr_market_open_today", _open)
+    monkeypatch.setattr(portfolio_service, "get_current_price", _price)
+
+
+@pytest.fixture(autouse=True)
+def written_through(monkeypatch):
+    calls = []
+
+    async def _write_through(rows, valued_at):
+        calls.append(rows)
+
+    monkeypatch.setattr(portfolio_service, "write_through_trades", _write_through)
+    return calls
+
+
+def _portfolio():
+    return UserPortfolio(id=7, user_id=1, initial_cash=1_000_000, current_cash=1_000_000)
+
+
+async def test_buy_is_one_statement_and_syncs_cash(written_through):
+    row = _Row(current_cash=860_000, trade_id=99)
+    db = _FakeSession(row=row)
+    portfolio = _portfolio()
+
+    trade = await execute_trade(db, portfolio, "005930", "삼성전자", "buy", 2)
+
+    assert len(db.executed) == 1 and db.commits == 1
+    sql, params = db.executed[0]
+    assert "current_cash >= :cash_delta" in sql
+    assert "ON CONFLICT (portfolio_id, stock_code)" in sql
+    assert params["cash_delta"] == 140_000 and params["portfolio_id"] == 7
+    assert (trade.id, trade.trade_type, trade.total_amount) == (99, "buy", 140_000)
+    assert portfolio.current_cash == 860_000
+    # 요약/리더보드는 같은 문장이 돌려준 체결 후 상태로 갱신 (추가 조회 없음)
+    assert "json_agg" in sql and written_through == [[row]]
+
+
+async def test_rejected_buy_rolls_back_with_reason(written_through):
+    db = _FakeSession(row=None, scalar=100_000)
+
+    with pytest.raises(ValueError, match="잔액 부족: 필요 140,000원, 보유 100,000원"):
+        await execute_trade(db, _portfolio(), "005930", "삼성전자", "buy", 2)
+    assert db.rollbacks == 1 and db.commits == 0
+    assert written_through == []
+
+
+async def test_rejected_sell_reports_available_quantity():
+    db = _FakeSession(row=None, scalar=1)
+
+    with pytest.raises(ValueError, match="보유 수량 부족: 보유 1주"):
+        await execute_trade(db, _portfolio(), "005930", "삼성전자", "sell", 2)
+    sql, _ = db.executed[0]
+    assert "DELETE FROM portfolio_holdings" in sql
+
+
+async def test_unknown_trade_type_skips_db():
+    db = _FakeSession()
+    with pytest.raises(ValueError, match="잘못된 거래 타입"):
+        await execute_trade(db, _portfolio(), "005930", "삼성전자", "hold", 1)
+    assert db.executed == []
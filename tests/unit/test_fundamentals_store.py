@@ -0,0 +1,95 @@
+"""Unit tests for the daily fundamentals snapshot."""
+
+import pandas as pd
+
+from datapipeline.collectors import fundamentals_store
+from datapipeline.collectors.financial_collector import format_fundamentals_for_llm
+from datapipeline.collectors.fundamentals_store import FundamentalsStore
+
+
+def _board():
+    return pd.DataFrame(
+        {
+            "BPS": [50000, 80000], "PER": [12.5, 0.0], "PBR": [1.2, 0.9],
+            "EPS": [5000, -300], "DIV": [2.1, 0.0], "DPS": [1444, 0],
+        },
+        index=["005930", "000660"],
+    )
+
+
+def _patch(monkeypatch, settled, boards):
+    calls = []
+
+    def _fake_fetch(date_str):
+        calls.append(date_str)
+        return boards.get(date_str)
+
+    monkeypatch.setattr(fundamentals_store, "_fetch_fundamentals", _fake_fetch)
+    monkeypatch.setattr(fundamentals_store, "_settled_through", lambda now=None: settled[0])
+    return calls
+
+
+def test_snapshot_uses_latest_trading_day_and_is_fetched_once_per_day(tmp_path, monkeypatch):
+    settled = [20260222]  # 일요일 → 금요일(20260220) 표 사용
+    calls = _patch(monkeypatch, settled, {"20260220": _board()})
+    store = FundamentalsStore(tmp_path)
+
+    trade_date, row = store.lookup("005930")
+    assert trade_date == "20260220"
+    assert row["PER"] == 12.5 and row["DPS"] == 1444
+    assert store.lookup("999999") is None
+    assert calls == ["20260220"]  # 주말은 거래일 달력으로 건너뜀
+
+    # 같은 확정일 안에서는 네트워크/파일 접근 없이 메모리 색인만 사용
+    store.lookup("000660")
+    assert len(calls) == 1
+
+    # 다른 워커/재시작은 저장된 파일을 읽는다
+    other = FundamentalsStore(tmp_path)
+    assert other.lookup("000660")[1]["EPS"] == -300
+    assert calls == ["20260220"]
+
+
+def test_new_trading_day_triggers_one_refresh(tmp_path, monkeypatch):
+    settled = [20260220]
+    boards = {"20260220": _board()}
+    calls = _patch(monkeypatch, settled, boards)
+    store = FundamentalsStore(tmp_path)
+    assert store.snapshot().trade_date == "20260220"
+
+    board = _board()
+    board.loc["005930", "PER"] = 13.0
+    boards["20260223"] = board
+    settled[0] = 20260223
+    assert store.lookup("005930") == ("20260223", store.snapshot().get("005930"))
+    assert store.snapshot().get("005930")["PER"] == 13.0
+    assert calls == ["20260220", "20260223"]
+
+
+def test_fetch_failure_keeps_previous_snapshot(tmp_path, monkeypatch):
+    settled = [20260220]
+    calls = _patch(monkeypatch, settled, {"20260220": _board()})
+    store = FundamentalsStore(tmp_path)
+    store.snapshot()
+
+    def _boom(date_str):
+        calls.append(date_str)
+        raise RuntimeError("krx down")
+
+    monkeypatch.setattr(fundamentals_store, "_fetch_fundamentals", _boom)
+    settled[0] = 20260223
+    assert store.snapshot().trade_date == "20260220"
+    # 재시도 간격 동안은 다시 조회하지 않는다
+    assert store.snapshot().trade_date == "20260220"
+    assert calls == ["20260220", "20260223"]
+
+
+def test_format_fundamentals_uses_snapshot(tmp_path, monkeypatch):
+    _patch(monkeypatch, [20260220], {"20260220": _board()})
+    monkeypatch.setattr(fundamentals_store, "_store", FundamentalsStore(tmp_path))
+
+    text = format_fundamentals_for_llm("005930", "삼성전자")
+    assert text.splitlines()[0] == "[삼성전자(005930) 재무 지표 (20260220)]"
+    assert "PER: 12.50배" in text and "배당수익률: 2.10%" in text
+    assert "PER: N/A" in format_fundamentals_for_llm("000660", "SK하이닉스")
+    assert "찾을 수 없습니다" in format_fundamentals_for_llm("123456", "없음")
@@ -0,0 +1,100 @@
+"""Unit tests for ETag / conditional GET on pipeline content endpoints."""
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, Response
+
+from app.core import http_cache
+from app.core.http_cache import conditional_get, etag_matches, uncacheable
+from app.core.responses import EnvelopeJSONResponse
+from app.services.redis_cache import TAG_PIPELINE
+
+
+class _FakeCache:
+    def __init__(self, generation):
+        self.generation = generation
+
+    async def get_generation(self, tag):
+        assert tag == TAG_PIPELINE
+        return self.generation
+
+
+@pytest.fixture
+def client_factory(monkeypatch):
+    def _make(cache):
+        async def _fake_cache():
+            return cache
+
+        monkeypatch.setattr(http_cache, "get_redis_cache", _fake_cache)
+        app = FastAPI(default_response_class=EnvelopeJSONResponse)
+        app.state.db_calls = 0
+
+        async def _db():
+            app.state.db_calls += 1
+            yield None
+
+        @app.get("/keywords/today", dependencies=[conditional_get()])
+        async def today(date: str = "", db=Depends(_db)):
+            return {"keywords": ["반도체"], "date": date}
+
+        @app.get("/glossary", dependencies=[conditional_get()])
+        async def glossary(response: Response):
+            # DB 오류 시 빈 대체 응답
+            uncacheable(response)
+            return {"items": []}
+
+        transport = httpx.ASGITransport(app=app)
+        return app, httpx.AsyncClient(transport=transport, base_url="http://test")
+
+    return _make
+
+
+def test_etag_matches_uses_weak_comparison():
+    assert etag_matches('W/"a", "g1.x"', '"g1.x"')
+    assert etag_matches("*", '"g1.x"')
+    assert not etag_matches('"g0.x"', '"g1.x"')
+    assert not etag_matches(None, '"g1.x"')
+
+
+async def test_matching_if_none_match_skips_db_and_body(client_factory):
+    app, client = client_factory(_FakeCache(3))
+    async with client:
+        first = await client.get("/keywords/today")
+        etag = first.headers["ETag"]
+        second = await client.get("/keywords/today", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200 and first.json()["keywords"] == ["반도체"]
+    assert etag.startswith('"g3.') and "max-age=60" in first.headers["Cache-Control"]
+    assert second.status_code == 304 and second.content == b""
+    assert second.headers["ETag"] == etag
+    assert app.state.db_calls == 1
+
+
+async def test_etag_changes_with_generation_and_query(client_factory):
+    _, client = client_factory(_FakeCache(3))
+    async with client:
+        base = (await client.get("/keywords/today")).headers["ETag"]
+        other_day = (await client.get("/keywords/today?date=20260101")).headers["ETag"]
+    _, client = client_factory(_FakeCache(4))
+    async with client:
+        stale = await client.get("/keywords/today", headers={"If-None-Match": base})
+
+    assert other_day != base
+    assert stale.status_code == 200 and stale.headers["ETag"] != base
+
+
+async def test_without_redis_responds_without_etag(client_factory):
+    _, client = client_factory(_FakeCache(None))
+    async with client:
+        response = await client.get("/keywords/today", headers={"If-None-Match": "*"})
+
+    assert response.status_code == 200 and "ETag" not in response.headers
+
+
+async def test_uncacheable_fallback_drops_generation_etag(client_factory):
+    _, client = client_factory(_FakeCache(3))
+    async with client:
+        response = await client.get("/glossary")
+
+    assert response.status_code == 200 and response.json()["items"] == []
+    assert "ETag" not in response.headers and response.headers["Cache-Control"] == "no-store"
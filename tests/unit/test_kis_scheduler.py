@@ -0,0 +1,65 @@
+"""Unit tests for the KIS token-bucket scheduler (local-bucket fallback)."""
+
+import asyncio
+
+import pytest
+
+from app.services import kis_scheduler
+from app.services.kis_scheduler import (
+    LANE_ORDER,
+    LANE_RANKING,
+    KISRateLimitTimeout,
+    KISRequestScheduler,
+    current_lane,
+    kis_priority,
+)
+
+
+class _NoRedisCache:
+    client = None
+
+
+@pytest.fixture(autouse=True)
+def _no_redis(monkeypatch):
+    async def _fake_get_redis_cache():
+        return _NoRedisCache()
+
+    monkeypatch.setattr(kis_scheduler, "get_redis_cache", _fake_get_redis_cache)
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_lane_is_served_first():
+    scheduler = KISRequestScheduler(rate_per_sec=20, burst=2)
+    # 버킷 비우기
+    await scheduler.acquire(LANE_ORDER)
+    await scheduler.acquire(LANE_ORDER)
+
+    served = []
+
+    async def _acquire(lane):
+        await scheduler.acquire(lane)
+        served.append(lane)
+
+    await asyncio.gather(_acquire(LANE_RANKING), _acquire(LANE_ORDER))
+    assert served == [LANE_ORDER, LANE_RANKING]
+
+
+@pytest.mark.asyncio
+async def test_acquire_times_out_after_deadline():
+    scheduler = KISRequestScheduler(rate_per_sec=0.5, burst=1)
+    await scheduler.acquire(LANE_ORDER)
+
+    with pytest.raises(KISRateLimitTimeout):
+        await scheduler.acquire(LANE_ORDER, timeout=0.05)
+    assert scheduler._heap == []
+
+
+def test_kis_priority_sets_lane_for_block():
+    assert current_lane() == kis_scheduler.LANE_VALUATION
+    with kis_priority(LANE_ORDER):
+        assert current_lane() == LANE_ORDER
+    assert current_lane() == kis_scheduler.LANE_VALUATION
+
+    with pytest.raises(ValueError):
+        with kis_priority("unknown"):
+            pass
@@ -0,0 +1,175 @@
+"""Unit tests for the in-process L1 cache in front of Redis."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.core.redis_keys import key_cache_invalidation_channel
+from app.services import l1_cache
+from app.services.l1_cache import L1Cache
+from app.services.redis_cache import RedisCacheService
+
+
+def test_l1_evicts_least_recently_used_and_expires(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(l1_cache.time, "monotonic", lambda: now[0])
+    cache = L1Cache(max_entries=2)
+    cache.set("a", {"v": 1}, ttl=10)
+    cache.set("b", {"v": 2}, ttl=10)
+    cache.get("a")            # a 를 최근 사용으로
+    cache.set("c", {"v": 3}, ttl=1)
+
+    assert cache.get("b") is None and cache.get("a") == {"v": 1}
+    now[0] += 2
+    assert cache.get("c", "miss") == "miss" and len(cache) == 1
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.ops = []
+
+    def get(self, key):
+        self.ops.append(("get", key))
+
+    def pttl(self, key):
+        self.ops.append(("pttl", key))
+
+    def setex(self, key, ttl, value):
+        self.ops.append(("setex", key, ttl, value))
+
+    def delete(self, key):
+        self.ops.append(("delete", key))
+
+    def publish(self, channel, message):
+        self.ops.append(("publish", channel, message))
+
+    async def execute(self):
+        self.client.executes += 1
+        out = []
+        for op in self.ops:
+            if op[0] == "get":
+                out.append(self.client.store.get(op[1]))
+            elif op[0] == "pttl":
+                out.append(60_000 if op[1] in self.client.store else -2)
+            elif op[0] == "setex":
+                self.client.store[op[1]] = op[3]
+                out.append(True)
+            elif op[0] == "delete":
+                out.append(int(self.client.store.pop(op[1], None) is not None))
+            else:
+                self.client.published.append(op[2])
+                out.append(1)
+        return out
+
+
+class _FakePubSub:
+    def __init__(self, messages):
+        self.messages = messages
+
+    async def subscribe(self, channel):
+        assert channel == key_cache_invalidation_channel()
+
+    async def listen(self):
+        yield {"type": "subscribe"}
+        while True:
+            yield await self.messages.get()
+
+    async def aclose(self):
+        pass
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.published = []
+        self.executes = 0
+        self.messages = asyncio.Queue()
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def pubsub(self):
+        return _FakePubSub(self.messages)
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+async def service():
+    svc = RedisCacheService()
+    svc._client = _FakeRedis()
+    svc._ensure_listener()
+    await _settle()
+    yield svc
+    svc._listener.cancel()
+    await _settle()
+
+
+async def test_second_read_is_served_from_l1(service):
+    service.client.store["k"] = json.dumps({"keywords": ["반도체"]})
+
+    first = await service.get_json("k")
+    second = await service.get_json("k")
+
+    assert first == second == {"keywords": ["반도체"]}
+    assert second is first            # 역직렬화된 객체를 그대로 재사용
+    assert service.client.executes == 1
+
+
+async def test_write_publishes_in_same_pipeline_and_drops_local(service):
+    service.client.store["k"] = json.dumps(1)
+    await service.get_json("k")
+
+    await service.set_json("k", 2, ttl=60)
+
+    assert service.client.executes == 2  # 조회 1 + (SETEX + PUBLISH) 1
+    assert service.client.published == [f"{service._origin} k"]
+    assert await service.get_json("k") == 2
+
+
+async def test_other_worker_invalidation_clears_l1(service):
+    service.client.store["k"] = json.dumps("old")
+    await service.get_json("k")
+    service.client.store["k"] = json.dumps("new")
+
+    await service.client.messages.put({"type": "message", "data": f"{service._origin} k"})
+    await _settle()
+    assert await service.get_json("k") == "old"   # 자기 발행은 이미 로컬에서 처리됨
+
+    await service.client.messages.put({"type": "message", "data": "other-worker k"})
+    await _settle()
+    assert await service.get_json("k") == "new"
+
+
+async def test_l1_disabled_until_subscribed():
+    svc = RedisCacheService()
+    svc._client = _FakeRedis()
+    svc._listener_retry_at = float("inf")  # 리스너 시작 안 함
+    svc.client.store["k"] = json.dumps(1)
+
+    await svc.get_json("k")
+    await svc.get_json("k")
+
+    assert svc.client.executes == 2 and len(svc._l1) == 0
+
+
+async def test_bulk_invalidation_is_one_message_and_one_epoch(service):
+    for key in ("a", "b", "c"):
+        service.client.store[key] = json.dumps(key)
+        await service.get_json(key)
+
+    await service.client.messages.put({"type": "message", "data": "other-worker a\nb"})
+    await _settle()
+    epoch = service._invalidations
+    pipe = service.client.pipeline()
+    service.queue_invalidation(pipe, "b", "c")
+    await pipe.execute()
+
+    assert service._invalidations == epoch + 1
+    assert service.client.published == [f"{service._origin} b\nc"]
+    assert len(service._l1) == 0
@@ -0,0 +1,215 @@
+"""Unit tests for the Redis sorted-set leaderboard."""
+
+import json
+
+from app.services import leaderboard
+from app.services.leaderboard import (
+    credit_leaderboard_entries,
+    load_leaderboard_page,
+    rebuild_leaderboard,
+    update_leaderboard_entries,
+)
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.ops = []
+
+    def __getattr__(self, name):
+        def _queue(*args, **kwargs):
+            self.ops.append((name, args, kwargs))
+        return _queue
+
+    async def execute(self):
+        results = []
+        for name, args, kwargs in self.ops:
+            results.append(await getattr(self.client, name)(*args, **kwargs))
+        return results
+
+
+class _FakeRedis:
+    """리더보드가 쓰는 ZSET/HASH 명령만 구현한 메모리 Redis."""
+
+    def __init__(self):
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.hashes: dict[str, dict[str, str]] = {}
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def _ordered(self, key):
+        items = self.zsets.get(key, {}).items()
+        return sorted(items, key=lambda kv: (kv[1], kv[0]), reverse=True)
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    async def zrevrange(self, key, start, end, withscores=False):
+        return self._ordered(key)[start:end + 1]
+
+    async def zrevrank(self, key, member):
+        for i, (m, _) in enumerate(self._ordered(key)):
+            if m == member:
+                return i
+        return None
+
+    async def zscore(self, key, member):
+        return self.zsets.get(key, {}).get(member)
+
+    async def hset(self, key, field=None, value=None, mapping=None):
+        h = self.hashes.setdefault(key, {})
+        if mapping:
+            h.update(mapping)
+        if field is not None:
+            h[field] = value
+
+    async def hmget(self, key, fields):
+        return [self.hashes.get(key, {}).get(f) for f in fields]
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.zsets.pop(key, None)
+            self.hashes.pop(key, None)
+
+    async def rename(self, src, dst):
+        for store in (self.zsets, self.hashes):
+            if src in store:
+                store[dst] = store.pop(src)
+
+    def _meta_t(self, key, member):
+        raw = self.hashes.get(key, {}).get(member)
+        return json.loads(raw).get("t", 0) if raw else 0
+
+    async def eval(self, script, numkeys, *keys_and_args):
+        """leaderboard 의 Lua 스크립트와 같은 동작."""
+        keys, args = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        if script == leaderboard._UPDATE_IF_NEWER_LUA:
+            board, meta = keys
+            for member, score, raw in zip(args[1::3], args[2::3], args[3::3]):
+                if self._meta_t(meta, member) <= args[0]:
+                    await self.zadd(board, {member: score})
+                    await self.hset(meta, mapping={member: raw})
+        elif script == leaderboard._SWAP_LUA:
+            board, meta, tmp_board, tmp_meta = keys
+            for member, raw in list(self.hashes.get(meta, {}).items()):
+                score = self.zsets.get(board, {}).get(member)
+                if self._meta_t(meta, member) > args[0] and score is not None:
+                    await self.zadd(tmp_board, {member: score})
+                    await self.hset(tmp_meta, mapping={member: raw})
+            if tmp_board in self.zsets:
+                await self.rename(tmp_board, board)
+                await self.rename(tmp_meta, meta)
+            else:
+                await self.delete(board, meta)
+        elif script == leaderboard._CREDIT_META_LUA:
+            (meta,) = keys
+            for member, amount in zip(args[1::2], args[2::2]):
+                raw = self.hashes.get(meta, {}).get(member)
+                if raw:
+                    entry = json.loads(raw)
+                    entry["total_value"] += amount
+                    entry["t"] = max(entry.get("t", 0), args[0])
+                    self.hashes[meta][member] = json.dumps(entry)
+
+
+class _FakeCache:
+    def __init__(self, client):
+        self.client = client
+
+
+def _entry(user_id, pct, username=None):
+    return {
+        "user_id": user_id,
+        "username": username or f"user{user_id}",
+        "total_value": 1_000_000 * (1 + pct / 100),
+        "profit_loss": 10_000 * pct,
+        "profit_loss_pct": pct,
+    }
+
+
+def _setup(monkeypatch, client, entries):
+    calls = []
+
+    async def _fake_cache():
+        return _FakeCache(client)
+
+    async def _fake_compute(db, user_ids=None):
+        calls.append(None if user_ids is None else list(user_ids))
+        if user_ids is None:
+            return list(entries.values())
+        return [entries[u] for u in user_ids if u in entries]
+
+    monkeypatch.setattr(leaderboard, "get_redis_cache", _fake_cache)
+    monkeypatch.setattr(leaderboard, "compute_entries", _fake_compute)
+    return calls
+
+
+async def test_cold_start_rebuilds_then_pages_from_zset(monkeypatch):
+    client = _FakeRedis()
+    entries = {1: _entry(1, 5.0), 2: _entry(2, -3.0), 3: _entry(3, 12.5), 4: _entry(4, 0.0)}
+    calls = _setup(monkeypatch, client, entries)
+
+    page = await load_leaderboard_page(None, offset=1, limit=2, user_id=2)
+    assert page.total == 4
+    assert [(r["rank"], r["user_id"]) for r in page.rows] == [(2, 1), (3, 4)]
+    assert page.me["rank"] == 4 and page.me["username"] == "user2"
+    assert calls == [None]
+
+    # 이후 조회는 재계산 없이 ZSET만 읽는다
+    await load_leaderboard_page(None, offset=0, limit=10, user_id=0)
+    assert calls == [None]
+
+
+async def test_update_entries_skips_older_valuation(monkeypatch):
+    client = _FakeRedis()
+    _setup(monkeypatch, client, {1: _entry(1, 5.0), 2: _entry(2, -3.0)})
+    await rebuild_leaderboard(None, valued_at=100.0)
+
+    await update_leaderboard_entries([_entry(2, 8.0)], valued_at=200.0)
+    # 더 늦게 도착한 이전 평가는 무시
+    await update_leaderboard_entries([_entry(2, 1.0)], valued_at=150.0)
+
+    page = await load_leaderboard_page(None, offset=0, limit=10, user_id=2)
+    assert [r["user_id"] for r in page.rows] == [2, 1]
+    assert page.me["rank"] == 1 and page.me["profit_loss_pct"] == 8.0
+
+
+async def test_rebuild_keeps_entries_written_during_valuation(monkeypatch):
+    client = _FakeRedis()
+    entries = {1: _entry(1, 5.0), 2: _entry(2, -3.0), 3: _entry(3, 0.0)}
+    _setup(monkeypatch, client, entries)
+    await rebuild_leaderboard(None, valued_at=100.0)
+
+    # 전체 재계산(평가 시각 200)이 DB 를 읽는 동안 매매/보상이 먼저 반영됨
+    await update_leaderboard_entries([_entry(2, 9.0)], valued_at=250.0)
+    await credit_leaderboard_entries({3: 50_000})
+    await rebuild_leaderboard(None, entries=list(entries.values()), valued_at=200.0)
+
+    page = await load_leaderboard_page(None, offset=0, limit=10, user_id=3)
+    assert [(r["user_id"], r["profit_loss_pct"]) for r in page.rows] == [(2, 9.0), (1, 5.0), (3, 0.0)]
+    assert page.me["total_value"] == 1_050_000
+
+
+async def test_rebuild_replaces_departed_users(monkeypatch):
+    client = _FakeRedis()
+    entries = {1: _entry(1, 5.0), 2: _entry(2, -3.0)}
+    _setup(monkeypatch, client, entries)
+    await rebuild_leaderboard(None)
+
+    del entries[2]
+    await rebuild_leaderboard(None)
+    page = await load_leaderboard_page(None, offset=0, limit=10, user_id=2)
+    assert page.total == 1 and page.me is None
+
+
+async def test_without_redis_falls_back_to_in_process_ranking(monkeypatch):
+    entries = {1: _entry(1, 5.0), 2: _entry(2, -3.0), 3: _entry(3, 12.5)}
+    _setup(monkeypatch, None, entries)
+
+    page = await load_leaderboard_page(None, offset=0, limit=2, user_id=1)
+    assert [r["user_id"] for r in page.rows] == [3, 1]
+    assert page.total == 3 and page.me["rank"] == 2
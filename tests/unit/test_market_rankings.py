@@ -0,0 +1,62 @@
+"""Unit tests for precomputed market rankings."""
+
+import pandas as pd
+
+from app.services import market_rankings, market_snapshot
+from app.services.kis_service import KISService
+from app.services.market_snapshot import MarketSnapshot
+
+
+def _make_snapshot() -> MarketSnapshot:
+    df = pd.DataFrame(
+        {
+            "종가": [71000, 124000, 50000, 9000, 3000],
+            "거래량": [1000, 500, 3000, 0, 200],
+            "등락률": [1.5, -2.0, 5.0, 30.0, -7.25],
+        },
+        index=["005930", "000660", "035720", "999999", "123456"],
+    )
+    names = {"005930": "삼성전자", "000660": "SK하이닉스", "035720": "카카오", "123456": "테스트"}
+    return MarketSnapshot.from_dataframe("20260219", df, names)
+
+
+def _codes(items):
+    return [item["stock_code"] for item in items]
+
+
+def test_compute_rankings_excludes_zero_volume():
+    rankings = market_rankings.compute_rankings(_make_snapshot())
+
+    assert _codes(rankings.top("volume")) == ["035720", "005930", "000660", "123456"]
+    assert _codes(rankings.top("gainers")) == ["035720", "005930", "000660", "123456"]
+    assert _codes(rankings.top("losers", 2)) == ["123456", "000660"]
+    assert rankings.top("high_volume") == rankings.top("volume")
+    assert rankings.top("losers", 1)[0] == {
+        "stock_code": "123456",
+        "stock_name": "테스트",
+        "current_price": 3000,
+        "change_rate": -7.25,
+        "volume": 200,
+    }
+
+
+def test_rankings_recomputed_only_when_snapshot_changes(monkeypatch):
+    monkeypatch.setattr(market_snapshot, "_snapshot", _make_snapshot())
+    monkeypatch.setattr(market_rankings, "ensure_fresh_snapshot", lambda: None)
+    monkeypatch.setattr(market_rankings, "_rankings", None)
+
+    first = market_rankings.get_market_rankings()
+    assert market_rankings.get_market_rankings() is first
+
+    market_snapshot.set_market_snapshot(_make_snapshot())
+    assert market_rankings.get_market_rankings() is not first
+
+
+async def test_kis_get_ranking_reads_precomputed_lists(monkeypatch):
+    monkeypatch.setattr(market_snapshot, "_snapshot", _make_snapshot())
+    monkeypatch.setattr(market_rankings, "ensure_fresh_snapshot", lambda: None)
+    monkeypatch.setattr(market_rankings, "_rankings", None)
+
+    kis = KISService()
+    assert _codes(await kis.get_ranking("volume"))[:2] == ["035720", "005930"]
+    assert _codes(await kis.get_ranking("losers"))[:1] == ["123456"]
@@ -0,0 +1,129 @@
+"""Unit tests for the whole-market price snapshot engine."""
+
+import json
+
+import pandas as pd
+import pytest
+
+from app.services import market_snapshot, stock_price_service
+from app.services.market_snapshot import MarketSnapshot
+
+
+class _FakeRedisClient:
+    def __init__(self, values=None):
+        self.values = values or {}
+        self.mget_calls = []
+
+    async def mget(self, keys):
+        self.mget_calls.append(keys)
+        return [self.values.get(k) for k in keys]
+
+
+class _FakeCache:
+    def __init__(self, client=None):
+        self.client = client
+
+
+def _patch_cache(monkeypatch, client=None):
+    fake_cache = _FakeCache(client)
+
+    async def _fake_get_redis_cache():
+        return fake_cache
+
+    monkeypatch.setattr(stock_price_service, "get_redis_cache", _fake_get_redis_cache)
+    return fake_cache
+
+
+def _make_snapshot() -> MarketSnapshot:
+    df = pd.DataFrame(
+        {
+            "시가": [70000, 120000],
+            "고가": [72000, 125000],
+            "저가": [69500, 119000],
+            "종가": [71000, 124000],
+            "거래량": [1000, 500],
+            "등락률": [1.234, -0.5],
+        },
+        index=["005930", "000660"],
+    )
+    return MarketSnapshot.from_dataframe(
+        "20260219", df, {"005930": "삼성전자", "000660": "SK하이닉스"}
+    )
+
+
+def test_snapshot_lookup_returns_standard_price_format():
+    snapshot = _make_snapshot()
+
+    item = snapshot.get("005930")
+    assert item == {
+        "stock_code": "005930",
+        "stock_name": "삼성전자",
+        "current_price": 71000,
+        "change_rate": 1.23,
+        "volume": 1000,
+        "timestamp": "20260219",
+        "source": "krx_snapshot",
+    }
+    assert snapshot.get("999999") is None
+
+    found, missing = snapshot.get_many(["000660", "999999"])
+    assert [p["stock_code"] for p in found] == ["000660"]
+    assert missing == ["999999"]
+    assert snapshot.price_map(["005930", "999999"]) == {"005930": 71000}
+
+
+@pytest.mark.asyncio
+async def test_get_batch_prices_reads_snapshot_and_fetches_only_missing(monkeypatch):
+    _patch_cache(monkeypatch)
+    monkeypatch.setattr(market_snapshot, "_snapshot", _make_snapshot())
+    fetched = []
+
+    async def _fake_get_current_price(code):
+        fetched.append(code)
+        return {"stock_code": code, "current_price": 1, "source": "kis"}
+
+    monkeypatch.setattr(stock_price_service, "get_current_price", _fake_get_current_price)
+
+    results = await stock_price_service.get_batch_prices(["005930", "000660", "035420", "005930"])
+    assert fetched == ["035420"]
+    assert {p["stock_code"]: p["source"] for p in results} == {
+        "005930": "krx_snapshot",
+        "000660": "krx_snapshot",
+        "035420": "kis",
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_batch_prices_realtime_bypasses_snapshot(monkeypatch):
+    _patch_cache(monkeypatch)
+    monkeypatch.setattr(market_snapshot, "_snapshot", _make_snapshot())
+    fetched = []
+
+    async def _fake_get_current_price(code):
+        fetched.append(code)
+        return {"stock_code": code, "current_price": 1, "source": "kis"}
+
+    monkeypatch.setattr(stock_price_service, "get_current_price", _fake_get_current_price)
+
+    results = await stock_price_service.get_batch_prices(["005930"], realtime=True)
+    assert fetched == ["005930"]
+    assert results[0]["source"] == "kis"
+
+
+@pytest.mark.asyncio
+async def test_get_batch_prices_prefers_redis_values_in_one_mget(monkeypatch):
+    cached = json.dumps({"stock_code": "005930", "current_price": 73000, "source": "kis"})
+    fake_cache = _patch_cache(monkeypatch, _FakeRedisClient({"stock_price:005930": cached}))
+    monkeypatch.setattr(market_snapshot, "_snapshot", _make_snapshot())
+
+    async def _fake_get_current_price(code):
+        raise AssertionError("캐시/스냅샷으로 충족되면 종목별 조회를 하지 않아야 한다")
+
+    monkeypatch.setattr(stock_price_service, "get_current_price", _fake_get_current_price)
+
+    results = await stock_price_service.get_batch_prices(["005930", "000660"])
+    assert fake_cache.client.mget_calls == [["stock_price:005930", "stock_price:000660"]]
+    assert {p["stock_code"]: p["current_price"] for p in results} == {
+        "005930": 73000,
+        "000660": 124000,
+    }
@@ -0,0 +1,115 @@
+"""Unit tests for the local columnar OHLCV store."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from datapipeline.collectors import ohlcv_store
+from datapipeline.collectors.ohlcv_store import KST, OHLCVStore
+
+
+def _frame(dates, closes, volume=100):
+    return pd.DataFrame(
+        {
+            "시가": closes, "고가": closes, "저가": closes,
+            "종가": closes, "거래량": [volume] * len(closes),
+        },
+        index=pd.to_datetime(dates),
+    )
+
+
+def _patch_fetch(monkeypatch, frame):
+    calls = []
+
+    def _fake_fetch(symbol, start, end):
+        calls.append((symbol, start, end))
+        df = frame[(frame.index >= pd.Timestamp(str(start))) & (frame.index <= pd.Timestamp(str(end)))]
+        return ohlcv_store.frame_to_rows(df)
+
+    monkeypatch.setattr(ohlcv_store, "_fetch_history", _fake_fetch)
+    monkeypatch.setattr(ohlcv_store, "_settled_through", lambda now=None, market=None: 20260220)
+    return calls
+
+
+def test_ensure_reads_through_once_then_serves_from_disk(tmp_path, monkeypatch):
+    frame = _frame(["2026-02-12", "2026-02-13", "2026-02-19", "2026-02-20"], [100, 110, 121, 120])
+    calls = _patch_fetch(monkeypatch, frame)
+    store = OHLCVStore(tmp_path)
+
+    rows = store.ensure("005930", "2026-02-10", "2026-02-20")
+    assert rows["date"].tolist() == [20260212, 20260213, 20260219, 20260220]
+    assert rows["close"].tolist() == [100, 110, 121, 120]
+
+    # 확인된 구간 안의 조회는 네트워크를 타지 않는다 (휴장일 포함)
+    sub = store.ensure("005930", "20260213", "20260219")
+    assert sub["date"].tolist() == [20260213, 20260219]
+    assert len(calls) == 1
+
+    # 더 이른 구간만 추가로 받는다
+    store.ensure("005930", "2026-02-01", "2026-02-20")
+    assert calls[-1] == ("005930", 20260201, 20260209)
+
+
+def test_append_board_extends_history_and_detects_adjustment(tmp_path, monkeypatch):
+    frame = _frame(["2026-02-19", "2026-02-20"], [100, 110])
+    calls = _patch_fetch(monkeypatch, frame)
+    store = OHLCVStore(tmp_path)
+    store.ensure("005930", "2026-02-19", "2026-02-20")
+    store.ensure("000660", "2026-02-19", "2026-02-20")
+
+    board = pd.DataFrame(
+        {
+            "시가": [115, 23], "고가": [116, 23], "저가": [114, 22],
+            "종가": [115, 22], "거래량": [10, 5],
+            # 000660: 50:1 분할 가정 (기준가 22 → 110과 불일치)
+            "등락률": [4.545, 0.0],
+        },
+        index=["005930", "000660"],
+    )
+    assert store.append_board("20260223", board) == 2
+
+    assert store.read("005930")["close"].tolist() == [100, 110, 115]
+    assert store.coverage("005930") == (20260219, 20260223)
+    # 수정주가 이벤트 종목은 새 행만 남기고 다음 조회 때 과거 구간을 다시 받는다
+    assert store.read("000660")["close"].tolist() == [22]
+    store.ensure("000660", "2026-02-19", "2026-02-20")
+    assert calls[-1] == ("000660", 20260219, 20260222)
+
+
+def test_ensure_frame_returns_pandas_view(tmp_path, monkeypatch):
+    _patch_fetch(monkeypatch, _frame(["2026-02-19"], [100]))
+    store = OHLCVStore(tmp_path)
+    df = store.ensure_frame("005930", "2026-02-19", "2026-02-19")
+    assert list(df.columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert df.index[0] == pd.Timestamp("2026-02-19")
+    assert isinstance(store.read("005930")["close"], np.ndarray)
+
+
+def test_today_is_stored_only_after_settlement():
+    assert ohlcv_store._settled_through(datetime(2026, 2, 19, 15, 0, tzinfo=KST)) == 20260218
+    assert ohlcv_store._settled_through(datetime(2026, 2, 19, 17, 0, tzinfo=KST)) == 20260219
+
+
+def test_us_symbols_settle_after_the_us_close():
+    # 2/20 07:00 KST = 2/19 17:00 ET → 미국 2/19 봉 확정, 06:00 KST 에는 아직 2/18 까지
+    assert ohlcv_store.market_of("AAPL") == ohlcv_store.MARKET_US
+    us = ohlcv_store.MARKET_US
+    assert ohlcv_store._settled_through(datetime(2026, 2, 20, 6, 0, tzinfo=KST), us) == 20260218
+    assert ohlcv_store._settled_through(datetime(2026, 2, 20, 7, 0, tzinfo=KST), us) == 20260219
+    # KST 16시 이후라도 미국 당일 봉은 아직 없다
+    assert ohlcv_store._settled_through(datetime(2026, 2, 19, 17, 0, tzinfo=KST), us) == 20260218
+
+
+def test_append_board_keeps_history_across_a_gap(tmp_path, monkeypatch):
+    _patch_fetch(monkeypatch, _frame(["2026-02-12", "2026-02-13"], [100, 110]))
+    store = OHLCVStore(tmp_path)
+    store.ensure("005930", "2026-02-12", "2026-02-13")
+    board = pd.DataFrame(
+        {"시가": [150], "고가": [150], "저가": [150], "종가": [150], "거래량": [10], "등락률": [1.0]},
+        index=["005930"],
+    )
+
+    # 저장된 마지막 봉(2/13)이 직전 거래일(2/20)이 아니면 종가 불일치로 지우지 않는다
+    store.append_board("20260223", board)
+    assert store.read("005930")["close"].tolist() == [100, 110, 150]
@@ -0,0 +1,135 @@
+"""Unit tests for the in-memory limit order matching engine."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import order_matching
+from app.services.order_matching import LimitOrder, MatchingEngine, OrderBook
+from app.services.portfolio_service import settle_limit_fills
+
+
+def _order(oid, order_type, target, code="005930", user_id=1):
+    return LimitOrder(
+        id=oid, user_id=user_id, stock_code=code, stock_name="삼성전자",
+        order_type=order_type, target_price=target, quantity=1,
+    )
+
+
+def test_book_pops_only_crossing_orders_in_priority_order():
+    book = OrderBook()
+    for order in (
+        _order(1, "buy", 70_000),
+        _order(2, "buy", 72_000),
+        _order(3, "buy", 72_000),
+        _order(4, "sell", 75_000),
+        _order(5, "sell", 71_000),
+    ):
+        book.add(order)
+
+    # 71,500원: 72,000원 매수 2건(먼저 들어온 순) + 71,000원 매도
+    assert [o.id for o in book.crossing(71_500)] == [2, 3, 5]
+    assert len(book) == 2
+    # 아무것도 닿지 않는 가격
+    assert book.crossing(73_000) == []
+    assert [o.id for o in book.crossing(76_000)] == [4]
+
+
+def test_book_skips_cancelled_orders():
+    book = OrderBook()
+    book.add(_order(1, "buy", 72_000))
+    book.add(_order(2, "buy", 71_000))
+    book.discard(1)
+    assert [o.id for o in book.crossing(70_000)] == [2]
+
+
+def test_engine_matches_only_ticked_codes():
+    engine = MatchingEngine()
+    engine.add(_order(1, "buy", 70_000, code="005930"))
+    engine.add(_order(2, "buy", 70_000, code="000660"))
+    engine.cancel(2)
+
+    assert engine.codes() == {"005930"}
+    fills = engine.crossing({"005930": 69_000, "000660": 60_000})
+    assert [(o.id, price) for o, price in fills] == [(1, 69_000)]
+    assert len(engine) == 0
+
+
+class _Session:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = MatchingEngine()
+
+    async def _sync():
+        return None
+
+    monkeypatch.setattr(engine, "sync", _sync)
+    monkeypatch.setattr(order_matching, "AsyncSessionLocal", _Session)
+    return engine
+
+
+async def test_on_prices_settles_crossed_orders_in_one_batch(engine, monkeypatch):
+    calls = []
+
+    async def _settle(db, fills):
+        calls.append([(o.id, price) for o, price in fills])
+        return {1: "filled", 2: "rejected"}  # 3은 다른 곳에서 이미 취소됨
+
+    monkeypatch.setattr(order_matching, "settle_limit_fills", _settle)
+    for order in (_order(1, "buy", 70_000), _order(2, "buy", 71_000), _order(3, "sell", 60_000)):
+        engine.add(order)
+    engine.add(_order(4, "buy", 50_000))
+
+    outcome = await engine.on_prices({"005930": 65_000})
+
+    assert calls == [[(2, 65_000), (1, 65_000), (3, 65_000)]]
+    assert outcome == {1: "filled", 2: "rejected"}
+    assert len(engine) == 1  # 닿지 않은 50,000원 매수만 남음
+
+
+async def test_on_prices_restores_orders_when_settlement_fails(engine, monkeypatch):
+    async def _settle(db, fills):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(order_matching, "settle_limit_fills", _settle)
+    engine.add(_order(1, "buy", 70_000))
+
+    with pytest.raises(RuntimeError):
+        await engine.on_prices({"005930": 65_000})
+    assert len(engine) == 1
+    assert [o.id for o, _ in engine.crossing({"005930": 65_000})] == [1]
+
+
+class _SettleDB:
+    """선점 UPDATE 에 아무것도 걸리지 않는(포트폴리오 없는) 경우의 가짜 세션."""
+
+    def __init__(self):
+        self.statements = []
+        self.committed = False
+
+    async def execute(self, stmt, params=None):
+        self.statements.append((str(stmt), params))
+        if "NOT EXISTS" in str(stmt):
+            return [SimpleNamespace(id=oid) for oid in params["ids"]]
+        return []
+
+    async def commit(self):
+        self.committed = True
+
+
+async def test_settle_rejects_orders_without_portfolio():
+    db = _SettleDB()
+
+    outcome = await settle_limit_fills(db, [(_order(7, "buy", 70_000), 65_000)])
+
+    # 대기로 남겨 두면 증분 동기화 때마다 호가창에 다시 들어와 매 틱 재시도된다
+    assert outcome == {7: "rejected"}
+    assert any("NOT EXISTS" in sql and params == {"ids": [7]} for sql, params in db.statements)
+    assert db.committed
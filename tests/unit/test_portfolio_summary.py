@@ -0,0 +1,207 @@
+"""Unit tests for the write-through portfolio summary cache."""
+
+import json
+from types import SimpleNamespace
+
+from app.core.redis_keys import key_portfolio_summary
+from app.services import portfolio_summary, portfolio_valuation
+from app.services.cache import pack_entry
+from app.services.portfolio_valuation import valuate
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.ops = []
+
+    def eval(self, script, numkeys, *keys_and_args):
+        if script == portfolio_summary._CREDIT_LUA:
+            keys, args = keys_and_args[:numkeys], keys_and_args[numkeys:]
+            self.ops.append(("credit", keys, args[0], args[1:]))
+        else:
+            # _SET_IF_NEWER_LUA 와 같은 동작
+            key, value, ex, valued_at = keys_and_args
+            self.ops.append(("set_if_newer", key, value, ex, valued_at))
+
+    def delete(self, key):
+        self.ops.append(("delete", key))
+
+    async def execute(self):
+        results = []
+        for op in self.ops:
+            if op[0] == "set_if_newer":
+                current = self.client.store.get(op[1])
+                if current and json.loads(current[0]).get("t", 0) > op[4]:
+                    results.append(0)
+                    continue
+                self.client.store[op[1]] = (op[2], op[3])
+                results.append(1)
+            elif op[0] == "credit":
+                # _CREDIT_LUA 와 같은 동작 (만료 유지, t 는 지급 시각 이상)
+                for key, amount in zip(op[1], op[3]):
+                    if key not in self.client.store:
+                        continue
+                    raw, ttl = self.client.store[key]
+                    entry = json.loads(raw)
+                    entry["v"]["total_value"] += amount
+                    entry["v"]["total_rewards_received"] += amount
+                    entry["t"] = max(entry["t"], op[2])
+                    self.client.store[key] = (json.dumps(entry), ttl)
+                results.append(1)
+            else:
+                self.client.store.pop(op[1], None)
+                results.append(1)
+        self.client.executes += 1
+        return results
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.executes = 0
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakeCache:
+    def __init__(self, client):
+        self.client = client
+        self.invalidated = []
+        self.messages = 0
+
+    def queue_invalidation(self, pipe, *keys):
+        self.invalidated.extend(keys)
+        self.messages += 1
+
+
+def _valuation():
+    portfolios = [
+        SimpleNamespace(id=10, user_id=1, username="a", initial_cash=1_000_000,
+                        current_cash=400_000, total_rewards_received=100_000),
+        SimpleNamespace(id=11, user_id=2, username="b", initial_cash=1_000_000,
+                        current_cash=1_000_000, total_rewards_received=0),
+    ]
+    holdings = [SimpleNamespace(portfolio_id=10, stock_code="005930", quantity=10, avg_buy_price=60_000)]
+    return valuate(portfolios, holdings, {"005930": 75_000})
+
+
+def _patch_cache(monkeypatch, client):
+    cache = _FakeCache(client)
+
+    async def _fake_cache():
+        return cache
+
+    monkeypatch.setattr(portfolio_summary, "get_redis_cache", _fake_cache)
+    monkeypatch.setattr(portfolio_summary, "cache_ttl", lambda kind: 300)
+    return cache
+
+
+def test_summaries_match_summary_schema():
+    summaries = _valuation().summaries()
+    assert summaries[1] == {
+        "total_value": 1_150_000,
+        "total_profit_loss": 50_000,   # 보상 10만원 제외
+        "total_profit_loss_pct": 5.0,
+        "total_rewards_received": 100_000,
+    }
+    assert summaries[2]["total_profit_loss"] == 0
+
+
+async def test_write_summaries_sets_keys_with_ttl(monkeypatch):
+    client = _FakeRedis()
+    cache = _patch_cache(monkeypatch, client)
+    monkeypatch.setattr(portfolio_summary, "WRITE_CHUNK", 1)
+
+    written = await portfolio_summary.write_summaries(_valuation())
+
+    assert written == 2 and client.executes == 2  # SET 청크 2
+    value, ttl = client.store[key_portfolio_summary(1)]
+    entry = json.loads(value)  # get_or_set 엔트리 형식
+    assert entry["v"]["total_value"] == 1_150_000
+    assert ttl == 300 + portfolio_summary.SUMMARY_CACHE_POLICY.stale_ttl
+    # 워커 L1 무효화 발행 — 키마다가 아니라 파이프라인(청크)당 메시지 하나
+    assert set(cache.invalidated) == {key_portfolio_summary(u) for u in (1, 2)}
+    assert cache.messages == 2
+
+
+async def test_write_through_trades_values_returned_rows_without_db(monkeypatch):
+    client = _FakeRedis()
+    _patch_cache(monkeypatch, client)
+    boards = []
+
+    async def _prices(codes):
+        return {"005930": 75_000}
+
+    async def _board(entries, valued_at):
+        boards.append([(e["user_id"], e["total_value"]) for e in entries])
+
+    monkeypatch.setattr(portfolio_valuation, "_price_map", _prices)
+    monkeypatch.setattr(portfolio_summary, "update_leaderboard_entries", _board)
+    # 매수 문장 RETURNING 형식 — 같은 포트폴리오의 두 번째 체결 행이 최신 상태
+    first = SimpleNamespace(id=10, user_id=1, username="a", initial_cash=1_000_000,
+                            current_cash=700_000, total_rewards_received=0,
+                            holdings='[["005930", 5, 60000]]')
+    second = SimpleNamespace(id=10, user_id=1, username="a", initial_cash=1_000_000,
+                             current_cash=400_000, total_rewards_received=0,
+                             holdings=[["005930", 10, 60000]])
+
+    await portfolio_summary.write_through_trades([first, second], valued_at=1_000.0)
+
+    entry = json.loads(client.store[key_portfolio_summary(1)][0])
+    assert entry["v"]["total_value"] == 1_150_000 and entry["t"] == 1_000.0
+    assert boards == [[(1, 1_150_000.0)]]
+
+
+async def test_credit_rewards_adds_to_cached_summary_and_leaderboard(monkeypatch):
+    client = _FakeRedis()
+    cache = _patch_cache(monkeypatch, client)
+    credited = []
+
+    async def _board(amounts):
+        credited.append(amounts)
+
+    monkeypatch.setattr(portfolio_summary, "credit_leaderboard_entries", _board)
+    summary = _valuation().summaries()[1]
+    client.store[key_portfolio_summary(1)] = (json.dumps(pack_entry(summary, 300, as_of=1.0)), 360)
+
+    await portfolio_summary.credit_rewards({1: 100_000, 2: 50_000, 3: 0})
+
+    entry = json.loads(client.store[key_portfolio_summary(1)][0])
+    # 보상은 수익률에서 빠지므로 총평가액/누적 보상만 늘어난다
+    assert entry["v"]["total_value"] == 1_250_000
+    assert entry["v"]["total_rewards_received"] == 200_000
+    assert entry["v"]["total_profit_loss"] == 50_000 and entry["t"] > 1.0
+    # 캐시에 없던 사용자는 건너뛴다 (다음 조회에서 계산)
+    assert key_portfolio_summary(2) not in client.store
+    assert credited == [{1: 100_000, 2: 50_000}] and cache.messages == 1
+
+
+async def test_write_summary_skips_newer_entry(monkeypatch):
+    client = _FakeRedis()
+    _patch_cache(monkeypatch, client)
+    newer = pack_entry({"total_value": 1}, 300, as_of=2_000.0)
+    client.store[key_portfolio_summary(1)] = (json.dumps(newer), 360)
+
+    # /portfolio/refresh 가 매매 write-through 보다 먼저 계산을 시작한 경우
+    assert not await portfolio_summary.write_summary(1, {"total_value": 2}, valued_at=1_000.0)
+    assert json.loads(client.store[key_portfolio_summary(1)][0]) == newer
+    assert await portfolio_summary.write_summary(1, {"total_value": 3}, valued_at=3_000.0)
+
+
+async def test_write_summaries_keeps_entries_written_after_valuation(monkeypatch):
+    client = _FakeRedis()
+    cache = _patch_cache(monkeypatch, client)
+    valuation = _valuation()
+    valuation.valued_at = 1_000.0
+    # 평가 시작 뒤 매매 write-through 가 먼저 쓴 요약
+    newer = pack_entry({"total_value": 1}, 300, as_of=1_005.0)
+    client.store[key_portfolio_summary(1)] = (json.dumps(newer), 360)
+
+    written = await portfolio_summary.write_summaries(valuation)
+
+    assert written == 1
+    assert json.loads(client.store[key_portfolio_summary(1)][0]) == newer
+    user2 = json.loads(client.store[key_portfolio_summary(2)][0])
+    assert user2["t"] == 1_000.0 and user2["v"]["total_profit_loss"] == 0
+    assert len(cache.invalidated) == 2 and cache.messages == 1
@@ -0,0 +1,77 @@
+"""Unit tests for the batch portfolio valuation."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.portfolio_valuation import get_nav_history, valuate
+
+
+def _portfolio(pid, user_id, cash, initial=1_000_000, rewards=0):
+    return SimpleNamespace(
+        id=pid, user_id=user_id, username=f"user{user_id}",
+        initial_cash=initial, current_cash=cash, total_rewards_received=rewards,
+    )
+
+
+def _holding(pid, code, qty, avg):
+    return SimpleNamespace(portfolio_id=pid, stock_code=code, quantity=qty, avg_buy_price=avg)
+
+
+def test_valuate_sums_holdings_per_portfolio():
+    portfolios = [
+        _portfolio(10, 1, cash=300_000),
+        _portfolio(11, 2, cash=1_100_000, rewards=100_000),
+        _portfolio(12, 3, cash=0, initial=0),
+    ]
+    holdings = [
+        _holding(10, "005930", 10, 70_000),
+        _holding(10, "000660", 2, 100_000),   # 가격 없음 → 평균 매입가
+        _holding(99, "005930", 5, 70_000),    # 소속 포트폴리오 없음 → 무시
+    ]
+    v = valuate(portfolios, holdings, {"005930": 75_000})
+
+    assert v.holdings_value.tolist() == [950_000, 0, 0]
+    assert v.total_value.tolist() == [1_250_000, 1_100_000, 0]
+    # 보상은 손익에서 제외, 초기 자금 0이면 수익률 0
+    assert v.profit_loss.tolist() == [250_000, 0, 0]
+    assert v.profit_loss_pct.tolist() == [25.0, 0.0, 0.0]
+
+    entries = v.entries()
+    assert entries[0] == {
+        "user_id": 1, "username": "user1", "total_value": 1_250_000.0,
+        "profit_loss": 250_000.0, "profit_loss_pct": 25.0,
+    }
+
+
+def test_valuate_keeps_first_portfolio_per_user():
+    portfolios = [_portfolio(10, 1, cash=900_000), _portfolio(20, 1, cash=5_000_000)]
+    holdings = [_holding(20, "005930", 1, 70_000)]
+    v = valuate(portfolios, holdings, {})
+
+    assert len(v) == 1
+    assert v.portfolio_ids.tolist() == [10]
+    assert v.profit_loss_pct[0] == pytest.approx(-10.0)
+
+
+def test_valuate_empty():
+    v = valuate([], [], {})
+    assert len(v) == 0 and v.entries() == []
+
+
+async def test_nav_history_filters_on_the_portfolio_date_index():
+    captured = []
+
+    class _Db:
+        async def execute(self, stmt):
+            captured.append(stmt)
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: []))
+
+    assert await get_nav_history(_Db(), user_id=7, days=30) == []
+    sql = str(captured[0].compile(dialect=postgresql.dialect()))
+    where = sql.split("WHERE", 1)[1]
+    # (portfolio_id, nav_date) 유니크 인덱스를 타도록 portfolio_id 로 건다
+    assert "portfolio_nav_history.portfolio_id = (SELECT user_portfolios.id" in where
+    assert "portfolio_nav_history.user_id" not in where
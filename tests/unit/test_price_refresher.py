@@ -0,0 +1,91 @@
+"""Unit tests for the hot-set price refresher leader lock."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.redis_keys import key_price_refresher_leader
+from app.services import price_refresher
+from app.services.price_refresher import PriceRefresher
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def eval(self, script, numkeys, key, token):
+        if self.store.get(key) == token:
+            del self.store[key]
+            return 1
+        return 0
+
+
+class _FakeCache:
+    def __init__(self, client):
+        self.client = client
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = _FakeRedis()
+
+    async def _fake_cache():
+        return _FakeCache(client)
+
+    monkeypatch.setattr(price_refresher, "get_redis_cache", _fake_cache)
+    return client
+
+
+async def test_failed_cycle_releases_leader_lock(client, monkeypatch):
+    async def _boom(self, client):
+        raise RuntimeError("redis down")
+
+    monkeypatch.setattr(PriceRefresher, "_refresh", _boom)
+
+    with pytest.raises(RuntimeError):
+        await PriceRefresher().run_cycle()
+    assert key_price_refresher_leader() not in client.store
+
+
+async def test_successful_cycle_keeps_lock_until_ttl(client, monkeypatch):
+    async def _ok(self, client):
+        return 3
+
+    monkeypatch.setattr(PriceRefresher, "_refresh", _ok)
+
+    assert await PriceRefresher().run_cycle() == 3
+    assert await PriceRefresher().run_cycle() == 0  # 같은 주기 안의 다른 워커는 건너뛴다
+
+
+async def test_without_kis_ticks_matching_engine_from_snapshot(client, monkeypatch):
+    ticks = []
+
+    class _Engine:
+        async def sync(self):
+            pass
+
+        def codes(self):
+            return {"005930", "000660"}
+
+        async def on_prices(self, prices):
+            ticks.append(prices)
+
+    async def _no_refresh(code):
+        raise AssertionError("KIS 없이 선갱신하지 않는다")
+
+    monkeypatch.setattr(price_refresher, "get_kis_service", lambda: SimpleNamespace(is_configured=False))
+    monkeypatch.setattr(price_refresher, "get_matching_engine", lambda: _Engine())
+    monkeypatch.setattr(
+        price_refresher, "lookup_prices",
+        lambda codes: ([{"stock_code": "005930", "current_price": 70_000}], ["000660"]),
+    )
+    monkeypatch.setattr(price_refresher, "refresh_price", _no_refresh)
+
+    assert await PriceRefresher().run_cycle() == 0
+    assert ticks == [{"005930": 70_000}]
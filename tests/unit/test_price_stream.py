@@ -0,0 +1,134 @@
+"""Unit tests for the price streaming hub."""
+
+from types import SimpleNamespace
+
+from app.services import price_stream
+from app.services.price_stream import PriceStreamHub, PriceSubscription
+
+
+def _price(code, price, volume=100):
+    return {"stock_code": code, "current_price": price, "volume": volume}
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.ops = []
+
+    def set(self, key, value, nx=False, px=None):
+        self.ops.append(key)
+
+    async def execute(self):
+        results = []
+        for key in self.ops:
+            results.append(key not in self.client.locks)
+            self.client.locks.add(key)
+        return results
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.locks = set()
+        self.published = []
+
+    def pipeline(self, transaction=False):
+        return _FakePipeline(self)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+class _FakeCache:
+    def __init__(self, client):
+        self.client = client
+
+
+def _hub(monkeypatch) -> PriceStreamHub:
+    hub = PriceStreamHub()
+    monkeypatch.setattr(hub, "_ensure_tasks", lambda: None)
+    return hub
+
+
+async def test_subscription_conflates_per_code():
+    sub = PriceSubscription(["005930", "000660"])
+    sub.offer("005930", _price("005930", 1))
+    sub.offer("005930", _price("005930", 2))
+    sub.offer("000660", _price("000660", 3))
+
+    batch = await sub.next_batch(0.01)
+    assert sorted(p["current_price"] for p in batch) == [2, 3]
+    assert await sub.next_batch(0.01) == []
+
+
+async def test_deliver_fans_out_changes_only(monkeypatch):
+    hub = _hub(monkeypatch)
+    a = hub.subscribe(["005930"])
+    b = hub.subscribe(["005930", "000660"])
+
+    assert hub.deliver("005930", _price("005930", 70000)) == 2
+    assert hub.deliver("005930", _price("005930", 70000)) == 0  # 변화 없음
+    assert hub.deliver("035720", _price("035720", 1)) == 0      # 구독자 없음
+
+    assert len(await a.next_batch(0.01)) == 1
+    hub.unsubscribe(a)
+    hub.unsubscribe(a)
+    assert hub.subscribed_codes == ["005930", "000660"]
+
+    # 새 구독자는 마지막 시세를 즉시 받는다
+    c = hub.subscribe(["005930"])
+    assert (await c.next_batch(0.01))[0]["current_price"] == 70000
+    hub.unsubscribe(b)
+    hub.unsubscribe(c)
+    assert hub.subscribed_codes == []
+
+
+async def test_slow_client_is_disconnected(monkeypatch):
+    hub = _hub(monkeypatch)
+    sub = hub.subscribe(["005930"])
+    hub.deliver("005930", _price("005930", 1))
+    sub._last_drain -= price_stream.SLOW_CLIENT_SECONDS + 1
+
+    hub.deliver("005930", _price("005930", 2))
+    assert sub.closed
+    assert hub.subscribed_codes == []
+
+
+async def test_poll_once_claims_codes_across_workers(monkeypatch):
+    redis = _FakeRedis()
+
+    async def _fake_get_redis_cache():
+        return _FakeCache(redis)
+
+    fetched = []
+
+    async def _fake_refresh_price(code):
+        fetched.append(code)
+        return _price(code, 100)
+
+    async def _cached_price(code):
+        raise AssertionError("stream must not poll the 60s price cache")
+
+    async def _noop(code):
+        return None
+
+    monkeypatch.setattr(price_stream, "get_redis_cache", _fake_get_redis_cache)
+    monkeypatch.setattr(price_stream, "get_kis_service", lambda: SimpleNamespace(is_configured=True))
+    monkeypatch.setattr(price_stream, "refresh_price", _fake_refresh_price)
+    monkeypatch.setattr(price_stream, "get_current_price", _cached_price)
+    monkeypatch.setattr(price_stream, "record_price_hit", _noop)
+
+    worker_a, worker_b = _hub(monkeypatch), _hub(monkeypatch)
+    sub_a = worker_a.subscribe(["005930"])
+    worker_b.subscribe(["005930", "000660"])
+
+    # 워커 A: 리스너 구독 전 → 발행은 하고 로컬에도 바로 전달
+    assert await worker_a.poll_once() == 1
+    assert (await sub_a.next_batch(0.01))[0]["stock_code"] == "005930"
+    assert len(redis.published) == 1
+
+    # 워커 B: 005930은 이미 A가 담당 → 000660만 조회, pub/sub로만 발행
+    worker_b._listening = True
+    assert await worker_b.poll_once() == 1
+    assert fetched == ["005930", "000660"]
+    assert len(redis.published) == 2
+    assert worker_b._last == {}
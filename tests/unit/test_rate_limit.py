@@ -0,0 +1,151 @@
+"""Unit tests for the hybrid local/Redis token bucket rate limiter."""
+
+from types import SimpleNamespace
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.responses import EnvelopeJSONResponse
+from app.middleware import rate_limit
+from app.middleware.rate_limit import HybridRateLimiter, RateLimitMiddleware, RateRule
+
+RULE = RateRule("ip", 20, 3600)
+
+
+class _FakeRedis:
+    """GLOBAL_BUCKET_LUA 와 같은 규칙의 전역 버킷 (테스트 시간 동안 리필은 무시)."""
+
+    def __init__(self):
+        self.tokens = {}
+        self.calls = []
+
+    async def eval(self, script, numkeys, *keys_and_args):
+        keys, args = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        self.calls.append(list(keys))
+        out = []
+        for i, key in enumerate(keys):
+            capacity, _rate, spend, need = args[4 * i:4 * i + 4]
+            tokens = self.tokens.get(key, capacity) - spend
+            granted = 0
+            if need > 0 and tokens >= need:
+                tokens -= need
+                granted = 1
+            self.tokens[key] = tokens
+            out += [granted, str(tokens)]
+        return out
+
+
+def _patch_cache(monkeypatch, client):
+    async def _fake_cache():
+        return SimpleNamespace(client=client)
+
+    monkeypatch.setattr(rate_limit, "get_redis_cache", _fake_cache)
+
+
+def _limiter(burst=5, workers=4):
+    return HybridRateLimiter(local_burst=burst, sync_interval=3600, workers=workers)
+
+
+async def test_requests_under_local_burst_skip_redis(monkeypatch):
+    redis = _FakeRedis()
+    _patch_cache(monkeypatch, redis)
+    limiter = _limiter()
+
+    results = [await limiter.hit(RULE, "1.1.1.1") for _ in range(5)]
+
+    assert all(allowed for allowed, _ in results)
+    assert redis.calls == []
+
+
+async def test_burst_exhaustion_syncs_pending_inline(monkeypatch):
+    redis = _FakeRedis()
+    _patch_cache(monkeypatch, redis)
+    limiter = _limiter()
+
+    for _ in range(6):
+        allowed, _ = await limiter.hit(RULE, "1.1.1.1")
+
+    assert allowed and len(redis.calls) == 1
+    # 로컬 5건 + 즉시 동기화 1건이 전역 버킷에 반영됨
+    assert redis.tokens[rate_limit.key_rate_limit("ip", "1.1.1.1")] == 14
+
+
+async def test_global_limit_holds_across_workers_within_burst_error(monkeypatch):
+    redis = _FakeRedis()
+    _patch_cache(monkeypatch, redis)
+    workers = [_limiter(), _limiter()]
+
+    allowed = 0
+    for _ in range(30):
+        for worker in workers:
+            ok, _ = await worker.hit(RULE, "1.1.1.1")
+            allowed += ok
+
+    assert RULE.limit <= allowed <= RULE.limit + len(workers) * 5
+    calls = len(redis.calls)
+    ok, retry_after = await workers[0].hit(RULE, "1.1.1.1")
+    # 소진을 확인한 직후에는 Redis 왕복 없이 거부
+    assert not ok and retry_after > 0 and len(redis.calls) == calls
+
+
+async def test_low_limit_rule_caps_local_burst_per_worker(monkeypatch):
+    redis = _FakeRedis()
+    _patch_cache(monkeypatch, redis)
+    rule = RateRule("tutor_chat", 10, 60)
+    workers = [_limiter(burst=10) for _ in range(4)]
+
+    # 한도 10 / 워커 4 → 워커당 로컬 2건까지만 Redis 확인 없이 허용
+    assert workers[0].burst(rule) == 2
+    allowed = 0
+    for _ in range(10):
+        for worker in workers:
+            ok, _ = await worker.hit(rule, "1.1.1.1")
+            allowed += ok
+
+    assert rule.limit <= allowed <= rule.limit + len(workers) * 2
+
+
+async def test_flush_batches_dirty_keys_and_drops_idle_buckets(monkeypatch):
+    redis = _FakeRedis()
+    _patch_cache(monkeypatch, redis)
+    limiter = _limiter()
+    await limiter.hit(RULE, "1.1.1.1")
+    await limiter.hit(RULE, "2.2.2.2")
+
+    assert await limiter.flush() == 2
+    assert len(redis.calls) == 1 and len(redis.calls[0]) == 2
+
+    # 다음 flush 에서 반영할 사용량이 없으면 0 (리필 전이라 버킷은 유지)
+    assert await limiter.flush() == 0 and len(limiter) == 2
+
+
+async def test_redis_down_falls_back_to_local_bucket(monkeypatch):
+    _patch_cache(monkeypatch, None)
+    limiter = _limiter(burst=2)
+    rule = RateRule("ip", 3, 3600)
+
+    results = [(await limiter.hit(rule, "1.1.1.1"))[0] for _ in range(4)]
+
+    assert results == [True, True, True, False]
+
+
+async def test_route_rule_replaces_default_limit(monkeypatch):
+    _patch_cache(monkeypatch, None)
+    monkeypatch.setitem(rate_limit.ROUTE_RULES, "/chat", RateRule("chat", 1, 60))
+    app = FastAPI(default_response_class=EnvelopeJSONResponse)
+
+    @app.post("/chat")
+    async def chat():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, limiter=_limiter())
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.post("/chat")
+        second = await client.post("/chat")
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert second.json()["message"] == "Too Many Requests"
+    assert second.headers["X-RateLimit-Limit"] == "1"
+    assert int(second.headers["Retry-After"]) >= 1
@@ -0,0 +1,59 @@
+"""Unit tests for the serialization-time response envelope and pure ASGI middlewares."""
+
+import json
+from types import SimpleNamespace
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from app.core.responses import EnvelopeJSONResponse, envelope
+from app.middleware import rate_limit
+from app.middleware.csrf import CSRFMiddleware
+from app.middleware.rate_limit import HybridRateLimiter, RateLimitMiddleware
+
+
+def test_success_payload_is_serialized_as_is():
+    response = EnvelopeJSONResponse({"name": "삼성전자", "price": 70_000})
+    assert json.loads(response.body) == {"name": "삼성전자", "price": 70_000}
+    assert "삼성전자".encode() in response.body  # ensure_ascii 없이 UTF-8
+
+
+def test_error_payload_is_wrapped_once():
+    assert envelope({"detail": "Not Found"}, 404) == {
+        "status": "error", "message": "Not Found", "error": None,
+    }
+    assert envelope([1, 2], 500) == {"status": "error", "message": "Request failed", "error": [1, 2]}
+    wrapped = {"status": "error", "message": "x", "error": None}
+    assert envelope(wrapped, 400) is wrapped
+
+
+def _app(monkeypatch):
+    async def _no_redis():
+        return SimpleNamespace(client=None)
+
+    monkeypatch.setattr(rate_limit, "get_redis_cache", _no_redis)
+    app = FastAPI(default_response_class=EnvelopeJSONResponse)
+
+    @app.get("/items")
+    async def items():
+        return {"items": [1, 2]}
+
+    @app.post("/items")
+    async def create():
+        raise HTTPException(status_code=409, detail="duplicate")
+
+    app.add_middleware(RateLimitMiddleware, limiter=HybridRateLimiter())
+    app.add_middleware(CSRFMiddleware)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def test_stack_passes_through_and_rejects_csrf_mismatch(monkeypatch):
+    async with _app(monkeypatch) as client:
+        ok = await client.get("/items")
+        forged = await client.post(
+            "/items", cookies={"csrfToken": "a"}, headers={"X-CSRF-Token": "b"},
+        )
+
+    assert ok.status_code == 200 and ok.json() == {"items": [1, 2]}
+    assert forged.status_code == 403
+    assert forged.json() == {"status": "error", "message": "CSRF token missing or invalid", "error": None}
@@ -0,0 +1,68 @@
+"""Unit tests for the matured briefing reward sweeper."""
+
+from datetime import date, datetime
+from types import SimpleNamespace
+
+from app.services.reward_sweeper import _settle_cutoff, decide, nav_profit_on_or_before
+
+
+def _reward(rid, portfolio_id, base=100_000):
+    return SimpleNamespace(id=rid, portfolio_id=portfolio_id, base_reward=base, final_reward=base)
+
+
+def test_nav_profit_uses_latest_row_on_or_before_maturity():
+    navs = {
+        1: ([date(2026, 2, 18), date(2026, 2, 19), date(2026, 2, 20)], [-5, 10, 99]),
+    }
+    # 만기일 당일 행
+    assert nav_profit_on_or_before(navs, 1, date(2026, 2, 19)) == 10
+    # 주말 만기 → 직전 거래일(금) 행
+    assert nav_profit_on_or_before(navs, 1, date(2026, 2, 22)) == 99
+
+
+def test_nav_profit_missing_or_stale_is_none():
+    navs = {1: ([date(2026, 2, 16)], [10])}
+    # 만기 세션보다 오래된 NAV(잡 누락)는 쓰지 않는다
+    assert nav_profit_on_or_before(navs, 1, date(2026, 2, 20)) is None
+    # 만기일 NAV 없이 전일 NAV만 있어도 쓰지 않는다
+    assert nav_profit_on_or_before({1: ([date(2026, 2, 19)], [10])}, 1, date(2026, 2, 20)) is None
+    # 만기일 이후 행만 있음 / 포트폴리오 없음
+    assert nav_profit_on_or_before(navs, 1, date(2026, 2, 13)) is None
+    assert nav_profit_on_or_before(navs, 2, date(2026, 2, 20)) is None
+
+
+def test_decide_applies_bonus_and_sums_per_portfolio():
+    now = datetime(2026, 2, 20, 7, 0)
+    rewards = [_reward(1, 10), _reward(2, 10), _reward(3, 11)]
+    profits = {1: 1_000, 2: 500, 3: 0}
+
+    updates, bonuses = decide(rewards, lambda r: profits[r.id], now)
+
+    assert [(u["b_id"], u["b_status"], u["b_multiplier"], u["b_final"]) for u in updates] == [
+        (1, "applied", 1.5, 150_000),
+        (2, "applied", 1.5, 150_000),
+        # 손익 0은 수익 아님 → 보너스 소멸, 기본 보상은 유지
+        (3, "expired", 1.0, 100_000),
+    ]
+    assert all(u["b_applied_at"] == now for u in updates)
+    # 같은 포트폴리오 보너스는 한 번의 UPDATE로 합산
+    assert bonuses == {10: 100_000}
+
+
+class _NavProbeDB:
+    def __init__(self, has_today_nav):
+        self.row = (1,) if has_today_nav else None
+
+    async def execute(self, _stmt):
+        return SimpleNamespace(first=lambda: self.row)
+
+
+async def test_settle_cutoff_holds_today_until_today_nav_exists():
+    now = datetime(2026, 2, 20, 3, 0)  # 금 12:00 KST, 장중
+    midnight_kst = datetime(2026, 2, 19, 15, 0)
+
+    assert await _settle_cutoff(_NavProbeDB(has_today_nav=False), now) == midnight_kst
+    assert await _settle_cutoff(_NavProbeDB(has_today_nav=True), now) == now
+    # 휴장일(토)은 오늘 NAV 가 생기지 않으므로 기다리지 않는다
+    saturday = datetime(2026, 2, 21, 3, 0)
+    assert await _settle_cutoff(_NavProbeDB(has_today_nav=False), saturday) == saturday
@@ -0,0 +1,94 @@
+"""Unit tests for in-process and cross-worker request coalescing."""
+
+import asyncio
+
+import pytest
+
+from app.services import single_flight as sf
+
+
+class _LockedRedisClient:
+    """다른 워커가 이미 락을 잡고 있는 상황을 흉내낸다."""
+
+    async def set(self, *_args, **_kwargs):
+        return None
+
+    async def eval(self, *_args):
+        raise AssertionError("락을 잡지 못한 워커는 해제하지 않아야 한다")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_upstream_fetch():
+    calls = 0
+
+    async def _fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"current_price": 71000}
+
+    results = await asyncio.gather(
+        *[sf.single_flight("test_price", "005930", _fetch) for _ in range(10)]
+    )
+
+    assert calls == 1
+    assert all(r == {"current_price": 71000} for r in results)
+    assert sf._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_waiter_reads_result_filled_by_other_worker(monkeypatch):
+    monkeypatch.setattr(sf, "POLL_INTERVAL", 0.001)
+    reads = 0
+
+    async def _read_cached():
+        nonlocal reads
+        reads += 1
+        return {"current_price": 72000} if reads >= 2 else None
+
+    async def _fetch():
+        raise AssertionError("다른 워커가 채운 결과를 사용해야 한다")
+
+    result = await sf.single_flight(
+        "test_price", "000660", _fetch,
+        client=_LockedRedisClient(), read_cached=_read_cached,
+    )
+    assert result == {"current_price": 72000}
+
+
+@pytest.mark.asyncio
+async def test_fetch_error_propagates_to_all_waiters():
+    async def _fetch():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(
+        *[sf.single_flight("test_price", "035420", _fetch) for _ in range(3)],
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_leader_cancellation_does_not_fail_waiters():
+    calls = 0
+    started = asyncio.Event()
+
+    async def _fetch():
+        nonlocal calls
+        calls += 1
+        started.set()
+        await asyncio.sleep(0.01)
+        return {"current_price": 73000}
+
+    leader = asyncio.create_task(sf.single_flight("test_price", "035420", _fetch))
+    await started.wait()
+    waiter = asyncio.create_task(sf.single_flight("test_price", "035420", _fetch))
+    await asyncio.sleep(0)
+
+    # 리더 요청의 클라이언트가 끊김 → 대기자는 직접 다시 조회한다
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert await waiter == {"current_price": 73000}
+    assert calls == 2 and sf._inflight == {}
@@ -0,0 +1,68 @@
+"""종목명 Aho-Corasick 매처 / 튜터 종목 감지 테스트."""
+
+from app.services import stock_resolver
+from app.services.stock_name_matcher import StockNameMatcher
+
+_LISTING = {
+    "삼성전자": "005930",
+    "삼성전자우": "005935",
+    "SK하이닉스": "000660",
+    "카카오": "035720",
+    "카카오뱅크": "323410",
+    "LG": "003550",
+}
+
+
+def test_longest_non_overlapping_matches():
+    matcher = StockNameMatcher(_LISTING)
+    assert matcher.find_all("카카오뱅크랑 카카오, 삼성전자우 비교") == [
+        ("카카오뱅크", "323410"),
+        ("카카오", "035720"),
+        ("삼성전자우", "005935"),
+    ]
+
+
+def test_overlapping_suffix_patterns_are_found():
+    matcher = StockNameMatcher({"하이닉스": "000660", "이닉": "999999", "닉스": "888888"})
+    hits = {word for _, _, word, _ in matcher.iter_matches("에스케이하이닉스")}
+    assert hits == {"하이닉스", "이닉", "닉스"}
+    assert matcher.find_all("에스케이하이닉스") == [("하이닉스", "000660")]
+
+
+def test_short_patterns_ignored_and_contains_any():
+    matcher = StockNameMatcher({"A": "000001", **_LISTING})
+    assert matcher.find_all("A") == []
+    assert matcher.contains_any("어제 LG 주가")
+    assert not matcher.contains_any("오늘 날씨")
+
+
+def _isolate_listing(monkeypatch):
+    monkeypatch.setattr(stock_resolver, "_matcher", None)
+    monkeypatch.setattr(stock_resolver, "_krx_cache", {})
+    monkeypatch.setattr(stock_resolver, "_krx_loaded", False)
+
+
+def test_detect_stock_codes_with_aliases(monkeypatch):
+    _isolate_listing(monkeypatch)
+    stock_resolver.set_krx_listing(_LISTING)
+
+    assert stock_resolver.detect_stock_codes("삼전이랑 하이닉스 어때?") == [
+        ("삼성전자", "005930"),
+        ("SK하이닉스", "000660"),
+    ]
+    # 코드 직접 입력 + 이름 중복 제거, 최대 3개
+    assert stock_resolver.detect_stock_codes("005930 삼성전자 카카오 카뱅 LG") == [
+        ("005930", "005930"),
+        ("카카오", "035720"),
+        ("카카오뱅크", "323410"),
+    ]
+
+
+def test_set_krx_listing_swaps_matcher(monkeypatch):
+    _isolate_listing(monkeypatch)
+    stock_resolver.set_krx_listing(_LISTING)
+    before = stock_resolver._matcher
+
+    stock_resolver.set_krx_listing({"네이버웹툰": "999990"})
+    assert stock_resolver._matcher is not before
+    assert stock_resolver.detect_stock_codes("카카오 네이버웹툰") == [("네이버웹툰", "999990")]
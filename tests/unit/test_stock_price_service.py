@@ -1,5 +1,6 @@
 """Unit tests for stock price source selection and cache behavior."""
 
+import asyncio
 import json
 
 import pytest
@@ -41,7 +42,7 @@ async def test_get_current_price_uses_cached_value_first(monkeypatch):
     async def _fake_get_redis_cache():
         return fake_cache
 
-    async def _fake_fetch_kis(_stock_code):
+    async def _fake_fetch_kis(_stock_code, fresh=False):
         raise AssertionError("KIS fetch should not run when cache hit exists")
 
     monkeypatch.setattr(stock_price_service, "get_redis_cache", _fake_get_redis_cache)
@@ -59,7 +60,7 @@ async def test_get_current_price_prefers_kis_before_pykrx(monkeypatch):
     async def _fake_get_redis_cache():
         return fake_cache
 
-    async def _fake_fetch_kis(_stock_code):
+    async def _fake_fetch_kis(_stock_code, fresh=False):
         return {
             "stock_code": "005930",
             "stock_name": "삼성전자",
@@ -90,7 +91,7 @@ async def test_get_current_price_falls_back_to_pykrx_when_kis_unavailable(monkey
     async def _fake_get_redis_cache():
         return fake_cache
 
-    async def _fake_fetch_kis(_stock_code):
+    async def _fake_fetch_kis(_stock_code, fresh=False):
         return None
 
     async def _fake_to_thread(*_args, **_kwargs):
@@ -117,3 +118,52 @@ async def test_get_current_price_falls_back_to_pykrx_when_kis_unavailable(monkey
     assert result["current_price"] == 70000
     assert result["source"] == "pykrx"
     assert len(fake_cache.client.setex_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_price_skips_both_caches(monkeypatch):
+    cached = json.dumps({"stock_code": "005930", "current_price": 1})
+    fake_cache = _FakeCache(_FakeRedisClient(cached=cached))
+    calls = []
+
+    async def _fake_get_redis_cache():
+        return fake_cache
+
+    async def _fake_fetch_kis(stock_code, fresh=False):
+        calls.append(fresh)
+        return {"stock_code": stock_code, "current_price": 2, "change_rate": 0.0}
+
+    monkeypatch.setattr(stock_price_service, "get_redis_cache", _fake_get_redis_cache)
+    monkeypatch.setattr(stock_price_service, "_fetch_price_from_kis", _fake_fetch_kis)
+
+    result = await stock_price_service.refresh_price("005930")
+
+    assert result["current_price"] == 2
+    assert calls == [True]  # kis:price 캐시도 건너뛴다
+    assert json.loads(fake_cache.client.setex_calls[0][2])["current_price"] == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh_price_does_not_join_in_flight_lookup(monkeypatch):
+    fake_cache = _FakeCache(None)
+    release = asyncio.Event()
+
+    async def _fake_get_redis_cache():
+        return fake_cache
+
+    async def _fake_fetch_kis(stock_code, fresh=False):
+        if not fresh:
+            await release.wait()  # 캐시를 읽은 느린 조회
+            return {"stock_code": stock_code, "current_price": 1, "change_rate": 0.0}
+        return {"stock_code": stock_code, "current_price": 2, "change_rate": 0.0}
+
+    monkeypatch.setattr(stock_price_service, "get_redis_cache", _fake_get_redis_cache)
+    monkeypatch.setattr(stock_price_service, "_fetch_price_from_kis", _fake_fetch_kis)
+
+    lookup = asyncio.create_task(stock_price_service.get_current_price("005930"))
+    await asyncio.sleep(0)
+    refreshed = await asyncio.wait_for(stock_price_service.refresh_price("005930"), timeout=1)
+    release.set()
+
+    assert refreshed["current_price"] == 2
+    assert (await lookup)["current_price"] == 1
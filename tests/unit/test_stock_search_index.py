@@ -0,0 +1,50 @@
+"""종목 검색 인메모리 인덱스 테스트."""
+
+from app.services.stock_search_index import StockSearchIndex, to_chosung
+
+_LISTINGS = [
+    ("005930", "삼성전자", "KOSPI"),
+    ("005935", "삼성전자우", "KOSPI"),
+    ("006400", "삼성SDI", "KOSPI"),
+    ("000660", "SK하이닉스", "KOSPI"),
+    ("035720", "카카오", "KOSPI"),
+    ("323410", "카카오뱅크", "KOSPI"),
+    ("011070", "LG이노텍", "KOSPI"),
+]
+
+
+def _codes(results):
+    return [r["stock_code"] for r in results]
+
+
+def test_to_chosung():
+    assert to_chosung("삼성전자") == "ㅅㅅㅈㅈ"
+    assert to_chosung("SK하이닉스") == "skㅎㅇㄴㅅ"
+
+
+def test_code_prefix_search():
+    index = StockSearchIndex(_LISTINGS)
+    assert _codes(index.search("0059")) == ["005930", "005935"]
+    assert _codes(index.search("005930"))[0] == "005930"
+
+
+def test_name_ranking_exact_then_prefix_then_substring():
+    index = StockSearchIndex(_LISTINGS)
+    assert _codes(index.search("카카오")) == ["035720", "323410"]
+    assert _codes(index.search("삼성")) == ["005930", "006400", "005935"]
+    assert _codes(index.search("하이닉스")) == ["000660"]
+    # 대소문자/공백 무시
+    assert _codes(index.search("sk 하이")) == ["000660"]
+
+
+def test_chosung_search():
+    index = StockSearchIndex(_LISTINGS)
+    assert _codes(index.search("ㅅㅅㅈㅈ")) == ["005930", "005935"]
+    assert _codes(index.search("ㅋㅋㅇ"))[0] == "035720"
+    assert "323410" in _codes(index.search("ㅇㅂㅋ"))
+
+
+def test_limit_and_empty_query():
+    index = StockSearchIndex(_LISTINGS)
+    assert index.search("") == []
+    assert len(index.search("ㅅ", limit=2)) == 2
@@ -0,0 +1,91 @@
+"""Unit tests for portfolio loading profiles and keyset trade pagination."""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.portfolio_service import (
+    LOAD_BARE,
+    LOAD_FULL,
+    LOAD_HOLDINGS,
+    decode_trade_cursor,
+    encode_trade_cursor,
+    get_or_create_portfolio,
+    list_trades,
+)
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+    def scalars(self):
+        return self
+
+    def first(self):
+        return self._rows[0] if self._rows else None
+
+
+class _FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return _Result(self.rows)
+
+
+def _trade(tid, ts):
+    return SimpleNamespace(id=tid, traded_at=ts)
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_cursor_round_trip():
+    ts = datetime(2026, 2, 20, 9, 30, 15, 123456)
+    cursor = encode_trade_cursor(_trade(42, ts))
+    assert decode_trade_cursor(cursor) == (ts, 42)
+
+
+@pytest.mark.parametrize("cursor", ["garbage", "2026-02-20T09:30:00_x", "_1"])
+def test_bad_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_trade_cursor(cursor)
+
+
+@pytest.mark.asyncio
+async def test_list_trades_returns_next_cursor_only_when_more_rows():
+    rows = [_trade(i, datetime(2026, 2, 20, 9, 0, i)) for i in (3, 2, 1)]
+
+    db = _FakeSession(rows)
+    page, cursor = await list_trades(db, portfolio_id=7, limit=2)
+    assert [t.id for t in page] == [3, 2]
+    assert cursor == encode_trade_cursor(rows[1])
+    sql = _sql(db.statements[0])
+    assert "ORDER BY simulation_trades.traded_at DESC, simulation_trades.id DESC" in sql
+    assert "OFFSET" not in sql
+
+    db = _FakeSession(rows[2:])
+    page, cursor = await list_trades(db, portfolio_id=7, limit=2, cursor=encode_trade_cursor(rows[1]))
+    assert [t.id for t in page] == [1] and cursor is None
+    assert "(simulation_trades.traded_at, simulation_trades.id) <" in _sql(db.statements[0])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "load, expected",
+    [(LOAD_BARE, []), (LOAD_HOLDINGS, ["holdings"]), (LOAD_FULL, ["holdings", "trades"])],
+)
+async def test_loading_profiles_only_eager_load_requested_relations(load, expected):
+    db = _FakeSession([SimpleNamespace(id=1, user_id=5)])
+    await get_or_create_portfolio(db, 5, load=load)
+    options = db.statements[0]._with_options
+    assert [opt.path[1].key for opt in options] == expected
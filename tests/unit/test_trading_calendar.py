@@ -0,0 +1,56 @@
+"""Unit tests for the precomputed KRX trading calendar."""
+
+from datetime import date, datetime
+
+from shared.trading_calendar import (
+    KST,
+    is_trading_day,
+    latest_trading_day,
+    next_trading_day,
+    prev_trading_day,
+    recent_trading_days,
+    session_hours,
+    trading_days_between,
+)
+from app.services.market_calendar import is_market_session, next_session_open
+
+
+def test_navigation_skips_weekends_and_holidays():
+    # 2026 설 연휴: 2/16(월)~2/18(수)
+    assert not is_trading_day("20260217")
+    assert prev_trading_day("20260219") == date(2026, 2, 13)
+    assert next_trading_day("2026-02-13") == date(2026, 2, 19)
+    assert latest_trading_day(date(2026, 2, 15)) == date(2026, 2, 13)
+    assert latest_trading_day(date(2026, 2, 19)) == date(2026, 2, 19)
+    assert recent_trading_days("20260219", 3) == [
+        date(2026, 2, 19), date(2026, 2, 13), date(2026, 2, 12),
+    ]
+    # 연도 경계: 2025-12-31 연말 휴장 → 2026-01-01 신정
+    assert next_trading_day("20251230") == date(2026, 1, 2)
+    assert prev_trading_day("20260102") == date(2025, 12, 30)
+
+
+def test_trading_days_between_counts_inclusive():
+    assert trading_days_between("20260216", "20260220") == 2
+    assert trading_days_between("20260219", "20260219") == 1
+    assert trading_days_between("20260221", "20260222") == 0
+    assert trading_days_between("20260220", "20260219") == 0
+    assert trading_days_between("20240101", "20240105") == 4
+
+
+def test_out_of_range_falls_back_to_weekdays():
+    assert is_trading_day("20300102")
+    assert next_trading_day("20300104") == date(2030, 1, 7)
+    assert recent_trading_days("20240102", 2) == [date(2024, 1, 2), date(2023, 12, 29)]
+
+
+def test_special_sessions_shift_market_hours():
+    opens, closes = session_hours("20261119")  # 수능일
+    assert (opens.hour, closes.hour, closes.minute) == (10, 16, 30)
+    assert session_hours("20260101") is None
+
+    assert not is_market_session(datetime(2026, 1, 2, 9, 30, tzinfo=KST))
+    assert is_market_session(datetime(2026, 11, 19, 16, 0, tzinfo=KST))
+    assert next_session_open(datetime(2025, 12, 30, 20, 0, tzinfo=KST)) == datetime(
+        2026, 1, 2, 10, 0, tzinfo=KST
+    )